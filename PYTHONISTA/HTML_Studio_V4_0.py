@@ -8,7 +8,9 @@ Fonctionnalités :
 - Serveur HTTP local (127.0.0.1:8787)
 - Routes API REST (machines, patterns, GPT, MIDI export, project save/load)
 - Intégration OpenAI (GPT-4.1-mini)
-- Export MIDI multi-pistes (mido)
+- Export MIDI multi-pistes (encodeur SMF interne, pistes gardées en cache)
+- Tâches de fond (exports, validation, rendus dans un pool de processus)
+- Télémétrie de performance client (séries par appareil et par build)
 - Persistence (JSON + SQLite)
 - Gate OpenAI (validation clé API)
 
@@ -16,29 +18,49 @@ Auteur : IA constructrice
 Date : 2025-10-21
 """
 
+import io
 import os
+import re
 import sys
 import json
+import hashlib
 import sqlite3
 import threading
+import time
+import itertools
+import wave
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional
 
 # Flask
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, after_this_request, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
 
-# MIDI
-import mido
-from mido import MidiFile, MidiTrack, Message, MetaMessage
+# openai et jsonschema sont importés à la première utilisation :
+# la plupart des sessions n'exportent pas et n'appellent pas GPT au démarrage
+# (voir --profile-startup)
 
-# OpenAI
-from openai import OpenAI
-
-# JSON Schema validation
-import jsonschema
-from jsonschema import validate, ValidationError
+# Modules internes
+from modules.pattern_buffer import PatternBuffer, as_buffer, schema_view, unpack_project
+from modules.groove import GrooveSettings, apply_groove, variations
+from modules.automation import AutomationLane, AutomationSettings, CCStats
+from modules.drum_samples import INSTRUMENTS as RD9_INSTRUMENTS, QUANT_STEPS, SAMPLE_RATES, SampleCache, render_pattern
+from modules.jobs import Job, JobContext, JobManager
+from modules.json_stream import dump_project, read_project_body
+from modules.gpt_batch import MAX_BATCH_SIZE, MAX_CONCURRENCY, SingleFlight, run_batch
+from modules import log_store, project_format, schema_validators, smf
+from modules.pattern_index import MAX_K, PatternIndex
+from modules.pattern_model import PatternModel, extract_length
+from modules.perf_store import PerfStore, build_hash
+from modules.profiling import ProfilingMiddleware, RequestProfiler
+from modules.project_store import BINARY, JSON, JSON_GZIP, ProjectStore
+from modules.project_sync import ProjectHub, duplicate_error, serve_project
+from modules.sequencer import SequencerStats, serve_sequencer
+from modules.tempo_map import TempoMap
+from modules.track_cache import CachedTrack, TrackCache, track_keys
+from modules.websocket import WebSocketServer
+from modules.zipstream import MEDIA_TYPE as ZIP_MEDIA_TYPE, stream_zip
 
 # ============================================================================
 # CONFIGURATION
@@ -51,26 +73,87 @@ SCHEMAS_DIR = BASE_DIR.parent / "SCHEMAS"
 MACHINES_DIR = BASE_DIR.parent / "MACHINES"
 DATA_DIR = BASE_DIR / "data"
 
-# Créer les dossiers nécessaires
-DATA_DIR.mkdir(exist_ok=True)
-
 # Serveur
 HOST = "127.0.0.1"
 PORT = 8787
+WS_PORT = 8788  # WebSocket (séquenceur)
+# Pages autorisées à ouvrir une connexion WebSocket (en-tête Origin)
+WS_ALLOWED_ORIGINS = (f"http://127.0.0.1:{PORT}", f"http://localhost:{PORT}")
 
 # OpenAI
 OPENAI_API_KEY = None  # Sera défini via Gate
 OPENAI_MODEL = "gpt-4.1-mini"
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")  # None = API OpenAI (sinon serveur local, ex. faux serveur de test)
+
+OPENAI_TIMEOUT = 20.0  # Secondes par tentative (au-delà : erreur, donc repli local sur /api/gpt)
+
+# Génération par lots (/api/gpt/batch)
+GPT_BATCH_CONCURRENCY = 3
+
+# Générateur local (/api/generate/local, repli de /api/gpt si OpenAI échoue), dans DATA_DIR
+PATTERN_MODEL_FILE = "pattern_model.json"
+PATTERN_MODEL_REFRESH = 5.0  # Secondes entre deux lectures des patterns ajoutés à la bibliothèque
+GPT_LOCAL_FALLBACK = True
+
+# Bibliothèque de patterns (dédoublonnage, recherche par groove), dans DATA_DIR
+PATTERN_INDEX_FILE = "patterns.db"
+
+# Pistes MIDI encodées gardées entre deux exports (réencodage des seules machines modifiées)
+TRACK_CACHE_BUDGET = 16 * 1024 * 1024  # octets de chunks MTrk (éviction LRU au-delà)
+
+# Tâches de fond (/api/jobs : exports, validation, rendus hors des threads de requête), dans DATA_DIR
+JOB_SPOOL_DIR = "jobs"
+JOB_SPOOL_BUDGET = 256 * 1024 * 1024  # octets de résultats conservés (les plus anciens supprimés au-delà)
+JOB_WORKERS = 2
+JOB_PROCESSES = True  # False : threads (sans sous-processus, comme sous Pythonista)
+JOB_HISTORY = 256  # Tâches terminées consultables
+JOB_MAX_ERRORS = 50  # Erreurs rapportées par une validation
+
+# Cache des one-shots RD-9 (pré-écoute), dans DATA_DIR
+SAMPLE_CACHE_DIR = "samples/rd9"
+SAMPLE_CACHE_BUDGET = 32 * 1024 * 1024  # octets (éviction LRU au-delà)
+
+# Projet courant (gardé en mémoire, réponses de /api/project/load précalculées)
+PROJECT_SAVE_DEBOUNCE = 0.5  # Secondes sans sauvegarde avant l'écriture de project.json (0 = immédiate)
+PROJECT_GZIP = True  # Réponse JSON compressée si le client accepte gzip
+
+# Corps JSON lus en flux au-delà de cette taille (patterns validés et traités un à un)
+STREAM_BODY_THRESHOLD = 8 * 1024 * 1024  # octets
+
+# Profilage par requête (opt-in) : 1 requête sur N, 0 = en-tête X-Profile uniquement
+PROFILE_EVERY = os.environ.get("PROFILE_EVERY")  # None = désactivé (voir --profile-requests)
+
+# Télémétrie de performance client (/api/perf, performance_test.html), dans DATA_DIR
+PERF_DB_FILE = "perf.db"
+PERF_RETENTION_DAYS = 7  # Au-delà : cases horaires uniquement
+PERF_REGRESSION_THRESHOLD = 0.05  # Écart relatif minimal signalé par /api/perf/compare
 
 # Base de données SQLite
 DB_PATH = DATA_DIR / "HTML_Studio_logs.db"
+LOG_RETENTION_DAYS = 30  # Au-delà : agrégats horaires uniquement
+LOG_COMPACTION_INTERVAL = 3600  # Secondes entre deux compactages
 
 # ============================================================================
 # BASE DE DONNÉES
 # ============================================================================
 
+# Initialisation paresseuse du stockage (dossier data/ + tables)
+_storage_ready = False
+_storage_lock = threading.Lock()
+
+def ensure_storage():
+    """Crée le dossier de données et les tables au premier besoin (idempotent)."""
+    global _storage_ready
+    if _storage_ready:
+        return
+    with _storage_lock:
+        if not _storage_ready:
+            init_database()
+            _storage_ready = True
+
 def init_database():
     """Initialise la base de données SQLite pour les logs."""
+    DATA_DIR.mkdir(exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -97,12 +180,16 @@ def init_database():
         )
     """)
     
+    # Index et tables d'agrégats horaires (rétention)
+    log_store.ensure_schema(conn)
+    
     conn.commit()
     conn.close()
     print(f"✅ Base de données initialisée : {DB_PATH}")
 
 def log_action(action_type: str, payload: Dict, success: bool, error_message: Optional[str] = None):
     """Log une action dans la base de données."""
+    ensure_storage()
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -112,7 +199,7 @@ def log_action(action_type: str, payload: Dict, success: bool, error_message: Op
     """, (
         datetime.utcnow().isoformat(),
         action_type,
-        json.dumps(payload),
+        log_store.compact_payload(payload),
         1 if success else 0,
         error_message
     ))
@@ -122,6 +209,7 @@ def log_action(action_type: str, payload: Dict, success: bool, error_message: Op
 
 def log_error(error_type: str, message: str, stack_trace: Optional[str] = None):
     """Log une erreur dans la base de données."""
+    ensure_storage()
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -138,6 +226,97 @@ def log_error(error_type: str, message: str, stack_trace: Optional[str] = None):
     conn.commit()
     conn.close()
 
+def pattern_index() -> PatternIndex:
+    """Bibliothèque de patterns (créée au premier usage dans DATA_DIR)."""
+    return PatternIndex(DATA_DIR / PATTERN_INDEX_FILE)
+
+def perf_store() -> PerfStore:
+    """Séries de télémétrie client (créées au premier usage dans DATA_DIR)."""
+    return PerfStore(DATA_DIR / PERF_DB_FILE)
+
+def index_patterns(patterns: List, source: str) -> None:
+    """Ajoute des patterns à la bibliothèque ; une erreur d'index ne bloque pas l'appelant."""
+    try:
+        pattern_index().add_many(patterns, source)
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        log_error("PatternIndexError", str(e))
+
+_pattern_models: Dict[Path, PatternModel] = {}
+_pattern_models_lock = threading.Lock()
+
+def pattern_model() -> PatternModel:
+    """Générateur local : chargé au premier usage (ou appris sur MACHINES/*/tests.json),
+    puis complété par les patterns ajoutés à la bibliothèque au plus toutes les
+    PATTERN_MODEL_REFRESH secondes."""
+    path = DATA_DIR / PATTERN_MODEL_FILE
+    with _pattern_models_lock:
+        model = _pattern_models.get(path)
+        if model is None:
+            model = PatternModel.load(path)
+            if model is None:
+                model = PatternModel()
+                model.add_examples(MACHINES_DIR)
+            _pattern_models[path] = model
+        now = time.monotonic()
+        if now - model.checked >= PATTERN_MODEL_REFRESH:
+            model.checked = now
+            try:
+                if model.update(pattern_index().iter_since(model.last_id)) or not path.exists():
+                    model.save(path)
+            except (sqlite3.Error, OSError) as e:
+                log_error("PatternModelError", str(e))
+        return model
+
+def generate_pattern_locally(prompt: str, project_state: Dict, target_machine: Optional[str] = None,
+                             length_steps: Optional[int] = None, resolution_ppq: int = 96,
+                             seed: Optional[int] = None) -> Dict:
+    """Pattern CreatePattern.v1 tiré du modèle local (machine et longueur déduites du prompt à défaut).
+
+    Raises:
+        ValueError: Aucun modèle pour la machine, longueur ou résolution non supportée
+    """
+    model = pattern_model()
+    target_machine = target_machine or model.pick_machine(prompt, project_state)
+    if target_machine is None:
+        raise ValueError("Aucun modèle local adapté (aucun pattern appris pour ce type de machine)")
+    return model.generate(target_machine, length_steps or extract_length(prompt) or 16, resolution_ppq, seed)
+
+_sample_caches: Dict[Path, SampleCache] = {}
+_sample_caches_lock = threading.Lock()
+
+def sample_cache(directory: Optional[Path] = None) -> SampleCache:
+    """Cache des one-shots RD-9 (un par dossier et par processus, créé au premier usage).
+
+    Args:
+        directory: Dossier du cache (défaut : SAMPLE_CACHE_DIR dans DATA_DIR)
+    """
+    directory = directory or DATA_DIR / SAMPLE_CACHE_DIR
+    with _sample_caches_lock:
+        cache = _sample_caches.get(directory)
+        if cache is None:
+            cache = _sample_caches[directory] = SampleCache(directory, SAMPLE_CACHE_BUDGET)
+        return cache
+
+def start_log_retention() -> threading.Thread:
+    """Compacte les logs et la télémétrie anciens au démarrage puis toutes les LOG_COMPACTION_INTERVAL secondes."""
+    def run():
+        stop = threading.Event()
+        while True:
+            try:
+                removed = log_store.compact(DB_PATH, LOG_RETENTION_DAYS)
+                if any(removed.values()):
+                    print(f"🧹 Logs compactés : {removed['action']} actions, {removed['error']} erreurs")
+                merged = perf_store().compact(PERF_RETENTION_DAYS)
+                if merged:
+                    print(f"🧹 Télémétrie compactée : {merged} cases fusionnées")
+            except sqlite3.Error as e:
+                print(f"⚠️  Compactage des logs impossible : {e}")
+            stop.wait(LOG_COMPACTION_INTERVAL)
+    
+    thread = threading.Thread(target=run, name="log-retention", daemon=True)
+    thread.start()
+    return thread
+
 # ============================================================================
 # VALIDATION JSON SCHEMA
 # ============================================================================
@@ -155,27 +334,97 @@ def load_schema(schema_name: str) -> Dict:
     with open(schema_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def schema_store() -> Dict[str, Dict]:
+    """Tous les schémas indexés par $id (résolution des $ref entre fichiers)."""
+    store = {}
+    for schema_path in sorted(SCHEMAS_DIR.rglob("*.schema.json")):
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        store[schema.get("$id", schema_path.name)] = schema
+    return store
+
 def validate_json(data: Dict, schema_name: str) -> bool:
-    """Valide un JSON contre un schéma."""
+    """Valide un JSON contre un schéma.
+
+    Les patterns peuvent être des dicts ou des PatternBuffer : les pas de ces
+    derniers sont vérifiés colonne par colonne, sans reconstruire les dicts.
+    """
     try:
-        schema = load_schema(schema_name)
-        validate(instance=data, schema=schema)
+        data, column_errors = schema_view(data)
+        error = column_errors[0] if column_errors else schema_error(data, schema_name)
+        if error is not None:
+            log_error("ValidationError", error)
+            return False
         return True
-    except ValidationError as e:
-        log_error("ValidationError", str(e))
-        return False
     except Exception as e:
         log_error("SchemaLoadError", str(e))
         return False
 
+# Validateurs construits une fois par schéma (documents validés en série)
+_schema_validators: Dict[str, Any] = {}
+_schema_validators_lock = threading.Lock()
+_compiled_schemas_current: Optional[bool] = None
+
+def compiled_schemas_current() -> bool:
+    """Les validateurs compilés (modules/schema_validators.py) correspondent-ils à SCHEMAS/ ?"""
+    global _compiled_schemas_current
+    if _compiled_schemas_current is None:
+        sources = {
+            schema_path.relative_to(SCHEMAS_DIR).as_posix(): hashlib.sha1(schema_path.read_bytes()).hexdigest()
+            for schema_path in SCHEMAS_DIR.rglob("*.schema.json")
+        }
+        _compiled_schemas_current = sources == schema_validators.SOURCES
+        if not _compiled_schemas_current:
+            print("⚠️  Validateurs compilés périmés (relancer TOOLS/compile_schemas.py) : jsonschema utilisé")
+    return _compiled_schemas_current
+
+def schema_error(data: Any, schema_name: str) -> Optional[str]:
+    """Premier écart d'un document à un schéma, None s'il est valide.
+
+    Validateurs compilés si SCHEMAS/ n'a pas changé depuis la compilation
+    (mêmes messages que jsonschema, sans l'interprétation du schéma), sinon
+    jsonschema.
+    """
+    if schema_name in schema_validators.VALIDATORS and compiled_schemas_current():
+        error = schema_validators.first_error(schema_name, data)
+        return error.message if error is not None else None
+
+    from jsonschema import RefResolver, validators
+    
+    with _schema_validators_lock:
+        validator = _schema_validators.get(schema_name)
+        if validator is None:
+            schema = load_schema(schema_name)
+            # "$ref": "Pattern.v1.schema.json" désigne un autre fichier de SCHEMAS/
+            resolver = RefResolver(base_uri=schema.get("$id", ""), referrer=schema, store=schema_store())
+            validator = validators.validator_for(schema)(schema, resolver=resolver)
+            _schema_validators[schema_name] = validator
+    error = next(validator.iter_errors(data), None)
+    return error.message if error is not None else None
+
 # ============================================================================
 # OPENAI CLIENT
 # ============================================================================
 
+# Clients réutilisés (pool de connexions HTTP) par (clé, URL)
+_openai_clients: Dict[tuple, Any] = {}
+_openai_clients_lock = threading.Lock()
+
+def get_openai_client(api_key: str):
+    """Client OpenAI partagé pour une clé (thread-safe, créé au premier appel)."""
+    cache_key = (api_key, OPENAI_BASE_URL)
+    with _openai_clients_lock:
+        client = _openai_clients.get(cache_key)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, timeout=OPENAI_TIMEOUT)
+            _openai_clients[cache_key] = client
+        return client
+
 def validate_openai_key(api_key: str) -> bool:
     """Valide une clé API OpenAI."""
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         # Test minimal (1 token)
         response = client.chat.completions.create(
             model=OPENAI_MODEL,
@@ -195,7 +444,7 @@ def generate_pattern_with_gpt(prompt: str, project_state: Dict) -> Optional[Dict
         return None
     
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client(OPENAI_API_KEY)
         
         # Construire le prompt système
         system_prompt = f"""Tu es une IA compositrice pour LiveTechno-Web.
@@ -248,6 +497,7 @@ Règles :
             log_error("GPT_ValidationError", "Pattern généré invalide")
             return None
         
+        index_patterns([pattern], "gpt")
         return pattern
         
     except Exception as e:
@@ -258,98 +508,166 @@ Règles :
 # MIDI EXPORT
 # ============================================================================
 
-def export_midi(project_state: Dict, output_path: Path) -> bool:
-    """Exporte le projet en fichier MIDI multi-pistes."""
-    try:
-        # Créer le fichier MIDI (Type 1, multi-pistes)
-        mid = MidiFile(type=1)
-        
-        # Récupérer les métadonnées
-        meta = project_state.get("meta", {})
-        bpm = meta.get("bpm", 128)
-        ppq = meta.get("ppq", 480)
-        
-        # Configurer le PPQ
-        mid.ticks_per_beat = ppq
+def _pattern_target(pattern) -> Optional[str]:
+    """Machine cible d'un pattern (dict ou PatternBuffer)."""
+    if isinstance(pattern, PatternBuffer):
+        return pattern.meta.get("targetMachine")
+    return pattern.get("targetMachine")
+
+# Paramètres de synthé → numéro de CC (exemple simplifié, CC 1 par défaut)
+CC_MAP = {
+    "cutoff": 74,
+    "resonance": 71,
+    "envmod": 72,
+    "decay": 73,
+    "accent": 75
+}
+
+def track_label(machine: Dict) -> str:
+    """Nom de piste MIDI d'une machine (ex. BEHRINGER.RD9_drums_1)."""
+    return f"{machine.get('id', 'unknown').upper()}_{machine.get('instanceId', 'unknown')}"
+
+def machine_events(machine: Dict, patterns: List, ppq: int,
+                   groove: Optional[GrooveSettings] = None,
+                   tempo: Optional[TempoMap] = None,
+                   automation: Optional[AutomationSettings] = None,
+                   stats: Optional[CCStats] = None) -> List[tuple]:
+    """Événements MIDI d'une machine, patterns enchaînés bout à bout.
+    
+    Un pattern couvre une mesure de la signature en cours à son début
+    (carte de tempo ; 4/4 par défaut). Les automations sont développées en
+    flux de CC (courbes, quantification, éclaircissement) et comptées par
+    mesure dans `stats`.
+    
+    Returns:
+        (tick absolu, priorité, octets MIDI) triés ; à tick égal :
+        note_off < CC < note_on
+    """
+    instance_id = machine.get("instanceId", "unknown")
+    machine_id = machine.get("id", "unknown")
+    channel = (machine.get("midiChannel", 1) - 1) & 0x0F  # MIDI channels 0-15
+    
+    tempo = tempo or TempoMap(ppq)
+    lane = AutomationLane(machine.get("params"))
+    events = []
+    pattern_offset = 0
+    
+    for pattern in patterns:
+        if _pattern_target(pattern) not in (instance_id, machine_id):
+            continue
+        buffer = as_buffer(pattern)
+        length_steps = buffer.meta.get("lengthSteps", 16)
         
-        # Track 0 : Tempo map
-        tempo_track = MidiTrack()
-        mid.tracks.append(tempo_track)
+        # Calculer le ratio de conversion pas → ticks
+        ticks_per_step = tempo.bar_ticks(pattern_offset) // length_steps
         
-        tempo_track.append(MetaMessage('set_tempo', tempo=mido.bpm2tempo(bpm), time=0))
-        tempo_track.append(MetaMessage('time_signature', numerator=4, denominator=4, time=0))
+        # swing/microTime/prob/ratchet appliqués par le moteur de groove
+        grooved = apply_groove(buffer, ppq, ticks_per_step, groove)
+        for tick, note, vel, length in grooved.iter_events():
+            tick += pattern_offset
+            events.append((tick, 2, smf.channel_message(0x90 | channel, note, vel)))
+            # Note-off avant note-on au même tick (notes répétées) : une durée
+            # nulle doit donc durer au moins un tick pour rester fermée
+            events.append((tick + max(length, 1), 0, smf.channel_message(0x80 | channel, note, 0)))
         
-        # Créer une track par machine
-        machines = project_state.get("machines", [])
-        patterns = project_state.get("patterns", [])
-        
-        for machine in machines:
-            instance_id = machine.get("instanceId", "unknown")
-            midi_channel = machine.get("midiChannel", 1) - 1  # MIDI channels 0-15
-            machine_id = machine.get("id", "unknown")
-            
-            # Créer la track
-            track = MidiTrack()
-            mid.tracks.append(track)
-            
-            # Nom de la track
-            track_name = f"{machine_id.upper()}_{instance_id}"
-            track.append(MetaMessage('track_name', name=track_name, time=0))
-            
-            # Trouver les patterns de cette machine
-            machine_patterns = [p for p in patterns if p.get("targetMachine") == instance_id or p.get("targetMachine") == machine_id]
-            
-            # Ajouter les notes de chaque pattern
-            for pattern in machine_patterns:
-                steps = pattern.get("steps", [])
-                length_steps = pattern.get("lengthSteps", 16)
-                resolution_ppq = pattern.get("resolutionPPQ", 96)
-                
-                # Calculer le ratio de conversion pas → ticks
-                ticks_per_step = ppq * 4 // length_steps  # 4 beats = 1 bar
-                
-                for step in steps:
-                    t = step.get("t", 0)
-                    note = step.get("note", 60)
-                    vel = step.get("vel", 100)
-                    duration = step.get("duration", 0.5)  # Durée en beats
-                    
-                    # Convertir en ticks
-                    time_ticks = t * ticks_per_step
-                    duration_ticks = int(duration * ppq)
-                    
-                    # Note On
-                    track.append(Message('note_on', note=note, velocity=vel, time=time_ticks, channel=midi_channel))
-                    
-                    # Note Off
-                    track.append(Message('note_off', note=note, velocity=0, time=duration_ticks, channel=midi_channel))
-                
-                # Ajouter l'automation
-                automation = pattern.get("automation", [])
-                for auto in automation:
-                    target = auto.get("target", "")
-                    at = auto.get("at", 0)
-                    val = auto.get("val", 0.5)
-                    
-                    # Mapper le paramètre à un CC (exemple simplifié)
-                    cc_map = {
-                        "cutoff": 74,
-                        "resonance": 71,
-                        "envmod": 72,
-                        "decay": 73,
-                        "accent": 75
-                    }
-                    
-                    cc_num = cc_map.get(target.lower(), 1)
-                    cc_val = int(val * 127)
-                    
-                    time_ticks = at * ticks_per_step
-                    
-                    track.append(Message('control_change', control=cc_num, value=cc_val, time=time_ticks, channel=midi_channel))
-        
-        # Sauvegarder le fichier
-        mid.save(output_path)
+        # Points d'automation (développés après le dernier pattern)
+        lane.add(buffer.meta.get("automation", []), pattern_offset, ticks_per_step, ppq)
         
+        pattern_offset += length_steps * ticks_per_step
+    
+    cc_events = lane.events(channel, CC_MAP, 1, automation)
+    if stats is not None:
+        stats.add(track_label(machine), [tick for tick, _ in cc_events], tempo.bar_at)
+    events.extend((tick, 1, data) for tick, data in cc_events)
+    events.sort(key=lambda e: (e[0], e[1]))
+    return events
+
+# Pistes encodées réutilisées d'un export à l'autre
+TRACK_CACHE = TrackCache(TRACK_CACHE_BUDGET)
+
+def machine_tracks(project_state: Dict, ppq: int, tempo: TempoMap,
+                   groove: Optional[GrooveSettings] = None,
+                   automation: Optional[AutomationSettings] = None,
+                   stats: Optional[CCStats] = None,
+                   cache_counts: Optional[Dict[str, int]] = None) -> Iterator[tuple]:
+    """Chunk MTrk de chaque machine, repris du cache si ses entrées n'ont pas changé.
+    
+    Yields:
+        (machine, chunk) dans l'ordre des machines ; `cache_counts` reçoit
+        les pistes reprises ("hits") et encodées ("misses")
+    """
+    machines = project_state.get("machines", [])
+    patterns = project_state.get("patterns", [])
+    context = {"ppq": ppq, "tempo": tempo.meta_events(), "groove": groove, "automation": automation}
+    for machine, key in zip(machines, track_keys(machines, patterns, context)):
+        name = track_label(machine)
+        track = TRACK_CACHE.get(key)
+        if cache_counts is not None:
+            outcome = "misses" if track is None else "hits"
+            cache_counts[outcome] = cache_counts.get(outcome, 0) + 1
+        if track is None:
+            track_stats = CCStats()
+            events = machine_events(machine, patterns, ppq, groove, tempo, automation, track_stats)
+            chunk = smf.encode_track([(0, smf.track_name(name))] + [(tick, data) for tick, _, data in events])
+            del events
+            track = CachedTrack(chunk, dict(track_stats.per_bar), sum(track_stats.per_track.values()))
+            TRACK_CACHE.put(key, track)
+        if stats is not None:
+            stats.add_counts(name, track.cc_per_bar, track.cc_events)
+        yield machine, track.chunk
+
+def write_midi(project_state: Dict, output_path: Path, groove: Optional[GrooveSettings] = None,
+               automation: Optional[AutomationSettings] = None,
+               stats: Optional[CCStats] = None,
+               cache_counts: Optional[Dict[str, int]] = None,
+               progress: Optional[Callable[[float], None]] = None) -> None:
+    """Écrit le fichier MIDI multi-pistes (Type 1), sans journaliser (voir export_midi).
+    
+    Args:
+        progress: Appelée avec la fraction des pistes prêtes
+    
+    Raises:
+        ValueError: Carte de tempo invalide
+        OSError: Écriture impossible
+    """
+    meta = project_state.get("meta", {})
+    ppq = meta.get("ppq", 480)
+    tempo = TempoMap.from_project(project_state)
+    
+    # Track 0 : Tempo map (tempo, signatures et sections), puis une track par machine
+    tempo_chunk = smf.encode_track(tempo.meta_events())
+    total = len(project_state.get("machines", []))
+    chunks = []
+    for _, chunk in machine_tracks(project_state, ppq, tempo, groove, automation, stats, cache_counts):
+        chunks.append(chunk)
+        if progress is not None:
+            progress(len(chunks) / total)
+    
+    with open(output_path, 'wb') as f:
+        f.write(smf.header(1, len(chunks) + 1, ppq))
+        f.write(tempo_chunk)
+        for chunk in chunks:
+            f.write(chunk)
+
+def export_midi(project_state: Dict, output_path: Path, groove: Optional[GrooveSettings] = None,
+                automation: Optional[AutomationSettings] = None,
+                stats: Optional[CCStats] = None,
+                cache_counts: Optional[Dict[str, int]] = None) -> bool:
+    """Exporte le projet en fichier MIDI multi-pistes (Type 1).
+    
+    Seules les pistes dont les entrées ont changé depuis un export précédent
+    sont encodées ; le fichier est réassemblé à partir des chunks.
+    
+    Args:
+        project_state: ProjectState.v1 (patterns en dicts ou PatternBuffer)
+        output_path: Fichier .mid à écrire
+        groove: Paramètres de groove (défaut : champs des patterns, seed 0)
+        automation: Résolution et tolérance des flux de CC (défaut : 7 bits)
+        stats: Reçoit le nombre de CC par mesure
+        cache_counts: Reçoit les pistes reprises du cache ("hits") et encodées ("misses")
+    """
+    try:
+        write_midi(project_state, output_path, groove, automation, stats, cache_counts)
         log_action("midi_export", {"output": str(output_path)}, True)
         return True
         
@@ -357,6 +675,249 @@ def export_midi(project_state: Dict, output_path: Path) -> bool:
         log_error("MIDI_ExportError", str(e))
         return False
 
+def _archive_name(name: str) -> str:
+    """Nom utilisable dans une archive (caractères sûrs uniquement)."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "export"
+
+def export_midi_zip(project_state: Dict, groove: Optional[GrooveSettings] = None,
+                    automation: Optional[AutomationSettings] = None,
+                    cache_counts: Optional[Dict[str, int]] = None,
+                    progress: Optional[Callable[[float], None]] = None) -> Iterator[bytes]:
+    """Exporte le projet en archive ZIP produite en flux.
+    
+    Contenu : un fichier SMF Type 0 par machine (tracks/), les statistiques
+    d'export (stats.json : CC par mesure), puis le projet complet en Type 1
+    et en Type 0. Chaque piste est encodée dès que ses
+    événements sont prêts et ses objets libérés aussitôt : seuls les
+    chunks MTrk encodés sont conservés pour les fichiers complets. Rien
+    n'est écrit sur disque. Les pistes inchangées depuis un export précédent
+    sont reprises du cache (`cache_counts` : "hits", "misses") ; `progress`
+    reçoit la fraction des pistes ajoutées à l'archive.
+    
+    Yields:
+        Octets de l'archive
+    """
+    meta = project_state.get("meta", {})
+    ppq = meta.get("ppq", 480)
+    title = _archive_name(meta.get("name") or "export")
+    
+    tempo = TempoMap.from_project(project_state)
+    tempo_chunk = smf.encode_track([(0, smf.track_name("Tempo"))] + tempo.meta_events())
+    chunks: List[bytes] = []
+    stats = CCStats()
+    
+    total = len(project_state.get("machines", []))
+    
+    def entries():
+        tracks = machine_tracks(project_state, ppq, tempo, groove, automation, stats, cache_counts)
+        for index, (machine, chunk) in enumerate(tracks, 1):
+            name = track_label(machine)
+            chunks.append(chunk)
+            yield (f"tracks/{index:02d}_{_archive_name(name)}.mid",
+                   itertools.chain([smf.header(0, 1, ppq)], smf.iter_merged_track([tempo_chunk, chunk], name)))
+            if progress is not None:
+                progress(index / total)
+        
+        yield "stats.json", [json.dumps(stats.to_json(), indent=2).encode("utf-8")]
+        yield f"{title}_type1.mid", itertools.chain([smf.header(1, len(chunks) + 1, ppq), tempo_chunk], chunks)
+        yield (f"{title}_type0.mid",
+               itertools.chain([smf.header(0, 1, ppq)], smf.iter_merged_track([tempo_chunk] + chunks, title)))
+    
+    return stream_zip(entries())
+
+# ============================================================================
+# SÉQUENCEUR (WebSocket)
+# ============================================================================
+
+# Mesures agrégées de toutes les sessions de lecture
+SEQUENCER_STATS = SequencerStats()
+
+# ============================================================================
+# SYNCHRONISATION DU PROJET (WebSocket)
+# ============================================================================
+
+_project_hubs: Dict[Path, ProjectHub] = {}
+_project_hubs_lock = threading.Lock()
+
+def _validate_entity(kind: str, value: Any) -> Optional[str]:
+    """Valide une entité modifiée par un client (voir project_sync).
+
+    Les patterns sont validés contre Pattern.v1 ; les autres entités dans un
+    ProjectState minimal (sans patterns) qui ne contient qu'elles.
+    """
+    if kind == "pattern":
+        valid = validate_json(value, "Pattern.v1")
+    else:
+        skeleton = {"schema": "ProjectState.v1", "meta": {"bpm": 128, "signature": "4/4", "ppq": 480},
+                    "machines": [], "patterns": [], "routing": []}
+        if kind == "machine":
+            skeleton["machines"] = [value]
+        else:
+            skeleton[kind] = value
+        valid = validate_json(skeleton, "ProjectState.v1")
+    return None if valid else f"{kind} invalide"
+
+def project_hub() -> ProjectHub:
+    """État partagé du projet (chargé depuis la dernière sauvegarde au premier usage)."""
+    with _project_hubs_lock:
+        hub = _project_hubs.get(DATA_DIR)
+        if hub is None:
+            snapshot = project_store().get()
+            project_state = snapshot.state if snapshot is not None else None
+            hub = _project_hubs[DATA_DIR] = ProjectHub(
+                project_state, validate=_validate_entity, persist=project_store().put)
+        return hub
+
+def start_websocket_server() -> WebSocketServer:
+    """Démarre le serveur WebSocket (séquenceur, synchronisation) dans un thread dédié."""
+    ws_server = WebSocketServer(HOST, WS_PORT, origins=WS_ALLOWED_ORIGINS)
+    
+    @ws_server.route('/ws/sequencer')
+    def sequencer_route(conn):
+        log_action("sequencer_connect", {}, True)
+        serve_sequencer(conn, SEQUENCER_STATS,
+                        validate=lambda project_state: schema_error(project_state, "ProjectState.v1"))
+    
+    @ws_server.route('/ws/project')
+    def project_route(conn):
+        log_action("project_sync_connect", {}, True)
+        serve_project(conn, project_hub())
+    
+    ws_server.start()
+    return ws_server
+
+# ============================================================================
+# TÂCHES DE FOND
+# ============================================================================
+
+# Exécutées dans un worker (processus) : le corps de la requête est décodé ici,
+# aucun état global du serveur (DATA_DIR, logs) n'est utilisé.
+
+def _job_body(job: JobContext) -> Dict:
+    """Corps JSON soumis avec la tâche (même forme que la route synchrone).
+    
+    Raises:
+        ValueError: Corps absent ou invalide
+    """
+    try:
+        with open(job.input_path, "rb") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError("Corps manquant")
+    except ValueError as e:
+        raise ValueError(f"JSON invalide : {e}")
+    if not isinstance(data, dict):
+        raise ValueError("Corps JSON invalide (objet attendu)")
+    return data
+
+def _validation_errors(project_state: Dict, job: JobContext, share: float = 1.0) -> List[str]:
+    """Écarts d'un ProjectState à son schéma, pattern par pattern puis le reste
+    (comme un corps lu en flux) ; au plus JOB_MAX_ERRORS."""
+    patterns = project_state.get("patterns")
+    errors = []
+    if isinstance(patterns, list):
+        for index, pattern in enumerate(patterns):
+            error = schema_error(pattern, "Pattern.v1")
+            if error:
+                errors.append(f"patterns[{index}] : {error}")
+                if len(errors) >= JOB_MAX_ERRORS:
+                    return errors
+            job.progress(share * (index + 1) / (len(patterns) + 1))
+        project_state = dict(project_state, patterns=[])
+    error = schema_error(project_state, "ProjectState.v1")
+    if error:
+        errors.append(error)
+    return errors
+
+def _project_body(job: JobContext, share: float = 1.0) -> tuple:
+    """(ProjectState, erreurs de validation, corps) d'une tâche de projet."""
+    data = _job_body(job)
+    project_state = data.get("projectState")
+    if not isinstance(project_state, dict):
+        raise ValueError("ProjectState manquant")
+    return project_state, _validation_errors(project_state, job, share), data
+
+def job_validate(params: Dict, job: JobContext) -> Dict:
+    """Validation d'un projet (tâche "validate")."""
+    _, errors, _ = _project_body(job)
+    return {"valid": not errors, "errors": errors}
+
+def _export_inputs(job: JobContext) -> tuple:
+    """(ProjectState, groove, automation) d'une tâche d'export, validés sur les 10 premiers pour cent.
+    
+    Raises:
+        ValueError: Projet ou réglages invalides
+    """
+    project_state, errors, data = _project_body(job, share=0.1)
+    if errors:
+        raise ValueError(f"ProjectState invalide : {errors[0]}")
+    try:
+        groove = GrooveSettings.from_json(data.get("groove"))
+        automation = AutomationSettings.from_json(data.get("automation"))
+        TempoMap.from_project(project_state)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Paramètres d'export invalides : {e}")
+    return project_state, groove, automation
+
+def job_midi_export(params: Dict, job: JobContext) -> Dict:
+    """Export .mid (tâche "midi")."""
+    project_state, groove, automation = _export_inputs(job)
+    stats = CCStats()
+    cache_counts = {"hits": 0, "misses": 0}
+    write_midi(project_state, job.output_path, groove, automation, stats, cache_counts,
+               lambda fraction: job.progress(0.1 + 0.9 * fraction, "pistes"))
+    summary = stats.to_json()
+    return {"mediaType": "audio/midi", "filename": "export.mid", "ccEvents": summary["ccEvents"],
+            "maxCcPerBar": summary["maxPerBar"], "trackCache": cache_counts}
+
+def job_midi_zip(params: Dict, job: JobContext) -> Dict:
+    """Export ZIP (tâche "zip"), écrit dans le spool plutôt que diffusé."""
+    project_state, groove, automation = _export_inputs(job)
+    cache_counts = {"hits": 0, "misses": 0}
+    with open(job.output_path, "wb") as f:
+        for data in export_midi_zip(project_state, groove, automation, cache_counts,
+                                    lambda fraction: job.progress(0.1 + 0.9 * fraction, "pistes")):
+            f.write(data)
+    return {"mediaType": ZIP_MEDIA_TYPE, "filename": "export.zip", "trackCache": cache_counts}
+
+def job_rd9_render(params: Dict, job: JobContext) -> Dict:
+    """Pré-écoute WAV d'un pattern RD-9 (tâche "rd9", cache de one-shots `params["cacheDir"]`)."""
+    data = _job_body(job)
+    pattern = data.get("pattern", {})
+    error = schema_error(pattern, "Pattern.v1")
+    if error:
+        raise ValueError(f"Pattern invalide : {error}")
+    sample_rate, bpm = _render_settings(data)
+    job.progress(0.1, "rendu")
+    # Cache du worker, réutilisé d'une tâche à l'autre (inventaire du dossier lu une fois)
+    audio = render_pattern(pattern, sample_cache(Path(params["cacheDir"])), bpm, data.get("params"), sample_rate)
+    job.output_path.write_bytes(encode_wav(audio, sample_rate))
+    return {"mediaType": "audio/wav", "filename": "preview.wav", "samples": len(audio)}
+
+JOB_TASKS = {
+    "validate": job_validate,
+    "midi": job_midi_export,
+    "zip": job_midi_zip,
+    "rd9": job_rd9_render,
+}
+
+def _log_job(job: Job) -> None:
+    log_action("job", {"id": job.id, "kind": job.kind, "state": job.state, "result": job.result},
+               job.state == "done", job.error)
+
+_job_managers: Dict[Path, JobManager] = {}
+_job_managers_lock = threading.Lock()
+
+def job_manager() -> JobManager:
+    """File des tâches de fond (spool dans DATA_DIR, workers lancés à la première tâche)."""
+    spool_dir = DATA_DIR / JOB_SPOOL_DIR
+    with _job_managers_lock:
+        manager = _job_managers.get(spool_dir)
+        if manager is None:
+            manager = _job_managers[spool_dir] = JobManager(
+                spool_dir, JOB_TASKS, JOB_WORKERS, JOB_SPOOL_BUDGET, JOB_PROCESSES, JOB_HISTORY, _log_job)
+        return manager
+
 # ============================================================================
 # FLASK APP
 # ============================================================================
@@ -364,6 +925,24 @@ def export_midi(project_state: Dict, output_path: Path) -> bool:
 app = Flask(__name__, static_folder=str(PROJECT_DIR), static_url_path='')
 CORS(app)  # Activer CORS pour le développement
 
+# Profileur de requêtes (None tant que le mode n'est pas activé)
+PROFILER: Optional[RequestProfiler] = None
+
+def enable_request_profiling(every: int) -> RequestProfiler:
+    """Active le profilage cProfile/tracemalloc d'une requête sur `every`."""
+    global PROFILER
+    PROFILER = RequestProfiler(every)
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app, PROFILER, app.url_map)
+    return PROFILER
+
+if PROFILE_EVERY is not None:
+    enable_request_profiling(int(PROFILE_EVERY))
+
+@app.before_request
+def prepare_storage():
+    """Initialise le stockage avant la première requête (et non à l'import)."""
+    ensure_storage()
+
 # En-têtes COOP/COEP
 @app.after_request
 def add_headers(response):
@@ -454,40 +1033,161 @@ def generate_with_gpt():
             return jsonify({"error": "Prompt manquant"}), 400
         
         if not OPENAI_API_KEY:
-            return jsonify({"error": "Clé API OpenAI non configurée"}), 401
+            if not GPT_LOCAL_FALLBACK:
+                return jsonify({"error": "Clé API OpenAI non configurée"}), 401
+            # Pas de clé : le modèle local répond directement
+            try:
+                pattern = generate_pattern_locally(prompt, project_state)
+            except ValueError as e:
+                log_error("LocalGenerationError", str(e))
+                return jsonify({"error": str(e)}), 500
+            log_action("local_generate", {"prompt": prompt, "fallback": True}, True)
+            return jsonify({"pattern": pattern, "source": "local"})
         
         # Générer le pattern
         pattern = generate_pattern_with_gpt(prompt, project_state)
         
         if pattern:
             log_action("gpt_generate", {"prompt": prompt}, True)
-            return jsonify({"pattern": pattern})
-        else:
-            log_action("gpt_generate", {"prompt": prompt}, False, "Génération échouée")
-            return jsonify({"error": "Génération échouée"}), 500
+            return jsonify({"pattern": pattern, "source": "gpt"})
+        
+        log_action("gpt_generate", {"prompt": prompt}, False, "Génération échouée")
+        if GPT_LOCAL_FALLBACK:
+            # OpenAI injoignable, trop lent ou réponse invalide : pattern du modèle local
+            try:
+                pattern = generate_pattern_locally(prompt, project_state)
+                log_action("local_generate", {"prompt": prompt, "fallback": True}, True)
+                return jsonify({"pattern": pattern, "source": "local"})
+            except ValueError as e:
+                log_error("LocalGenerationError", str(e))
+        return jsonify({"error": "Génération échouée"}), 500
             
     except Exception as e:
         log_error("API_Error", str(e))
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/midi/export', methods=['POST'])
-def export_midi_route():
-    """Exporter le projet en MIDI."""
+# Regroupement des prompts identiques en cours, partagé entre tous les lots
+GPT_FLIGHT = SingleFlight()
+
+@app.route('/api/gpt/batch', methods=['POST'])
+def generate_batch_with_gpt():
+    """Générer plusieurs patterns en parallèle (NDJSON, un résultat par ligne dès qu'il est prêt)."""
     try:
         data = request.json
+        prompts = data.get('prompts', [])
         project_state = data.get('projectState', {})
+        concurrency = data.get('concurrency', GPT_BATCH_CONCURRENCY)
+        
+        if not isinstance(prompts, list) or not prompts or not all(isinstance(p, str) and p.strip() for p in prompts):
+            return jsonify({"error": "Prompts manquants"}), 400
+        
+        if len(prompts) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Trop de prompts (max {MAX_BATCH_SIZE})"}), 400
+        
+        if not isinstance(concurrency, int) or not 1 <= concurrency <= MAX_CONCURRENCY:
+            return jsonify({"error": f"Concurrence invalide (1-{MAX_CONCURRENCY})"}), 400
+        
+        if OPENAI_API_KEY:
+            source, generate = "gpt", lambda prompt: generate_pattern_with_gpt(prompt, project_state)
+        elif GPT_LOCAL_FALLBACK:
+            # Pas de clé : tout le lot passe par le modèle local
+            source, generate = "local", lambda prompt: generate_pattern_locally(prompt, project_state)
+        else:
+            return jsonify({"error": "Clé API OpenAI non configurée"}), 401
+        
+        # Le prompt système inclut l'état du projet : il fait partie de la clé
+        state_hash = hashlib.sha1(json.dumps(project_state, sort_keys=True).encode("utf-8")).hexdigest()
+        
+        def results():
+            for result in run_batch(
+                prompts,
+                generate,
+                GPT_FLIGHT,
+                concurrency=concurrency,
+                key=lambda prompt: (source, prompt.strip(), state_hash),
+            ):
+                result["source"] = source
+                log_action(f"{source}_generate", {"prompt": result["prompt"], "batch": True, "shared": result["shared"]},
+                           "pattern" in result, result.get("error"))
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        
+        return Response(results(), mimetype="application/x-ndjson")
+        
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/midi/export', methods=['POST'])
+def export_midi_route():
+    """Exporter le projet en MIDI (fichier .mid, ou archive ZIP avec "format": "zip")."""
+    try:
+        if _wants_stream():
+            # Gros projet : patterns validés un à un puis relus depuis le disque, machine par machine
+            try:
+                data = _read_streamed_body()
+            except ValueError as e:
+                log_error("ValidationError", str(e))
+                return jsonify({"error": str(e)}), 400
+            project_state = data["projectState"]
+        else:
+            data = request.json
+            project_state = data.get('projectState', {})
+            
+            # Valider ProjectState
+            if not validate_json(project_state, "ProjectState.v1"):
+                return jsonify({"error": "ProjectState invalide"}), 400
+        
+        # Paramètres de groove optionnels (seed, humanize, quantize…)
+        try:
+            groove = GrooveSettings.from_json(data.get('groove'))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Groove invalide : {e}"}), 400
+        
+        # Développement des automations (résolution 7/14 bits, tolérance)
+        try:
+            automation = AutomationSettings.from_json(data.get('automation'))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Automation invalide : {e}"}), 400
         
-        # Valider ProjectState
-        if not validate_json(project_state, "ProjectState.v1"):
-            return jsonify({"error": "ProjectState invalide"}), 400
+        # Carte de tempo (tempo et signature par section de l'arrangement)
+        try:
+            TempoMap.from_project(project_state)
+        except ValueError as e:
+            return jsonify({"error": f"Carte de tempo invalide : {e}"}), 400
+        
+        # Archive ZIP en flux (pistes séparées + Type 0 + Type 1, sans disque)
+        if data.get('format') == 'zip':
+            def archive():
+                cache_counts = {"hits": 0, "misses": 0}
+                try:
+                    yield from export_midi_zip(project_state, groove, automation, cache_counts)
+                except Exception as e:
+                    log_error("MIDI_ExportError", str(e))
+                    raise
+                log_action("midi_export", {"format": "zip", "machines": len(project_state.get("machines", [])),
+                                           "trackCache": cache_counts}, True)
+            
+            return Response(archive(), mimetype=ZIP_MEDIA_TYPE,
+                            headers={"Content-Disposition": 'attachment; filename="export.zip"'})
         
         # Générer le fichier MIDI
         output_path = DATA_DIR / "export.mid"
-        success = export_midi(project_state, output_path)
+        stats = CCStats()
+        cache_counts = {"hits": 0, "misses": 0}
+        success = export_midi(project_state, output_path, groove, automation, stats, cache_counts)
         
         if success:
-            log_action("midi_export", {"output": str(output_path)}, True)
-            return send_from_directory(DATA_DIR, "export.mid", as_attachment=True)
+            summary = stats.to_json()
+            log_action("midi_export", {"output": str(output_path), "ccEvents": summary["ccEvents"],
+                                       "maxCcPerBar": summary["maxPerBar"], "trackCache": cache_counts}, True)
+            response = send_from_directory(DATA_DIR, "export.mid", as_attachment=True)
+            # Pistes reprises du cache / réencodées
+            response.headers["X-Track-Cache-Hits"] = str(cache_counts["hits"])
+            response.headers["X-Track-Cache-Misses"] = str(cache_counts["misses"])
+            response.headers["X-CC-Events"] = str(summary["ccEvents"])
+            response.headers["X-CC-Max-Per-Bar"] = str(summary["maxPerBar"])
+            response.headers["X-CC-Per-Bar"] = ",".join(map(str, summary["perBar"]))
+            return response
         else:
             log_action("midi_export", {}, False, "Export échoué")
             return jsonify({"error": "Export échoué"}), 500
@@ -496,22 +1196,577 @@ def export_midi_route():
         log_error("API_Error", str(e))
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/project/save', methods=['POST'])
-def save_project():
-    """Sauvegarder le projet."""
+@app.route('/api/groove/variations', methods=['POST'])
+def groove_variations():
+    """Générer des variantes humanisées d'un pattern (pré-écoute).
+    
+    Le pattern couvre une mesure, comme à l'export : sa longueur suit la
+    signature de la carte de tempo (`projectState` facultatif, sinon 4/4)
+    à la mesure `bar` (0 par défaut).
+    """
     try:
         data = request.json
-        project_state = data.get('projectState', {})
+        pattern = data.get('pattern', {})
+        count = data.get('count', 1)
+        project_state = data.get('projectState') or {}
+        if not isinstance(project_state, dict):
+            return jsonify({"error": "projectState invalide"}), 400
+        ppq = data.get('ppq', project_state.get('meta', {}).get('ppq', 480))
+        
+        # Valider le pattern
+        if not validate_json(pattern, "Pattern.v1"):
+            return jsonify({"error": "Pattern invalide"}), 400
+        
+        try:
+            settings = GrooveSettings.from_json(data.get('groove'))
+            tempo = TempoMap.from_project(dict(project_state, meta=dict(project_state.get("meta", {}), ppq=ppq)))
+            bar_start = tempo.bar_tick(data.get('bar', 0))
+            ticks_per_step = tempo.bar_ticks(bar_start) // pattern.get("lengthSteps", 16)
+            results = variations(pattern, ppq, ticks_per_step, count, settings)
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+        
+        log_action("groove_variations", {"count": count, "seed": settings.seed}, True)
+        return jsonify({
+            "ppq": ppq,
+            "variations": [events.to_list() for events in results]
+        })
+        
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/sequencer/stats', methods=['GET'])
+def sequencer_stats():
+    """Mesures du séquenceur (jitter, marge d'envoi, événements en retard)."""
+    return jsonify(SEQUENCER_STATS.summary())
+
+@app.route('/api/logs', methods=['GET'])
+def query_logs():
+    """Logs paginés (du plus récent au plus ancien, curseur `before` = nextCursor).
+    
+    Paramètres : kind (action|error), limit, before, type, since, until,
+    failed (1 = échecs uniquement), aggregate=hourly (lignes compactées).
+    """
+    try:
+        args = request.args
+        kind = args.get('kind', 'action')
+        if args.get('aggregate') == 'hourly':
+            return jsonify({"items": log_store.hourly(DB_PATH, kind, args.get('since'), args.get('type'))})
+        
+        before = args.get('before')
+        page = log_store.query_logs(
+            DB_PATH,
+            kind,
+            limit=int(args.get('limit', log_store.DEFAULT_PAGE_SIZE)),
+            before=int(before) if before else None,
+            type_filter=args.get('type'),
+            since=args.get('since'),
+            until=args.get('until'),
+            failed_only=args.get('failed') == '1',
+        )
+        return jsonify(page)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/debug/profiles', methods=['GET', 'DELETE'])
+def debug_profiles():
+    """Profils de requêtes échantillonnées.
+    
+    GET : résumés (`route` pour filtrer), profil complet (`id`), ou piles
+    repliées fusionnées pour flamegraph.pl / speedscope (`format=collapsed`).
+    DELETE : vide les profils.
+    """
+    if PROFILER is None:
+        return jsonify({"error": "Profilage désactivé (PROFILE_EVERY ou --profile-requests)"}), 404
+    
+    if request.method == 'DELETE':
+        PROFILER.clear()
+        return jsonify({"success": True})
+    
+    route = request.args.get('route')
+    profile_id = request.args.get('id', type=int)
+    
+    if request.args.get('format') == 'collapsed':
+        return Response(PROFILER.collapsed(route, profile_id), mimetype="text/plain",
+                        headers={"Content-Disposition": "attachment; filename=profiles.folded"})
+    
+    if profile_id is not None:
+        record = PROFILER.get(profile_id)
+        if record is None:
+            return jsonify({"error": "Profil introuvable"}), 404
+        return jsonify(record)
+    
+    return jsonify({"every": PROFILER.every, "profiles": PROFILER.profiles(route)})
+
+@app.route('/api/generate/local', methods=['POST'])
+def generate_local():
+    """Générer un pattern avec le modèle local (hors ligne, sans clé API).
+    
+    Corps : "targetMachine" (sinon déduite du prompt), "prompt", "lengthSteps",
+    "resolutionPPQ", "seed" (tirage reproductible), "projectState" ; tous
+    facultatifs.
+    """
+    try:
+        data = request.json or {}
+        prompt = data.get('prompt', '')
+        seed = data.get('seed')
+        if not isinstance(prompt, str):
+            return jsonify({"error": "Prompt invalide"}), 400
+        if seed is not None and not isinstance(seed, int):
+            return jsonify({"error": "seed invalide"}), 400
+        target_machine = data.get('targetMachine')
+        if target_machine is not None and not isinstance(target_machine, str):
+            return jsonify({"error": "targetMachine invalide"}), 400
+        # 16.0 ferait partie de LENGTHS mais pas un nombre de pas (range())
+        length_steps = data.get('lengthSteps')
+        if length_steps is not None and type(length_steps) is not int:
+            return jsonify({"error": "lengthSteps invalide"}), 400
+        resolution_ppq = data.get('resolutionPPQ', 96)
+        if type(resolution_ppq) is not int:
+            return jsonify({"error": "resolutionPPQ invalide"}), 400
+        project_state = data.get('projectState') or {}
+        if not isinstance(project_state, dict):
+            return jsonify({"error": "projectState invalide"}), 400
+        
+        pattern = generate_pattern_locally(
+            prompt, project_state, target_machine, length_steps, resolution_ppq, seed,
+        )
+        log_action("local_generate", {"prompt": prompt, "targetMachine": pattern["targetMachine"]}, True)
+        return jsonify({"pattern": pattern, "source": "local"})
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/generate/local/model', methods=['GET'])
+def local_model_stats():
+    """Machines du modèle local et nombre de patterns appris."""
+    return jsonify(pattern_model().stats())
+
+@app.route('/api/patterns/similar', methods=['POST'])
+def similar_patterns():
+    """Patterns de la bibliothèque au groove le plus proche.
+    
+    Corps : {"pattern": {...}} ou {"id": n}, et optionnellement "k",
+    "maxDistance" (bits d'attaque différents), "targetMachine".
+    """
+    try:
+        data = request.json or {}
+        index = pattern_index()
+        
+        pattern = data.get('pattern')
+        if pattern is None and data.get('id') is not None:
+            pattern = index.get(data['id'])
+            if pattern is None:
+                return jsonify({"error": "Pattern introuvable"}), 404
+        
+        if not isinstance(pattern, dict) or not isinstance(pattern.get('steps'), list):
+            return jsonify({"error": "Pattern manquant"}), 400
+        
+        k = data.get('k', 10)
+        max_distance = data.get('maxDistance')
+        if not isinstance(k, int) or not 1 <= k <= MAX_K:
+            return jsonify({"error": f"k invalide (1-{MAX_K})"}), 400
+        if max_distance is not None and (not isinstance(max_distance, int) or max_distance < 0):
+            return jsonify({"error": "maxDistance invalide"}), 400
+        
+        result = index.similar(pattern, k, max_distance, data.get('targetMachine'))
+        result["indexed"] = index.count()
+        return jsonify(result)
+        
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/rd9/samples', methods=['GET'])
+def rd9_samples():
+    """Instruments RD-9 disponibles et état du cache de one-shots."""
+    return jsonify({
+        "instruments": [{"note": note, "name": name} for note, (name, _, _, _) in sorted(RD9_INSTRUMENTS.items())],
+        "quantSteps": QUANT_STEPS,
+        "cache": sample_cache().stats(),
+    })
+
+@app.route('/api/rd9/samples/<int:note>', methods=['GET'])
+def rd9_sample(note):
+    """One-shot RD-9 en float32 little-endian brut (?tune, ?decay, ?rate).
+    
+    Les paramètres sont quantifiés : l'ETag identifie l'instantané rendu,
+    le client peut donc garder le one-shot en cache.
+    """
+    try:
+        samples, hit = sample_cache().get(
+            note,
+            request.args.get('tune', 0.5, type=float),
+            request.args.get('decay', 0.5, type=float),
+            request.args.get('rate', 44100, type=int),
+        )
+    except ImportError:
+        return jsonify({"error": "NumPy requis pour les one-shots"}), 503
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    response = Response(samples.astype('<f4', copy=False).tobytes(), mimetype="application/octet-stream")
+    response.headers["X-Sample-Rate"] = request.args.get('rate', '44100')
+    response.headers["X-Sample-Count"] = str(len(samples))
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    response.set_etag(Path(samples.filename).stem)
+    return response.make_conditional(request)
+
+def encode_wav(audio: Any, sample_rate: int) -> bytes:
+    """WAV 16 bits mono d'échantillons float32 (-1..1)."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((audio * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+def _render_settings(data: Dict) -> tuple:
+    """(sampleRate, bpm) d'une requête de pré-écoute RD-9.
+    
+    Raises:
+        ValueError: Valeur hors limites
+    """
+    sample_rate = data.get('sampleRate', 44100)
+    bpm = data.get('bpm', 128)
+    if sample_rate not in SAMPLE_RATES:
+        raise ValueError(f"sampleRate invalide {SAMPLE_RATES}")
+    if not isinstance(bpm, (int, float)) or not 20 <= bpm <= 300:
+        raise ValueError("bpm invalide (20-300)")
+    return sample_rate, bpm
+
+@app.route('/api/rd9/preview', methods=['POST'])
+def rd9_preview():
+    """Pré-écoute WAV (16 bits mono) d'un pattern RD-9 mixée depuis le cache.
+    
+    Corps : {"pattern": {...}, "bpm": 128, "params": {"BD": {"tune", "decay",
+    "level"}}, "sampleRate": 44100}
+    """
+    try:
+        data = request.json or {}
+        pattern = data.get('pattern', {})
+        if not validate_json(pattern, "Pattern.v1"):
+            return jsonify({"error": "Pattern invalide"}), 400
+        
+        try:
+            sample_rate, bpm = _render_settings(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        try:
+            audio = render_pattern(pattern, sample_cache(), bpm, data.get('params'), sample_rate)
+        except ImportError:
+            return jsonify({"error": "NumPy requis pour la pré-écoute"}), 503
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+        
+        log_action("rd9_preview", {"steps": len(pattern.get("steps", [])), "sampleRate": sample_rate}, True)
+        return Response(encode_wav(audio, sample_rate), mimetype="audio/wav")
+        
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def jobs():
+    """Soumettre une tâche de fond (202 + id) ou lister les tâches récentes.
+    
+    POST /api/jobs?kind=midi|zip|validate|rd9&priority=high|normal|low : le
+    corps est celui de /api/midi/export (projectState, groove, automation)
+    ou de /api/rd9/preview. Il est recopié dans le spool sans être décodé ;
+    la tâche le valide (erreurs : état "failed").
+    """
+    try:
+        if request.method == 'GET':
+            return jsonify({"jobs": job_manager().list(), "stats": job_manager().stats()})
+        
+        kind = request.args.get('kind')
+        params = {"cacheDir": str(DATA_DIR / SAMPLE_CACHE_DIR)} if kind == "rd9" else {}
+        try:
+            job = job_manager().submit(kind, params, request.args.get('priority', 'normal'), request.stream)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        log_action("job_submit", {"id": job.id, "kind": kind, "priority": job.priority}, True)
+        response = jsonify(job_manager().to_json(job))
+        response.status_code = 202
+        response.headers["Location"] = f"/api/jobs/{job.id}"
+        return response
+        
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def job_status(job_id):
+    """État et progression d'une tâche (DELETE : annulation)."""
+    if request.method == 'DELETE':
+        return cancel_job(job_id)
+    job = job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Tâche inconnue"}), 404
+    return jsonify(job_manager().to_json(job))
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Annuler une tâche en attente ou en cours."""
+    try:
+        job = job_manager().cancel(job_id)
+    except KeyError:
+        return jsonify({"error": "Tâche inconnue"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    log_action("job_cancel", {"id": job_id}, True)
+    return jsonify(job_manager().to_json(job))
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Résultat d'une tâche terminée : fichier du spool, ou JSON (validation)."""
+    job = job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Tâche inconnue"}), 404
+    if job.state != "done":
+        return jsonify({"error": f"Tâche non terminée ({job.state})", "state": job.state}), 409
+    if job.expired:
+        return jsonify({"error": "Résultat supprimé du spool"}), 410
+    path = job_manager().result_path(job)
+    if path is None:
+        return jsonify(job.result)
+    return send_file(path, mimetype=job.result.get("mediaType"), as_attachment=True,
+                     download_name=job.result.get("filename", path.name))
+
+@app.route('/api/perf', methods=['POST'])
+def ingest_perf():
+    """Enregistrer des mesures de performance_test.html.
+    
+    Corps : {"device": "iPhone 14 Pro Max", "build": "…" (défaut : build
+    servi), "samples": [{"t": ms, "cpu", "latency", "memory", "fps"}]}.
+    Accepte aussi les envois de navigator.sendBeacon (type quelconque).
+    """
+    try:
+        data = request.get_json(force=True, silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Corps JSON invalide"}), 400
+        device = data.get('device') or request.headers.get('User-Agent', '')
+        build = data.get('build') or build_hash(PROJECT_DIR)
+        try:
+            counts = perf_store().ingest(device, build, data.get('samples'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # Pas de log_action : un envoi toutes les 10 s par page ouverte
+        return jsonify(dict(counts, build=build))
         
-        # Valider ProjectState
-        if not validate_json(project_state, "ProjectState.v1"):
-            return jsonify({"error": "ProjectState invalide"}), 400
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/perf/builds', methods=['GET'])
+def perf_builds():
+    """Builds mesurés (filtre ?device=) et build actuellement servi."""
+    try:
+        store = perf_store()
+        return jsonify({"current": build_hash(PROJECT_DIR), "builds": store.builds(request.args.get('device')),
+                        "store": store.stats()})
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/perf/series', methods=['GET'])
+def perf_series():
+    """Points d'une série : ?device=&build=&metric=&since= (secondes epoch)."""
+    try:
+        args = request.args
+        if not args.get('device') or not args.get('build'):
+            return jsonify({"error": "device et build requis"}), 400
+        try:
+            since = float(args.get('since', 0))
+            points = perf_store().series(args['device'], args['build'], args.get('metric', 'fps'), since)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"points": points})
         
-        # Sauvegarder dans un fichier JSON
-        project_path = DATA_DIR / "project.json"
-        with open(project_path, 'w', encoding='utf-8') as f:
-            json.dump(project_state, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/perf/compare', methods=['GET'])
+def perf_compare():
+    """Rapport de comparaison entre builds : ?base=&head=&device=&threshold=.
+    
+    head : build servi par défaut ; base : dernier autre build mesuré.
+    """
+    try:
+        args = request.args
+        device = args.get('device')
+        head = args.get('head') or build_hash(PROJECT_DIR)
+        base = args.get('base') or perf_store().previous_build(head, device)
+        if base is None:
+            return jsonify({"error": "Aucun autre build mesuré"}), 404
+        try:
+            threshold = float(args.get('threshold', PERF_REGRESSION_THRESHOLD))
+        except ValueError:
+            threshold = -1
+        if not 0 <= threshold <= 1:
+            return jsonify({"error": "threshold invalide (0-1)"}), 400
+        report = perf_store().compare(base, head, device, threshold)
+        log_action("perf_compare", {"base": base, "head": head, "regressions": report["regressions"]}, True)
+        return jsonify(report)
         
+    except Exception as e:
+        log_error("API_Error", str(e))
+        return jsonify({"error": str(e)}), 500
+
+def _project_paths() -> Dict[str, Path]:
+    """Fichiers de projet par format (JSON et binaire LTPB)."""
+    return {
+        "json": DATA_DIR / "project.json",
+        "binary": DATA_DIR / f"project{project_format.FILE_SUFFIX}",
+    }
+
+_project_stores: Dict[Path, ProjectStore] = {}
+_project_stores_lock = threading.Lock()
+
+def _project_response_body(project_state: Dict[str, Any]) -> bytes:
+    """Réponse JSON de /api/project/load (identique à jsonify)."""
+    return app.json.response({"projectState": project_state}).get_data()
+
+def project_store() -> ProjectStore:
+    """Projet courant en mémoire (un par dossier de données, créé au premier usage)."""
+    with _project_stores_lock:
+        store = _project_stores.get(DATA_DIR)
+        if store is None:
+            paths = _project_paths()
+            store = _project_stores[DATA_DIR] = ProjectStore(
+                paths["json"], paths["binary"], PROJECT_SAVE_DEBOUNCE, dumps=_project_response_body)
+        return store
+
+def _wants_binary() -> bool:
+    """Vrai si le client préfère le format binaire (en-tête Accept)."""
+    best = request.accept_mimetypes.best_match(["application/json", project_format.MEDIA_TYPE])
+    return best == project_format.MEDIA_TYPE
+
+def _wants_stream() -> bool:
+    """Corps JSON volumineux (ou de taille inconnue) : lu en flux plutôt que par request.json."""
+    length = request.content_length
+    return request.mimetype == "application/json" and (length is None or length > STREAM_BODY_THRESHOLD)
+
+def _read_streamed_body() -> Dict[str, Any]:
+    """Lit le corps de la requête en flux (voir json_stream).
+    
+    Chaque pattern est validé (Pattern.v1) dès qu'il est lu, puis le reste du
+    ProjectState. Les patterns restent sur disque (PatternSpool) jusqu'à la
+    fermeture de la réponse.
+    
+    Raises:
+        ValueError: Corps, pattern ou ProjectState invalide
+    """
+    pattern_ids = set()
+    
+    def validate_pattern(pattern: Dict) -> Optional[str]:
+        error = schema_error(pattern, "Pattern.v1")
+        if error is None and pattern["id"] in pattern_ids:
+            error = f"id en double dans patterns: {pattern['id']}"
+        pattern_ids.add(pattern.get("id"))
+        return error
+    
+    body = read_project_body(request.stream, validate_pattern)
+    project_state = body.setdefault("projectState", {})
+    patterns = project_state.get("patterns")
+    if patterns is not None:
+        @after_this_request
+        def close_spool(response):
+            response.call_on_close(patterns.close)
+            return response
+    
+    skeleton = dict(project_state, patterns=[])
+    error = schema_error(skeleton, "ProjectState.v1") or duplicate_error(skeleton)
+    if error:
+        raise ValueError(f"ProjectState invalide : {error}")
+    return body
+
+def _index_streamed_patterns(patterns: Any, source: str, batch: int = 32) -> None:
+    """Indexe des patterns relus depuis le disque, par lots (mémoire bornée)."""
+    iterator = iter(patterns)
+    while True:
+        chunk = list(itertools.islice(iterator, batch))
+        if not chunk:
+            return
+        index_patterns(chunk, source)
+
+def _reload_project_hub() -> None:
+    """Après une sauvegarde lue en flux : l'état partagé est rechargé depuis le fichier.
+    
+    Sans client connecté, il est simplement abandonné (rechargé au prochain usage).
+    """
+    with _project_hubs_lock:
+        hub = _project_hubs.get(DATA_DIR)
+        if hub is not None and not hub.stats()["clients"]:
+            del _project_hubs[DATA_DIR]
+            return
+    if hub is not None:
+        hub.replace(project_store().get().state)
+
+@app.route('/api/project/save', methods=['POST'])
+def save_project():
+    """Sauvegarder le projet (JSON ou binaire LTPB selon Content-Type)."""
+    try:
+        if _wants_stream():
+            # Gros projet : patterns lus, validés et écrits un à un
+            try:
+                project_state = _read_streamed_body()["projectState"]
+            except ValueError as e:
+                log_error("ValidationError", str(e))
+                return jsonify({"error": str(e)}), 400
+            
+            project_path = project_store().put_stream(lambda f: dump_project(project_state, f))
+            _reload_project_hub()
+            _index_streamed_patterns(project_state.get("patterns", []), "project_save")
+            log_action("project_save", {"path": str(project_path), "streamed": True}, True)
+            return jsonify({"success": True, "path": str(project_path)})
+        
+        if request.mimetype == project_format.MEDIA_TYPE:
+            # Corps binaire : patterns décodés en PatternBuffer pour la validation
+            body = request.get_data()
+            try:
+                project_state = project_format.loads(body, packed=True)
+            except (project_format.ProjectFormatError, KeyError, ValueError) as e:
+                return jsonify({"error": f"Conteneur binaire invalide : {e}"}), 400
+            
+            if not validate_json(project_state, "ProjectState.v1"):
+                return jsonify({"error": "ProjectState invalide"}), 400
+            error = duplicate_error(project_state)
+            if error:
+                return jsonify({"error": f"ProjectState invalide : {error}"}), 400
+            
+            project_state = unpack_project(project_state)
+            project_path = project_store().put(project_state, binary=body)
+        else:
+            data = request.json
+            project_state = data.get('projectState', {})
+            
+            # Valider ProjectState
+            if not validate_json(project_state, "ProjectState.v1"):
+                return jsonify({"error": "ProjectState invalide"}), 400
+            error = duplicate_error(project_state)
+            if error:
+                return jsonify({"error": f"ProjectState invalide : {error}"}), 400
+            
+            # Servi aussitôt depuis la mémoire ; project.json est écrit en différé
+            project_path = project_store().put(project_state)
+        
+        # Clients connectés à /ws/project : seules les entités modifiées leur sont envoyées
+        project_hub().replace(project_state)
+        index_patterns(project_state.get("patterns", []), "project_save")
         log_action("project_save", {"path": str(project_path)}, True)
         return jsonify({"success": True, "path": str(project_path)})
         
@@ -521,41 +1776,81 @@ def save_project():
 
 @app.route('/api/project/load', methods=['GET'])
 def load_project():
-    """Charger le projet."""
+    """Charger le projet (JSON ou binaire LTPB selon Accept)."""
     try:
-        project_path = DATA_DIR / "project.json"
+        snapshot = project_store().get()
         
-        if not project_path.exists():
+        if snapshot is None:
             return jsonify({"error": "Aucun projet sauvegardé"}), 404
         
-        with open(project_path, 'r', encoding='utf-8') as f:
-            project_state = json.load(f)
+        if _wants_binary():
+            kind, mimetype = BINARY, project_format.MEDIA_TYPE
+        elif PROJECT_GZIP and request.accept_encodings["gzip"]:
+            kind, mimetype = JSON_GZIP, "application/json"
+        else:
+            kind, mimetype = JSON, "application/json"
+        
+        # Corps et ETag calculés une fois par version du projet
+        response = Response(snapshot.body(kind), mimetype=mimetype)
+        response.set_etag(snapshot.etag(kind))
+        response.vary.add("Accept")
+        response.vary.add("Accept-Encoding")
+        if kind == JSON_GZIP:
+            response.headers["Content-Encoding"] = "gzip"
         
-        log_action("project_load", {"path": str(project_path)}, True)
-        return jsonify({"projectState": project_state})
+        payload = {"path": str(project_store().path)}
+        if kind == BINARY:
+            payload["format"] = "binary"
+        log_action("project_load", payload, True)
+        return response.make_conditional(request)
         
     except Exception as e:
         log_error("API_Error", str(e))
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/project/sync', methods=['GET'])
+def project_sync_stats():
+    """État de la synchronisation (/ws/project) et du projet en mémoire (écritures différées)."""
+    return jsonify(dict(project_hub().stats(), store=project_store().stats()))
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
 def main():
     """Point d'entrée principal."""
+    if "--profile-startup" in sys.argv[1:]:
+        # Import du profileur ici : il ne sert qu'en mode diagnostic
+        from modules.startup import print_startup_profile
+        print_startup_profile(BASE_DIR, Path(__file__).stem)
+        return
+    
+    if "--profile-requests" in sys.argv[1:]:
+        # --profile-requests [N] : une requête sur N (défaut 0 = en-tête X-Profile uniquement)
+        args = sys.argv[sys.argv.index("--profile-requests") + 1:]
+        enable_request_profiling(int(args[0]) if args and args[0].isdigit() else 0)
+    
     print("=" * 60)
     print("🎹 LiveTechno-Web v0.1 — Backend Python")
     print("=" * 60)
     
     # Initialiser la base de données
-    init_database()
+    ensure_storage()
+    start_log_retention()
+    
+    # Démarrer le serveur WebSocket (séquenceur)
+    start_websocket_server()
     
     # Démarrer le serveur Flask
     print(f"\n🚀 Serveur démarré sur http://{HOST}:{PORT}")
+    print(f"🔌 Séquenceur WebSocket : ws://{HOST}:{WS_PORT}/ws/sequencer")
+    print(f"🔄 Synchronisation projet : ws://{HOST}:{WS_PORT}/ws/project")
     print(f"📁 Dossier projet : {PROJECT_DIR}")
     print(f"📁 Dossier données : {DATA_DIR}")
     print(f"📁 Base de données : {DB_PATH}")
+    if PROFILER is not None:
+        every = f"1 requête sur {PROFILER.every}" if PROFILER.every else "en-tête X-Profile: 1"
+        print(f"🔬 Profilage : {every} → /api/debug/profiles")
     print("\n⚠️  Appuyez sur Ctrl+C pour arrêter le serveur\n")
     
     app.run(host=HOST, port=PORT, debug=False, threaded=True)
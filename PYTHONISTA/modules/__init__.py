@@ -0,0 +1,6 @@
+"""
+modules — Sous-systèmes du backend LiveTechno-Web (Pythonista Edition)
+
+Chaque module est autonome (stdlib uniquement, dépendances optionnelles
+chargées à la demande) et importé par HTML_Studio_V4_0.py.
+"""
@@ -0,0 +1,212 @@
+"""
+automation.py — Courbes d'automation développées en flux de CC MIDI
+
+Un point d'automation (`target`, `at`, `val`, `easing`, `duration`) décrit
+une transition depuis la valeur courante du paramètre vers `val`, sur
+`duration` beats à partir du pas `at` (sans durée : saut immédiat). La
+valeur de départ est celle du point précédent du même paramètre, ou à
+défaut la valeur `params` de la machine ; une transition interrompue par le
+point suivant repart de la valeur atteinte.
+
+Chaque courbe est évaluée tick par tick puis quantifiée (7 bits, ou 14 bits
+MSB/LSB pour les CC 0-31). Un nouvel événement n'est émis que lorsque la
+courbe s'écarte de la dernière valeur envoyée de plus de `tolerance` pas de
+quantification (0.5 = à chaque changement de valeur quantifiée) : l'écart
+entre la courbe et la valeur tenue par le récepteur reste borné, avec le
+minimum de messages. La valeur finale de chaque transition est toujours
+émise, et une valeur identique à la dernière envoyée ne l'est jamais.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from modules import smf
+
+# Courbes normalisées [0, 1] → [0, 1] (noms du schéma Pattern.v1)
+_CURVE = 4.0
+
+
+def _exp(x: float) -> float:
+    return math.expm1(_CURVE * x) / math.expm1(_CURVE)
+
+
+def _log(x: float) -> float:
+    return math.log1p(math.expm1(_CURVE) * x) / _CURVE
+
+
+def _smooth(x: float) -> float:
+    return x * x * (3 - 2 * x)
+
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "lin": lambda x: x,
+    "exp": _exp,
+    "log": _log,
+    "smooth": _smooth,
+}
+
+# CC 0-31 : MSB ; LSB correspondant = CC + 32
+LSB_OFFSET = 32
+
+# (tick, paramètre, valeur, courbe, durée en ticks)
+Point = Tuple[int, str, float, str, int]
+
+
+class AutomationSettings:
+    """Paramètres de développement des automations.
+
+    Attributes:
+        resolution: 7 ou 14 bits (14 bits uniquement pour les CC 0-31)
+        tolerance: Écart toléré entre la courbe et la valeur tenue, en pas
+            de quantification (≥ 0.5)
+    """
+
+    __slots__ = ("resolution", "tolerance")
+
+    def __init__(self, resolution: int = 7, tolerance: float = 0.5) -> None:
+        if resolution not in (7, 14):
+            raise ValueError(f"Résolution invalide: {resolution} (7 ou 14)")
+        if tolerance < 0.5:
+            raise ValueError(f"Tolérance invalide: {tolerance} (≥ 0.5)")
+        self.resolution = resolution
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_json(cls, data: Optional[Dict[str, Any]]) -> "AutomationSettings":
+        """Construit les paramètres depuis le JSON d'une requête."""
+        data = data or {}
+        return cls(resolution=data.get("resolution", 7), tolerance=data.get("tolerance", 0.5))
+
+
+def ramp(start: int, length: int, v0: float, v1: float, easing: str,
+         steps: int, tolerance: float, stop: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Transition v0 → v1 évaluée tick par tick, quantifiée et éclaircie.
+
+    Args:
+        start: Tick de début
+        length: Durée en ticks (la valeur v1 est émise à start + length)
+        v0, v1: Valeurs normalisées (0.0-1.0)
+        easing: Nom de courbe (EASINGS ; inconnu = lin)
+        steps: Valeur quantifiée maximale (127 ou 16383)
+        tolerance: Écart maximal (pas de quantification) avant réémission
+        stop: Interrompre la transition après `stop` ticks (point suivant)
+
+    Returns:
+        (tick, valeur quantifiée), le premier à `start`
+    """
+    curve = EASINGS.get(easing, EASINGS["lin"])
+    span = (v1 - v0) * steps
+    base = v0 * steps
+    last = round(base)
+    out = [(start, last)]
+    for offset in range(1, length if stop is None else min(stop, length)):
+        y = base + span * curve(offset / length)
+        if abs(y - last) > tolerance:
+            last = round(y)
+            out.append((start + offset, last))
+    if (stop is None or stop >= length) and round(v1 * steps) != last:
+        out.append((start + length, round(v1 * steps)))
+    return out
+
+
+class AutomationLane:
+    """Automations d'une machine, accumulées pattern après pattern.
+
+    Args:
+        params: Valeurs initiales des paramètres (`params` de la machine)
+    """
+
+    def __init__(self, params: Optional[Dict[str, float]] = None) -> None:
+        self.initial = {k.lower(): v for k, v in (params or {}).items()}
+        self.points: Dict[str, List[Point]] = defaultdict(list)
+
+    def add(self, automation: List[Dict[str, Any]], offset: int,
+            ticks_per_step: int, ppq: int) -> None:
+        """Ajoute les points d'un pattern commençant au tick `offset`."""
+        for auto in automation:
+            target = auto.get("target", "").lower()
+            tick = int(auto.get("at", 0) * ticks_per_step) + offset
+            duration = int(auto.get("duration", 0) * ppq)
+            self.points[target].append(
+                (tick, target, auto.get("val", 0.5), auto.get("easing", "lin"), duration))
+
+    def events(self, channel: int, cc_map: Dict[str, int], default_cc: int,
+               settings: Optional["AutomationSettings"] = None) -> List[Tuple[int, bytes]]:
+        """Messages CC de toutes les automations, triés par tick."""
+        settings = settings or AutomationSettings()
+        events: List[Tuple[int, bytes]] = []
+        for target, points in self.points.items():
+            cc = cc_map.get(target, default_cc)
+            fine = settings.resolution == 14 and cc < LSB_OFFSET
+            steps = 16383 if fine else 127
+            values: List[Tuple[int, int]] = []
+            current = self.initial.get(target)
+            points = sorted(points, key=lambda p: p[0])
+            for i, (tick, _, val, easing, duration) in enumerate(points):
+                limit = points[i + 1][0] - tick if i + 1 < len(points) else duration
+                if duration <= 0 or current is None or limit <= 0:
+                    values.append((tick, round(val * steps)))
+                    current = val
+                    continue
+                values.extend(ramp(tick, duration, current, val, easing, steps, settings.tolerance, limit))
+                # Valeur atteinte (transition éventuellement interrompue)
+                x = min(1.0, limit / duration)
+                current = current + (val - current) * EASINGS.get(easing, EASINGS["lin"])(x)
+            events.extend(_cc_messages(values, channel, cc, fine))
+        events.sort(key=lambda e: e[0])
+        return events
+
+
+def _cc_messages(values: List[Tuple[int, int]], channel: int, cc: int,
+                 fine: bool) -> List[Tuple[int, bytes]]:
+    """Valeurs quantifiées → messages CC (répétitions supprimées).
+
+    En 14 bits, le MSB n'est renvoyé que s'il change.
+    """
+    status = 0xB0 | channel
+    out = []
+    last = msb = None
+    for tick, value in values:
+        if value == last:
+            continue
+        last = value
+        if not fine:
+            out.append((tick, smf.channel_message(status, cc, value)))
+            continue
+        if value >> 7 != msb:
+            msb = value >> 7
+            out.append((tick, smf.channel_message(status, cc, msb)))
+        out.append((tick, smf.channel_message(status, cc + LSB_OFFSET, value & 0x7F)))
+    return out
+
+
+class CCStats:
+    """Nombre de messages CC par mesure (statistiques d'export)."""
+
+    def __init__(self) -> None:
+        self.per_bar: Dict[int, int] = defaultdict(int)
+        self.per_track: Dict[str, int] = {}
+
+    def add(self, track: str, ticks: List[int], bar_at: Callable[[int], int]) -> None:
+        self.per_track[track] = self.per_track.get(track, 0) + len(ticks)
+        for tick in ticks:
+            self.per_bar[bar_at(tick)] += 1
+
+    def add_counts(self, track: str, per_bar: Dict[int, int], events: int) -> None:
+        """Ajoute des comptes déjà agrégés (piste reprise du cache d'export)."""
+        self.per_track[track] = self.per_track.get(track, 0) + events
+        for bar, count in per_bar.items():
+            self.per_bar[bar] += count
+
+    def to_json(self) -> Dict[str, Any]:
+        bars = max(self.per_bar) + 1 if self.per_bar else 0
+        counts = [self.per_bar.get(bar, 0) for bar in range(bars)]
+        total = sum(counts)
+        return {
+            "ccEvents": total,
+            "maxPerBar": max(counts, default=0),
+            "meanPerBar": round(total / bars, 2) if bars else 0,
+            "perBar": counts,
+            "perTrack": dict(self.per_track),
+        }
@@ -0,0 +1,252 @@
+"""
+drum_samples.py — Cache de one-shots RD-9 précalculés
+
+Les voix RD-9 de `dsp.worklet.js` sont synthétisées à chaque frappe alors
+qu'elles ne dépendent que de l'instrument et de ses réglages. Chaque
+instrument est ici rendu une seule fois par instantané de paramètres
+quantifiés (`tune`, `decay` sur QUANT_STEPS niveaux), à vélocité 1 : la
+vélocité et le niveau ne sont que des gains appliqués au mixage.
+
+Les rendus sont stockés en `.npy` (float32 mono) et relus en memmap, gardé
+ouvert tant que le fichier est en cache (un accès ne relit pas l'en-tête
+.npy) ; le répertoire est borné par un budget en octets, avec éviction LRU.
+Le bruit (caisse claire, hi-hats, instruments génériques) vient d'un
+générateur à graine fixe par instrument : un même instantané donne
+toujours les mêmes échantillons.
+
+Les algorithmes reprennent ceux du worklet (enveloppe linéaire depuis 1.0,
+sans attaque) ; `tune` transpose de ±1/2 octave, `decay` multiplie la durée
+de ×0.5 à ×2 (0.5 = valeurs du worklet).
+
+NumPy est requis (importé à la première utilisation).
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_SAMPLE_RATE = 44100
+SAMPLE_RATES = (22050, 44100, 48000)
+QUANT_STEPS = 32
+DEFAULT_BUDGET = 32 * 1024 * 1024
+
+# Note MIDI → (nom, algorithme, decay du worklet en secondes, gain de sortie)
+INSTRUMENTS: Dict[int, Tuple[str, str, float, float]] = {
+    36: ("BD", "kick", 0.2, 0.8),
+    38: ("SD", "snare", 0.15, 0.6),
+    43: ("LT", "generic", 0.1, 0.5),
+    47: ("MT", "generic", 0.1, 0.5),
+    50: ("HT", "generic", 0.1, 0.5),
+    37: ("RS", "generic", 0.1, 0.5),
+    39: ("CP", "generic", 0.1, 0.5),
+    56: ("CB", "generic", 0.1, 0.5),
+    49: ("CY", "generic", 0.1, 0.5),
+    46: ("OH", "hihat", 0.3, 0.4),
+    42: ("CH", "hihat", 0.05, 0.4),
+}
+
+def quantize(value: float) -> int:
+    """Paramètre normalisé (0.0-1.0) → niveau 0..QUANT_STEPS-1."""
+    if not 0.0 <= value <= 1.0:
+        raise ValueError(f"Paramètre hors plage: {value}")
+    return min(QUANT_STEPS - 1, int(value * QUANT_STEPS))
+
+
+def _level_value(level: int) -> float:
+    """Centre du niveau quantifié (valeur effectivement rendue)."""
+    return (level + 0.5) / QUANT_STEPS
+
+
+def render(note: int, tune: int, decay: int, sample_rate: int = DEFAULT_SAMPLE_RATE) -> Any:
+    """Rend un one-shot (float32, vélocité 1).
+
+    Args:
+        note: Note MIDI de l'instrument (INSTRUMENTS)
+        tune, decay: Niveaux quantifiés (quantize)
+        sample_rate: Fréquence d'échantillonnage
+
+    Raises:
+        ValueError: Instrument inconnu
+    """
+    import numpy as np
+
+    if note not in INSTRUMENTS:
+        raise ValueError(f"Instrument RD-9 inconnu: {note}")
+    _, kind, base_decay, gain = INSTRUMENTS[note]
+    pitch = 2.0 ** (_level_value(tune) - 0.5)
+    decay_s = base_decay * 4.0 ** (_level_value(decay) - 0.5)
+
+    length = max(1, math.ceil(decay_s * sample_rate))
+    n = np.arange(length, dtype=np.float64)
+    rate = 1.0 / (decay_s * sample_rate)
+    env_before = np.maximum(0.0, 1.0 - n * rate)
+    env = np.maximum(0.0, 1.0 - (n + 1) * rate)
+    t = n / sample_rate
+    noise = np.random.default_rng(note).uniform(-1.0, 1.0, length)
+
+    if kind == "kick":
+        # Enveloppe de hauteur 80 Hz → 40 Hz, phase cumulée
+        freq = (env_before * 40.0 + 40.0) * pitch
+        phase = np.concatenate(([0.0], np.cumsum(freq[:-1]) / sample_rate))
+        out = np.tanh(np.sin(2.0 * np.pi * phase) * 2.0)
+    elif kind == "snare":
+        out = noise * 0.7 + np.sin(2.0 * np.pi * 200.0 * pitch * t) * 0.3
+    elif kind == "hihat":
+        out = noise
+    else:
+        out = np.sin(2.0 * np.pi * 200.0 * pitch * t) + noise * 0.3
+    return (out * env * gain).astype(np.float32)
+
+
+class SampleCache:
+    """One-shots en `.npy` avec éviction LRU sur un budget en octets.
+
+    Args:
+        directory: Répertoire des fichiers .npy
+        budget: Taille maximale du répertoire (octets)
+    """
+
+    def __init__(self, directory: Path, budget: int = DEFAULT_BUDGET) -> None:
+        self.directory = Path(directory)
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._open: Dict[str, Any] = {}
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+        # Fichiers d'une session précédente : du plus ancien au plus récent
+        if self.directory.exists():
+            for path in sorted(self.directory.glob("*.npy"), key=lambda p: p.stat().st_mtime):
+                size = path.stat().st_size
+                self._files[path.stem] = size
+                self._bytes += size
+            self._evict()
+
+    @staticmethod
+    def key(note: int, tune: int, decay: int, sample_rate: int) -> str:
+        return f"{note}_{tune:02d}_{decay:02d}_{sample_rate}"
+
+    def get(self, note: int, tune: float = 0.5, decay: float = 0.5,
+            sample_rate: int = DEFAULT_SAMPLE_RATE) -> Tuple[Any, bool]:
+        """One-shot (memmap en lecture seule) pour des paramètres normalisés.
+
+        Returns:
+            (échantillons float32, True si servi depuis le cache)
+
+        Raises:
+            ValueError: Instrument, paramètre ou fréquence invalide
+        """
+        import numpy as np
+
+        if note not in INSTRUMENTS:
+            raise ValueError(f"Instrument RD-9 inconnu: {note}")
+        if sample_rate not in SAMPLE_RATES:
+            raise ValueError(f"Fréquence non supportée: {sample_rate} {SAMPLE_RATES}")
+        levels = (quantize(tune), quantize(decay))
+        key = self.key(note, *levels, sample_rate)
+        path = self.directory / f"{key}.npy"
+
+        with self._lock:
+            if key in self._files:
+                samples = self._open.get(key)
+                if samples is None:
+                    try:
+                        samples = self._open[key] = np.load(path, mmap_mode="r")
+                    except OSError:
+                        # Fichier supprimé hors du cache : on le rend à nouveau
+                        self._bytes -= self._files.pop(key)
+                if samples is not None:
+                    self._files.move_to_end(key)
+                    self.hits += 1
+                    return samples, True
+            self.misses += 1
+
+        samples = render(note, *levels, sample_rate)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, samples)
+        os.replace(tmp, path)
+
+        samples = np.load(path, mmap_mode="r")
+        with self._lock:
+            if key not in self._files:
+                size = path.stat().st_size
+                self._files[key] = size
+                self._bytes += size
+            self._open[key] = samples
+            self._files.move_to_end(key)
+            self._evict(keep=key)
+        return samples, False
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Supprime les fichiers les moins récemment utilisés (verrou tenu)."""
+        while self._bytes > self.budget and self._files:
+            key = next(iter(self._files))
+            if key == keep:
+                break
+            size = self._files.pop(key)
+            self._open.pop(key, None)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                (self.directory / f"{key}.npy").unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": self._bytes,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def render_pattern(pattern: Dict[str, Any], cache: SampleCache, bpm: float,
+                   params: Optional[Dict[str, Dict[str, float]]] = None,
+                   sample_rate: int = DEFAULT_SAMPLE_RATE) -> Any:
+    """Pré-écoute d'un pattern RD-9 mixée depuis les one-shots du cache.
+
+    Un pattern couvre une mesure de 4 temps ; chaque pas déclenche le
+    one-shot de sa note, multiplié par la vélocité (et le `level` de
+    l'instrument). Les notes sans instrument RD-9 sont ignorées.
+
+    Args:
+        pattern: Pattern.v1
+        cache: Cache de one-shots
+        bpm: Tempo
+        params: Réglages par instrument ({"BD": {"tune", "decay", "level"}})
+
+    Returns:
+        Échantillons float32 mono, limités par tanh comme le worklet
+    """
+    import numpy as np
+
+    params = params or {}
+    steps = pattern.get("lengthSteps", 16)
+    seconds_per_step = 240.0 / bpm / steps
+    hits = [s for s in pattern.get("steps", []) if s.get("note") in INSTRUMENTS]
+
+    tails = []
+    for step in hits:
+        name = INSTRUMENTS[step["note"]][0]
+        settings = params.get(name, {})
+        sample, _ = cache.get(step["note"], settings.get("tune", 0.5), settings.get("decay", 0.5), sample_rate)
+        start = int(round(step.get("t", 0) * seconds_per_step * sample_rate))
+        gain = step.get("vel", 100) / 127 * settings.get("level", 1.0)
+        tails.append((start, sample, gain))
+
+    length = int(round(steps * seconds_per_step * sample_rate))
+    length = max([length] + [start + len(sample) for start, sample, _ in tails])
+    out = np.zeros(length, dtype=np.float32)
+    for start, sample, gain in tails:
+        out[start:start + len(sample)] += sample * np.float32(gain)
+    return np.tanh(out)
@@ -0,0 +1,123 @@
+"""
+gpt_batch.py — Génération GPT par lots : parallélisme borné et single-flight
+
+Un set live demande souvent plusieurs patterns d'un coup (kick, hats,
+basse). Les prompts d'un lot sont répartis sur un pool de threads de taille
+bornée, et les prompts identiques en cours de génération (dans ce lot ou
+dans un lot concurrent) ne déclenchent qu'un seul appel amont : les
+demandeurs suivants attendent le résultat du premier.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple
+
+# Bornes par défaut (surchargées par la configuration du serveur)
+DEFAULT_CONCURRENCY = 3
+MAX_CONCURRENCY = 8
+MAX_BATCH_SIZE = 16
+
+
+class SingleFlight:
+    """Regroupe les appels concurrents portant la même clé.
+
+    Tant qu'un appel pour une clé est en cours, les appels suivants avec la
+    même clé reçoivent son résultat (ou son exception) au lieu de relancer
+    le travail. La clé est libérée dès la fin de l'appel : rien n'est mis en
+    cache au-delà.
+
+    Attributes:
+        calls: Nombre d'exécutions réelles
+        shared: Nombre d'appels servis par une exécution déjà en cours
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Exécute fn() ou attend l'exécution en cours pour la même clé.
+
+        Returns:
+            (résultat, partagé) — partagé est vrai si le résultat vient d'un
+            appel lancé par un autre demandeur
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.shared += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.calls += 1
+                owner = True
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+def run_batch(prompts: List[str], generate: Callable[[str], Any],
+              flight: SingleFlight, concurrency: int = DEFAULT_CONCURRENCY,
+              key: Callable[[str], Hashable] = lambda p: p.strip()) -> Iterator[Dict[str, Any]]:
+    """Génère un résultat par prompt, dans l'ordre d'achèvement.
+
+    Args:
+        prompts: Prompts du lot
+        generate: Fonction bloquante prompt → pattern (None si échec)
+        flight: Regroupement des appels identiques (partagé entre lots)
+        concurrency: Nombre maximal d'appels amont simultanés pour ce lot
+        key: Clé de regroupement d'un prompt
+
+    Yields:
+        {"index", "prompt", "pattern" | "error", "shared"}
+    """
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        raise ValueError(f"Concurrence invalide: {concurrency} (1-{MAX_CONCURRENCY})")
+    if not 1 <= len(prompts) <= MAX_BATCH_SIZE:
+        raise ValueError(f"Taille de lot invalide: {len(prompts)} (1-{MAX_BATCH_SIZE})")
+
+    # Un seul worker par clé distincte : les doublons du lot attendent le
+    # premier via SingleFlight sans occuper de place dans le pool
+    groups: Dict[Hashable, List[int]] = {}
+    for index, prompt in enumerate(prompts):
+        groups.setdefault(key(prompt), []).append(index)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gpt-batch") as pool:
+        futures = {
+            pool.submit(flight.do, group_key, lambda p=prompts[indexes[0]]: generate(p)): indexes
+            for group_key, indexes in groups.items()
+        }
+        for future in as_completed(futures):
+            indexes = futures[future]
+            try:
+                pattern, shared = future.result()
+                error = None if pattern is not None else "Génération échouée"
+            except Exception as e:
+                pattern, shared, error = None, False, str(e)
+
+            for rank, index in enumerate(indexes):
+                result: Dict[str, Any] = {
+                    "index": index,
+                    "prompt": prompts[index],
+                    "shared": shared or rank > 0,
+                }
+                if error:
+                    result["error"] = error
+                else:
+                    result["pattern"] = pattern
+                yield result
@@ -0,0 +1,247 @@
+"""
+groove.py — Moteur de transformation rythmique (swing, quantize, humanize,
+probabilité, ratchets)
+
+Les champs `swing`, `microTime`, `ratchet` et `prob` de Pattern.v1 sont
+appliqués en une passe sur les colonnes d'un PatternBuffer (une liste en
+compréhension par étape, pas de dict par pas) et produisent des événements
+en ticks absolus, prêts pour l'export MIDI ou la pré-écoute.
+
+Le tirage aléatoire (probabilité, humanisation) utilise un `random.Random`
+initialisé par `seed` : même pattern + même seed = mêmes événements.
+"""
+
+import random
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from modules.pattern_buffer import PatternBuffer, as_buffer
+
+# Nombre maximal de variantes par appel (protection des routes)
+MAX_VARIATIONS = 1000
+
+# ============================================================================
+# PARAMÈTRES
+# ============================================================================
+
+class GrooveSettings:
+    """Paramètres de transformation.
+
+    Attributes:
+        swing: Swing 0.0-1.0 (None = valeur `swing` du pattern). À 1.0, les
+            pas impairs sont retardés d'un demi-pas
+        quantize: Grille de quantification en ticks (0 = désactivée)
+        strength: Force de quantification (0.0-1.0)
+        humanize_ticks: Amplitude max du décalage aléatoire en ticks
+        humanize_vel: Amplitude max de la variation de vélocité
+        seed: Graine du générateur aléatoire
+        probability: Appliquer `prob` (tirage par pas)
+        ratchets: Développer `ratchet` en sous-déclenchements
+    """
+
+    __slots__ = ("swing", "quantize", "strength", "humanize_ticks",
+                 "humanize_vel", "seed", "probability", "ratchets")
+
+    def __init__(self, swing: Optional[float] = None, quantize: int = 0,
+                 strength: float = 1.0, humanize_ticks: float = 0,
+                 humanize_vel: int = 0, seed: int = 0,
+                 probability: bool = True, ratchets: bool = True) -> None:
+        if swing is not None and not 0.0 <= swing <= 1.0:
+            raise ValueError(f"Swing invalide: {swing}")
+        if not 0.0 <= strength <= 1.0:
+            raise ValueError(f"Force de quantification invalide: {strength}")
+        if quantize < 0 or humanize_ticks < 0 or humanize_vel < 0:
+            raise ValueError("Quantize/humanize doivent être positifs")
+
+        self.swing = swing
+        self.quantize = int(quantize)
+        self.strength = strength
+        self.humanize_ticks = humanize_ticks
+        self.humanize_vel = int(humanize_vel)
+        self.seed = seed
+        self.probability = probability
+        self.ratchets = ratchets
+
+    @classmethod
+    def from_json(cls, data: Optional[Dict[str, Any]]) -> "GrooveSettings":
+        """Construit les paramètres depuis le JSON d'une requête (camelCase).
+
+        Raises:
+            ValueError: Si `data` n'est pas un objet JSON ou une valeur est invalide
+        """
+        data = data or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Paramètres de groove invalides (objet attendu) : {data!r}")
+        return cls(
+            swing=data.get("swing"),
+            quantize=data.get("quantize", 0),
+            strength=data.get("strength", 1.0),
+            humanize_ticks=data.get("humanizeTicks", 0),
+            humanize_vel=data.get("humanizeVel", 0),
+            seed=data.get("seed", 0),
+            probability=data.get("probability", True),
+            ratchets=data.get("ratchets", True),
+        )
+
+    def with_seed(self, seed: int) -> "GrooveSettings":
+        """Copie des paramètres avec une autre graine."""
+        copy = GrooveSettings.__new__(GrooveSettings)
+        for name in self.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.seed = seed
+        return copy
+
+# ============================================================================
+# ÉVÉNEMENTS
+# ============================================================================
+
+class GrooveEvents:
+    """Événements transformés, triés par tick, en colonnes.
+
+    Attributes:
+        tick: Position absolue en ticks (depuis le début du pattern)
+        note: Note MIDI
+        vel: Vélocité
+        length: Durée en ticks
+        source: Index du pas d'origine dans le pattern
+    """
+
+    __slots__ = ("tick", "note", "vel", "length", "source")
+
+    def __init__(self) -> None:
+        self.tick = array("I")
+        self.note = array("B")
+        self.vel = array("B")
+        self.length = array("I")
+        self.source = array("I")
+
+    def __len__(self) -> int:
+        return len(self.tick)
+
+    def iter_events(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Itère sur (tick, note, vel, length)."""
+        return zip(self.tick, self.note, self.vel, self.length)
+
+    def to_list(self) -> List[Dict[str, int]]:
+        """Événements au format JSON (pré-écoute côté client)."""
+        return [{"tick": t, "note": n, "vel": v, "length": l}
+                for t, n, v, l in self.iter_events()]
+
+# ============================================================================
+# TRANSFORMATION
+# ============================================================================
+
+def apply_groove(pattern: Any, ppq: int, ticks_per_step: int,
+                 settings: Optional[GrooveSettings] = None) -> GrooveEvents:
+    """Applique prob, microTime, quantize, swing, humanize et ratchets.
+
+    Ordre des étapes : tirage `prob` → position (t + microTime) → quantize →
+    swing → humanize → développement des ratchets → tri par tick.
+
+    Args:
+        pattern: Pattern (dict ou PatternBuffer)
+        ppq: Résolution cible (ticks par noire)
+        ticks_per_step: Durée d'un pas en ticks cibles
+        settings: Paramètres (défaut : champs du pattern uniquement)
+
+    Returns:
+        Événements en ticks absolus
+    """
+    buffer: PatternBuffer = as_buffer(pattern)
+    settings = settings or GrooveSettings()
+    rng = random.Random(settings.seed)
+    n = len(buffer)
+
+    # 1. Probabilité : un tirage par pas dont prob < 1
+    keep: Any = range(n)
+    prob = buffer.prob
+    if settings.probability and n and min(prob) < 1.0:
+        keep = [i for i in keep if prob[i] >= 1.0 or rng.random() < prob[i]]
+
+    # 2. Position en ticks (microTime exprimé dans la résolution du pattern)
+    t_col, micro = buffer.t, buffer.micro_time
+    micro_scale = ppq / buffer.meta.get("resolutionPPQ", ppq)
+    pos = [t_col[i] * ticks_per_step + micro[i] * micro_scale for i in keep]
+
+    # 3. Quantize (attire chaque position vers la grille)
+    grid = settings.quantize
+    if grid:
+        strength = settings.strength
+        pos = [p + (round(p / grid) * grid - p) * strength for p in pos]
+
+    # 4. Swing : retard des pas impairs
+    swing = settings.swing if settings.swing is not None else buffer.meta.get("swing", 0.0)
+    if swing:
+        offset = swing * ticks_per_step * 0.5
+        pos = [p + offset if t_col[i] & 1 else p for p, i in zip(pos, keep)]
+
+    # 5. Humanize (temps puis vélocité)
+    if settings.humanize_ticks:
+        h = settings.humanize_ticks
+        uniform = rng.uniform
+        pos = [p + uniform(-h, h) for p in pos]
+
+    vel_col = buffer.vel
+    vel = [vel_col[i] for i in keep]
+    if settings.humanize_vel:
+        h = settings.humanize_vel
+        randint = rng.randint
+        vel = [min(127, max(1, v + randint(-h, h))) if v else 0 for v in vel]
+
+    duration = buffer.duration
+    length = [int(duration[i] * ppq) for i in keep]
+
+    # 6. Ratchets : r sous-déclenchements répartis sur le pas
+    note_col, ratchet = buffer.note, buffer.ratchet
+    ticks: List[int] = []
+    notes: List[int] = []
+    vels: List[int] = []
+    lengths: List[int] = []
+    sources: List[int] = []
+    expand = settings.ratchets
+    for j, i in enumerate(keep):
+        start = max(0, int(round(pos[j])))
+        r = ratchet[i] if expand else 1
+        if r <= 1:
+            ticks.append(start)
+            notes.append(note_col[i])
+            vels.append(vel[j])
+            lengths.append(length[j])
+            sources.append(i)
+            continue
+        sub = max(1, ticks_per_step // r)
+        sub_length = max(1, min(length[j], sub))
+        for k in range(r):
+            ticks.append(start + k * sub)
+            notes.append(note_col[i])
+            vels.append(vel[j])
+            lengths.append(sub_length)
+            sources.append(i)
+
+    # 7. Tri stable par tick
+    order = sorted(range(len(ticks)), key=ticks.__getitem__)
+    events = GrooveEvents()
+    events.tick.extend(ticks[k] for k in order)
+    events.note.extend(notes[k] for k in order)
+    events.vel.extend(vels[k] for k in order)
+    events.length.extend(lengths[k] for k in order)
+    events.source.extend(sources[k] for k in order)
+    return events
+
+
+def variations(pattern: Any, ppq: int, ticks_per_step: int, count: int,
+               settings: Optional[GrooveSettings] = None) -> List[GrooveEvents]:
+    """Génère `count` variantes (graines seed, seed+1, …) d'un même pattern.
+
+    Le pattern n'est converti qu'une fois ; chaque variante est déterministe.
+
+    Raises:
+        ValueError: Si count dépasse MAX_VARIATIONS
+    """
+    if not 1 <= count <= MAX_VARIATIONS:
+        raise ValueError(f"Nombre de variantes invalide: {count} (1-{MAX_VARIATIONS})")
+
+    buffer = as_buffer(pattern)
+    settings = settings or GrooveSettings()
+    return [apply_groove(buffer, ppq, ticks_per_step, settings.with_seed(settings.seed + k))
+            for k in range(count)]
@@ -0,0 +1,430 @@
+"""
+jobs.py — Tâches de fond (export, validation, rendu) hors des threads Flask
+
+Les travaux lourds en CPU (encodage MIDI, validation de gros projets,
+rendus) bloquent le GIL : exécutés dans un thread de requête, ils ralentissent
+toutes les autres routes. Ils sont ici soumis comme tâches :
+
+- une file à priorités (heapq : "high" < "normal" < "low", puis ordre
+  d'arrivée) alimente un pool de processus (`ProcessPoolExecutor`) de taille
+  fixe ; une tâche n'est confiée au pool que lorsqu'un worker est libre, la
+  priorité s'applique donc à toute la file d'attente ;
+- le corps de la requête est recopié tel quel dans le spool (`<id>.in`) et
+  décodé par le worker : le thread de requête ne fait que des entrées-sorties
+  (pas de décodage JSON ni de pickle d'un gros projet sous le GIL) ;
+- la progression et l'annulation passent par de petits fichiers du spool
+  (`<id>.progress`, `<id>.cancel`), lisibles et écrits de part et d'autre
+  quel que soit le mode d'exécution ; l'annulation d'une tâche en cours est
+  coopérative (au prochain point de progression) ;
+- le résultat est écrit par le worker dans `<id>.out` ; le spool est borné
+  en octets, les résultats les plus anciens sont supprimés au-delà (tâche
+  marquée `expired`).
+
+Les fonctions de tâche doivent être définies au niveau module (sérialisées
+par pickle vers le worker) et ne dépendre que de leurs paramètres. Sans
+processus disponibles (Pythonista : pas de fork ni de spawn), le pool
+retombe sur des threads : les tâches restent asynchrones mais partagent le GIL.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import secrets
+import shutil
+import threading
+import time
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+# Écriture de la progression au plus toutes les PROGRESS_INTERVAL secondes
+PROGRESS_INTERVAL = 0.1
+
+
+class JobCancelled(Exception):
+    """Levée au point de progression suivant une demande d'annulation."""
+
+
+class JobContext:
+    """Contexte passé à la fonction de tâche (dans le worker).
+
+    Attributes:
+        job_id: Identifiant de la tâche
+        input_path: Corps soumis avec la tâche (s'il y en a un)
+        output_path: Fichier de résultat à écrire (facultatif)
+    """
+
+    def __init__(self, job_id: str, spool_dir: Path) -> None:
+        self.job_id = job_id
+        self.input_path = spool_dir / f"{job_id}.in"
+        self.output_path = spool_dir / f"{job_id}.out"
+        self._progress_path = spool_dir / f"{job_id}.progress"
+        self._cancel_path = spool_dir / f"{job_id}.cancel"
+        self._written = 0.0
+
+    def cancelled(self) -> bool:
+        return self._cancel_path.exists()
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """Publie l'avancement (0-1) et interrompt la tâche si elle a été annulée.
+
+        Raises:
+            JobCancelled: Annulation demandée
+        """
+        if self.cancelled():
+            raise JobCancelled(self.job_id)
+        now = time.monotonic()
+        if now - self._written < PROGRESS_INTERVAL and fraction < 1.0:
+            return
+        self._written = now
+        tmp = self._progress_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(f"{min(max(fraction, 0.0), 1.0):.4f}\t{message or ''}", encoding="utf-8")
+        os.replace(tmp, self._progress_path)
+
+
+def _run(task: Callable[[Dict[str, Any], JobContext], Optional[Dict[str, Any]]],
+         params: Dict[str, Any], context: JobContext) -> Optional[Dict[str, Any]]:
+    """Exécution dans le worker (niveau module : sérialisable par pickle)."""
+    context.progress(0.0)
+    result = task(params, context)
+    context.progress(1.0)
+    return result
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class Job:
+    """État d'une tâche (côté serveur)."""
+
+    def __init__(self, job_id: str, kind: str, priority: str, params: Dict[str, Any]) -> None:
+        self.id = job_id
+        self.kind = kind
+        self.priority = priority
+        self.params: Optional[Dict[str, Any]] = params  # libérés une fois la tâche confiée au pool
+        self.state = QUEUED
+        self.created = _now()
+        self.started: Optional[str] = None
+        self.finished: Optional[str] = None
+        self.finished_at = 0.0
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.result_bytes = 0
+        self.expired = False
+        self.future: Optional[Future] = None
+
+    @property
+    def has_file(self) -> bool:
+        return self.result_bytes > 0 and not self.expired
+
+
+class JobManager:
+    """File de tâches à priorités exécutées par un pool de workers.
+
+    Args:
+        spool_dir: Dossier des résultats, progressions et annulations (vidé à la création)
+        tasks: Fonctions de tâche par type, `task(params, context) -> dict | None`
+        workers: Taille du pool
+        max_bytes: Taille maximale des résultats conservés sur disque
+        processes: Pool de processus (sinon threads)
+        history: Nombre de tâches terminées gardées en mémoire
+        on_finish: Appelée (côté serveur) à la fin de chaque tâche
+    """
+
+    def __init__(self, spool_dir: Path, tasks: Dict[str, Callable], workers: int = 2,
+                 max_bytes: int = 256 * 1024 * 1024, processes: bool = True, history: int = 256,
+                 on_finish: Optional[Callable[[Job], None]] = None) -> None:
+        self.spool_dir = Path(spool_dir)
+        self.tasks = tasks
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.processes = processes
+        self.history = history
+        self.on_finish = on_finish
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._queue: List[tuple] = []
+        self._order = itertools.count()
+        self._running = 0
+        self._spool_bytes = 0
+        self._executor: Optional[Executor] = None
+        self.mode: Optional[str] = None
+        self.counters = {"submitted": 0, "done": 0, "failed": 0, "cancelled": 0, "expired": 0}
+
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        for leftover in self.spool_dir.iterdir():
+            # Résultats d'une session précédente : plus aucune tâche ne les référence
+            if leftover.is_file():
+                leftover.unlink()
+
+    # ------------------------------------------------------------------
+    # Soumission et file d'attente
+    # ------------------------------------------------------------------
+
+    def submit(self, kind: str, params: Dict[str, Any], priority: str = "normal",
+               body: Optional[BinaryIO] = None) -> Job:
+        """Met une tâche en file.
+
+        Args:
+            kind: Type de tâche
+            params: Paramètres (sérialisés vers le worker : à garder petits)
+            priority: "high", "normal" ou "low"
+            body: Flux recopié dans le spool, lu par la tâche (`context.input_path`)
+
+        Raises:
+            ValueError: Type de tâche ou priorité inconnus
+        """
+        if kind not in self.tasks:
+            raise ValueError(f"Type de tâche inconnu: {kind} ({', '.join(sorted(self.tasks))})")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priorité invalide: {priority} ({', '.join(PRIORITIES)})")
+
+        job = Job(secrets.token_hex(8), kind, priority, params)
+        if body is not None:
+            with open(self.spool_dir / f"{job.id}.in", "wb") as f:
+                shutil.copyfileobj(body, f, 1024 * 1024)
+        with self._lock:
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (PRIORITIES[priority], next(self._order), job.id))
+            self.counters["submitted"] += 1
+        self._dispatch()
+        return job
+
+    def _pool(self) -> Executor:
+        """Pool créé au premier besoin (pas de processus lancés au démarrage du serveur)."""
+        if self._executor is None:
+            if self.processes:
+                try:
+                    # spawn : pas de fork d'un serveur multithread (verrous hérités)
+                    self._executor = ProcessPoolExecutor(self.workers, multiprocessing.get_context("spawn"))
+                    self.mode = "processes"
+                except (ImportError, NotImplementedError, OSError, ValueError) as e:
+                    print(f"⚠️  Pool de processus indisponible ({e}) : tâches exécutées dans des threads")
+                    self.processes = False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="job")
+                self.mode = "threads"
+        return self._executor
+
+    def _dispatch(self) -> None:
+        """Confie au pool les tâches les plus prioritaires tant qu'un worker est libre."""
+        while True:
+            with self._lock:
+                if self._running >= self.workers or not self._queue:
+                    return
+                _, _, job_id = heapq.heappop(self._queue)
+                job = self._jobs.get(job_id)
+                if job is None or job.state != QUEUED:
+                    continue
+                job.state = RUNNING
+                job.started = _now()
+                self._running += 1
+                params, job.params = job.params, None
+                context = JobContext(job.id, self.spool_dir)
+                try:
+                    try:
+                        future = self._pool().submit(_run, self.tasks[job.kind], params, context)
+                    except (BrokenProcessPool, OSError) as e:
+                        if self.mode != "processes":
+                            raise
+                        # Processus refusés au lancement (sandbox) : repli sur les threads
+                        print(f"⚠️  Pool de processus indisponible ({e}) : tâches exécutées dans des threads")
+                        self._executor.shutdown(wait=False)
+                        self._executor = None
+                        self.processes = False
+                        future = self._pool().submit(_run, self.tasks[job.kind], params, context)
+                except (BrokenProcessPool, OSError, RuntimeError) as e:
+                    # Pool arrêté (fin de l'interpréteur) : la tâche ne sera pas exécutée
+                    self._running -= 1
+                    self._remove(job.id, ".in")
+                    job.state, job.error = FAILED, str(e)
+                    job.finished = _now()
+                    job.finished_at = time.monotonic()
+                    self.counters[FAILED] += 1
+                    continue
+                job.future = future
+            future.add_done_callback(lambda f, job=job: self._finish(job, f))
+
+    def _finish(self, job: Job, future: Future) -> None:
+        with self._lock:
+            self._running -= 1
+            job.finished = _now()
+            job.finished_at = time.monotonic()
+            job.future = None
+            try:
+                job.result = future.result()
+                job.state = DONE
+            except (JobCancelled, CancelledError):
+                job.state = CANCELLED
+            except BrokenProcessPool as e:
+                # Worker tué (mémoire…) : le pool est recréé à la tâche suivante
+                job.state, job.error = FAILED, f"Worker interrompu: {e}"
+                self._executor = None
+            except Exception as e:
+                job.state, job.error = FAILED, str(e) or type(e).__name__
+            self.counters[job.state] += 1
+
+            self._remove(job.id, ".in", ".progress", ".cancel")
+            output = self.spool_dir / f"{job.id}.out"
+            if job.state == DONE and output.exists():
+                job.result_bytes = output.stat().st_size
+                self._spool_bytes += job.result_bytes
+                self._evict()
+            else:
+                self._remove(job.id, ".out")
+            self._trim_history()
+        if self.on_finish is not None:
+            self.on_finish(job)
+        self._dispatch()
+
+    # ------------------------------------------------------------------
+    # Spool borné
+    # ------------------------------------------------------------------
+
+    def _remove(self, job_id: str, *suffixes: str) -> None:
+        for suffix in suffixes:
+            try:
+                (self.spool_dir / f"{job_id}{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+
+    def _expire(self, job: Job) -> None:
+        self._remove(job.id, ".out")
+        self._spool_bytes -= job.result_bytes
+        job.expired = True
+        self.counters["expired"] += 1
+
+    def _evict(self) -> None:
+        """Supprime les résultats les plus anciens au-delà de max_bytes (verrou tenu)."""
+        if self._spool_bytes <= self.max_bytes:
+            return
+        stored = sorted((j for j in self._jobs.values() if j.has_file), key=lambda j: j.finished_at)
+        for job in stored:
+            if self._spool_bytes <= self.max_bytes:
+                break
+            self._expire(job)
+
+    def _trim_history(self) -> None:
+        """Oublie les tâches terminées les plus anciennes au-delà de `history` (verrou tenu)."""
+        finished = [j for j in self._jobs.values() if j.state in FINISHED]
+        if len(finished) <= self.history:
+            return
+        finished.sort(key=lambda j: j.finished_at)
+        for job in finished[:len(finished) - self.history]:
+            if job.has_file:
+                self._expire(job)
+            del self._jobs[job.id]
+
+    # ------------------------------------------------------------------
+    # Consultation et annulation
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job:
+        """Annule une tâche en attente (aussitôt) ou en cours (au prochain point de progression).
+
+        Raises:
+            KeyError: Tâche inconnue
+            ValueError: Tâche déjà terminée
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.state in FINISHED:
+                raise ValueError(f"Tâche déjà terminée ({job.state})")
+            if job.state == QUEUED:
+                job.state = CANCELLED
+                job.params = None
+                self._remove(job.id, ".in")
+                job.finished = _now()
+                job.finished_at = time.monotonic()
+                self.counters[CANCELLED] += 1
+                self._trim_history()
+                return job
+            future = job.future
+
+        # Hors verrou : Future.cancel() appelle aussitôt _finish, qui le reprend
+        if future is not None and future.cancel():
+            return job  # pas encore démarrée dans le pool : _finish a reçu CancelledError
+        with self._lock:
+            if job.state == RUNNING:
+                (self.spool_dir / f"{job.id}.cancel").touch()
+        return job
+
+    def result_path(self, job: Job) -> Optional[Path]:
+        return self.spool_dir / f"{job.id}.out" if job.has_file else None
+
+    def _progress(self, job: Job) -> tuple:
+        if job.state == DONE:
+            return 1.0, None
+        if job.state != RUNNING:
+            return 0.0, None
+        try:
+            fraction, message = (self.spool_dir / f"{job.id}.progress").read_text(encoding="utf-8").split("\t", 1)
+            return float(fraction), message or None
+        except (OSError, ValueError):
+            return 0.0, None
+
+    def to_json(self, job: Job) -> Dict[str, Any]:
+        """État d'une tâche (position dans la file si elle attend)."""
+        progress, message = self._progress(job)
+        data = {
+            "id": job.id,
+            "kind": job.kind,
+            "priority": job.priority,
+            "state": job.state,
+            "progress": round(progress, 4),
+            "createdAt": job.created,
+            "startedAt": job.started,
+            "finishedAt": job.finished,
+        }
+        if message:
+            data["message"] = message
+        if job.state == RUNNING and (self.spool_dir / f"{job.id}.cancel").exists():
+            data["cancelling"] = True
+        if job.state == QUEUED:
+            with self._lock:
+                key = next((k for k in self._queue if k[2] == job.id), None)
+                data["position"] = sum(1 for k in self._queue if key is not None and k < key)
+        if job.error:
+            data["error"] = job.error
+        if job.state == DONE:
+            data["result"] = job.result
+            data["resultBytes"] = job.result_bytes
+            data["expired"] = job.expired
+        return data
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Tâches les plus récentes d'abord."""
+        with self._lock:
+            jobs = list(self._jobs.values())[-limit:]
+        return [self.to_json(job) for job in reversed(jobs)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, mode=self.mode, workers=self.workers, running=self._running,
+                        queued=sum(1 for j in self._jobs.values() if j.state == QUEUED),
+                        spoolBytes=self._spool_bytes, maxBytes=self.max_bytes)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,273 @@
+"""
+json_stream.py — Lecture incrémentale des gros corps de requête ProjectState
+
+`request.json` construit tout le document avant le moindre traitement : un
+gros projet occupe alors deux fois sa taille en mémoire (octets + objets
+Python). Ici le corps est lu par blocs et décodé valeur par valeur
+(`json.JSONDecoder.raw_decode` sur un tampon dont la partie consommée est
+libérée au fur et à mesure) :
+
+- les clés de l'enveloppe (`groove`, `format`…) et du ProjectState hors
+  patterns sont décodées entières (petites) ;
+- chaque pattern est décodé seul, validé, puis déposé dans un fichier
+  temporaire (JSON compact, bout à bout) : PatternSpool les
+  relit un à un, autant de fois que nécessaire (une passe par machine à
+  l'export).
+
+La mémoire de pointe reste ainsi de l'ordre du plus gros pattern, quel que
+soit le nombre de patterns ; une valeur de plus de MAX_VALUE_BYTES est
+refusée.
+"""
+
+import codecs
+import json
+import re
+import tempfile
+import threading
+from array import array
+from typing import Any, Callable, Dict, IO, Iterator, Optional, TextIO
+
+CHUNK_SIZE = 64 * 1024
+MAX_VALUE_BYTES = 64 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JsonStreamError(ValueError):
+    """Document JSON invalide ou tronqué."""
+
+
+class PatternError(ValueError):
+    """Pattern invalide dans un corps lu en flux."""
+
+    def __init__(self, index: int, message: str) -> None:
+        super().__init__(f"Pattern {index} invalide : {message}")
+        self.index = index
+
+# ============================================================================
+# LECTEUR
+# ============================================================================
+
+class JsonStreamReader:
+    """Lecture d'un document JSON valeur par valeur depuis un flux binaire.
+
+    iter_object() et iter_array() se placent sur chaque membre ; l'appelant
+    consomme alors sa valeur (value(), ou iter_object()/iter_array() pour
+    descendre) avant de passer au suivant.
+    """
+
+    def __init__(self, stream: IO[bytes], chunk_size: int = CHUNK_SIZE,
+                 max_value: int = MAX_VALUE_BYTES) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._max_value = max_value
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> bool:
+        """Lit un bloc (la partie déjà consommée du tampon est libérée)."""
+        if self._eof:
+            return False
+        data = self._stream.read(self._chunk_size)
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        if not data:
+            self._buf += self._decoder.decode(b"", final=True)
+            self._eof = True
+            return False
+        self.bytes_read += len(data)
+        self._buf += self._decoder.decode(data)
+        return True
+
+    def _peek(self) -> str:
+        """Prochain caractère significatif (sans le consommer)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise JsonStreamError("Fin de document inattendue")
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise JsonStreamError(f"'{char}' attendu, '{found}' trouvé (octet ~{self.bytes_read})")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Décode la valeur suivante en entier."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # Un nombre en fin de tampon peut continuer dans le bloc suivant
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise JsonStreamError(f"JSON invalide : {e.msg} (octet ~{self.bytes_read})") from None
+            # Valeur incomplète : on double la partie en attente (coût amorti linéaire)
+            pending = len(self._buf) - self._pos
+            if pending > self._max_value:
+                raise JsonStreamError(f"Valeur de plus de {self._max_value} octets")
+            while len(self._buf) - self._pos < 2 * pending and self._fill():
+                pass
+
+    def iter_object(self) -> Iterator[str]:
+        """Clés d'un objet ; la valeur de chaque clé reste à consommer."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise JsonStreamError(f"Clé attendue (octet ~{self.bytes_read})")
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise JsonStreamError(f"',' ou '}}' attendu, '{separator}' trouvé (octet ~{self.bytes_read})")
+
+    def iter_array(self) -> Iterator[int]:
+        """Indices d'un tableau ; chaque élément reste à consommer."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise JsonStreamError(f"',' ou ']' attendu, '{separator}' trouvé (octet ~{self.bytes_read})")
+
+    def end(self) -> None:
+        """Vérifie qu'il ne reste rien après le document."""
+        try:
+            found = self._peek()
+        except JsonStreamError:
+            return
+        raise JsonStreamError(f"Contenu après le document : '{found}'")
+
+# ============================================================================
+# PATTERNS
+# ============================================================================
+
+class PatternSpool:
+    """Patterns déposés sur disque, relus un à un (séquence réitérable)."""
+
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._offsets = array("q", [0])
+        self._lock = threading.Lock()
+        self.max_bytes = 0
+
+    def append(self, pattern: Dict[str, Any]) -> None:
+        data = json.dumps(pattern, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._file.seek(self._offsets[-1])
+            self._file.write(data)
+            self._offsets.append(self._offsets[-1] + len(data))
+        self.max_bytes = max(self.max_bytes, len(data))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        with self._lock:
+            self._file.seek(self._offsets[index])
+            data = self._file.read(self._offsets[index + 1] - self._offsets[index])
+        return json.loads(data)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_project_body(stream: IO[bytes],
+                      validate_pattern: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+                      chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Lit un corps {"projectState": {...}, ...} en flux.
+
+    Args:
+        stream: Corps de la requête
+        validate_pattern: Renvoie un message d'erreur pour un pattern invalide
+        chunk_size: Taille des blocs lus
+
+    Returns:
+        L'enveloppe (clés dans l'ordre du document) ; ses `projectState.patterns`
+        sont un PatternSpool à fermer par l'appelant
+
+    Raises:
+        JsonStreamError: Corps invalide
+        PatternError: Pattern refusé par validate_pattern
+    """
+    reader = JsonStreamReader(stream, chunk_size)
+    body: Dict[str, Any] = {}
+    spool: Optional[PatternSpool] = None
+    try:
+        for key in reader.iter_object():
+            if key != "projectState":
+                body[key] = reader.value()
+                continue
+            project: Dict[str, Any] = {}
+            body[key] = project
+            for field in reader.iter_object():
+                if field != "patterns":
+                    project[field] = reader.value()
+                    continue
+                spool = project[field] = PatternSpool()
+                for index in reader.iter_array():
+                    pattern = reader.value()
+                    error = validate_pattern(pattern) if validate_pattern else None
+                    if error:
+                        raise PatternError(index, error)
+                    spool.append(pattern)
+        reader.end()
+    except Exception:
+        if spool is not None:
+            spool.close()
+        raise
+    return body
+
+
+def dump_project(project_state: Dict[str, Any], fp: TextIO) -> None:
+    """Écrit un ProjectState pattern par pattern.
+
+    Sortie identique à json.dump(project_state, fp, indent=2,
+    ensure_ascii=False) ; `patterns` peut être un PatternSpool.
+    """
+    def dumps(value: Any, level: int) -> str:
+        return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + "  " * level)
+
+    fp.write("{")
+    for i, (key, value) in enumerate(project_state.items()):
+        fp.write(("," if i else "") + "\n  " + json.dumps(key, ensure_ascii=False) + ": ")
+        if key != "patterns" or not len(value):
+            fp.write(dumps(value, 1))
+            continue
+        fp.write("[")
+        for j, pattern in enumerate(value):
+            fp.write(("," if j else "") + "\n    " + dumps(pattern, 2))
+        fp.write("\n  ]")
+    fp.write("\n}" if project_state else "}")
@@ -0,0 +1,230 @@
+"""
+log_store.py — Index, rétention et requêtes paginées sur la base de logs
+
+Les tables `action_logs` et `error_logs` grossissent sans limite. Ce module :
+- ajoute les index utilisés par les requêtes de diagnostic ;
+- compacte les lignes plus anciennes que la rétention en agrégats horaires
+  (`*_hourly` : nombre total, nombre d'échecs) puis supprime les lignes
+  brutes par lots (transactions courtes, pas de blocage du serveur) ;
+- tronque les payloads volumineux (prompts complets) à l'écriture ;
+- pagine les lectures par curseur (keyset sur l'id), sans OFFSET.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Taille maximale d'un payload stocké (caractères JSON)
+MAX_PAYLOAD_CHARS = 2000
+
+# Pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Tables connues : colonne de type, colonne d'échec (None = toutes les lignes sont des erreurs)
+TABLES = {
+    "action": {"table": "action_logs", "type": "action_type", "failure": "success = 0"},
+    "error": {"table": "error_logs", "type": "error_type", "failure": None},
+}
+
+SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS idx_action_logs_timestamp ON action_logs(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_action_logs_action_type ON action_logs(action_type)",
+    "CREATE INDEX IF NOT EXISTS idx_action_logs_success ON action_logs(success)",
+    "CREATE INDEX IF NOT EXISTS idx_error_logs_timestamp ON error_logs(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_error_logs_error_type ON error_logs(error_type)",
+    """
+    CREATE TABLE IF NOT EXISTS action_logs_hourly (
+        hour TEXT NOT NULL,
+        action_type TEXT NOT NULL,
+        total INTEGER NOT NULL,
+        failures INTEGER NOT NULL,
+        PRIMARY KEY (hour, action_type)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS error_logs_hourly (
+        hour TEXT NOT NULL,
+        error_type TEXT NOT NULL,
+        total INTEGER NOT NULL,
+        failures INTEGER NOT NULL,
+        PRIMARY KEY (hour, error_type)
+    )
+    """,
+]
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Crée les index et les tables d'agrégats (idempotent)."""
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+
+def compact_payload(payload: Any) -> str:
+    """Sérialise un payload en le tronquant au-delà de MAX_PAYLOAD_CHARS.
+
+    Le résultat reste du JSON valide : {"_truncated": taille, "_head": début}.
+    """
+    raw = json.dumps(payload, ensure_ascii=False)
+    if len(raw) <= MAX_PAYLOAD_CHARS:
+        return raw
+    return json.dumps({"_truncated": len(raw), "_head": raw[:MAX_PAYLOAD_CHARS // 2]}, ensure_ascii=False)
+
+# ============================================================================
+# RÉTENTION
+# ============================================================================
+
+def compact(db_path: Path, retention_days: float, batch_size: int = 1000,
+            now: Optional[datetime] = None) -> Dict[str, int]:
+    """Agrège puis supprime les lignes plus anciennes que la rétention.
+
+    Chaque lot est traité dans sa propre transaction : agrégation dans la
+    table horaire (UPSERT) puis suppression des mêmes lignes.
+
+    Args:
+        db_path: Base SQLite
+        retention_days: Âge maximal des lignes brutes (jours)
+        batch_size: Lignes par transaction
+        now: Instant de référence (tests)
+
+    Returns:
+        Lignes compactées par type de log
+    """
+    cutoff = ((now or datetime.utcnow()) - timedelta(days=retention_days)).isoformat()
+    removed = {}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        for kind, spec in TABLES.items():
+            table, type_col = spec["table"], spec["type"]
+            failure = f"SUM({spec['failure']})" if spec["failure"] else "COUNT(*)"
+            batch = f"SELECT id FROM {table} WHERE timestamp < ? ORDER BY id LIMIT ?"
+            removed[kind] = 0
+
+            while True:
+                with conn:
+                    conn.execute(f"""
+                        INSERT INTO {table}_hourly (hour, {type_col}, total, failures)
+                        SELECT substr(timestamp, 1, 13), {type_col}, COUNT(*), {failure}
+                        FROM {table} WHERE id IN ({batch})
+                        GROUP BY substr(timestamp, 1, 13), {type_col}
+                        ON CONFLICT(hour, {type_col}) DO UPDATE SET
+                            total = total + excluded.total,
+                            failures = failures + excluded.failures
+                    """, (cutoff, batch_size))
+                    deleted = conn.execute(f"DELETE FROM {table} WHERE id IN ({batch})",
+                                           (cutoff, batch_size)).rowcount
+                removed[kind] += deleted
+                if deleted < batch_size:
+                    break
+    finally:
+        conn.close()
+
+    return removed
+
+# ============================================================================
+# REQUÊTES
+# ============================================================================
+
+def query_logs(db_path: Path, kind: str = "action", limit: int = DEFAULT_PAGE_SIZE,
+               before: Optional[int] = None, type_filter: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None,
+               failed_only: bool = False) -> Dict[str, Any]:
+    """Page de logs, du plus récent au plus ancien (pagination keyset).
+
+    Args:
+        kind: "action" ou "error"
+        limit: Taille de page (1-MAX_PAGE_SIZE)
+        before: Curseur (id exclu) renvoyé par la page précédente
+        type_filter: action_type / error_type exact
+        since, until: Bornes ISO 8601 sur timestamp ([since, until[)
+        failed_only: Actions en échec uniquement
+
+    Returns:
+        {"items": [...], "nextCursor": id ou None}
+
+    Raises:
+        ValueError: Si kind ou limit sont invalides
+    """
+    if kind not in TABLES:
+        raise ValueError(f"Type de log inconnu: {kind}")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Taille de page invalide: {limit} (1-{MAX_PAGE_SIZE})")
+
+    spec = TABLES[kind]
+    clauses: List[str] = []
+    params: List[Any] = []
+    if before is not None:
+        clauses.append("id < ?")
+        params.append(before)
+    if type_filter:
+        clauses.append(f"{spec['type']} = ?")
+        params.append(type_filter)
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    if failed_only and spec["failure"]:
+        clauses.append(spec["failure"])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT * FROM {spec['table']} {where} ORDER BY id DESC LIMIT ?"
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    finally:
+        conn.close()
+
+    items = []
+    for row in rows[:limit]:
+        item = dict(row)
+        if item.get("payload"):
+            try:
+                item["payload"] = json.loads(item["payload"])
+            except json.JSONDecodeError:
+                pass
+        items.append(item)
+
+    return {
+        "items": items,
+        "nextCursor": items[-1]["id"] if len(rows) > limit else None,
+    }
+
+
+def hourly(db_path: Path, kind: str = "action", since: Optional[str] = None,
+           type_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Agrégats horaires (lignes compactées) avec taux d'erreur."""
+    if kind not in TABLES:
+        raise ValueError(f"Type de log inconnu: {kind}")
+
+    spec = TABLES[kind]
+    clauses, params = [], []
+    if since:
+        clauses.append("hour >= ?")
+        params.append(since[:13])
+    if type_filter:
+        clauses.append(f"{spec['type']} = ?")
+        params.append(type_filter)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT hour, {spec['type']}, total, failures FROM {spec['table']}_hourly {where} "
+            f"ORDER BY hour DESC, {spec['type']}", params).fetchall()
+    finally:
+        conn.close()
+
+    return [{
+        "hour": hour,
+        "type": type_,
+        "total": total,
+        "failures": failures,
+        "errorRate": round(failures / total, 4) if total else 0.0,
+    } for hour, type_, total, failures in rows]
@@ -0,0 +1,68 @@
+"""
+metrics.py — Statistiques de latence (percentiles) partagées par les modules
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentile (méthode du rang le plus proche) d'une liste déjà triée.
+
+    Args:
+        sorted_values: Valeurs triées
+        q: Percentile 0-100
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyStats:
+    """Fenêtre glissante d'échantillons (en secondes) et résumé p50/p95/p99.
+
+    Attributes:
+        count: Nombre total d'échantillons reçus (y compris hors fenêtre)
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Ajoute un échantillon."""
+        with self._lock:
+            self._samples.append(value)
+            self.count += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Ajoute plusieurs échantillons."""
+        with self._lock:
+            for value in values:
+                self._samples.append(value)
+                self.count += 1
+
+    def summary(self, scale: float = 1000.0, digits: int = 3) -> Dict[str, Optional[float]]:
+        """Résumé (par défaut en millisecondes).
+
+        Returns:
+            {"count", "min", "p50", "p95", "p99", "max", "mean"}
+        """
+        with self._lock:
+            values = sorted(self._samples)
+        if not values:
+            return {"count": self.count, "min": None, "p50": None, "p95": None,
+                    "p99": None, "max": None, "mean": None}
+        return {
+            "count": self.count,
+            "min": round(values[0] * scale, digits),
+            "p50": round(percentile(values, 50) * scale, digits),
+            "p95": round(percentile(values, 95) * scale, digits),
+            "p99": round(percentile(values, 99) * scale, digits),
+            "max": round(values[-1] * scale, digits),
+            "mean": round(sum(values) / len(values) * scale, digits),
+        }
@@ -0,0 +1,371 @@
+"""
+pattern_buffer.py — Représentation compacte (struct-of-arrays) d'un Pattern.v1
+
+Un pattern JSON stocke ses pas sous forme de liste de dicts
+(`{"t", "note", "vel", "duration", ...}`), soit plusieurs centaines d'octets
+par pas et une recherche de clé à chaque accès. `PatternBuffer` range chaque
+champ dans une colonne `array` typée (≈ 30 octets par pas) et reste
+convertible sans perte vers/depuis le JSON Pattern.v1.
+
+Les colonnes peuvent être exposées en NumPy sans copie (`as_numpy()`) quand
+NumPy est disponible ; le module lui-même n'utilise que la stdlib.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Bits de la colonne `flags` : valeurs booléennes puis présence des champs
+# optionnels (pour restituer exactement le JSON d'origine)
+FLAG_SLIDE = 1 << 0
+FLAG_ACCENT = 1 << 1
+HAS_DURATION = 1 << 2
+HAS_MICROTIME = 1 << 3
+HAS_RATCHET = 1 << 4
+HAS_PROB = 1 << 5
+HAS_SLIDE = 1 << 6
+HAS_ACCENT = 1 << 7
+DURATION_IS_INT = 1 << 8
+PROB_IS_INT = 1 << 9
+
+# Valeurs effectives des champs absents (alignées sur export_midi)
+DEFAULT_DURATION = 0.5
+DEFAULT_PROB = 1.0
+DEFAULT_RATCHET = 1
+DEFAULT_MICROTIME = 0
+
+# Champs d'un pas connus du schéma Pattern.v1
+STEP_FIELDS = ("t", "note", "vel", "duration", "microTime", "ratchet", "prob", "slide", "accent")
+
+# Colonnes : nom → typecode array
+COLUMNS = (
+    ("t", "I"),
+    ("note", "B"),
+    ("vel", "B"),
+    ("duration", "d"),
+    ("prob", "d"),
+    ("micro_time", "i"),
+    ("ratchet", "H"),
+    ("flags", "H"),
+)
+
+# ============================================================================
+# PATTERN BUFFER
+# ============================================================================
+
+class PatternBuffer:
+    """Pattern.v1 stocké en colonnes typées.
+
+    Attributes:
+        meta: Champs du pattern hors `steps` (id, targetMachine, automation…)
+        t: Position en pas (uint32)
+        note: Note MIDI (uint8)
+        vel: Vélocité (uint8)
+        duration: Durée en beats (float64, défaut 0.5)
+        prob: Probabilité de déclenchement (float64, défaut 1.0)
+        micro_time: Offset micro-timing en ticks (int32, défaut 0)
+        ratchet: Nombre de sous-déclenchements (uint16, défaut 1)
+        flags: Booléens et présence des champs optionnels (uint16)
+        extras: Champs non standard par index de pas (conservés tels quels)
+    """
+
+    __slots__ = ("meta", "t", "note", "vel", "duration", "prob",
+                 "micro_time", "ratchet", "flags", "extras")
+
+    def __init__(self, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Initialise un buffer vide.
+
+        Args:
+            meta: Champs du pattern hors `steps`
+        """
+        self.meta: Dict[str, Any] = dict(meta or {})
+        self.meta.pop("steps", None)
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.extras: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __repr__(self) -> str:
+        return f"PatternBuffer(id={self.meta.get('id')!r}, steps={len(self)})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PatternBuffer):
+            return NotImplemented
+        return (self.meta == other.meta and self.extras == other.extras
+                and all(getattr(self, n) == getattr(other, n) for n, _ in COLUMNS))
+
+    # ------------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------------
+
+    def append(self, t: int, note: int, vel: int,
+               duration: Optional[float] = None,
+               prob: Optional[float] = None,
+               micro_time: Optional[int] = None,
+               ratchet: Optional[int] = None,
+               slide: Optional[bool] = None,
+               accent: Optional[bool] = None) -> None:
+        """Ajoute un pas. Les champs à None sont considérés absents.
+
+        Raises:
+            ValueError: Si une valeur n'a pas le type attendu (entier, nombre,
+                booléen) ou ne tient pas dans sa colonne
+        """
+        # Types JSON stricts, sans conversion implicite (1.7 ou "3" ne sont pas
+        # des entiers, True n'est pas un nombre) : sinon le pattern ne ferait
+        # plus l'aller-retour à l'identique
+        if type(t) is not int or type(note) is not int or type(vel) is not int:
+            raise ValueError(f"Pas {len(self.flags)} : t, note et vel doivent être des entiers "
+                             f"({t!r}, {note!r}, {vel!r})")
+        for name, value, kinds in (("duration", duration, (int, float)), ("prob", prob, (int, float)),
+                                   ("microTime", micro_time, (int,)), ("ratchet", ratchet, (int,)),
+                                   ("slide", slide, (bool,)), ("accent", accent, (bool,))):
+            if value is not None and type(value) not in kinds:
+                raise ValueError(f"Pas {len(self.flags)} : {name} de type invalide ({value!r})")
+
+        flags = 0
+        if duration is None:
+            duration = DEFAULT_DURATION
+        else:
+            flags |= HAS_DURATION | (DURATION_IS_INT if isinstance(duration, int) else 0)
+        if prob is None:
+            prob = DEFAULT_PROB
+        else:
+            flags |= HAS_PROB | (PROB_IS_INT if isinstance(prob, int) else 0)
+        if micro_time is None:
+            micro_time = DEFAULT_MICROTIME
+        else:
+            flags |= HAS_MICROTIME
+        if ratchet is None:
+            ratchet = DEFAULT_RATCHET
+        else:
+            flags |= HAS_RATCHET
+        if slide is not None:
+            flags |= HAS_SLIDE | (FLAG_SLIDE if slide else 0)
+        if accent is not None:
+            flags |= HAS_ACCENT | (FLAG_ACCENT if accent else 0)
+
+        try:
+            self.t.append(t)
+            self.note.append(note)
+            self.vel.append(vel)
+            self.duration.append(duration)
+            self.prob.append(prob)
+            self.micro_time.append(micro_time)
+            self.ratchet.append(ratchet)
+            self.flags.append(flags)
+        except OverflowError as e:
+            # Garder les colonnes alignées avant de remonter l'erreur
+            size = len(self.flags)
+            for name, _ in COLUMNS:
+                column = getattr(self, name)
+                del column[size:]
+            raise ValueError(f"Pas {size} : valeur hors plage ({e})") from e
+
+    @classmethod
+    def from_pattern(cls, pattern: Dict[str, Any]) -> "PatternBuffer":
+        """Construit un buffer depuis un Pattern.v1 (ou CreatePattern.v1) JSON.
+
+        Args:
+            pattern: Pattern sous forme de dict
+
+        Returns:
+            Buffer équivalent (conversion sans perte)
+
+        Raises:
+            ValueError: Si un pas est incomplet, mal typé ou hors plage
+        """
+        buffer = cls(pattern)
+        append = buffer.append
+        extras = buffer.extras
+
+        for index, step in enumerate(pattern.get("steps", [])):
+            try:
+                append(step["t"], step["note"], step["vel"],
+                       step.get("duration"), step.get("prob"),
+                       step.get("microTime"), step.get("ratchet"),
+                       step.get("slide"), step.get("accent"))
+            except KeyError as e:
+                raise ValueError(f"Pas {index} : champ requis manquant {e}") from e
+            if len(step) > 3:
+                unknown = {k: v for k, v in step.items() if k not in STEP_FIELDS}
+                if unknown:
+                    extras[index] = unknown
+
+        return buffer
+
+    # ------------------------------------------------------------------------
+    # Restitution
+    # ------------------------------------------------------------------------
+
+    def step(self, index: int) -> Dict[str, Any]:
+        """Reconstruit le dict JSON d'un pas."""
+        flags = self.flags[index]
+        step: Dict[str, Any] = {
+            "t": self.t[index],
+            "note": self.note[index],
+            "vel": self.vel[index],
+        }
+        if flags & HAS_DURATION:
+            duration = self.duration[index]
+            step["duration"] = int(duration) if flags & DURATION_IS_INT else duration
+        if flags & HAS_MICROTIME:
+            step["microTime"] = self.micro_time[index]
+        if flags & HAS_RATCHET:
+            step["ratchet"] = self.ratchet[index]
+        if flags & HAS_PROB:
+            prob = self.prob[index]
+            step["prob"] = int(prob) if flags & PROB_IS_INT else prob
+        if flags & HAS_SLIDE:
+            step["slide"] = bool(flags & FLAG_SLIDE)
+        if flags & HAS_ACCENT:
+            step["accent"] = bool(flags & FLAG_ACCENT)
+        if index in self.extras:
+            step.update(self.extras[index])
+        return step
+
+    def iter_steps(self) -> Iterator[Dict[str, Any]]:
+        """Itère sur les pas au format JSON."""
+        for index in range(len(self)):
+            yield self.step(index)
+
+    def to_pattern(self) -> Dict[str, Any]:
+        """Reconstruit le Pattern.v1 JSON d'origine."""
+        pattern = dict(self.meta)
+        pattern["steps"] = list(self.iter_steps())
+        return pattern
+
+    def header(self) -> Dict[str, Any]:
+        """Pattern sans ses pas (pour valider les métadonnées seules)."""
+        pattern = dict(self.meta)
+        pattern["steps"] = []
+        return pattern
+
+    # ------------------------------------------------------------------------
+    # Accès rapide (exporteurs)
+    # ------------------------------------------------------------------------
+
+    def iter_events(self) -> Iterator[Tuple[int, int, int, float]]:
+        """Itère sur (t, note, vel, duration) avec les valeurs par défaut appliquées."""
+        return zip(self.t, self.note, self.vel, self.duration)
+
+    def nbytes(self) -> int:
+        """Taille des colonnes en octets (hors meta/extras)."""
+        return sum(len(getattr(self, n)) * getattr(self, n).itemsize for n, _ in COLUMNS)
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """Vues NumPy (sans copie) sur les colonnes.
+
+        Raises:
+            ImportError: Si NumPy n'est pas disponible
+        """
+        import numpy as np
+
+        views = {}
+        for name, typecode in COLUMNS:
+            column = getattr(self, name)
+            views[name] = np.frombuffer(column, dtype=np.dtype(typecode)) if len(column) else \
+                np.zeros(0, dtype=np.dtype(typecode))
+        return views
+
+    # ------------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------------
+
+    def check(self) -> List[str]:
+        """Vérifie les contraintes Pattern.v1 des pas, colonne par colonne.
+
+        Les types et les bornes basses de t/note/vel sont garantis par les
+        colonnes non signées ; il reste les bornes hautes et les flottants.
+
+        Returns:
+            Liste des erreurs (vide si valide), au format "steps → i → champ: message"
+        """
+        errors = []
+
+        if len(self) and max(self.note) > 127:
+            errors += [f"steps → {i} → note: {v} is greater than the maximum of 127"
+                       for i, v in enumerate(self.note) if v > 127]
+        if len(self) and max(self.vel) > 127:
+            errors += [f"steps → {i} → vel: {v} is greater than the maximum of 127"
+                       for i, v in enumerate(self.vel) if v > 127]
+        if len(self) and min(self.duration) < 0:
+            errors += [f"steps → {i} → duration: {v} is less than the minimum of 0"
+                       for i, v in enumerate(self.duration) if v < 0]
+        if len(self) and (min(self.prob) < 0 or max(self.prob) > 1):
+            errors += [f"steps → {i} → prob: {v} is less than the minimum of 0" if v < 0
+                       else f"steps → {i} → prob: {v} is greater than the maximum of 1"
+                       for i, v in enumerate(self.prob) if v < 0 or v > 1]
+        if len(self) and min(self.ratchet) < 1:
+            errors += [f"steps → {i} → ratchet: {v} is less than the minimum of 1"
+                       for i, v in enumerate(self.ratchet) if v < 1]
+
+        return errors
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def as_buffer(pattern: Any) -> PatternBuffer:
+    """Retourne le pattern sous forme de PatternBuffer (sans copie si déjà converti)."""
+    if isinstance(pattern, PatternBuffer):
+        return pattern
+    return PatternBuffer.from_pattern(pattern)
+
+
+def as_pattern(pattern: Any) -> Dict[str, Any]:
+    """Retourne le pattern sous forme de dict Pattern.v1."""
+    if isinstance(pattern, PatternBuffer):
+        return pattern.to_pattern()
+    return pattern
+
+
+def pack_project(project_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Copie du ProjectState dont les patterns sont des PatternBuffer."""
+    packed = dict(project_state)
+    packed["patterns"] = [as_buffer(p) for p in project_state.get("patterns", [])]
+    return packed
+
+
+def unpack_project(project_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Copie du ProjectState dont les patterns sont des dicts Pattern.v1."""
+    unpacked = dict(project_state)
+    unpacked["patterns"] = [as_pattern(p) for p in project_state.get("patterns", [])]
+    return unpacked
+
+
+def schema_view(document: Any) -> Tuple[Any, List[str]]:
+    """Prépare un document contenant des PatternBuffer pour jsonschema.
+
+    Les buffers sont remplacés par leur en-tête (pas vides) et leurs pas sont
+    vérifiés par `PatternBuffer.check()`, ce qui évite de reconstruire des
+    milliers de dicts juste pour les valider.
+
+    Args:
+        document: Pattern (dict ou buffer) ou ProjectState
+
+    Returns:
+        (document validable par jsonschema, erreurs des colonnes)
+    """
+    if isinstance(document, PatternBuffer):
+        return document.header(), document.check()
+
+    patterns = document.get("patterns") if isinstance(document, dict) else None
+    if not isinstance(patterns, list) or not any(isinstance(p, PatternBuffer) for p in patterns):
+        return document, []
+
+    errors: List[str] = []
+    view = []
+    for index, pattern in enumerate(patterns):
+        if isinstance(pattern, PatternBuffer):
+            view.append(pattern.header())
+            errors += [f"patterns → {index} → {e}" for e in pattern.check()]
+        else:
+            view.append(pattern)
+    return dict(document, patterns=view), errors
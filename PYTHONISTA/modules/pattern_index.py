@@ -0,0 +1,366 @@
+"""
+pattern_index.py — Bibliothèque de patterns : dédoublonnage et recherche par groove
+
+Chaque pattern indexé reçoit :
+- une empreinte de contenu (SHA-1 des pas triés, hors id/nom/machine) : deux
+  patterns musicalement identiques ont la même, d'où un dédoublonnage exact
+  par index UNIQUE ;
+- une empreinte rythmique : masque d'attaques sur 64 cases (toutes notes,
+  position ramenée à 64 sur `lengthSteps`) et contour de vélocité (16 cases
+  × 2 bits).
+
+SQLite conserve les patterns et garantit l'unicité des empreintes de
+contenu. La recherche des voisins (distance de Hamming sur le masque) se
+fait sur une copie en mémoire des masques et des contours (`array`, 12
+octets par pattern), chargée une fois puis complétée à chaque recherche par
+les lignes ajoutées depuis : un parcours avec popcount reste de l'ordre de
+la milliseconde pour des dizaines de milliers de patterns. Les égalités de
+distance (fréquentes : bibliothèques de grooves 4/4) sont départagées en
+mémoire par le contour ; seules les k lignes retenues sont lues en base. Un découpage en bandes indexées
+(multi-index hashing) filtre mal ici : un pattern de 16 pas n'occupe que 16
+des 64 cases, chaque bande de 16 bits ne porte donc que 4 bits utiles.
+"""
+
+import hashlib
+import heapq
+import json
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from modules.pattern_buffer import FLAG_ACCENT, FLAG_SLIDE, PatternBuffer, as_buffer, as_pattern
+
+# Empreinte rythmique
+SLOTS = 64
+CONTOUR_SLOTS = 16
+
+# Recherche
+DEFAULT_K = 10
+MAX_K = 100
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS patterns (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        hash TEXT NOT NULL UNIQUE,
+        name TEXT,
+        target_machine TEXT,
+        length_steps INTEGER NOT NULL,
+        note_count INTEGER NOT NULL,
+        onsets INTEGER NOT NULL,
+        contour INTEGER NOT NULL,
+        pattern TEXT NOT NULL,
+        source TEXT,
+        created TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_patterns_target_machine ON patterns(target_machine)",
+]
+
+# ============================================================================
+# EMPREINTES
+# ============================================================================
+
+def content_hash(buffer: PatternBuffer) -> str:
+    """SHA-1 du contenu musical (pas triés par (t, note), longueur, automation)."""
+    digest = hashlib.sha1()
+    digest.update(struct.pack("<I", buffer.meta.get("lengthSteps", 16)))
+    musical = FLAG_SLIDE | FLAG_ACCENT
+    for i in sorted(range(len(buffer)), key=lambda i: (buffer.t[i], buffer.note[i])):
+        digest.update(struct.pack("<IBBddiHH", buffer.t[i], buffer.note[i], buffer.vel[i],
+                                  buffer.duration[i], buffer.prob[i], buffer.micro_time[i],
+                                  buffer.ratchet[i], buffer.flags[i] & musical))
+    automation = buffer.meta.get("automation")
+    if automation:
+        digest.update(json.dumps(automation, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def fingerprint(buffer: PatternBuffer) -> Tuple[int, int]:
+    """Empreinte rythmique.
+
+    Returns:
+        (masque d'attaques sur SLOTS bits, contour de vélocité sur
+        CONTOUR_SLOTS × 2 bits — 0 = silence, 1-3 = vélocité moyenne)
+    """
+    length = max(1, buffer.meta.get("lengthSteps", 16))
+    onsets = 0
+    sums = [0] * CONTOUR_SLOTS
+    counts = [0] * CONTOUR_SLOTS
+    for t, vel in zip(buffer.t, buffer.vel):
+        if t >= length:
+            continue
+        onsets |= 1 << (t * SLOTS // length)
+        slot = t * CONTOUR_SLOTS // length
+        sums[slot] += vel
+        counts[slot] += 1
+
+    contour = 0
+    for slot in range(CONTOUR_SLOTS):
+        level = 0
+        if counts[slot]:
+            level = 1 + min(2, sums[slot] // counts[slot] * 3 // 128)
+        contour |= level << (2 * slot)
+    return onsets, contour
+
+
+def _popcount_fallback(value: int) -> int:
+    return bin(value).count("1")
+
+
+# int.bit_count : Python 3.10+
+_popcount = getattr(int, "bit_count", _popcount_fallback)
+
+
+def hamming(a: int, b: int) -> int:
+    return _popcount(a ^ b)
+
+
+def contour_distance(a: int, b: int) -> int:
+    """Somme des écarts de niveau case par case."""
+    return sum(abs(((a >> s) & 3) - ((b >> s) & 3)) for s in range(0, 2 * CONTOUR_SLOTS, 2))
+
+
+def _to_sql(value: int) -> int:
+    """Entier non signé 64 bits → INTEGER SQLite (signé)."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _from_sql(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+def _closest_contours(contour: int, candidates: List[int], contours: array, count: int) -> List[int]:
+    """Les `count` candidats au contour le plus proche de `contour`.
+
+    Les candidats sont des positions croissantes (donc par id croissant) :
+    à écart égal, les premiers sont retenus. L'écart est calculé une fois par
+    valeur de contour distincte ; des patterns à égalité de masque n'en ont
+    que peu (3 niveaux par case occupée).
+    """
+    if len(candidates) <= count:
+        return candidates
+    tally = Counter(map(contours.__getitem__, candidates))
+    gaps = {value: contour_distance(contour, value) for value in tally}
+
+    # Plus petit écart qui réunit `count` candidats
+    total = 0
+    for threshold in sorted(set(gaps.values())):
+        total += sum(n for value, n in tally.items() if gaps[value] == threshold)
+        if total >= count:
+            break
+    inside = {value for value, gap in gaps.items() if gap < threshold}
+    edge = {value for value, gap in gaps.items() if gap == threshold}
+
+    # Un seul parcours, interrompu dès que les `count` candidats sont trouvés
+    remaining = sum(tally[value] for value in inside)
+    room = count - remaining
+    chosen = []
+    for i in candidates:
+        value = contours[i]
+        if value in inside:
+            remaining -= 1
+        elif room and value in edge:
+            room -= 1
+        else:
+            continue
+        chosen.append(i)
+        if not remaining and not room:
+            break
+    return chosen
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class _Masks:
+    """Copie en mémoire des masques d'attaques et des contours, par fichier de bibliothèque."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ids = array("q")
+        self.onsets = array("Q")
+        self.contours = array("L")
+        self.machines: List[Optional[str]] = []
+        self.last_id = 0
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        """Charge les lignes ajoutées depuis le dernier appel."""
+        for row_id, onsets, contour, machine in conn.execute(
+                "SELECT id, onsets, contour, target_machine FROM patterns WHERE id > ? ORDER BY id",
+                (self.last_id,)):
+            self.ids.append(row_id)
+            self.onsets.append(_from_sql(onsets))
+            self.contours.append(contour)
+            self.machines.append(machine)
+            self.last_id = row_id
+
+
+class PatternIndex:
+    """Index SQLite des patterns (une connexion par opération, comme les logs).
+
+    Args:
+        db_path: Fichier SQLite de la bibliothèque
+    """
+
+    _ready: Set[Path] = set()
+    _ready_lock = threading.Lock()
+    _masks: Dict[Path, _Masks] = {}
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._ready_lock:
+            if self.db_path not in self._ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path)
+                with conn:
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                conn.close()
+                self._ready.add(self.db_path)
+                self._masks[self.db_path] = _Masks()
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _row(pattern: Any, source: Optional[str]) -> Tuple:
+        buffer = as_buffer(pattern)
+        onsets, contour = fingerprint(buffer)
+        meta = buffer.meta
+        return (
+            content_hash(buffer), meta.get("name"), meta.get("targetMachine"),
+            meta.get("lengthSteps", 16), len(buffer), _to_sql(onsets), contour,
+            json.dumps(as_pattern(pattern), ensure_ascii=False, separators=(",", ":")),
+            source, datetime.utcnow().isoformat(),
+        )
+
+    def add_many(self, patterns: Iterable[Any], source: Optional[str] = None) -> Dict[str, int]:
+        """Indexe des patterns (doublons exacts ignorés) en une transaction.
+
+        Returns:
+            {"added", "duplicates"}
+        """
+        rows = [self._row(p, source) for p in patterns]
+        conn = self._connect()
+        try:
+            with conn:
+                before = conn.total_changes
+                conn.executemany("""
+                    INSERT OR IGNORE INTO patterns (hash, name, target_machine, length_steps, note_count,
+                        onsets, contour, pattern, source, created)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                added = conn.total_changes - before
+        finally:
+            conn.close()
+        return {"added": added, "duplicates": len(rows) - added}
+
+    def add(self, pattern: Any, source: Optional[str] = None) -> bool:
+        """Indexe un pattern ; False si un pattern identique existe déjà."""
+        return self.add_many([pattern], source)["added"] == 1
+
+    def count(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM patterns").fetchone()[0]
+        finally:
+            conn.close()
+
+    def get(self, pattern_id: int) -> Optional[Dict[str, Any]]:
+        """Pattern stocké (JSON) par id."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT pattern FROM patterns WHERE id = ?", (pattern_id,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def iter_since(self, after_id: int = 0) -> Iterator[Tuple[int, Optional[str], Dict[str, Any]]]:
+        """Patterns ajoutés après `after_id` : (id, machine cible, pattern), par id croissant."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, target_machine, pattern FROM patterns WHERE id > ? ORDER BY id", (after_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        for row_id, target_machine, pattern in rows:
+            yield row_id, target_machine, json.loads(pattern)
+
+    def similar(self, pattern: Any, k: int = DEFAULT_K, max_distance: Optional[int] = None,
+                target_machine: Optional[str] = None) -> Dict[str, Any]:
+        """Les k patterns au groove le plus proche.
+
+        Classement : distance de Hamming des masques d'attaques, puis écart
+        de contour de vélocité.
+
+        Args:
+            pattern: Pattern de référence (dict ou PatternBuffer)
+            k: Nombre de résultats (1-MAX_K)
+            max_distance: Distance de Hamming maximale (None = sans limite)
+            target_machine: Restreindre à une machine cible
+
+        Returns:
+            {"query": {...}, "results": [...], "scanned", "tookMs"}
+        """
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k invalide: {k} (1-{MAX_K})")
+
+        start = time.perf_counter()
+        buffer = as_buffer(pattern)
+        query_hash = content_hash(buffer)
+        onsets, contour = fingerprint(buffer)
+        limit = SLOTS if max_distance is None else max_distance
+
+        conn = self._connect()
+        try:
+            masks = self._masks[self.db_path]
+            with masks.lock:
+                masks.refresh(conn)
+                distances = [_popcount(onsets ^ mask) for mask in masks.onsets]
+                if target_machine:
+                    eligible = [i for i, m in enumerate(masks.machines) if m == target_machine]
+                else:
+                    eligible = range(len(distances))
+                eligible = [i for i in eligible if distances[i] <= limit]
+                nearest = heapq.nsmallest(k, eligible, key=distances.__getitem__)
+                cutoff = distances[nearest[-1]] if nearest else -1
+                # Égalités à la k-ième distance départagées en mémoire par le contour
+                below = [i for i in nearest if distances[i] < cutoff]
+                ties = [i for i in eligible if distances[i] == cutoff]
+                best = below + _closest_contours(contour, ties, masks.contours, len(nearest) - len(below))
+                chosen = {masks.ids[i]: (distances[i], contour_distance(contour, masks.contours[i]))
+                          for i in best}
+                scanned = len(distances)
+
+            ids = list(chosen)
+            rows = conn.execute(
+                "SELECT id, hash, name, target_machine, length_steps, note_count "
+                f"FROM patterns WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+        finally:
+            conn.close()
+
+        results = [{
+            "id": row_id,
+            "name": name,
+            "targetMachine": machine,
+            "lengthSteps": length_steps,
+            "noteCount": note_count,
+            "distance": chosen[row_id][0],
+            "contourDistance": chosen[row_id][1],
+            "duplicate": row_hash == query_hash,
+        } for row_id, row_hash, name, machine, length_steps, note_count in rows]
+        results.sort(key=lambda r: (r["distance"], r["contourDistance"], r["id"]))
+
+        return {
+            "query": {"hash": query_hash, "onsets": f"{onsets:016x}", "contour": f"{contour:08x}"},
+            "results": results,
+            "scanned": scanned,
+            "tookMs": round((time.perf_counter() - start) * 1000, 3),
+        }
@@ -0,0 +1,370 @@
+"""
+pattern_model.py — Générateur de patterns local (modèle statistique par machine)
+
+Alternative hors ligne à /api/gpt : un modèle par machine (`targetMachine`),
+appris sur la bibliothèque de patterns et les exemples propres à une machine
+de MACHINES/*/tests.json, sur une grille de 16 positions (pas modulo 16) :
+
+- attaques : pour chaque position, nombre de mesures observées et, par
+  note, nombre de mesures où elle est jouée ;
+- transitions : chaîne de Markov d'ordre 1 sur les notes successives (lignes
+  monophoniques : basse, lead) ;
+- vélocités : histogramme par position (lignes mélodiques : contour
+  d'accents) et par note (batterie : niveau propre à chaque instrument) ;
+- accents et slides : fréquence par attaque.
+
+Les comptes sont additifs : le modèle est complété par les patterns indexés
+depuis le dernier entraînement (`last_id`), sans réentraînement complet, et
+sauvegardé en JSON compact. La génération est une suite de tirages sur des
+tables cumulées précalculées : quelques dizaines de microsecondes pour 16 pas.
+"""
+
+import bisect
+import json
+import os
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+GRID = 16
+DEFAULT_VELOCITY = 100
+
+# Au-delà de cette part d'attaques simultanées, la machine est jouée en accords (batterie)
+POLYPHONY_THRESHOLD = 0.2
+
+# Longueurs et résolutions de CreatePattern.v1
+LENGTHS = (12, 16, 32, 48, 64, 68, 128, 256)
+RESOLUTIONS = (96, 192, 480)
+
+# Mots du prompt → famille de machine (choix de la machine pour /api/gpt)
+_DRUM_WORDS = re.compile(r"drum|batterie|kick|snare|hat|909|808|rd9|beat|percu", re.I)
+_BASS_WORDS = re.compile(r"bass|basse|303|td3|acid|lead|m[ée]lodie|arp", re.I)
+_LENGTH_WORDS = re.compile(r"\b(\d{2,3})\s*(?:pas|steps?)\b", re.I)
+
+
+def _cumulative(counts: Dict[int, int]) -> Tuple[List[int], List[int]]:
+    """Table de tirage (valeurs, poids cumulés)."""
+    values, totals, total = [], [], 0
+    for value, count in sorted(counts.items()):
+        total += count
+        values.append(value)
+        totals.append(total)
+    return values, totals
+
+
+def _draw(table: Tuple[List[int], List[int]], rng: random.Random) -> Optional[int]:
+    values, totals = table
+    if not values:
+        return None
+    return values[bisect.bisect_right(totals, rng.random() * totals[-1])]
+
+
+class MachineModel:
+    """Statistiques d'une machine (comptes additifs)."""
+
+    def __init__(self) -> None:
+        self.patterns = 0
+        self.bars = [0] * GRID
+        self.onsets = [0] * GRID
+        self.hits: List[Dict[int, int]] = [{} for _ in range(GRID)]
+        self.velocities: List[Dict[int, int]] = [{} for _ in range(GRID)]
+        self.note_velocities: Dict[int, Dict[int, int]] = {}
+        self.transitions: Dict[int, Dict[int, int]] = {}
+        self.chords = 0
+        self.attacks = 0
+        self.accents = 0
+        self.slides = 0
+        self.lengths: Dict[int, int] = {}
+        self._tables: Optional[Dict[str, Any]] = None
+
+    def add(self, pattern: Dict[str, Any]) -> bool:
+        """Compte un pattern ; False s'il est inexploitable (pas de pas valides)."""
+        length = pattern.get("lengthSteps", GRID)
+        if not isinstance(length, int) or length <= 0:
+            return False
+        notes_at: Dict[int, List[Dict[str, Any]]] = {}
+        for step in pattern.get("steps") or []:
+            t, note = step.get("t"), step.get("note")
+            if isinstance(t, int) and isinstance(note, int) and 0 <= t < length and 0 <= note <= 127:
+                notes_at.setdefault(t, []).append(step)
+        if not notes_at:
+            return False
+
+        self.patterns += 1
+        self.lengths[length] = self.lengths.get(length, 0) + 1
+        for pos in range(GRID):
+            self.bars[pos] += len(range(pos, length, GRID))
+        previous = None
+        for t in sorted(notes_at):
+            steps = notes_at[t]
+            pos = t % GRID
+            self.onsets[pos] += 1
+            if len({s["note"] for s in steps}) > 1:
+                self.chords += 1
+            for step in steps:
+                note = step["note"]
+                self.hits[pos][note] = self.hits[pos].get(note, 0) + 1
+                vel = step.get("vel")
+                if isinstance(vel, int) and 1 <= vel <= 127:
+                    self.velocities[pos][vel] = self.velocities[pos].get(vel, 0) + 1
+                    by_note = self.note_velocities.setdefault(note, {})
+                    by_note[vel] = by_note.get(vel, 0) + 1
+                self.attacks += 1
+                self.accents += bool(step.get("accent"))
+                self.slides += bool(step.get("slide"))
+            note = steps[0]["note"]
+            if previous is not None:
+                row = self.transitions.setdefault(previous, {})
+                row[note] = row.get(note, 0) + 1
+            previous = note
+        self._tables = None
+        return True
+
+    @property
+    def polyphonic(self) -> bool:
+        return self.chords > POLYPHONY_THRESHOLD * sum(self.onsets)
+
+    def _compile(self) -> Dict[str, Any]:
+        """Tables de tirage (recalculées après un ajout)."""
+        if self._tables is None:
+            self._tables = {
+                "onset": [self.onsets[p] / self.bars[p] if self.bars[p] else 0.0 for p in range(GRID)],
+                "hits": [[(note, count / self.bars[p]) for note, count in sorted(self.hits[p].items())]
+                         if self.bars[p] else [] for p in range(GRID)],
+                "notes": [_cumulative(self.hits[p]) for p in range(GRID)],
+                "velocities": [_cumulative(v) for v in self.velocities],
+                "noteVelocities": {note: _cumulative(v) for note, v in self.note_velocities.items()},
+                "transitions": {note: _cumulative(row) for note, row in self.transitions.items()},
+                "accent": self.accents / self.attacks if self.attacks else 0.0,
+                "slide": self.slides / self.attacks if self.attacks else 0.0,
+            }
+        return self._tables
+
+    def generate(self, length: int, rng: random.Random) -> List[Dict[str, Any]]:
+        """Pas d'un pattern de `length` pas."""
+        tables = self._compile()
+        polyphonic = self.polyphonic
+        empty = ([], [])
+        steps: List[Dict[str, Any]] = []
+        previous = None
+        for t in range(length):
+            pos = t % GRID
+            if polyphonic:
+                notes = [note for note, p in tables["hits"][pos] if rng.random() < p]
+            elif rng.random() < tables["onset"][pos]:
+                transition = tables["transitions"].get(previous)
+                note = _draw(transition, rng) if transition else None
+                notes = [note if note is not None else _draw(tables["notes"][pos], rng)]
+            else:
+                continue
+            for note in notes:
+                if polyphonic:
+                    vel = _draw(tables["noteVelocities"].get(note, empty), rng)
+                else:
+                    vel = _draw(tables["velocities"][pos], rng)
+                vel = vel or DEFAULT_VELOCITY
+                step = {"t": t, "note": note, "vel": vel}
+                if tables["accent"] and rng.random() < tables["accent"]:
+                    step["accent"] = True
+                if tables["slide"] and rng.random() < tables["slide"]:
+                    step["slide"] = True
+                steps.append(step)
+                previous = note
+        if not steps:
+            # Tirage vide : l'attaque la plus fréquente du modèle
+            pos, note = max(((p, n) for p in range(GRID) for n in self.hits[p]),
+                            key=lambda pn: self.hits[pn[0]][pn[1]])
+            steps.append({"t": pos if pos < length else 0, "note": note,
+                          "vel": _draw(tables["velocities"][pos], rng) or DEFAULT_VELOCITY})
+        return steps
+
+    def to_json(self) -> Dict[str, Any]:
+        def keyed(counts: Dict[int, int]) -> Dict[str, int]:
+            return {str(k): v for k, v in counts.items()}
+        return {
+            "patterns": self.patterns, "bars": self.bars, "onsets": self.onsets,
+            "hits": [keyed(h) for h in self.hits], "velocities": [keyed(v) for v in self.velocities],
+            "noteVelocities": {str(k): keyed(v) for k, v in self.note_velocities.items()},
+            "transitions": {str(k): keyed(row) for k, row in self.transitions.items()},
+            "chords": self.chords, "attacks": self.attacks, "accents": self.accents, "slides": self.slides,
+            "lengths": keyed(self.lengths),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "MachineModel":
+        def counts(keyed: Dict[str, int]) -> Dict[int, int]:
+            return {int(k): v for k, v in keyed.items()}
+        model = cls()
+        model.patterns, model.bars, model.onsets = data["patterns"], data["bars"], data["onsets"]
+        model.hits = [counts(h) for h in data["hits"]]
+        model.velocities = [counts(v) for v in data["velocities"]]
+        model.note_velocities = {int(k): counts(v) for k, v in data["noteVelocities"].items()}
+        model.transitions = {int(k): counts(row) for k, row in data["transitions"].items()}
+        model.chords, model.attacks = data["chords"], data["attacks"]
+        model.accents, model.slides = data["accents"], data["slides"]
+        model.lengths = counts(data["lengths"])
+        return model
+
+
+class PatternModel:
+    """Modèles par machine et position d'entraînement dans la bibliothèque.
+
+    Attributes:
+        machines: Modèle par targetMachine
+        last_id: Dernier id de la bibliothèque pris en compte
+        examples: Nombre d'exemples MACHINES/*/tests.json appris
+    """
+
+    VERSION = 2  # 2 : exemples recopiés d'une machine à l'autre ignorés
+
+    def __init__(self) -> None:
+        self.machines: Dict[str, MachineModel] = {}
+        self.last_id = 0
+        self.examples = 0
+        self.checked = 0.0  # time.monotonic() de la dernière mise à jour depuis la bibliothèque
+
+    def add(self, target_machine: Optional[str], pattern: Dict[str, Any]) -> bool:
+        if not target_machine:
+            return False
+        model = self.machines.get(target_machine) or MachineModel()
+        if not model.add(pattern):
+            return False
+        self.machines[target_machine] = model
+        return True
+
+    def update(self, rows: Iterable[Tuple[int, Optional[str], Dict[str, Any]]]) -> int:
+        """Apprend les patterns de la bibliothèque (id, machine, pattern) ; renvoie le nombre appris."""
+        added = 0
+        for row_id, target_machine, pattern in rows:
+            added += self.add(target_machine, pattern)
+            self.last_id = max(self.last_id, row_id)
+        return added
+
+    def add_examples(self, machines_dir: Path) -> int:
+        """Apprend les patterns d'exemple de MACHINES/<machine>/tests.json.
+
+        La machine est le `targetMachine` de l'exemple, à défaut le nom du
+        dossier (identifiant vendor.model). Des pas identiques chez plusieurs
+        machines (pattern de test recopié) ne disent rien du jeu d'aucune :
+        ces exemples sont ignorés.
+        """
+        examples = []
+        owners: Dict[str, set] = {}
+        for tests_path in sorted(Path(machines_dir).glob("*/tests.json")):
+            try:
+                with open(tests_path, 'r', encoding='utf-8') as f:
+                    tests = json.load(f).get("tests", [])
+            except (OSError, ValueError, AttributeError):
+                continue
+            for test in tests:
+                if not (isinstance(test, dict) and isinstance(test.get("pattern"), dict)):
+                    continue
+                pattern = test["pattern"]
+                machine = pattern.get("targetMachine")
+                if not isinstance(machine, str) or not machine:
+                    machine = tests_path.parent.name
+                steps = json.dumps(pattern.get("steps"), sort_keys=True)
+                owners.setdefault(steps, set()).add(machine)
+                examples.append((machine, steps, pattern))
+
+        added = 0
+        for machine, steps, pattern in examples:
+            if len(owners[steps]) == 1:
+                added += self.add(machine, pattern)
+        self.examples += added
+        return added
+
+    def pick_machine(self, prompt: str = "", project_state: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Machine à générer d'après un prompt libre (fallback de /api/gpt).
+
+        Identifiant cité dans le prompt, sinon famille (batterie / ligne
+        mélodique) d'après ses mots, en préférant les machines du projet
+        (`machines[].id`, mêmes identifiants que `targetMachine`) ; sans
+        indice, la machine du projet la mieux entraînée.
+
+        Returns:
+            None si aucun modèle ne correspond (famille sans modèle, projet
+            sans machine entraînée) : pas de pattern d'une autre machine
+        """
+        if not self.machines:
+            return None
+        lowered = prompt.lower()
+        for machine in self.machines:
+            if machine.lower() in lowered or machine.split(".")[-1].lower() in lowered:
+                return machine
+        machines = project_state.get("machines", []) if isinstance(project_state, dict) else []
+        in_project = {m.get("id") for m in machines if isinstance(m, dict)} if isinstance(machines, list) else set()
+        ranked = sorted(self.machines, key=lambda m: (m not in in_project, -self.machines[m].patterns, m))
+        for words, polyphonic in ((_DRUM_WORDS, True), (_BASS_WORDS, False)):
+            if words.search(prompt):
+                for machine in ranked:
+                    if self.machines[machine].polyphonic == polyphonic:
+                        return machine
+                return None
+        return ranked[0] if ranked[0] in in_project else None
+
+    def generate(self, target_machine: str, length_steps: int = GRID, resolution_ppq: int = 96,
+                 seed: Optional[int] = None, name: Optional[str] = None) -> Dict[str, Any]:
+        """Pattern CreatePattern.v1 tiré du modèle de `target_machine`.
+
+        Raises:
+            ValueError: Machine sans modèle, longueur ou résolution non supportée
+        """
+        model = self.machines.get(target_machine)
+        if model is None:
+            raise ValueError(f"Aucun modèle pour la machine : {target_machine}")
+        if length_steps not in LENGTHS:
+            raise ValueError(f"Longueur non supportée : {length_steps}")
+        if resolution_ppq not in RESOLUTIONS:
+            raise ValueError(f"Résolution non supportée : {resolution_ppq}")
+        rng = random.Random(seed)
+        return {
+            "schema": "CreatePattern.v1",
+            "name": name or f"Local {target_machine.split('.')[-1].upper()}",
+            "targetMachine": target_machine,
+            "lengthSteps": length_steps,
+            "resolutionPPQ": resolution_ppq,
+            "steps": model.generate(length_steps, rng),
+            "explain": f"Généré localement (modèle appris sur {model.patterns} pattern{'s' if model.patterns > 1 else ''})",
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lastId": self.last_id,
+            "examples": self.examples,
+            "machines": {m: {"patterns": model.patterns, "polyphonic": model.polyphonic}
+                         for m, model in sorted(self.machines.items())},
+        }
+
+    def save(self, path: Path) -> None:
+        """Écriture atomique du modèle (JSON compact)."""
+        data = {"version": self.VERSION, "lastId": self.last_id, "examples": self.examples,
+                "machines": {m: model.to_json() for m, model in self.machines.items()}}
+        tmp_path = Path(path).with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PatternModel"]:
+        """Modèle sauvegardé ; None si absent, illisible ou d'une autre version."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != cls.VERSION:
+                return None
+            model = cls()
+            model.last_id, model.examples = data["lastId"], data["examples"]
+            model.machines = {m: MachineModel.from_json(d) for m, d in data["machines"].items()}
+            return model
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def extract_length(prompt: str) -> Optional[int]:
+    """Longueur demandée dans un prompt (« 32 pas », « 64 steps »)."""
+    for match in _LENGTH_WORDS.finditer(prompt):
+        if int(match.group(1)) in LENGTHS:
+            return int(match.group(1))
+    return None
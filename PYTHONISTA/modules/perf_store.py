@@ -0,0 +1,417 @@
+"""
+perf_store.py — Télémétrie de performance client (performance_test.html)
+
+Les mesures de la page de test (CPU, latence audio, mémoire, FPS) sont
+conservées par appareil et par build, sous forme de série temporelle
+sous-échantillonnée :
+
+- chaque série (appareil, build, métrique) est un entier de `perf_series` :
+  les chaînes ne sont pas répétées dans les points ;
+- les échantillons ne sont pas stockés un à un mais agrégés à l'ingestion
+  par cases de FINE_RESOLUTION secondes (nombre, somme, somme des carrés,
+  min, max ; table WITHOUT ROWID à clé entière) ;
+- au-delà de la rétention, les cases fines sont fusionnées en cases
+  horaires (mêmes agrégats), par lots, comme les logs (log_store).
+
+Somme et somme des carrés suffisent à la moyenne et à l'écart type de
+n'importe quel regroupement de cases : la comparaison de deux builds
+(écart relatif, test de Welch) se fait sur les agrégats, sans les
+échantillons d'origine.
+
+Le build est l'empreinte des fichiers servis au client (projet/ : UI et
+worklet DSP), calculée par le serveur.
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Métriques : unité, sens (+1 : plus haut = pire), écart minimal significatif, bornes acceptées
+METRICS = {
+    "cpu": {"unit": "%", "worse": 1, "min_delta": 1.0, "range": (0.0, 100.0)},
+    "latency": {"unit": "ms", "worse": 1, "min_delta": 1.0, "range": (0.0, 10000.0)},
+    "memory": {"unit": "MB", "worse": 1, "min_delta": 5.0, "range": (0.0, 100000.0)},
+    "fps": {"unit": "fps", "worse": -1, "min_delta": 1.0, "range": (0.0, 1000.0)},
+}
+
+# Sous-échantillonnage (secondes par case)
+FINE_RESOLUTION = 10
+COARSE_RESOLUTION = 3600
+
+# Comparaison de builds : écart relatif minimal et score de Welch minimal
+REGRESSION_THRESHOLD = 0.05
+REGRESSION_Z = 2.0
+
+# Ingestion
+MAX_SAMPLES = 1000  # par requête
+MAX_LABEL_CHARS = 120  # appareil, build
+MAX_AGE = 30 * 86400  # secondes ; échantillons plus anciens refusés
+MAX_SKEW = 3600  # secondes d'avance tolérées sur l'horloge du serveur
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS perf_series (
+        id INTEGER PRIMARY KEY,
+        device TEXT NOT NULL,
+        build TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        first_seen INTEGER NOT NULL,
+        last_seen INTEGER NOT NULL,
+        UNIQUE (device, build, metric)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS perf_points (
+        series_id INTEGER NOT NULL,
+        resolution INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        total REAL NOT NULL,
+        squares REAL NOT NULL,
+        low REAL NOT NULL,
+        high REAL NOT NULL,
+        PRIMARY KEY (series_id, resolution, bucket)
+    ) WITHOUT ROWID
+    """,
+]
+
+_UPSERT = """
+    INSERT INTO perf_points (series_id, resolution, bucket, n, total, squares, low, high)
+    {source}
+    ON CONFLICT(series_id, resolution, bucket) DO UPDATE SET
+        n = n + excluded.n,
+        total = total + excluded.total,
+        squares = squares + excluded.squares,
+        low = min(low, excluded.low),
+        high = max(high, excluded.high)
+"""
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+_build_cache: Dict[Path, Tuple[Tuple, str]] = {}
+_build_lock = threading.Lock()
+
+
+def build_hash(directory: Path) -> str:
+    """Empreinte (12 caractères) des fichiers servis au client, recalculée si l'un d'eux change."""
+    directory = Path(directory)
+    files = sorted(p for p in directory.rglob("*") if p.is_file())
+    signature = tuple((p.relative_to(directory).as_posix(), p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+    with _build_lock:
+        cached = _build_cache.get(directory)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    digest = hashlib.sha1()
+    for path in files:
+        digest.update(path.relative_to(directory).as_posix().encode("utf-8") + b"\x00")
+        digest.update(path.read_bytes())
+    value = digest.hexdigest()[:12]
+    with _build_lock:
+        _build_cache[directory] = (signature, value)
+    return value
+
+# ============================================================================
+# STATISTIQUES
+# ============================================================================
+
+def summarize(n: int, total: float, squares: float, low: float, high: float) -> Dict[str, Any]:
+    """Moyenne, écart type (échantillon), min et max depuis les agrégats."""
+    mean = total / n
+    variance = max(0.0, (squares - total * total / n) / (n - 1)) if n > 1 else 0.0
+    return {"n": n, "mean": round(mean, 3), "std": round(math.sqrt(variance), 3),
+            "min": round(low, 3), "max": round(high, 3), "_variance": variance}
+
+
+def verdict(metric: str, base: Dict[str, Any], head: Dict[str, Any],
+            threshold: float = REGRESSION_THRESHOLD) -> Dict[str, Any]:
+    """Écart du build `head` au build `base` sur une métrique.
+
+    Régression (ou amélioration) si l'écart dépasse à la fois `threshold`
+    (relatif), l'écart minimal de la métrique et REGRESSION_Z écarts types
+    de la différence des moyennes (Welch).
+    """
+    spec = METRICS[metric]
+    delta = head["mean"] - base["mean"]
+    stderr = math.sqrt(base["_variance"] / base["n"] + head["_variance"] / head["n"])
+    z = abs(delta) / stderr if stderr > 0 else (math.inf if delta else 0.0)
+    relative = delta / abs(base["mean"]) if base["mean"] else (math.inf if delta else 0.0)
+    significant = (abs(delta) >= max(spec["min_delta"], threshold * abs(base["mean"]))
+                   and z >= REGRESSION_Z)
+    if not significant:
+        outcome = "unchanged"
+    elif delta * spec["worse"] > 0:
+        outcome = "regression"
+    else:
+        outcome = "improvement"
+    return {
+        "delta": round(delta, 3),
+        "relative": round(relative, 4) if math.isfinite(relative) else None,
+        "z": round(z, 2) if math.isfinite(z) else None,
+        "verdict": outcome,
+    }
+
+# ============================================================================
+# STOCKAGE
+# ============================================================================
+
+def _label(value: Any, name: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{name} manquant")
+    return value.strip()[:MAX_LABEL_CHARS]
+
+
+class PerfStore:
+    """Séries temporelles de performance (SQLite, une connexion par opération).
+
+    Args:
+        db_path: Fichier SQLite
+    """
+
+    _ready: Set[Path] = set()
+    _ready_lock = threading.Lock()
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._ready_lock:
+            if self.db_path not in self._ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path)
+                with conn:
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                conn.close()
+                self._ready.add(self.db_path)
+        return sqlite3.connect(self.db_path)
+
+    def ingest(self, device: str, build: str, samples: List[Dict[str, Any]],
+               now: Optional[float] = None) -> Dict[str, int]:
+        """Agrège des échantillons par case de FINE_RESOLUTION secondes.
+
+        Args:
+            device: Appareil (ex. "iPhone 14 Pro Max")
+            build: Empreinte du build mesuré
+            samples: {"t": horodatage en ms (défaut : maintenant), "cpu", "latency", "memory", "fps"} ;
+                une métrique absente ou null est ignorée
+            now: Instant de référence (tests)
+
+        Returns:
+            {"accepted": valeurs agrégées, "rejected": valeurs hors bornes ou horodatages invalides}
+
+        Raises:
+            ValueError: Appareil, build ou liste d'échantillons invalides
+        """
+        device, build = _label(device, "device"), _label(build, "build")
+        if not isinstance(samples, list) or len(samples) > MAX_SAMPLES:
+            raise ValueError(f"samples invalide (liste de {MAX_SAMPLES} échantillons au plus)")
+
+        now = time.time() if now is None else now
+        buckets: Dict[Tuple[str, int], List[float]] = {}
+        accepted = rejected = 0
+        for sample in samples:
+            if not isinstance(sample, dict):
+                rejected += 1
+                continue
+            t = sample.get("t")
+            seconds = t / 1000.0 if isinstance(t, (int, float)) and not isinstance(t, bool) else now
+            if not now - MAX_AGE <= seconds <= now + MAX_SKEW:
+                rejected += 1
+                continue
+            bucket = int(seconds // FINE_RESOLUTION)
+            for metric, spec in METRICS.items():
+                value = sample.get(metric)
+                if value is None:
+                    continue
+                low, high = spec["range"]
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+                    rejected += 1
+                    continue
+                agg = buckets.get((metric, bucket))
+                if agg is None:
+                    buckets[(metric, bucket)] = [1, value, value * value, value, value]
+                else:
+                    agg[0] += 1
+                    agg[1] += value
+                    agg[2] += value * value
+                    agg[3] = min(agg[3], value)
+                    agg[4] = max(agg[4], value)
+                accepted += 1
+
+        if buckets:
+            conn = self._connect()
+            try:
+                with conn:
+                    series = self._series_ids(conn, device, build, {metric for metric, _ in buckets}, int(now))
+                    conn.executemany(_UPSERT.format(source="VALUES (?, ?, ?, ?, ?, ?, ?, ?)"), [
+                        (series[metric], FINE_RESOLUTION, bucket, *agg)
+                        for (metric, bucket), agg in buckets.items()
+                    ])
+            finally:
+                conn.close()
+        return {"accepted": accepted, "rejected": rejected}
+
+    @staticmethod
+    def _series_ids(conn: sqlite3.Connection, device: str, build: str, metrics: Set[str],
+                    now: int) -> Dict[str, int]:
+        ids = {}
+        for metric in sorted(metrics):
+            conn.execute("""
+                INSERT INTO perf_series (device, build, metric, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(device, build, metric) DO UPDATE SET last_seen = excluded.last_seen
+            """, (device, build, metric, now, now))
+            ids[metric] = conn.execute("SELECT id FROM perf_series WHERE device = ? AND build = ? AND metric = ?",
+                                       (device, build, metric)).fetchone()[0]
+        return ids
+
+    def compact(self, retention_days: float, batch_size: int = 1000,
+                now: Optional[float] = None) -> int:
+        """Fusionne en cases horaires les cases fines plus anciennes que la rétention.
+
+        Série par série, au plus `batch_size` cases fines par transaction.
+
+        Returns:
+            Cases fines fusionnées
+        """
+        cutoff = int(((time.time() if now is None else now) - retention_days * 86400) // FINE_RESOLUTION)
+        ratio = COARSE_RESOLUTION // FINE_RESOLUTION
+        merge = _UPSERT.format(source=f"""
+            SELECT series_id, {COARSE_RESOLUTION}, bucket / {ratio}, SUM(n), SUM(total), SUM(squares),
+                   MIN(low), MAX(high)
+            FROM perf_points WHERE series_id = ? AND resolution = {FINE_RESOLUTION} AND bucket < ?
+            GROUP BY bucket / {ratio}
+        """)
+        merged = 0
+        conn = self._connect()
+        try:
+            series_ids = [row[0] for row in conn.execute(
+                "SELECT DISTINCT series_id FROM perf_points WHERE resolution = ? AND bucket < ?",
+                (FINE_RESOLUTION, cutoff))]
+            for series_id in series_ids:
+                while True:
+                    with conn:
+                        # Borne du lot : la batch_size-ième case fine ancienne (ou la rétention)
+                        row = conn.execute(
+                            "SELECT bucket FROM perf_points WHERE series_id = ? AND resolution = ? AND bucket < ? "
+                            "ORDER BY bucket LIMIT 1 OFFSET ?", (series_id, FINE_RESOLUTION, cutoff, batch_size)
+                        ).fetchone()
+                        bound = row[0] if row else cutoff
+                        conn.execute(merge, (series_id, bound))
+                        deleted = conn.execute(
+                            "DELETE FROM perf_points WHERE series_id = ? AND resolution = ? AND bucket < ?",
+                            (series_id, FINE_RESOLUTION, bound)).rowcount
+                    merged += deleted
+                    if row is None:
+                        break
+        finally:
+            conn.close()
+        return merged
+
+    # ------------------------------------------------------------------
+    # Lectures
+    # ------------------------------------------------------------------
+
+    def builds(self, device: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Builds mesurés (du plus récent au plus ancien), par appareil."""
+        where, args = ("WHERE s.device = ?", [device]) if device else ("", [])
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"""
+                SELECT s.device, s.build, MIN(s.first_seen), MAX(s.last_seen), SUM(p.n)
+                FROM perf_series s JOIN perf_points p ON p.series_id = s.id
+                {where}
+                GROUP BY s.device, s.build
+                ORDER BY MAX(s.last_seen) DESC
+            """, args).fetchall()
+        finally:
+            conn.close()
+        return [{"device": d, "build": b, "firstSeen": first, "lastSeen": last, "values": n}
+                for d, b, first, last, n in rows]
+
+    def series(self, device: str, build: str, metric: str, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Points d'une série (cases horaires puis fines), par début de case croissant."""
+        if metric not in METRICS:
+            raise ValueError(f"Métrique inconnue: {metric} ({', '.join(METRICS)})")
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT p.resolution, p.bucket, p.n, p.total, p.squares, p.low, p.high
+                FROM perf_points p JOIN perf_series s ON s.id = p.series_id
+                WHERE s.device = ? AND s.build = ? AND s.metric = ? AND p.bucket * p.resolution >= ?
+            """, (device, build, metric, int(since or 0))).fetchall()
+        finally:
+            conn.close()
+        points = []
+        for resolution, bucket, n, total, squares, low, high in rows:
+            point = summarize(n, total, squares, low, high)
+            del point["_variance"]
+            points.append(dict(point, t=bucket * resolution, resolution=resolution))
+        points.sort(key=lambda p: p["t"])
+        return points
+
+    def _totals(self, conn: sqlite3.Connection, build: str, device: Optional[str]) -> Dict[Tuple[str, str], Dict]:
+        where, args = ("AND s.device = ?", [build, device]) if device else ("", [build])
+        rows = conn.execute(f"""
+            SELECT s.device, s.metric, SUM(p.n), SUM(p.total), SUM(p.squares), MIN(p.low), MAX(p.high)
+            FROM perf_series s JOIN perf_points p ON p.series_id = s.id
+            WHERE s.build = ? {where}
+            GROUP BY s.device, s.metric
+        """, args).fetchall()
+        return {(d, metric): summarize(*aggregates) for d, metric, *aggregates in rows}
+
+    def compare(self, base: str, head: str, device: Optional[str] = None,
+                threshold: float = REGRESSION_THRESHOLD) -> Dict[str, Any]:
+        """Rapport de comparaison de deux builds, par appareil et par métrique.
+
+        Seuls les couples (appareil, métrique) mesurés sur les deux builds
+        sont comparés.
+
+        Returns:
+            {"base", "head", "threshold", "devices": [{"device", "metrics": [...]}], "regressions"}
+        """
+        conn = self._connect()
+        try:
+            before, after = self._totals(conn, base, device), self._totals(conn, head, device)
+        finally:
+            conn.close()
+
+        devices: Dict[str, List[Dict[str, Any]]] = {}
+        regressions = 0
+        for key in sorted(before.keys() & after.keys(), key=lambda k: (k[0], list(METRICS).index(k[1]))):
+            name, metric = key
+            result = verdict(metric, before[key], after[key], threshold)
+            regressions += result["verdict"] == "regression"
+            public = [{k: v for k, v in stats.items() if k != "_variance"} for stats in (before[key], after[key])]
+            devices.setdefault(name, []).append(dict(metric=metric, unit=METRICS[metric]["unit"], **result,
+                                                     base=public[0], head=public[1]))
+        return {
+            "base": base,
+            "head": head,
+            "threshold": threshold,
+            "devices": [{"device": name, "metrics": metrics} for name, metrics in devices.items()],
+            "regressions": regressions,
+        }
+
+    def previous_build(self, build: str, device: Optional[str] = None) -> Optional[str]:
+        """Dernier build mesuré avant `build` (sur le même appareil si précisé)."""
+        for entry in self.builds(device):
+            if entry["build"] != build:
+                return entry["build"]
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            series = conn.execute("SELECT COUNT(*) FROM perf_series").fetchone()[0]
+            points = dict(conn.execute("SELECT resolution, COUNT(*) FROM perf_points GROUP BY resolution"))
+        finally:
+            conn.close()
+        return {"series": series, "finePoints": points.get(FINE_RESOLUTION, 0),
+                "hourlyPoints": points.get(COARSE_RESOLUTION, 0),
+                "bytes": self.db_path.stat().st_size if self.db_path.exists() else 0}
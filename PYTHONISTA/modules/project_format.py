@@ -0,0 +1,375 @@
+"""
+project_format.py — Format binaire compact (LTPB) pour ProjectState.v1
+
+Le JSON indenté de `project.json` est lent à parser et volumineux dès que
+les projets contiennent beaucoup de pas. Le conteneur LTPB stocke :
+
+    En-tête (16 octets, little-endian)
+        magic "LTPB" | version u16 | réservé u16 | taille méta u32 | offset données u32
+    Bloc méta (JSON UTF-8)
+        {"project": ProjectState sans pas ni automation,
+         "patterns": [{"offset", "steps", "automation", "extras"?, "automationExtras"?}],
+         "targets": [noms de paramètres d'automation]}
+    Bloc données
+        par pattern : colonnes PatternBuffer puis colonnes d'automation,
+        chaque colonne alignée sur 8 octets
+
+Le fichier peut être ouvert en mmap (`BinaryProject`) : seules l'en-tête et
+la méta sont lues, chaque pattern est décodé à la demande.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.pattern_buffer import COLUMNS, PatternBuffer, as_buffer
+
+MAGIC = b"LTPB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+ALIGN = 8
+
+# Type MIME utilisé pour la négociation Accept/Content-Type
+MEDIA_TYPE = "application/vnd.livetechno.project+binary"
+FILE_SUFFIX = ".ltpb"
+
+# Automation : colonnes et codes d'easing
+EASINGS = ("lin", "log", "exp", "smooth")
+AUTOMATION_COLUMNS = (
+    ("at", "d"),
+    ("val", "d"),
+    ("duration", "d"),
+    ("target", "H"),
+    ("flags", "B"),
+)
+AUTO_HAS_DURATION = 1 << 0
+AUTO_AT_IS_INT = 1 << 1
+AUTO_VAL_IS_INT = 1 << 2
+AUTO_DURATION_IS_INT = 1 << 3
+AUTO_HAS_EASING = 1 << 4
+AUTO_EASING_SHIFT = 5  # 2 bits : index dans EASINGS
+AUTOMATION_FIELDS = ("target", "at", "val", "easing", "duration")
+
+
+class ProjectFormatError(ValueError):
+    """Conteneur LTPB invalide ou version non supportée."""
+
+
+def _to_le(column: array) -> bytes:
+    """Octets little-endian d'une colonne."""
+    if sys.byteorder == "big" and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_le(typecode: str, data) -> array:
+    """Colonne depuis des octets little-endian."""
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big" and column.itemsize > 1:
+        column.byteswap()
+    return column
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % ALIGN)
+
+# ============================================================================
+# ÉCRITURE
+# ============================================================================
+
+def _pack_automation(points: List[Dict[str, Any]], targets: Dict[str, int]) -> Tuple[Dict[str, array], Dict[str, Dict]]:
+    """Automation → colonnes (+ champs non standard par index)."""
+    columns = {name: array(code) for name, code in AUTOMATION_COLUMNS}
+    extras: Dict[str, Dict] = {}
+
+    for index, point in enumerate(points):
+        flags = 0
+        at, val = point["at"], point["val"]
+        duration = point.get("duration")
+        easing = point.get("easing")
+        if isinstance(at, int):
+            flags |= AUTO_AT_IS_INT
+        if isinstance(val, int):
+            flags |= AUTO_VAL_IS_INT
+        if duration is not None:
+            flags |= AUTO_HAS_DURATION | (AUTO_DURATION_IS_INT if isinstance(duration, int) else 0)
+        unknown = {k: v for k, v in point.items() if k not in AUTOMATION_FIELDS}
+        if easing is not None:
+            if easing in EASINGS:
+                flags |= AUTO_HAS_EASING | (EASINGS.index(easing) << AUTO_EASING_SHIFT)
+            else:
+                unknown["easing"] = easing
+        if unknown:
+            extras[str(index)] = unknown
+
+        target = point["target"]
+        if target not in targets:
+            targets[target] = len(targets)
+
+        columns["at"].append(at)
+        columns["val"].append(val)
+        columns["duration"].append(duration if duration is not None else 0.0)
+        columns["target"].append(targets[target])
+        columns["flags"].append(flags)
+
+    return columns, extras
+
+
+def dumps(project_state: Dict[str, Any]) -> bytes:
+    """Sérialise un ProjectState (patterns en dicts ou PatternBuffer) en LTPB.
+
+    Raises:
+        ValueError: Si un pattern contient des valeurs hors plage
+    """
+    targets: Dict[str, int] = {}
+    index = []
+    chunks: List[bytes] = []
+    offset = 0
+    headers = []
+
+    for pattern in project_state.get("patterns", []):
+        buffer = as_buffer(pattern)
+        header = dict(buffer.meta)
+        automation = header.pop("automation", None)
+        headers.append(header)
+
+        entry: Dict[str, Any] = {"offset": offset, "steps": len(buffer)}
+        if buffer.extras:
+            entry["extras"] = {str(k): v for k, v in buffer.extras.items()}
+
+        blobs = [_to_le(getattr(buffer, name)) for name, _ in COLUMNS]
+        if automation is not None:
+            auto_columns, auto_extras = _pack_automation(automation, targets)
+            entry["automation"] = len(automation)
+            if auto_extras:
+                entry["automationExtras"] = auto_extras
+            blobs += [_to_le(auto_columns[name]) for name, _ in AUTOMATION_COLUMNS]
+
+        for blob in blobs:
+            chunks.append(blob)
+            chunks.append(_padding(len(blob)))
+            offset += len(blob) + len(chunks[-1])
+        index.append(entry)
+
+    project = dict(project_state)
+    project["patterns"] = headers
+    meta = json.dumps({
+        "project": project,
+        "patterns": index,
+        "targets": sorted(targets, key=targets.get),
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    meta_end = HEADER.size + len(meta)
+    data_offset = meta_end + (-meta_end % ALIGN)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(meta), data_offset)
+    return b"".join([header, meta, b"\0" * (data_offset - meta_end)] + chunks)
+
+
+def save(project_state: Dict[str, Any], path: Path) -> int:
+    """Écrit un fichier LTPB de façon atomique. Retourne la taille écrite."""
+    data = dumps(project_state)
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+# ============================================================================
+# LECTURE
+# ============================================================================
+
+def _check_extras(extras: Any, count: int, what: str) -> None:
+    """Vérifie des champs non standard indexés ({"<index>": {...}}, index < count).
+
+    Raises:
+        ProjectFormatError: Si la table est mal formée
+    """
+    if not isinstance(extras, dict):
+        raise ProjectFormatError(f"LTPB : {what} invalides")
+    for key, value in extras.items():
+        if not (key.isdigit() and int(key) < count and isinstance(value, dict)):
+            raise ProjectFormatError(f"LTPB : {what} invalides (entrée {key!r})")
+
+
+class BinaryProject:
+    """Vue paresseuse sur un conteneur LTPB (bytes ou fichier mmappé).
+
+    Attributes:
+        version: Version du conteneur
+        project: ProjectState sans les pas ni l'automation des patterns
+        index: Entrées d'index des patterns
+        targets: Table des noms de paramètres d'automation
+    """
+
+    def __init__(self, data) -> None:
+        """Analyse l'en-tête et la méta (les colonnes ne sont pas lues).
+
+        Args:
+            data: bytes, bytearray, memoryview ou mmap
+
+        Raises:
+            ProjectFormatError: Si le conteneur est invalide
+        """
+        self._data = data
+        self._mmap: Optional[mmap.mmap] = data if isinstance(data, mmap.mmap) else None
+
+        if len(data) < HEADER.size:
+            raise ProjectFormatError("Conteneur LTPB tronqué")
+        magic, version, _, meta_length, data_offset = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ProjectFormatError("Signature LTPB absente")
+        if version > VERSION:
+            raise ProjectFormatError(f"Version LTPB non supportée : {version}")
+        if HEADER.size + meta_length > data_offset or data_offset > len(data):
+            raise ProjectFormatError("En-tête LTPB incohérent")
+
+        try:
+            meta = json.loads(bytes(data[HEADER.size:HEADER.size + meta_length]).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ProjectFormatError(f"Méta LTPB illisible : {e}") from e
+
+        try:
+            self.project: Dict[str, Any] = meta["project"]
+            self.index: List[Dict[str, Any]] = meta["patterns"]
+            self.targets: List[str] = meta["targets"]
+            headers = self.project["patterns"]
+        except (KeyError, TypeError) as e:
+            raise ProjectFormatError(f"Méta LTPB incomplète : {e}") from e
+        if not (isinstance(self.index, list) and isinstance(self.targets, list)
+                and isinstance(headers, list) and len(headers) == len(self.index)):
+            raise ProjectFormatError("Index LTPB incohérent")
+        self.version = version
+        self._data_offset = data_offset
+
+        # Étendue des colonnes de chaque pattern vérifiée dès l'ouverture (sans
+        # les lire) : un fichier tronqué est refusé avant tout décodage
+        for i, entry in enumerate(self.index):
+            try:
+                layouts = [(entry["steps"], COLUMNS)]
+                if "automation" in entry:
+                    layouts.append((entry["automation"], AUTOMATION_COLUMNS))
+                position = entry["offset"]
+            except (KeyError, TypeError) as e:
+                raise ProjectFormatError(f"Index LTPB du pattern {i} invalide : {e}") from e
+            if not all(isinstance(v, int) and v >= 0 for v in [position] + [c for c, _ in layouts]):
+                raise ProjectFormatError(f"Index LTPB du pattern {i} invalide")
+            if not isinstance(headers[i], dict):
+                raise ProjectFormatError(f"En-tête LTPB du pattern {i} invalide")
+            _check_extras(entry.get("extras", {}), entry["steps"], f"extras du pattern {i}")
+            if "automation" in entry:
+                _check_extras(entry.get("automationExtras", {}), entry["automation"],
+                              f"automationExtras du pattern {i}")
+            position += data_offset
+            for count, layout in layouts:
+                position = self._column_end(position, count, layout)
+
+    @classmethod
+    def open(cls, path: Path) -> "BinaryProject":
+        """Ouvre un fichier LTPB en mmap (lecture seule)."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ProjectFormatError("Fichier LTPB vide")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "BinaryProject":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _column_end(self, position: int, count: int, layout) -> int:
+        """Position qui suit les colonnes `layout` (alignée).
+
+        Raises:
+            ProjectFormatError: Si une colonne dépasse la fin du conteneur
+        """
+        for name, typecode in layout:
+            size = count * array(typecode).itemsize
+            if position + size > len(self._data):
+                raise ProjectFormatError(f"Conteneur LTPB tronqué (colonne {name!r})")
+            position += size + (-size % ALIGN)
+        return position
+
+    def _read_columns(self, position: int, count: int, layout) -> Tuple[Dict[str, array], int]:
+        columns = {}
+        for name, typecode in layout:
+            size = count * array(typecode).itemsize
+            if position + size > len(self._data):
+                raise ProjectFormatError(f"Conteneur LTPB tronqué (colonne {name!r})")
+            columns[name] = _from_le(typecode, self._data[position:position + size])
+            position += size + (-size % ALIGN)
+        return columns, position
+
+    def pattern(self, i: int) -> PatternBuffer:
+        """Décode le pattern i (et lui seul) en PatternBuffer."""
+        entry = self.index[i]
+        position = self._data_offset + entry["offset"]
+
+        buffer = PatternBuffer(self.project["patterns"][i])
+        columns, position = self._read_columns(position, entry["steps"], COLUMNS)
+        for name, column in columns.items():
+            setattr(buffer, name, column)
+        buffer.extras = {int(k): v for k, v in entry.get("extras", {}).items()}
+
+        if "automation" in entry:
+            auto, _ = self._read_columns(position, entry["automation"], AUTOMATION_COLUMNS)
+            if entry["automation"] and max(auto["target"]) >= len(self.targets):
+                raise ProjectFormatError(f"Cible d'automation inconnue (pattern {i})")
+            extras = entry.get("automationExtras", {})
+            points = []
+            for k in range(entry["automation"]):
+                flags = auto["flags"][k]
+                at, val = auto["at"][k], auto["val"][k]
+                point: Dict[str, Any] = {
+                    "target": self.targets[auto["target"][k]],
+                    "at": int(at) if flags & AUTO_AT_IS_INT else at,
+                    "val": int(val) if flags & AUTO_VAL_IS_INT else val,
+                }
+                if flags & AUTO_HAS_EASING:
+                    point["easing"] = EASINGS[(flags >> AUTO_EASING_SHIFT) & 0b11]
+                if flags & AUTO_HAS_DURATION:
+                    duration = auto["duration"][k]
+                    point["duration"] = int(duration) if flags & AUTO_DURATION_IS_INT else duration
+                point.update(extras.get(str(k), {}))
+                points.append(point)
+            buffer.meta["automation"] = points
+
+        return buffer
+
+    def to_project(self, packed: bool = False) -> Dict[str, Any]:
+        """Reconstruit le ProjectState complet.
+
+        Args:
+            packed: Patterns en PatternBuffer plutôt qu'en dicts JSON
+        """
+        project = dict(self.project)
+        buffers = [self.pattern(i) for i in range(len(self))]
+        project["patterns"] = buffers if packed else [b.to_pattern() for b in buffers]
+        return project
+
+
+def loads(data: bytes, packed: bool = False) -> Dict[str, Any]:
+    """Désérialise un conteneur LTPB en ProjectState."""
+    return BinaryProject(data).to_project(packed)
+
+
+def load(path: Path, packed: bool = False) -> Dict[str, Any]:
+    """Charge un fichier LTPB complet."""
+    with BinaryProject.open(path) as project:
+        return project.to_project(packed)
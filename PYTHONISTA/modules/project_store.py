@@ -0,0 +1,275 @@
+"""
+project_store.py — Projet courant en mémoire et réponses de chargement précalculées
+
+Le projet ne change qu'à la sauvegarde : il est gardé en mémoire avec ses
+réponses sérialisées (JSON, JSON gzip, conteneur LTPB), calculées au premier
+chargement puis resservies telles quelles. Un chargement ne coûte plus qu'un
+`stat` des fichiers de projet : si le dernier fichier a changé sur disque
+(mtime, taille — modification hors du serveur), il est relu.
+
+Les sauvegardes JSON sont écrites en différé (write-behind) : la version en
+mémoire est servie immédiatement, le fichier n'est écrit qu'après `debounce`
+secondes sans nouvelle sauvegarde (au plus `max_delay` après la première
+sauvegarde en attente), si bien qu'une rafale d'autosauvegardes ne produit
+qu'une écriture. Les sauvegardes binaires (LTPB) sont écrites immédiatement
+et annulent une écriture JSON en attente. flush() écrit la sauvegarde en
+attente (appelé à l'arrêt du processus).
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
+
+from modules import project_format
+
+# Représentations servies par /api/project/load
+JSON = "json"
+JSON_GZIP = "json.gz"
+BINARY = "binary"
+
+GZIP_LEVEL = 6
+
+Serializer = Callable[[Dict[str, Any]], bytes]
+
+
+def _default_dumps(project_state: Dict[str, Any]) -> bytes:
+    return (json.dumps({"projectState": project_state}, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class ProjectSnapshot:
+    """Une version du projet et ses réponses sérialisées (calculées au premier usage).
+
+    Args:
+        state: ProjectState (patterns en dicts)
+        dumps: Sérialisation de la réponse JSON
+        binary: Conteneur LTPB déjà disponible (fichier sauvegardé)
+    """
+
+    def __init__(self, state: Dict[str, Any], dumps: Serializer,
+                 binary: Optional[bytes] = None) -> None:
+        self.state = state
+        self._dumps = dumps
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, bytes] = {}
+        self._etags: Dict[str, str] = {}
+        if binary is not None:
+            self._bodies[BINARY] = binary
+
+    def body(self, kind: str) -> bytes:
+        """Corps de réponse de la représentation `kind` (JSON, JSON_GZIP, BINARY)."""
+        with self._lock:
+            return self._body(kind)
+
+    def _body(self, kind: str) -> bytes:
+        body = self._bodies.get(kind)
+        if body is None:
+            if kind == JSON:
+                body = self._dumps(self.state)
+            elif kind == JSON_GZIP:
+                body = gzip.compress(self._body(JSON), GZIP_LEVEL, mtime=0)
+            elif kind == BINARY:
+                body = project_format.dumps(self.state)
+            else:
+                raise ValueError(f"Représentation inconnue: {kind}")
+            self._bodies[kind] = body
+        return body
+
+    def etag(self, kind: str) -> str:
+        """ETag fort de la représentation (SHA-1 du contenu JSON ou LTPB)."""
+        etag = self._etags.get(kind)
+        if etag is None:
+            if kind == JSON_GZIP:
+                etag = self.etag(JSON) + "-gz"
+            else:
+                etag = hashlib.sha1(self.body(kind)).hexdigest()[:20]
+            self._etags[kind] = etag
+        return etag
+
+
+class ProjectStore:
+    """Projet courant : cache mémoire, invalidation par mtime, écriture différée.
+
+    Args:
+        json_path: Fichier project.json
+        binary_path: Fichier LTPB
+        debounce: Délai d'écriture des sauvegardes JSON (0 = écriture immédiate)
+        max_delay: Délai maximal d'une écriture en attente (défaut 10 × debounce)
+        dumps: Sérialisation de la réponse JSON de chargement
+    """
+
+    def __init__(self, json_path: Path, binary_path: Path, debounce: float = 0.0,
+                 max_delay: Optional[float] = None, dumps: Optional[Serializer] = None) -> None:
+        self.json_path = Path(json_path)
+        self.binary_path = Path(binary_path)
+        self.debounce = debounce
+        self.max_delay = debounce * 10 if max_delay is None else max_delay
+        self.dumps = dumps or _default_dumps
+
+        self._lock = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._snapshot: Optional[ProjectSnapshot] = None
+        # (chemin, mtime_ns, taille) du fichier d'où vient le snapshot ; None = mémoire plus récente
+        self._key: Optional[Tuple[str, int, int]] = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._first_put = self._last_put = 0.0
+        self._worker: Optional[threading.Thread] = None
+        self.counters = {"saves": 0, "writes": 0, "reloads": 0}
+
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[Tuple[str, int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return str(path), st.st_mtime_ns, st.st_size
+
+    def _latest_key(self) -> Optional[Tuple[str, int, int]]:
+        """Dernier fichier de projet sauvegardé, quel que soit son format."""
+        keys = [k for k in (self._stat_key(self.json_path), self._stat_key(self.binary_path)) if k]
+        return max(keys, key=lambda k: k[1]) if keys else None
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Fichier correspondant à la version courante (None : pas encore écrite)."""
+        with self._lock:
+            if self._pending is not None:
+                return self.json_path
+            return Path(self._key[0]) if self._key else None
+
+    # ------------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------------
+
+    def get(self) -> Optional[ProjectSnapshot]:
+        """Version courante du projet (None si aucun projet sauvegardé)."""
+        with self._lock:
+            if self._snapshot is not None and self._key is None:
+                return self._snapshot
+            key = self._latest_key()
+            if key != self._key:
+                self._snapshot = self._read(key) if key else None
+                self._key = key
+                self.counters["reloads"] += 1
+            return self._snapshot
+
+    def _read(self, key: Tuple[str, int, int]) -> ProjectSnapshot:
+        path = Path(key[0])
+        if path.suffix == project_format.FILE_SUFFIX:
+            binary = path.read_bytes()
+            return ProjectSnapshot(project_format.loads(binary), self.dumps, binary)
+        with open(path, 'r', encoding='utf-8') as f:
+            return ProjectSnapshot(json.load(f), self.dumps)
+
+    # ------------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------------
+
+    def put(self, project_state: Dict[str, Any], binary: Optional[bytes] = None) -> Path:
+        """Remplace le projet courant.
+
+        Args:
+            project_state: ProjectState (patterns en dicts)
+            binary: Conteneur LTPB à écrire tel quel (sauvegarde binaire,
+                immédiate) ; sinon project.json, écrit après `debounce`
+
+        Returns:
+            Fichier de destination
+        """
+        if binary is not None:
+            with self._io_lock:
+                with self._lock:
+                    self._pending = None
+                    self.counters["saves"] += 1
+                _atomic_write(self.binary_path, binary)
+                with self._lock:
+                    self._snapshot = ProjectSnapshot(project_state, self.dumps, binary)
+                    self._key = self._stat_key(self.binary_path)
+                    self.counters["writes"] += 1
+            return self.binary_path
+
+        with self._lock:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_put = now
+            self._last_put = now
+            self._pending = project_state
+            self._snapshot = ProjectSnapshot(project_state, self.dumps)
+            self._key = None
+            self.counters["saves"] += 1
+            if self.debounce > 0:
+                self._start_worker()
+                self._lock.notify_all()
+        if self.debounce <= 0:
+            self.flush()
+        return self.json_path
+
+    def put_stream(self, write: Callable[[TextIO], None]) -> Path:
+        """Écrit project.json au fil de l'eau (gros projet lu en flux).
+
+        Rien n'est gardé en mémoire : le projet est relu depuis le fichier
+        au prochain get(). Une écriture JSON en attente est annulée.
+        """
+        with self._io_lock:
+            with self._lock:
+                self._pending = None
+                self.counters["saves"] += 1
+            tmp_path = self.json_path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                write(f)
+            os.replace(tmp_path, self.json_path)
+            with self._lock:
+                self._snapshot = self._key = None
+                self.counters["writes"] += 1
+        return self.json_path
+
+    def flush(self) -> bool:
+        """Écrit la sauvegarde JSON en attente ; False s'il n'y en avait pas."""
+        with self._io_lock:
+            with self._lock:
+                state, self._pending = self._pending, None
+            if state is None:
+                return False
+            data = json.dumps(state, indent=2, ensure_ascii=False).encode("utf-8")
+            _atomic_write(self.json_path, data)
+            with self._lock:
+                self.counters["writes"] += 1
+                # Une sauvegarde arrivée pendant l'écriture reste plus récente que le fichier
+                if self._pending is None and self._snapshot is not None and self._snapshot.state is state:
+                    self._key = self._stat_key(self.json_path)
+            return True
+
+    def _start_worker(self) -> None:
+        """Démarre le thread d'écriture différée (verrou tenu)."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="project-write-behind", daemon=True)
+            self._worker.start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while self._pending is None:
+                    self._lock.wait()
+                due = min(self._last_put + self.debounce, self._first_put + self.max_delay)
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._lock.wait(delay)
+                    continue
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, pending=self._pending is not None, debounce=self.debounce)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Écriture atomique : un chargement concurrent ne lit jamais un fichier à moitié écrit."""
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,501 @@
+"""
+project_sync.py — Synchronisation du projet entre clients (WebSocket, deltas)
+
+Le serveur garde le ProjectState canonique en mémoire, découpé en entités :
+`meta`, `routing`, `arrangement`, `order` (ordre des machines et des
+patterns), `machine/<instanceId>` et `pattern/<id>`. Chaque modification
+incrémente la révision globale ; l'entité modifiée prend cette révision.
+
+Les clients envoient des modifications par entité avec la révision sur
+laquelle ils se basent (`baseRev`, 0 = entité nouvelle). Une modification
+dont la base n'est plus la révision courante est refusée et renvoyée en
+conflit avec la valeur actuelle : le client la rejoue sur cette valeur.
+Deux clients qui modifient des entités différentes ne sont jamais en
+conflit. Les modifications acceptées sont diffusées aux autres clients sous
+forme de deltas (seules les entités modifiées) ; une sauvegarde HTTP est
+comparée à l'état courant et diffusée de la même façon.
+
+Protocole (/ws/project, JSON) :
+    serveur → {"type": "snapshot", "revision": r, "revisions": {...}, "projectState": {...}}
+              ou, avec ?since=r si l'historique le couvre :
+              {"type": "delta", "revision": r, "changes": [...]}
+    client  → {"type": "edit", "id": x, "changes": [{"kind": "pattern", "id": "p1",
+               "baseRev": 12, "value": {...}} | {..., "delete": true}]}
+    serveur → {"type": "ack", "id": x, "revision": r, "applied": [...],
+               "conflicts": [...], "errors": [...]}
+    serveur → {"type": "delta", "revision": r, "changes": [{"kind", "id", "rev",
+               "value" | "deleted": true}]} (aux autres clients)
+"""
+
+import copy
+import json
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from modules.websocket import ConnectionClosed, WebSocketConnection
+
+# Entités uniques et collections (clé du ProjectState, champ identifiant)
+SINGLETONS = ("meta", "routing", "arrangement", "order")
+COLLECTIONS = {"machine": ("machines", "instanceId"), "pattern": ("patterns", "id")}
+
+# Deltas conservés pour le rattrapage (?since=)
+DEFAULT_HISTORY = 512
+
+# Messages en attente d'envoi par client : au-delà, le client trop lent est
+# déconnecté (il se resynchronisera avec ?since=)
+MAX_PENDING = 1024
+
+Validator = Callable[[str, Any], Optional[str]]
+
+
+def entity_key(kind: str, entity_id: Optional[str] = None) -> str:
+    """Clé d'entité ("meta", "pattern/p1"…).
+
+    Raises:
+        ValueError: Type d'entité inconnu ou identifiant manquant
+    """
+    if not isinstance(kind, str):
+        raise ValueError(f"Type d'entité invalide: {kind!r}")
+    if kind in SINGLETONS:
+        return kind
+    if kind in COLLECTIONS:
+        if not isinstance(entity_id, str) or not entity_id:
+            raise ValueError(f"Identifiant manquant pour {kind}")
+        return f"{kind}/{entity_id}"
+    raise ValueError(f"Type d'entité inconnu: {kind}")
+
+
+def duplicate_error(project_state: Dict[str, Any]) -> Optional[str]:
+    """Message d'erreur si deux machines (instanceId) ou deux patterns (id) partagent un identifiant.
+
+    Le schéma ne l'interdit pas, mais chaque entité est repérée par son
+    identifiant : deux éléments identiques n'en feraient qu'un.
+    """
+    for field, id_field in COLLECTIONS.values():
+        seen = set()
+        for item in project_state.get(field, []):
+            entity_id = item.get(id_field) if isinstance(item, dict) else None
+            if entity_id in seen:
+                return f"{id_field} en double dans {field}: {entity_id}"
+            seen.add(entity_id)
+    return None
+
+
+def split_key(key: str) -> Tuple[str, Optional[str]]:
+    kind, _, entity_id = key.partition("/")
+    return kind, entity_id or None
+
+
+def _change(key: str, rev: int, value: Any = None, deleted: bool = False) -> Dict[str, Any]:
+    kind, entity_id = split_key(key)
+    change: Dict[str, Any] = {"kind": kind, "rev": rev}
+    if entity_id is not None:
+        change["id"] = entity_id
+    if deleted:
+        change["deleted"] = True
+    else:
+        change["value"] = value
+    return change
+
+# ============================================================================
+# RÉPLIQUE
+# ============================================================================
+
+class ProjectReplica:
+    """ProjectState découpé en entités révisionnées.
+
+    Sert d'état canonique au serveur et de miroir aux clients Python (les
+    deltas reçus s'appliquent avec apply()). Les clés de premier niveau hors
+    entités (`schema`…) sont conservées telles quelles.
+    """
+
+    def __init__(self, project_state: Optional[Dict[str, Any]] = None) -> None:
+        self.revision = 0
+        self.entities: Dict[str, Any] = {}
+        self.revs: Dict[str, int] = {}
+        self.extra: Dict[str, Any] = {}
+        if project_state is not None:
+            self.entities, self.extra = self.split(project_state)
+
+    @staticmethod
+    def split(project_state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """ProjectState → (entités, clés de premier niveau restantes).
+
+        Raises:
+            ValueError: Identifiant manquant ou en double
+        """
+        error = duplicate_error(project_state)
+        if error:
+            raise ValueError(error)
+        entities: Dict[str, Any] = {}
+        order: Dict[str, List[str]] = {}
+        for kind, (field, id_field) in COLLECTIONS.items():
+            order[field] = []
+            for item in project_state.get(field, []):
+                entity_id = item.get(id_field)
+                entities[entity_key(kind, entity_id)] = item
+                order[field].append(entity_id)
+        for kind in ("meta", "routing", "arrangement"):
+            if kind in project_state:
+                entities[kind] = project_state[kind]
+        entities["order"] = order
+        skip = {"meta", "routing", "arrangement"} | {field for field, _ in COLLECTIONS.values()}
+        return entities, {k: v for k, v in project_state.items() if k not in skip}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "ProjectReplica":
+        replica = cls(snapshot["projectState"])
+        replica.revision = snapshot["revision"]
+        replica.revs = dict(snapshot["revisions"])
+        return replica
+
+    def rev(self, key: str) -> int:
+        return self.revs.get(key, 0)
+
+    def put(self, key: str, value: Any, rev: int) -> None:
+        """Écrit une entité ; une machine ou un pattern nouveau est ajouté en fin d'ordre."""
+        kind, entity_id = split_key(key)
+        if kind in COLLECTIONS and key not in self.entities:
+            order = self.entities.setdefault("order", {"machines": [], "patterns": []})
+            order.setdefault(COLLECTIONS[kind][0], []).append(entity_id)
+        self.entities[key] = value
+        self.revs[key] = rev
+
+    def delete(self, key: str, rev: int) -> None:
+        kind, entity_id = split_key(key)
+        if self.entities.pop(key, None) is not None and kind in COLLECTIONS:
+            ids = self.entities.get("order", {}).get(COLLECTIONS[kind][0], [])
+            if entity_id in ids:
+                ids.remove(entity_id)
+        self.revs[key] = rev
+
+    def apply(self, changes: List[Dict[str, Any]], revision: int) -> None:
+        """Applique un delta reçu du serveur."""
+        for change in changes:
+            key = entity_key(change["kind"], change.get("id"))
+            if change.get("deleted"):
+                self.delete(key, change["rev"])
+            else:
+                self.put(key, change["value"], change["rev"])
+        self.revision = revision
+
+    def project_state(self) -> Dict[str, Any]:
+        """ProjectState assemblé (machines et patterns dans l'ordre `order`)."""
+        state = dict(self.extra)
+        order = self.entities.get("order", {})
+        for kind in ("meta", "routing", "arrangement"):
+            if kind in self.entities:
+                state[kind] = self.entities[kind]
+        for kind, (field, _) in COLLECTIONS.items():
+            state[field] = [self.entities[entity_key(kind, i)] for i in order.get(field, [])
+                            if entity_key(kind, i) in self.entities]
+        return state
+
+# ============================================================================
+# HUB
+# ============================================================================
+
+class _Outbox:
+    """File d'envoi d'un client, vidée par son propre thread.
+
+    Le hub y dépose les messages sous son verrou (sans E/S) : un client lent
+    ne retarde ni les autres clients ni les modifications.
+    """
+
+    def __init__(self, conn: WebSocketConnection) -> None:
+        self.conn = conn
+        self.closed = False
+        self._queue: Deque[str] = deque()
+        self._ready = threading.Condition()
+        threading.Thread(target=self._run, name="project-sync-send", daemon=True).start()
+
+    def put(self, message: str) -> bool:
+        """Met un message en file ; False si le client est fermé ou débordé."""
+        with self._ready:
+            if self.closed:
+                return False
+            if len(self._queue) >= MAX_PENDING:
+                self.closed = True
+                self._ready.notify()
+                return False
+            self._queue.append(message)
+            self._ready.notify()
+            return True
+
+    def close(self) -> None:
+        with self._ready:
+            self.closed = True
+            self._ready.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                while not self._queue and not self.closed:
+                    self._ready.wait()
+                if self.closed:
+                    break
+                message = self._queue.popleft()
+            try:
+                self.conn.send_text(message)
+            except ConnectionClosed:
+                break
+        self.closed = True
+        # Débordement : fermer la connexion termine aussi la lecture (serve_project)
+        self.conn.close()
+
+
+class ProjectHub:
+    """État canonique partagé, révisions et diffusion aux clients.
+
+    Args:
+        project_state: État initial (None = projet vide)
+        validate: validate(kind, valeur) → message d'erreur ou None
+        persist: Appelé avec le ProjectState après chaque modification
+            reçue d'un client (pas après replace(), déjà sauvegardé)
+        history: Nombre de deltas conservés pour le rattrapage
+
+    Les modifications s'appliquent sous un même verrou et les messages sont
+    mis en file par client dans l'ordre des révisions ; les envois et la
+    sauvegarde (persist) se font hors verrou.
+    """
+
+    def __init__(self, project_state: Optional[Dict[str, Any]] = None,
+                 validate: Optional[Validator] = None,
+                 persist: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 history: int = DEFAULT_HISTORY) -> None:
+        self.replica = ProjectReplica(project_state)
+        self.validate = validate
+        self.persist = persist
+        self._lock = threading.RLock()
+        self._persist_lock = threading.Lock()
+        self._persisted = 0
+        self._history: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=history)
+        self._clients: Dict[int, _Outbox] = {}
+        self.counters = {"changes": 0, "conflicts": 0, "errors": 0, "deltas": 0, "deltaBytes": 0}
+
+    @property
+    def revision(self) -> int:
+        return self.replica.revision
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "type": "snapshot",
+                "revision": self.replica.revision,
+                "revisions": dict(self.replica.revs),
+                "projectState": copy.deepcopy(self.replica.project_state()),
+            }
+
+    def project_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self.replica.project_state())
+
+    def since(self, revision: int) -> Optional[List[Dict[str, Any]]]:
+        """Changements postérieurs à `revision`, ou None si l'historique ne les couvre plus."""
+        with self._lock:
+            if revision > self.replica.revision:
+                return None
+            if revision == self.replica.revision:
+                return []
+            if not self._history or self._history[0][0] > revision + 1:
+                return None
+            return [change for rev, change in self._history if rev > revision]
+
+    # ------------------------------------------------------------------------
+    # Modifications
+    # ------------------------------------------------------------------------
+
+    def _check(self, key: str, change: Dict[str, Any]) -> Optional[str]:
+        """Erreur de forme ou de validation d'une modification, sinon None."""
+        kind, entity_id = split_key(key)
+        if change.get("delete"):
+            return "Suppression impossible" if kind in SINGLETONS else None
+        value = change.get("value")
+        if kind in COLLECTIONS and (not isinstance(value, dict)
+                                    or value.get(COLLECTIONS[kind][1]) != entity_id):
+            return f"{COLLECTIONS[kind][1]} ne correspond pas à l'entité"
+        if kind == "order":
+            if not isinstance(value, dict):
+                return "L'ordre doit être un objet"
+            current = self.replica.entities.get("order", {})
+            for field, _ in COLLECTIONS.values():
+                ids = value.get(field, [])
+                if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                    return f"L'ordre des {field} doit être une liste d'identifiants"
+                if sorted(ids) != sorted(current.get(field, [])):
+                    return f"L'ordre doit être une permutation des {field} existants"
+            return None
+        if self.validate is not None:
+            return self.validate(kind, value)
+        return None
+
+    def _commit(self, key: str, value: Any = None, deleted: bool = False) -> Dict[str, Any]:
+        self.replica.revision += 1
+        rev = self.replica.revision
+        if deleted:
+            self.replica.delete(key, rev)
+        else:
+            self.replica.put(key, value, rev)
+        change = _change(key, rev, value, deleted)
+        self._history.append((rev, change))
+        self.counters["changes"] += 1
+        return change
+
+    def apply(self, changes: List[Dict[str, Any]], origin: Optional[int] = None) -> Dict[str, Any]:
+        """Applique des modifications client (chacune acceptée ou refusée seule).
+
+        Returns:
+            {"revision", "applied": [{kind, id, rev}], "conflicts": [état
+            actuel des entités en conflit], "errors": [{kind, id, error}]}
+        """
+        applied, conflicts, errors, delta = [], [], [], []
+        with self._lock:
+            for change in changes:
+                if not isinstance(change, dict):
+                    errors.append({"kind": None, "id": None, "error": "Modification invalide : objet attendu"})
+                    continue
+                try:
+                    key = entity_key(change.get("kind"), change.get("id"))
+                except ValueError as e:
+                    errors.append({"kind": change.get("kind"), "id": change.get("id"), "error": str(e)})
+                    continue
+                current = self.replica.rev(key)
+                if change.get("baseRev", 0) != current:
+                    conflicts.append(_change(key, current, self.replica.entities.get(key),
+                                             key not in self.replica.entities))
+                    continue
+                error = self._check(key, change)
+                if error:
+                    errors.append({"kind": change.get("kind"), "id": change.get("id"), "error": error})
+                    continue
+                deleted = bool(change.get("delete"))
+                if deleted and key not in self.replica.entities:
+                    continue
+                committed = self._commit(key, change.get("value"), deleted)
+                delta.append(committed)
+                applied.append({k: v for k, v in committed.items() if k not in ("value", "deleted")})
+
+            self.counters["conflicts"] += len(conflicts)
+            self.counters["errors"] += len(errors)
+            if delta:
+                self._broadcast(delta, origin)
+            result = {"revision": self.replica.revision, "applied": applied,
+                      "conflicts": conflicts, "errors": errors}
+        if delta and self.persist is not None:
+            self._persist()
+        return result
+
+    def _persist(self) -> None:
+        """Sauvegarde l'état courant hors du verrou des modifications.
+
+        Les sauvegardes sont sérialisées entre elles et ne reculent jamais :
+        un appel qui arrive après une sauvegarde plus récente ne fait rien.
+        """
+        with self._persist_lock:
+            with self._lock:
+                revision = self.replica.revision
+                if revision <= self._persisted:
+                    return
+                # Les entités sont remplacées, jamais modifiées en place :
+                # l'état assemblé reste stable une fois le verrou relâché
+                project_state = self.replica.project_state()
+            self.persist(project_state)
+            self._persisted = revision
+
+    def replace(self, project_state: Dict[str, Any], origin: Optional[int] = None) -> int:
+        """Remplace l'état (sauvegarde complète) et diffuse les entités modifiées.
+
+        Returns:
+            Nombre d'entités modifiées
+
+        Raises:
+            ValueError: Identifiant manquant ou en double (état inchangé)
+        """
+        entities, extra = ProjectReplica.split(project_state)
+        with self._lock:
+            delta = []
+            # Suppressions d'abord : l'ordre recalculé par put() reste cohérent
+            for key in [k for k in self.replica.entities if k not in entities]:
+                delta.append(self._commit(key, deleted=True))
+            for key, value in entities.items():
+                if key != "order" and self.replica.entities.get(key) != value:
+                    delta.append(self._commit(key, value))
+            if self.replica.entities.get("order") != entities["order"]:
+                delta.append(self._commit("order", entities["order"]))
+            self.replica.extra = extra
+            if delta:
+                self._broadcast(delta, origin)
+            return len(delta)
+
+    # ------------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------------
+
+    def _broadcast(self, delta: List[Dict[str, Any]], origin: Optional[int]) -> None:
+        """Met un delta en file pour tous les clients sauf l'émetteur (verrou tenu)."""
+        message = json.dumps({"type": "delta", "revision": self.replica.revision, "changes": delta},
+                             separators=(",", ":"))
+        size = len(message.encode("utf-8"))
+        for client_id, outbox in list(self._clients.items()):
+            if client_id == origin:
+                continue
+            if not outbox.put(message):
+                self._clients.pop(client_id, None)
+                continue
+            self.counters["deltas"] += 1
+            self.counters["deltaBytes"] += size
+
+    def send(self, conn: WebSocketConnection, data: Any) -> None:
+        """Envoie un message à un client inscrit, après les deltas déjà en file."""
+        message = json.dumps(data, separators=(",", ":"))
+        with self._lock:
+            outbox = self._clients.get(id(conn))
+            if outbox is None or not outbox.put(message):
+                self._clients.pop(id(conn), None)
+                raise ConnectionClosed("Client désinscrit")
+
+    def subscribe(self, conn: WebSocketConnection, since: Optional[int] = None) -> None:
+        """Inscrit un client et lui envoie l'état (instantané ou rattrapage)."""
+        with self._lock:
+            changes = self.since(since) if since is not None else None
+            if changes is None:
+                first = self.snapshot()
+            else:
+                first = {"type": "delta", "revision": self.replica.revision, "changes": changes}
+            outbox = _Outbox(conn)
+            outbox.put(json.dumps(first, separators=(",", ":")))
+            self._clients[id(conn)] = outbox
+
+    def unsubscribe(self, conn: WebSocketConnection) -> None:
+        with self._lock:
+            outbox = self._clients.pop(id(conn), None)
+        if outbox is not None:
+            outbox.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, clients=len(self._clients), revision=self.replica.revision)
+
+
+def serve_project(conn: WebSocketConnection, hub: ProjectHub) -> None:
+    """Handler WebSocket de /ws/project (voir le protocole en tête de module)."""
+    since = conn.query.get("since")
+    hub.subscribe(conn, int(since) if since and since.isdigit() else None)
+    try:
+        while True:
+            try:
+                message = conn.recv_json()
+            except ValueError as e:
+                hub.send(conn, {"type": "error", "error": f"Message invalide : {e}"})
+                continue
+            if (not isinstance(message, dict) or message.get("type") != "edit"
+                    or not isinstance(message.get("changes"), list)):
+                hub.send(conn, {"type": "error", "error": "Message attendu : edit"})
+                continue
+            result = hub.apply(message["changes"], origin=id(conn))
+            hub.send(conn, dict(result, type="ack", id=message.get("id")))
+    except ConnectionClosed:
+        pass
+    finally:
+        hub.unsubscribe(conn)
@@ -0,0 +1,1396 @@
+"""
+schema_validators.py — Validateurs JSON Schema compilés (fichier généré)
+
+Généré par TOOLS/compile_schemas.py depuis SCHEMAS/ : ne pas modifier à la
+main, relancer le script après toute modification d'un schéma (`--check`
+vérifie que ce fichier est à jour).
+
+Chaque schéma est une fonction Python (bibliothèque standard uniquement,
+utilisable sous Pythonista). Les erreurs sont produites dans le même ordre
+que Draft7Validator.iter_errors de jsonschema, avec les mêmes messages et
+chemins ; comme jsonschema sans vérificateur de formats, `format` n'est pas
+contrôlé.
+"""
+
+import re
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class SchemaError(ValueError):
+    """Écart d'un document à un schéma.
+
+    Attributes:
+        message: Message (identique à jsonschema)
+        path: Chemin dans le document (clés et indices)
+        schema_path: Chemin dans le schéma
+        validator: Mot-clé en échec
+        instance: Valeur en échec
+    """
+
+    def __init__(self, message: str, path: Tuple, schema_path: Tuple, validator: Optional[str],
+                 instance: Any) -> None:
+        super().__init__(message)
+        self.message = message
+        self.path = path
+        self.schema_path = schema_path
+        self.validator = validator
+        self.instance = instance
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _unbool(value: Any) -> Any:
+    return (bool, value) if isinstance(value, bool) else value
+
+
+def _equal(one: Any, two: Any) -> bool:
+    """Égalité JSON (True ≠ 1), comme jsonschema."""
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(_equal(a, b) for a, b in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return one.keys() == two.keys() and all(_equal(one[k], two[k]) for k in one)
+    return _unbool(one) == _unbool(two)
+
+# SHA-1 des schémas compilés
+SOURCES = {
+    'Acknowledgement.v1.schema.json': 'e01b403258aff31dbbb41b3e05d2cf14a8fe5d2f',
+    'Machine.v1.schema.json': 'b4dc2793e1a2266543ebe40f8899c89e1cb05266',
+    'Pattern.v1.schema.json': 'c77d34fb0ba3a0d3cea096603ebacd483f6c2213',
+    'ProjectState.v1.schema.json': '14fd2bb5feb93f1be392b327b1da19a5697ce46f',
+    'actions/ActionBatch.v1.schema.json': 'f541372056898ea77a3311c6801c25d7dee145b0',
+    'actions/AddMachine.v1.schema.json': '3ae4a156ac656f35ad986a3b5bbe30e06bfaedb3',
+    'actions/Arrange.v1.schema.json': 'bd710ce5f0b618b71e657be2d58d8b29c6c0073e',
+    'actions/CreatePattern.v1.schema.json': '9bc2e2c235e5406f709e3a0dc46b69350cef2251',
+    'actions/ExportPlan.v1.schema.json': '577420d1516b317b28275caf4d0c6ac333c1af10',
+    'actions/SetParam.v1.schema.json': '63ce0e1c936779819de4108dec31e7eb3e8b8bf3',
+}
+
+_PATTERN_0 = re.compile('^[a-f0-9]{64}$')
+_PATTERN_1 = re.compile('^[a-z]+\\.[a-z0-9]+$')
+_ENUM_2 = frozenset(['drum', 'effect', 'other', 'synth'])
+_PATTERN_3 = re.compile('^[0-9]+$')
+_ENUM_4 = frozenset(['exp', 'lin', 'log'])
+_PATTERN_5 = re.compile('^[0-9]+$')
+_ENUM_6 = frozenset(['exp', 'lin', 'log'])
+_ENUM_7 = frozenset(['button', 'knob', 'slider', 'switch'])
+_PATTERN_8 = re.compile('^[a-z]+\\.[a-z0-9]+$')
+_ENUM_9 = frozenset([12, 16, 32, 48, 64, 68, 128, 256])
+_ENUM_10 = frozenset([96, 192, 480])
+_ENUM_11 = frozenset(['exp', 'lin', 'log', 'smooth'])
+_PATTERN_12 = re.compile('^[0-9]+/[0-9]+$')
+_ENUM_13 = frozenset([96, 192, 480])
+_PATTERN_14 = re.compile('^[a-z]+\\.[a-z0-9]+$')
+_PATTERN_15 = re.compile('^[a-zA-Z_][a-zA-Z0-9_]*$')
+_PATTERN_16 = re.compile('^[0-9]+/(1|2|4|8|16|32)$')
+_ENUM_17 = frozenset(['AddMachine.v1', 'Arrange.v1', 'CreatePattern.v1', 'ExportPlan.v1', 'SetParam.v1'])
+_PATTERN_18 = re.compile('^[a-z]+\\.[a-z0-9]+$')
+_PATTERN_19 = re.compile('^[0-9]+/(1|2|4|8|16|32)$')
+_ENUM_20 = frozenset([12, 16, 32, 48, 64, 68, 128, 256])
+_ENUM_21 = frozenset([96, 192, 480])
+_ENUM_22 = frozenset(['exp', 'lin', 'log', 'smooth'])
+_PATTERN_23 = re.compile('^[0-9]+/[0-9]+$')
+_ENUM_24 = frozenset(['midi'])
+_ENUM_25 = frozenset(['exp', 'lin', 'log', 'smooth'])
+
+
+def _validate_0(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """Acknowledgement.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v0 = instance['schema']
+            if not (isinstance(v0, str)):
+                yield SchemaError(repr(v0) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v0)
+            if v0 != 'Acknowledgement.v1':
+                yield SchemaError("'Acknowledgement.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v0)
+        if 'actor' in instance:
+            v1 = instance['actor']
+            if not (isinstance(v1, str)):
+                yield SchemaError(repr(v1) + " is not of type 'string'", path + ('actor',), schema_path + ('properties', 'actor', 'type'), 'type', v1)
+        if 'read' in instance:
+            v2 = instance['read']
+            if not (isinstance(v2, list)):
+                yield SchemaError(repr(v2) + " is not of type 'array'", path + ('read',), schema_path + ('properties', 'read', 'type'), 'type', v2)
+            if isinstance(v2, list):
+                for i3, v4 in enumerate(v2):
+                    if not (isinstance(v4, dict)):
+                        yield SchemaError(repr(v4) + " is not of type 'object'", path + ('read', i3), schema_path + ('properties', 'read', 'items', 'type'), 'type', v4)
+                    if isinstance(v4, dict):
+                        if 'path' in v4:
+                            v5 = v4['path']
+                            if not (isinstance(v5, str)):
+                                yield SchemaError(repr(v5) + " is not of type 'string'", path + ('read', i3, 'path'), schema_path + ('properties', 'read', 'items', 'properties', 'path', 'type'), 'type', v5)
+                        if 'sha256' in v4:
+                            v6 = v4['sha256']
+                            if not (isinstance(v6, str)):
+                                yield SchemaError(repr(v6) + " is not of type 'string'", path + ('read', i3, 'sha256'), schema_path + ('properties', 'read', 'items', 'properties', 'sha256', 'type'), 'type', v6)
+                            if isinstance(v6, str) and not _PATTERN_0.search(v6):
+                                yield SchemaError(repr(v6) + " does not match '^[a-f0-9]{64}$'", path + ('read', i3, 'sha256'), schema_path + ('properties', 'read', 'items', 'properties', 'sha256', 'pattern'), 'pattern', v6)
+                    if isinstance(v4, dict):
+                        if 'path' not in v4:
+                            yield SchemaError("'path' is a required property", path + ('read', i3), schema_path + ('properties', 'read', 'items', 'required'), 'required', v4)
+                        if 'sha256' not in v4:
+                            yield SchemaError("'sha256' is a required property", path + ('read', i3), schema_path + ('properties', 'read', 'items', 'required'), 'required', v4)
+            if isinstance(v2, list) and len(v2) < 1:
+                yield SchemaError(repr(v2) + ' should be non-empty', path + ('read',), schema_path + ('properties', 'read', 'minItems'), 'minItems', v2)
+        if 'timestamp' in instance:
+            v7 = instance['timestamp']
+            if not (isinstance(v7, str)):
+                yield SchemaError(repr(v7) + " is not of type 'string'", path + ('timestamp',), schema_path + ('properties', 'timestamp', 'type'), 'type', v7)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'actor' not in instance:
+            yield SchemaError("'actor' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'read' not in instance:
+            yield SchemaError("'read' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'timestamp' not in instance:
+            yield SchemaError("'timestamp' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_1(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """Machine.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v8 = instance['schema']
+            if not (isinstance(v8, str)):
+                yield SchemaError(repr(v8) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v8)
+            if v8 != 'Machine.v1':
+                yield SchemaError("'Machine.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v8)
+        if 'id' in instance:
+            v9 = instance['id']
+            if not (isinstance(v9, str)):
+                yield SchemaError(repr(v9) + " is not of type 'string'", path + ('id',), schema_path + ('properties', 'id', 'type'), 'type', v9)
+            if isinstance(v9, str) and not _PATTERN_1.search(v9):
+                yield SchemaError(repr(v9) + " does not match '^[a-z]+\\\\.[a-z0-9]+$'", path + ('id',), schema_path + ('properties', 'id', 'pattern'), 'pattern', v9)
+        if 'name' in instance:
+            v10 = instance['name']
+            if not (isinstance(v10, str)):
+                yield SchemaError(repr(v10) + " is not of type 'string'", path + ('name',), schema_path + ('properties', 'name', 'type'), 'type', v10)
+        if 'vendor' in instance:
+            v11 = instance['vendor']
+            if not (isinstance(v11, str)):
+                yield SchemaError(repr(v11) + " is not of type 'string'", path + ('vendor',), schema_path + ('properties', 'vendor', 'type'), 'type', v11)
+        if 'model' in instance:
+            v12 = instance['model']
+            if not (isinstance(v12, str)):
+                yield SchemaError(repr(v12) + " is not of type 'string'", path + ('model',), schema_path + ('properties', 'model', 'type'), 'type', v12)
+        if 'type' in instance:
+            v13 = instance['type']
+            if not (isinstance(v13, str)):
+                yield SchemaError(repr(v13) + " is not of type 'string'", path + ('type',), schema_path + ('properties', 'type', 'type'), 'type', v13)
+            if not (isinstance(v13, str) and v13 in _ENUM_2):
+                yield SchemaError(repr(v13) + " is not one of ['synth', 'drum', 'effect', 'other']", path + ('type',), schema_path + ('properties', 'type', 'enum'), 'enum', v13)
+        if 'midi' in instance:
+            v14 = instance['midi']
+            if not (isinstance(v14, dict)):
+                yield SchemaError(repr(v14) + " is not of type 'object'", path + ('midi',), schema_path + ('properties', 'midi', 'type'), 'type', v14)
+            if isinstance(v14, dict):
+                if 'ccMap' in v14:
+                    v15 = v14['ccMap']
+                    if not (isinstance(v15, dict)):
+                        yield SchemaError(repr(v15) + " is not of type 'object'", path + ('midi', 'ccMap'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'type'), 'type', v15)
+                    if isinstance(v15, dict):
+                        for k16, v17 in v15.items():
+                            if _PATTERN_3.search(k16):
+                                if not (isinstance(v17, dict)):
+                                    yield SchemaError(repr(v17) + " is not of type 'object'", path + ('midi', 'ccMap', k16), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'type'), 'type', v17)
+                                if isinstance(v17, dict):
+                                    if 'param' in v17:
+                                        v18 = v17['param']
+                                        if not (isinstance(v18, str)):
+                                            yield SchemaError(repr(v18) + " is not of type 'string'", path + ('midi', 'ccMap', k16, 'param'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'param', 'type'), 'type', v18)
+                                    if 'min' in v17:
+                                        v19 = v17['min']
+                                        if not (((isinstance(v19, int) and not isinstance(v19, bool)) or (isinstance(v19, float) and v19.is_integer()))):
+                                            yield SchemaError(repr(v19) + " is not of type 'integer'", path + ('midi', 'ccMap', k16, 'min'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'min', 'type'), 'type', v19)
+                                        if (isinstance(v19, (int, float)) and not isinstance(v19, bool)) and v19 < 0:
+                                            yield SchemaError(repr(v19) + ' is less than the minimum of 0', path + ('midi', 'ccMap', k16, 'min'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'min', 'minimum'), 'minimum', v19)
+                                        if (isinstance(v19, (int, float)) and not isinstance(v19, bool)) and v19 > 127:
+                                            yield SchemaError(repr(v19) + ' is greater than the maximum of 127', path + ('midi', 'ccMap', k16, 'min'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'min', 'maximum'), 'maximum', v19)
+                                    if 'max' in v17:
+                                        v20 = v17['max']
+                                        if not (((isinstance(v20, int) and not isinstance(v20, bool)) or (isinstance(v20, float) and v20.is_integer()))):
+                                            yield SchemaError(repr(v20) + " is not of type 'integer'", path + ('midi', 'ccMap', k16, 'max'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'max', 'type'), 'type', v20)
+                                        if (isinstance(v20, (int, float)) and not isinstance(v20, bool)) and v20 < 0:
+                                            yield SchemaError(repr(v20) + ' is less than the minimum of 0', path + ('midi', 'ccMap', k16, 'max'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'max', 'minimum'), 'minimum', v20)
+                                        if (isinstance(v20, (int, float)) and not isinstance(v20, bool)) and v20 > 127:
+                                            yield SchemaError(repr(v20) + ' is greater than the maximum of 127', path + ('midi', 'ccMap', k16, 'max'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'max', 'maximum'), 'maximum', v20)
+                                    if 'curve' in v17:
+                                        v21 = v17['curve']
+                                        if not (isinstance(v21, str)):
+                                            yield SchemaError(repr(v21) + " is not of type 'string'", path + ('midi', 'ccMap', k16, 'curve'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'curve', 'type'), 'type', v21)
+                                        if not (isinstance(v21, str) and v21 in _ENUM_4):
+                                            yield SchemaError(repr(v21) + " is not one of ['lin', 'log', 'exp']", path + ('midi', 'ccMap', k16, 'curve'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'curve', 'enum'), 'enum', v21)
+                                    if 'default' in v17:
+                                        v22 = v17['default']
+                                        if not (((isinstance(v22, int) and not isinstance(v22, bool)) or (isinstance(v22, float) and v22.is_integer()))):
+                                            yield SchemaError(repr(v22) + " is not of type 'integer'", path + ('midi', 'ccMap', k16, 'default'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'default', 'type'), 'type', v22)
+                                        if (isinstance(v22, (int, float)) and not isinstance(v22, bool)) and v22 < 0:
+                                            yield SchemaError(repr(v22) + ' is less than the minimum of 0', path + ('midi', 'ccMap', k16, 'default'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'default', 'minimum'), 'minimum', v22)
+                                        if (isinstance(v22, (int, float)) and not isinstance(v22, bool)) and v22 > 127:
+                                            yield SchemaError(repr(v22) + ' is greater than the maximum of 127', path + ('midi', 'ccMap', k16, 'default'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'default', 'maximum'), 'maximum', v22)
+                                    if 'source' in v17:
+                                        v23 = v17['source']
+                                        if not (isinstance(v23, str)):
+                                            yield SchemaError(repr(v23) + " is not of type 'string'", path + ('midi', 'ccMap', k16, 'source'), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'properties', 'source', 'type'), 'type', v23)
+                                if isinstance(v17, dict):
+                                    if 'param' not in v17:
+                                        yield SchemaError("'param' is a required property", path + ('midi', 'ccMap', k16), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'required'), 'required', v17)
+                                    if 'min' not in v17:
+                                        yield SchemaError("'min' is a required property", path + ('midi', 'ccMap', k16), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'required'), 'required', v17)
+                                    if 'max' not in v17:
+                                        yield SchemaError("'max' is a required property", path + ('midi', 'ccMap', k16), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'required'), 'required', v17)
+                                    if 'curve' not in v17:
+                                        yield SchemaError("'curve' is a required property", path + ('midi', 'ccMap', k16), schema_path + ('properties', 'midi', 'properties', 'ccMap', 'patternProperties', '^[0-9]+$', 'required'), 'required', v17)
+                if 'nrpn' in v14:
+                    v24 = v14['nrpn']
+                    if not (isinstance(v24, dict)):
+                        yield SchemaError(repr(v24) + " is not of type 'object'", path + ('midi', 'nrpn'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'type'), 'type', v24)
+                    if isinstance(v24, dict):
+                        for k25, v26 in v24.items():
+                            if _PATTERN_5.search(k25):
+                                if not (isinstance(v26, dict)):
+                                    yield SchemaError(repr(v26) + " is not of type 'object'", path + ('midi', 'nrpn', k25), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'type'), 'type', v26)
+                                if isinstance(v26, dict):
+                                    if 'param' in v26:
+                                        v27 = v26['param']
+                                        if not (isinstance(v27, str)):
+                                            yield SchemaError(repr(v27) + " is not of type 'string'", path + ('midi', 'nrpn', k25, 'param'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'param', 'type'), 'type', v27)
+                                    if 'min' in v26:
+                                        v28 = v26['min']
+                                        if not (((isinstance(v28, int) and not isinstance(v28, bool)) or (isinstance(v28, float) and v28.is_integer()))):
+                                            yield SchemaError(repr(v28) + " is not of type 'integer'", path + ('midi', 'nrpn', k25, 'min'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'min', 'type'), 'type', v28)
+                                        if (isinstance(v28, (int, float)) and not isinstance(v28, bool)) and v28 < 0:
+                                            yield SchemaError(repr(v28) + ' is less than the minimum of 0', path + ('midi', 'nrpn', k25, 'min'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'min', 'minimum'), 'minimum', v28)
+                                        if (isinstance(v28, (int, float)) and not isinstance(v28, bool)) and v28 > 16383:
+                                            yield SchemaError(repr(v28) + ' is greater than the maximum of 16383', path + ('midi', 'nrpn', k25, 'min'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'min', 'maximum'), 'maximum', v28)
+                                    if 'max' in v26:
+                                        v29 = v26['max']
+                                        if not (((isinstance(v29, int) and not isinstance(v29, bool)) or (isinstance(v29, float) and v29.is_integer()))):
+                                            yield SchemaError(repr(v29) + " is not of type 'integer'", path + ('midi', 'nrpn', k25, 'max'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'max', 'type'), 'type', v29)
+                                        if (isinstance(v29, (int, float)) and not isinstance(v29, bool)) and v29 < 0:
+                                            yield SchemaError(repr(v29) + ' is less than the minimum of 0', path + ('midi', 'nrpn', k25, 'max'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'max', 'minimum'), 'minimum', v29)
+                                        if (isinstance(v29, (int, float)) and not isinstance(v29, bool)) and v29 > 16383:
+                                            yield SchemaError(repr(v29) + ' is greater than the maximum of 16383', path + ('midi', 'nrpn', k25, 'max'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'max', 'maximum'), 'maximum', v29)
+                                    if 'curve' in v26:
+                                        v30 = v26['curve']
+                                        if not (isinstance(v30, str)):
+                                            yield SchemaError(repr(v30) + " is not of type 'string'", path + ('midi', 'nrpn', k25, 'curve'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'curve', 'type'), 'type', v30)
+                                        if not (isinstance(v30, str) and v30 in _ENUM_6):
+                                            yield SchemaError(repr(v30) + " is not one of ['lin', 'log', 'exp']", path + ('midi', 'nrpn', k25, 'curve'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'curve', 'enum'), 'enum', v30)
+                                    if 'default' in v26:
+                                        v31 = v26['default']
+                                        if not (((isinstance(v31, int) and not isinstance(v31, bool)) or (isinstance(v31, float) and v31.is_integer()))):
+                                            yield SchemaError(repr(v31) + " is not of type 'integer'", path + ('midi', 'nrpn', k25, 'default'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'default', 'type'), 'type', v31)
+                                        if (isinstance(v31, (int, float)) and not isinstance(v31, bool)) and v31 < 0:
+                                            yield SchemaError(repr(v31) + ' is less than the minimum of 0', path + ('midi', 'nrpn', k25, 'default'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'default', 'minimum'), 'minimum', v31)
+                                        if (isinstance(v31, (int, float)) and not isinstance(v31, bool)) and v31 > 16383:
+                                            yield SchemaError(repr(v31) + ' is greater than the maximum of 16383', path + ('midi', 'nrpn', k25, 'default'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'default', 'maximum'), 'maximum', v31)
+                                    if 'source' in v26:
+                                        v32 = v26['source']
+                                        if not (isinstance(v32, str)):
+                                            yield SchemaError(repr(v32) + " is not of type 'string'", path + ('midi', 'nrpn', k25, 'source'), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'properties', 'source', 'type'), 'type', v32)
+                                if isinstance(v26, dict):
+                                    if 'param' not in v26:
+                                        yield SchemaError("'param' is a required property", path + ('midi', 'nrpn', k25), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'required'), 'required', v26)
+                                    if 'min' not in v26:
+                                        yield SchemaError("'min' is a required property", path + ('midi', 'nrpn', k25), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'required'), 'required', v26)
+                                    if 'max' not in v26:
+                                        yield SchemaError("'max' is a required property", path + ('midi', 'nrpn', k25), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'required'), 'required', v26)
+                                    if 'curve' not in v26:
+                                        yield SchemaError("'curve' is a required property", path + ('midi', 'nrpn', k25), schema_path + ('properties', 'midi', 'properties', 'nrpn', 'patternProperties', '^[0-9]+$', 'required'), 'required', v26)
+                if 'programChange' in v14:
+                    v33 = v14['programChange']
+                    if not (isinstance(v33, dict)):
+                        yield SchemaError(repr(v33) + " is not of type 'object'", path + ('midi', 'programChange'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'type'), 'type', v33)
+                    if isinstance(v33, dict):
+                        if 'min' in v33:
+                            v34 = v33['min']
+                            if not (((isinstance(v34, int) and not isinstance(v34, bool)) or (isinstance(v34, float) and v34.is_integer()))):
+                                yield SchemaError(repr(v34) + " is not of type 'integer'", path + ('midi', 'programChange', 'min'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'properties', 'min', 'type'), 'type', v34)
+                            if (isinstance(v34, (int, float)) and not isinstance(v34, bool)) and v34 < 0:
+                                yield SchemaError(repr(v34) + ' is less than the minimum of 0', path + ('midi', 'programChange', 'min'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'properties', 'min', 'minimum'), 'minimum', v34)
+                            if (isinstance(v34, (int, float)) and not isinstance(v34, bool)) and v34 > 127:
+                                yield SchemaError(repr(v34) + ' is greater than the maximum of 127', path + ('midi', 'programChange', 'min'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'properties', 'min', 'maximum'), 'maximum', v34)
+                        if 'max' in v33:
+                            v35 = v33['max']
+                            if not (((isinstance(v35, int) and not isinstance(v35, bool)) or (isinstance(v35, float) and v35.is_integer()))):
+                                yield SchemaError(repr(v35) + " is not of type 'integer'", path + ('midi', 'programChange', 'max'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'properties', 'max', 'type'), 'type', v35)
+                            if (isinstance(v35, (int, float)) and not isinstance(v35, bool)) and v35 < 0:
+                                yield SchemaError(repr(v35) + ' is less than the minimum of 0', path + ('midi', 'programChange', 'max'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'properties', 'max', 'minimum'), 'minimum', v35)
+                            if (isinstance(v35, (int, float)) and not isinstance(v35, bool)) and v35 > 127:
+                                yield SchemaError(repr(v35) + ' is greater than the maximum of 127', path + ('midi', 'programChange', 'max'), schema_path + ('properties', 'midi', 'properties', 'programChange', 'properties', 'max', 'maximum'), 'maximum', v35)
+                if 'bank' in v14:
+                    v36 = v14['bank']
+                    if not (isinstance(v36, dict)):
+                        yield SchemaError(repr(v36) + " is not of type 'object'", path + ('midi', 'bank'), schema_path + ('properties', 'midi', 'properties', 'bank', 'type'), 'type', v36)
+                    if isinstance(v36, dict):
+                        if 'msb' in v36:
+                            v37 = v36['msb']
+                            if not (((isinstance(v37, int) and not isinstance(v37, bool)) or (isinstance(v37, float) and v37.is_integer()))):
+                                yield SchemaError(repr(v37) + " is not of type 'integer'", path + ('midi', 'bank', 'msb'), schema_path + ('properties', 'midi', 'properties', 'bank', 'properties', 'msb', 'type'), 'type', v37)
+                            if (isinstance(v37, (int, float)) and not isinstance(v37, bool)) and v37 < 0:
+                                yield SchemaError(repr(v37) + ' is less than the minimum of 0', path + ('midi', 'bank', 'msb'), schema_path + ('properties', 'midi', 'properties', 'bank', 'properties', 'msb', 'minimum'), 'minimum', v37)
+                            if (isinstance(v37, (int, float)) and not isinstance(v37, bool)) and v37 > 127:
+                                yield SchemaError(repr(v37) + ' is greater than the maximum of 127', path + ('midi', 'bank', 'msb'), schema_path + ('properties', 'midi', 'properties', 'bank', 'properties', 'msb', 'maximum'), 'maximum', v37)
+                        if 'lsb' in v36:
+                            v38 = v36['lsb']
+                            if not (((isinstance(v38, int) and not isinstance(v38, bool)) or (isinstance(v38, float) and v38.is_integer()))):
+                                yield SchemaError(repr(v38) + " is not of type 'integer'", path + ('midi', 'bank', 'lsb'), schema_path + ('properties', 'midi', 'properties', 'bank', 'properties', 'lsb', 'type'), 'type', v38)
+                            if (isinstance(v38, (int, float)) and not isinstance(v38, bool)) and v38 < 0:
+                                yield SchemaError(repr(v38) + ' is less than the minimum of 0', path + ('midi', 'bank', 'lsb'), schema_path + ('properties', 'midi', 'properties', 'bank', 'properties', 'lsb', 'minimum'), 'minimum', v38)
+                            if (isinstance(v38, (int, float)) and not isinstance(v38, bool)) and v38 > 127:
+                                yield SchemaError(repr(v38) + ' is greater than the maximum of 127', path + ('midi', 'bank', 'lsb'), schema_path + ('properties', 'midi', 'properties', 'bank', 'properties', 'lsb', 'maximum'), 'maximum', v38)
+            if isinstance(v14, dict):
+                if 'ccMap' not in v14:
+                    yield SchemaError("'ccMap' is a required property", path + ('midi',), schema_path + ('properties', 'midi', 'required'), 'required', v14)
+        if 'ui' in instance:
+            v39 = instance['ui']
+            if not (isinstance(v39, dict)):
+                yield SchemaError(repr(v39) + " is not of type 'object'", path + ('ui',), schema_path + ('properties', 'ui', 'type'), 'type', v39)
+            if isinstance(v39, dict):
+                if 'panel' in v39:
+                    v40 = v39['panel']
+                    if not (isinstance(v40, list)):
+                        yield SchemaError(repr(v40) + " is not of type 'array'", path + ('ui', 'panel'), schema_path + ('properties', 'ui', 'properties', 'panel', 'type'), 'type', v40)
+                    if isinstance(v40, list):
+                        for i41, v42 in enumerate(v40):
+                            if not (isinstance(v42, dict)):
+                                yield SchemaError(repr(v42) + " is not of type 'object'", path + ('ui', 'panel', i41), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'type'), 'type', v42)
+                            if isinstance(v42, dict):
+                                if 'name' in v42:
+                                    v43 = v42['name']
+                                    if not (isinstance(v43, str)):
+                                        yield SchemaError(repr(v43) + " is not of type 'string'", path + ('ui', 'panel', i41, 'name'), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'name', 'type'), 'type', v43)
+                                if 'controls' in v42:
+                                    v44 = v42['controls']
+                                    if not (isinstance(v44, list)):
+                                        yield SchemaError(repr(v44) + " is not of type 'array'", path + ('ui', 'panel', i41, 'controls'), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'type'), 'type', v44)
+                                    if isinstance(v44, list):
+                                        for i45, v46 in enumerate(v44):
+                                            if not (isinstance(v46, dict)):
+                                                yield SchemaError(repr(v46) + " is not of type 'object'", path + ('ui', 'panel', i41, 'controls', i45), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'type'), 'type', v46)
+                                            if isinstance(v46, dict):
+                                                if 'param' in v46:
+                                                    v47 = v46['param']
+                                                    if not (isinstance(v47, str)):
+                                                        yield SchemaError(repr(v47) + " is not of type 'string'", path + ('ui', 'panel', i41, 'controls', i45, 'param'), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'properties', 'param', 'type'), 'type', v47)
+                                                if 'type' in v46:
+                                                    v48 = v46['type']
+                                                    if not (isinstance(v48, str)):
+                                                        yield SchemaError(repr(v48) + " is not of type 'string'", path + ('ui', 'panel', i41, 'controls', i45, 'type'), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'properties', 'type', 'type'), 'type', v48)
+                                                    if not (isinstance(v48, str) and v48 in _ENUM_7):
+                                                        yield SchemaError(repr(v48) + " is not one of ['knob', 'slider', 'switch', 'button']", path + ('ui', 'panel', i41, 'controls', i45, 'type'), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'properties', 'type', 'enum'), 'enum', v48)
+                                                if 'label' in v46:
+                                                    v49 = v46['label']
+                                                    if not (isinstance(v49, str)):
+                                                        yield SchemaError(repr(v49) + " is not of type 'string'", path + ('ui', 'panel', i41, 'controls', i45, 'label'), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'properties', 'label', 'type'), 'type', v49)
+                                            if isinstance(v46, dict):
+                                                if 'param' not in v46:
+                                                    yield SchemaError("'param' is a required property", path + ('ui', 'panel', i41, 'controls', i45), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'required'), 'required', v46)
+                                                if 'type' not in v46:
+                                                    yield SchemaError("'type' is a required property", path + ('ui', 'panel', i41, 'controls', i45), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'required'), 'required', v46)
+                                                if 'label' not in v46:
+                                                    yield SchemaError("'label' is a required property", path + ('ui', 'panel', i41, 'controls', i45), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'properties', 'controls', 'items', 'required'), 'required', v46)
+                            if isinstance(v42, dict):
+                                if 'name' not in v42:
+                                    yield SchemaError("'name' is a required property", path + ('ui', 'panel', i41), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'required'), 'required', v42)
+                                if 'controls' not in v42:
+                                    yield SchemaError("'controls' is a required property", path + ('ui', 'panel', i41), schema_path + ('properties', 'ui', 'properties', 'panel', 'items', 'required'), 'required', v42)
+        if 'sources' in instance:
+            v50 = instance['sources']
+            if not (isinstance(v50, list)):
+                yield SchemaError(repr(v50) + " is not of type 'array'", path + ('sources',), schema_path + ('properties', 'sources', 'type'), 'type', v50)
+            if isinstance(v50, list):
+                for i51, v52 in enumerate(v50):
+                    if not (isinstance(v52, dict)):
+                        yield SchemaError(repr(v52) + " is not of type 'object'", path + ('sources', i51), schema_path + ('properties', 'sources', 'items', 'type'), 'type', v52)
+                    if isinstance(v52, dict):
+                        if 'url' in v52:
+                            v53 = v52['url']
+                            if not (isinstance(v53, str)):
+                                yield SchemaError(repr(v53) + " is not of type 'string'", path + ('sources', i51, 'url'), schema_path + ('properties', 'sources', 'items', 'properties', 'url', 'type'), 'type', v53)
+                        if 'pages' in v52:
+                            v54 = v52['pages']
+                            if not (isinstance(v54, str)):
+                                yield SchemaError(repr(v54) + " is not of type 'string'", path + ('sources', i51, 'pages'), schema_path + ('properties', 'sources', 'items', 'properties', 'pages', 'type'), 'type', v54)
+                        if 'revision' in v52:
+                            v55 = v52['revision']
+                            if not (isinstance(v55, str)):
+                                yield SchemaError(repr(v55) + " is not of type 'string'", path + ('sources', i51, 'revision'), schema_path + ('properties', 'sources', 'items', 'properties', 'revision', 'type'), 'type', v55)
+                    if isinstance(v52, dict):
+                        if 'url' not in v52:
+                            yield SchemaError("'url' is a required property", path + ('sources', i51), schema_path + ('properties', 'sources', 'items', 'required'), 'required', v52)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'id' not in instance:
+            yield SchemaError("'id' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'name' not in instance:
+            yield SchemaError("'name' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'vendor' not in instance:
+            yield SchemaError("'vendor' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'model' not in instance:
+            yield SchemaError("'model' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'type' not in instance:
+            yield SchemaError("'type' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'midi' not in instance:
+            yield SchemaError("'midi' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_2(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """Pattern.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v56 = instance['schema']
+            if not (isinstance(v56, str)):
+                yield SchemaError(repr(v56) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v56)
+            if v56 != 'Pattern.v1':
+                yield SchemaError("'Pattern.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v56)
+        if 'id' in instance:
+            v57 = instance['id']
+            if not (isinstance(v57, str)):
+                yield SchemaError(repr(v57) + " is not of type 'string'", path + ('id',), schema_path + ('properties', 'id', 'type'), 'type', v57)
+        if 'name' in instance:
+            v58 = instance['name']
+            if not (isinstance(v58, str)):
+                yield SchemaError(repr(v58) + " is not of type 'string'", path + ('name',), schema_path + ('properties', 'name', 'type'), 'type', v58)
+        if 'targetMachine' in instance:
+            v59 = instance['targetMachine']
+            if not (isinstance(v59, str)):
+                yield SchemaError(repr(v59) + " is not of type 'string'", path + ('targetMachine',), schema_path + ('properties', 'targetMachine', 'type'), 'type', v59)
+            if isinstance(v59, str) and not _PATTERN_8.search(v59):
+                yield SchemaError(repr(v59) + " does not match '^[a-z]+\\\\.[a-z0-9]+$'", path + ('targetMachine',), schema_path + ('properties', 'targetMachine', 'pattern'), 'pattern', v59)
+        if 'lengthSteps' in instance:
+            v60 = instance['lengthSteps']
+            if not (((isinstance(v60, int) and not isinstance(v60, bool)) or (isinstance(v60, float) and v60.is_integer()))):
+                yield SchemaError(repr(v60) + " is not of type 'integer'", path + ('lengthSteps',), schema_path + ('properties', 'lengthSteps', 'type'), 'type', v60)
+            if not ((isinstance(v60, (int, float)) and not isinstance(v60, bool)) and v60 in _ENUM_9):
+                yield SchemaError(repr(v60) + ' is not one of [12, 16, 32, 48, 64, 68, 128, 256]', path + ('lengthSteps',), schema_path + ('properties', 'lengthSteps', 'enum'), 'enum', v60)
+        if 'resolutionPPQ' in instance:
+            v61 = instance['resolutionPPQ']
+            if not (((isinstance(v61, int) and not isinstance(v61, bool)) or (isinstance(v61, float) and v61.is_integer()))):
+                yield SchemaError(repr(v61) + " is not of type 'integer'", path + ('resolutionPPQ',), schema_path + ('properties', 'resolutionPPQ', 'type'), 'type', v61)
+            if not ((isinstance(v61, (int, float)) and not isinstance(v61, bool)) and v61 in _ENUM_10):
+                yield SchemaError(repr(v61) + ' is not one of [96, 192, 480]', path + ('resolutionPPQ',), schema_path + ('properties', 'resolutionPPQ', 'enum'), 'enum', v61)
+        if 'steps' in instance:
+            v62 = instance['steps']
+            if not (isinstance(v62, list)):
+                yield SchemaError(repr(v62) + " is not of type 'array'", path + ('steps',), schema_path + ('properties', 'steps', 'type'), 'type', v62)
+            if isinstance(v62, list):
+                for i63, v64 in enumerate(v62):
+                    if not (isinstance(v64, dict)):
+                        yield SchemaError(repr(v64) + " is not of type 'object'", path + ('steps', i63), schema_path + ('properties', 'steps', 'items', 'type'), 'type', v64)
+                    if isinstance(v64, dict):
+                        if 't' in v64:
+                            v65 = v64['t']
+                            if not (((isinstance(v65, int) and not isinstance(v65, bool)) or (isinstance(v65, float) and v65.is_integer()))):
+                                yield SchemaError(repr(v65) + " is not of type 'integer'", path + ('steps', i63, 't'), schema_path + ('properties', 'steps', 'items', 'properties', 't', 'type'), 'type', v65)
+                            if (isinstance(v65, (int, float)) and not isinstance(v65, bool)) and v65 < 0:
+                                yield SchemaError(repr(v65) + ' is less than the minimum of 0', path + ('steps', i63, 't'), schema_path + ('properties', 'steps', 'items', 'properties', 't', 'minimum'), 'minimum', v65)
+                        if 'note' in v64:
+                            v66 = v64['note']
+                            if not (((isinstance(v66, int) and not isinstance(v66, bool)) or (isinstance(v66, float) and v66.is_integer()))):
+                                yield SchemaError(repr(v66) + " is not of type 'integer'", path + ('steps', i63, 'note'), schema_path + ('properties', 'steps', 'items', 'properties', 'note', 'type'), 'type', v66)
+                            if (isinstance(v66, (int, float)) and not isinstance(v66, bool)) and v66 < 0:
+                                yield SchemaError(repr(v66) + ' is less than the minimum of 0', path + ('steps', i63, 'note'), schema_path + ('properties', 'steps', 'items', 'properties', 'note', 'minimum'), 'minimum', v66)
+                            if (isinstance(v66, (int, float)) and not isinstance(v66, bool)) and v66 > 127:
+                                yield SchemaError(repr(v66) + ' is greater than the maximum of 127', path + ('steps', i63, 'note'), schema_path + ('properties', 'steps', 'items', 'properties', 'note', 'maximum'), 'maximum', v66)
+                        if 'vel' in v64:
+                            v67 = v64['vel']
+                            if not (((isinstance(v67, int) and not isinstance(v67, bool)) or (isinstance(v67, float) and v67.is_integer()))):
+                                yield SchemaError(repr(v67) + " is not of type 'integer'", path + ('steps', i63, 'vel'), schema_path + ('properties', 'steps', 'items', 'properties', 'vel', 'type'), 'type', v67)
+                            if (isinstance(v67, (int, float)) and not isinstance(v67, bool)) and v67 < 0:
+                                yield SchemaError(repr(v67) + ' is less than the minimum of 0', path + ('steps', i63, 'vel'), schema_path + ('properties', 'steps', 'items', 'properties', 'vel', 'minimum'), 'minimum', v67)
+                            if (isinstance(v67, (int, float)) and not isinstance(v67, bool)) and v67 > 127:
+                                yield SchemaError(repr(v67) + ' is greater than the maximum of 127', path + ('steps', i63, 'vel'), schema_path + ('properties', 'steps', 'items', 'properties', 'vel', 'maximum'), 'maximum', v67)
+                        if 'duration' in v64:
+                            v68 = v64['duration']
+                            if not ((isinstance(v68, (int, float)) and not isinstance(v68, bool))):
+                                yield SchemaError(repr(v68) + " is not of type 'number'", path + ('steps', i63, 'duration'), schema_path + ('properties', 'steps', 'items', 'properties', 'duration', 'type'), 'type', v68)
+                            if (isinstance(v68, (int, float)) and not isinstance(v68, bool)) and v68 < 0:
+                                yield SchemaError(repr(v68) + ' is less than the minimum of 0', path + ('steps', i63, 'duration'), schema_path + ('properties', 'steps', 'items', 'properties', 'duration', 'minimum'), 'minimum', v68)
+                        if 'microTime' in v64:
+                            v69 = v64['microTime']
+                            if not (((isinstance(v69, int) and not isinstance(v69, bool)) or (isinstance(v69, float) and v69.is_integer()))):
+                                yield SchemaError(repr(v69) + " is not of type 'integer'", path + ('steps', i63, 'microTime'), schema_path + ('properties', 'steps', 'items', 'properties', 'microTime', 'type'), 'type', v69)
+                        if 'ratchet' in v64:
+                            v70 = v64['ratchet']
+                            if not (((isinstance(v70, int) and not isinstance(v70, bool)) or (isinstance(v70, float) and v70.is_integer()))):
+                                yield SchemaError(repr(v70) + " is not of type 'integer'", path + ('steps', i63, 'ratchet'), schema_path + ('properties', 'steps', 'items', 'properties', 'ratchet', 'type'), 'type', v70)
+                            if (isinstance(v70, (int, float)) and not isinstance(v70, bool)) and v70 < 1:
+                                yield SchemaError(repr(v70) + ' is less than the minimum of 1', path + ('steps', i63, 'ratchet'), schema_path + ('properties', 'steps', 'items', 'properties', 'ratchet', 'minimum'), 'minimum', v70)
+                        if 'prob' in v64:
+                            v71 = v64['prob']
+                            if not ((isinstance(v71, (int, float)) and not isinstance(v71, bool))):
+                                yield SchemaError(repr(v71) + " is not of type 'number'", path + ('steps', i63, 'prob'), schema_path + ('properties', 'steps', 'items', 'properties', 'prob', 'type'), 'type', v71)
+                            if (isinstance(v71, (int, float)) and not isinstance(v71, bool)) and v71 < 0:
+                                yield SchemaError(repr(v71) + ' is less than the minimum of 0', path + ('steps', i63, 'prob'), schema_path + ('properties', 'steps', 'items', 'properties', 'prob', 'minimum'), 'minimum', v71)
+                            if (isinstance(v71, (int, float)) and not isinstance(v71, bool)) and v71 > 1:
+                                yield SchemaError(repr(v71) + ' is greater than the maximum of 1', path + ('steps', i63, 'prob'), schema_path + ('properties', 'steps', 'items', 'properties', 'prob', 'maximum'), 'maximum', v71)
+                        if 'slide' in v64:
+                            v72 = v64['slide']
+                            if not (isinstance(v72, bool)):
+                                yield SchemaError(repr(v72) + " is not of type 'boolean'", path + ('steps', i63, 'slide'), schema_path + ('properties', 'steps', 'items', 'properties', 'slide', 'type'), 'type', v72)
+                        if 'accent' in v64:
+                            v73 = v64['accent']
+                            if not (isinstance(v73, bool)):
+                                yield SchemaError(repr(v73) + " is not of type 'boolean'", path + ('steps', i63, 'accent'), schema_path + ('properties', 'steps', 'items', 'properties', 'accent', 'type'), 'type', v73)
+                    if isinstance(v64, dict):
+                        if 't' not in v64:
+                            yield SchemaError("'t' is a required property", path + ('steps', i63), schema_path + ('properties', 'steps', 'items', 'required'), 'required', v64)
+                        if 'note' not in v64:
+                            yield SchemaError("'note' is a required property", path + ('steps', i63), schema_path + ('properties', 'steps', 'items', 'required'), 'required', v64)
+                        if 'vel' not in v64:
+                            yield SchemaError("'vel' is a required property", path + ('steps', i63), schema_path + ('properties', 'steps', 'items', 'required'), 'required', v64)
+        if 'automation' in instance:
+            v74 = instance['automation']
+            if not (isinstance(v74, list)):
+                yield SchemaError(repr(v74) + " is not of type 'array'", path + ('automation',), schema_path + ('properties', 'automation', 'type'), 'type', v74)
+            if isinstance(v74, list):
+                for i75, v76 in enumerate(v74):
+                    if not (isinstance(v76, dict)):
+                        yield SchemaError(repr(v76) + " is not of type 'object'", path + ('automation', i75), schema_path + ('properties', 'automation', 'items', 'type'), 'type', v76)
+                    if isinstance(v76, dict):
+                        if 'target' in v76:
+                            v77 = v76['target']
+                            if not (isinstance(v77, str)):
+                                yield SchemaError(repr(v77) + " is not of type 'string'", path + ('automation', i75, 'target'), schema_path + ('properties', 'automation', 'items', 'properties', 'target', 'type'), 'type', v77)
+                        if 'at' in v76:
+                            v78 = v76['at']
+                            if not ((isinstance(v78, (int, float)) and not isinstance(v78, bool))):
+                                yield SchemaError(repr(v78) + " is not of type 'number'", path + ('automation', i75, 'at'), schema_path + ('properties', 'automation', 'items', 'properties', 'at', 'type'), 'type', v78)
+                            if (isinstance(v78, (int, float)) and not isinstance(v78, bool)) and v78 < 0:
+                                yield SchemaError(repr(v78) + ' is less than the minimum of 0', path + ('automation', i75, 'at'), schema_path + ('properties', 'automation', 'items', 'properties', 'at', 'minimum'), 'minimum', v78)
+                        if 'val' in v76:
+                            v79 = v76['val']
+                            if not ((isinstance(v79, (int, float)) and not isinstance(v79, bool))):
+                                yield SchemaError(repr(v79) + " is not of type 'number'", path + ('automation', i75, 'val'), schema_path + ('properties', 'automation', 'items', 'properties', 'val', 'type'), 'type', v79)
+                            if (isinstance(v79, (int, float)) and not isinstance(v79, bool)) and v79 < 0:
+                                yield SchemaError(repr(v79) + ' is less than the minimum of 0', path + ('automation', i75, 'val'), schema_path + ('properties', 'automation', 'items', 'properties', 'val', 'minimum'), 'minimum', v79)
+                            if (isinstance(v79, (int, float)) and not isinstance(v79, bool)) and v79 > 1:
+                                yield SchemaError(repr(v79) + ' is greater than the maximum of 1', path + ('automation', i75, 'val'), schema_path + ('properties', 'automation', 'items', 'properties', 'val', 'maximum'), 'maximum', v79)
+                        if 'easing' in v76:
+                            v80 = v76['easing']
+                            if not (isinstance(v80, str)):
+                                yield SchemaError(repr(v80) + " is not of type 'string'", path + ('automation', i75, 'easing'), schema_path + ('properties', 'automation', 'items', 'properties', 'easing', 'type'), 'type', v80)
+                            if not (isinstance(v80, str) and v80 in _ENUM_11):
+                                yield SchemaError(repr(v80) + " is not one of ['lin', 'log', 'exp', 'smooth']", path + ('automation', i75, 'easing'), schema_path + ('properties', 'automation', 'items', 'properties', 'easing', 'enum'), 'enum', v80)
+                        if 'duration' in v76:
+                            v81 = v76['duration']
+                            if not ((isinstance(v81, (int, float)) and not isinstance(v81, bool))):
+                                yield SchemaError(repr(v81) + " is not of type 'number'", path + ('automation', i75, 'duration'), schema_path + ('properties', 'automation', 'items', 'properties', 'duration', 'type'), 'type', v81)
+                            if (isinstance(v81, (int, float)) and not isinstance(v81, bool)) and v81 < 0:
+                                yield SchemaError(repr(v81) + ' is less than the minimum of 0', path + ('automation', i75, 'duration'), schema_path + ('properties', 'automation', 'items', 'properties', 'duration', 'minimum'), 'minimum', v81)
+                    if isinstance(v76, dict):
+                        if 'target' not in v76:
+                            yield SchemaError("'target' is a required property", path + ('automation', i75), schema_path + ('properties', 'automation', 'items', 'required'), 'required', v76)
+                        if 'at' not in v76:
+                            yield SchemaError("'at' is a required property", path + ('automation', i75), schema_path + ('properties', 'automation', 'items', 'required'), 'required', v76)
+                        if 'val' not in v76:
+                            yield SchemaError("'val' is a required property", path + ('automation', i75), schema_path + ('properties', 'automation', 'items', 'required'), 'required', v76)
+        if 'swing' in instance:
+            v82 = instance['swing']
+            if not ((isinstance(v82, (int, float)) and not isinstance(v82, bool))):
+                yield SchemaError(repr(v82) + " is not of type 'number'", path + ('swing',), schema_path + ('properties', 'swing', 'type'), 'type', v82)
+            if (isinstance(v82, (int, float)) and not isinstance(v82, bool)) and v82 < 0:
+                yield SchemaError(repr(v82) + ' is less than the minimum of 0', path + ('swing',), schema_path + ('properties', 'swing', 'minimum'), 'minimum', v82)
+            if (isinstance(v82, (int, float)) and not isinstance(v82, bool)) and v82 > 1:
+                yield SchemaError(repr(v82) + ' is greater than the maximum of 1', path + ('swing',), schema_path + ('properties', 'swing', 'maximum'), 'maximum', v82)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'id' not in instance:
+            yield SchemaError("'id' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'targetMachine' not in instance:
+            yield SchemaError("'targetMachine' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'lengthSteps' not in instance:
+            yield SchemaError("'lengthSteps' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'resolutionPPQ' not in instance:
+            yield SchemaError("'resolutionPPQ' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'steps' not in instance:
+            yield SchemaError("'steps' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_3(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """ProjectState.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v83 = instance['schema']
+            if not (isinstance(v83, str)):
+                yield SchemaError(repr(v83) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v83)
+            if v83 != 'ProjectState.v1':
+                yield SchemaError("'ProjectState.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v83)
+        if 'meta' in instance:
+            v84 = instance['meta']
+            if not (isinstance(v84, dict)):
+                yield SchemaError(repr(v84) + " is not of type 'object'", path + ('meta',), schema_path + ('properties', 'meta', 'type'), 'type', v84)
+            if isinstance(v84, dict):
+                if 'name' in v84:
+                    v85 = v84['name']
+                    if not (isinstance(v85, str)):
+                        yield SchemaError(repr(v85) + " is not of type 'string'", path + ('meta', 'name'), schema_path + ('properties', 'meta', 'properties', 'name', 'type'), 'type', v85)
+                if 'bpm' in v84:
+                    v86 = v84['bpm']
+                    if not ((isinstance(v86, (int, float)) and not isinstance(v86, bool))):
+                        yield SchemaError(repr(v86) + " is not of type 'number'", path + ('meta', 'bpm'), schema_path + ('properties', 'meta', 'properties', 'bpm', 'type'), 'type', v86)
+                    if (isinstance(v86, (int, float)) and not isinstance(v86, bool)) and v86 < 20:
+                        yield SchemaError(repr(v86) + ' is less than the minimum of 20', path + ('meta', 'bpm'), schema_path + ('properties', 'meta', 'properties', 'bpm', 'minimum'), 'minimum', v86)
+                    if (isinstance(v86, (int, float)) and not isinstance(v86, bool)) and v86 > 300:
+                        yield SchemaError(repr(v86) + ' is greater than the maximum of 300', path + ('meta', 'bpm'), schema_path + ('properties', 'meta', 'properties', 'bpm', 'maximum'), 'maximum', v86)
+                if 'signature' in v84:
+                    v87 = v84['signature']
+                    if not (isinstance(v87, str)):
+                        yield SchemaError(repr(v87) + " is not of type 'string'", path + ('meta', 'signature'), schema_path + ('properties', 'meta', 'properties', 'signature', 'type'), 'type', v87)
+                    if isinstance(v87, str) and not _PATTERN_12.search(v87):
+                        yield SchemaError(repr(v87) + " does not match '^[0-9]+/[0-9]+$'", path + ('meta', 'signature'), schema_path + ('properties', 'meta', 'properties', 'signature', 'pattern'), 'pattern', v87)
+                if 'ppq' in v84:
+                    v88 = v84['ppq']
+                    if not (((isinstance(v88, int) and not isinstance(v88, bool)) or (isinstance(v88, float) and v88.is_integer()))):
+                        yield SchemaError(repr(v88) + " is not of type 'integer'", path + ('meta', 'ppq'), schema_path + ('properties', 'meta', 'properties', 'ppq', 'type'), 'type', v88)
+                    if not ((isinstance(v88, (int, float)) and not isinstance(v88, bool)) and v88 in _ENUM_13):
+                        yield SchemaError(repr(v88) + ' is not one of [96, 192, 480]', path + ('meta', 'ppq'), schema_path + ('properties', 'meta', 'properties', 'ppq', 'enum'), 'enum', v88)
+                if 'created' in v84:
+                    v89 = v84['created']
+                    if not (isinstance(v89, str)):
+                        yield SchemaError(repr(v89) + " is not of type 'string'", path + ('meta', 'created'), schema_path + ('properties', 'meta', 'properties', 'created', 'type'), 'type', v89)
+                if 'modified' in v84:
+                    v90 = v84['modified']
+                    if not (isinstance(v90, str)):
+                        yield SchemaError(repr(v90) + " is not of type 'string'", path + ('meta', 'modified'), schema_path + ('properties', 'meta', 'properties', 'modified', 'type'), 'type', v90)
+            if isinstance(v84, dict):
+                if 'bpm' not in v84:
+                    yield SchemaError("'bpm' is a required property", path + ('meta',), schema_path + ('properties', 'meta', 'required'), 'required', v84)
+                if 'signature' not in v84:
+                    yield SchemaError("'signature' is a required property", path + ('meta',), schema_path + ('properties', 'meta', 'required'), 'required', v84)
+                if 'ppq' not in v84:
+                    yield SchemaError("'ppq' is a required property", path + ('meta',), schema_path + ('properties', 'meta', 'required'), 'required', v84)
+        if 'machines' in instance:
+            v91 = instance['machines']
+            if not (isinstance(v91, list)):
+                yield SchemaError(repr(v91) + " is not of type 'array'", path + ('machines',), schema_path + ('properties', 'machines', 'type'), 'type', v91)
+            if isinstance(v91, list):
+                for i92, v93 in enumerate(v91):
+                    if not (isinstance(v93, dict)):
+                        yield SchemaError(repr(v93) + " is not of type 'object'", path + ('machines', i92), schema_path + ('properties', 'machines', 'items', 'type'), 'type', v93)
+                    if isinstance(v93, dict):
+                        if 'id' in v93:
+                            v94 = v93['id']
+                            if not (isinstance(v94, str)):
+                                yield SchemaError(repr(v94) + " is not of type 'string'", path + ('machines', i92, 'id'), schema_path + ('properties', 'machines', 'items', 'properties', 'id', 'type'), 'type', v94)
+                            if isinstance(v94, str) and not _PATTERN_14.search(v94):
+                                yield SchemaError(repr(v94) + " does not match '^[a-z]+\\\\.[a-z0-9]+$'", path + ('machines', i92, 'id'), schema_path + ('properties', 'machines', 'items', 'properties', 'id', 'pattern'), 'pattern', v94)
+                        if 'instanceId' in v93:
+                            v95 = v93['instanceId']
+                            if not (isinstance(v95, str)):
+                                yield SchemaError(repr(v95) + " is not of type 'string'", path + ('machines', i92, 'instanceId'), schema_path + ('properties', 'machines', 'items', 'properties', 'instanceId', 'type'), 'type', v95)
+                        if 'midiChannel' in v93:
+                            v96 = v93['midiChannel']
+                            if not (((isinstance(v96, int) and not isinstance(v96, bool)) or (isinstance(v96, float) and v96.is_integer()))):
+                                yield SchemaError(repr(v96) + " is not of type 'integer'", path + ('machines', i92, 'midiChannel'), schema_path + ('properties', 'machines', 'items', 'properties', 'midiChannel', 'type'), 'type', v96)
+                            if (isinstance(v96, (int, float)) and not isinstance(v96, bool)) and v96 < 1:
+                                yield SchemaError(repr(v96) + ' is less than the minimum of 1', path + ('machines', i92, 'midiChannel'), schema_path + ('properties', 'machines', 'items', 'properties', 'midiChannel', 'minimum'), 'minimum', v96)
+                            if (isinstance(v96, (int, float)) and not isinstance(v96, bool)) and v96 > 16:
+                                yield SchemaError(repr(v96) + ' is greater than the maximum of 16', path + ('machines', i92, 'midiChannel'), schema_path + ('properties', 'machines', 'items', 'properties', 'midiChannel', 'maximum'), 'maximum', v96)
+                        if 'position' in v93:
+                            v97 = v93['position']
+                            if not (isinstance(v97, dict)):
+                                yield SchemaError(repr(v97) + " is not of type 'object'", path + ('machines', i92, 'position'), schema_path + ('properties', 'machines', 'items', 'properties', 'position', 'type'), 'type', v97)
+                            if isinstance(v97, dict):
+                                if 'x' in v97:
+                                    v98 = v97['x']
+                                    if not ((isinstance(v98, (int, float)) and not isinstance(v98, bool))):
+                                        yield SchemaError(repr(v98) + " is not of type 'number'", path + ('machines', i92, 'position', 'x'), schema_path + ('properties', 'machines', 'items', 'properties', 'position', 'properties', 'x', 'type'), 'type', v98)
+                                if 'y' in v97:
+                                    v99 = v97['y']
+                                    if not ((isinstance(v99, (int, float)) and not isinstance(v99, bool))):
+                                        yield SchemaError(repr(v99) + " is not of type 'number'", path + ('machines', i92, 'position', 'y'), schema_path + ('properties', 'machines', 'items', 'properties', 'position', 'properties', 'y', 'type'), 'type', v99)
+                            if isinstance(v97, dict):
+                                if 'x' not in v97:
+                                    yield SchemaError("'x' is a required property", path + ('machines', i92, 'position'), schema_path + ('properties', 'machines', 'items', 'properties', 'position', 'required'), 'required', v97)
+                                if 'y' not in v97:
+                                    yield SchemaError("'y' is a required property", path + ('machines', i92, 'position'), schema_path + ('properties', 'machines', 'items', 'properties', 'position', 'required'), 'required', v97)
+                        if 'params' in v93:
+                            v100 = v93['params']
+                            if not (isinstance(v100, dict)):
+                                yield SchemaError(repr(v100) + " is not of type 'object'", path + ('machines', i92, 'params'), schema_path + ('properties', 'machines', 'items', 'properties', 'params', 'type'), 'type', v100)
+                            if isinstance(v100, dict):
+                                for k101, v102 in v100.items():
+                                    if _PATTERN_15.search(k101):
+                                        if not ((isinstance(v102, (int, float)) and not isinstance(v102, bool))):
+                                            yield SchemaError(repr(v102) + " is not of type 'number'", path + ('machines', i92, 'params', k101), schema_path + ('properties', 'machines', 'items', 'properties', 'params', 'patternProperties', '^[a-zA-Z_][a-zA-Z0-9_]*$', 'type'), 'type', v102)
+                                        if (isinstance(v102, (int, float)) and not isinstance(v102, bool)) and v102 < 0:
+                                            yield SchemaError(repr(v102) + ' is less than the minimum of 0', path + ('machines', i92, 'params', k101), schema_path + ('properties', 'machines', 'items', 'properties', 'params', 'patternProperties', '^[a-zA-Z_][a-zA-Z0-9_]*$', 'minimum'), 'minimum', v102)
+                                        if (isinstance(v102, (int, float)) and not isinstance(v102, bool)) and v102 > 1:
+                                            yield SchemaError(repr(v102) + ' is greater than the maximum of 1', path + ('machines', i92, 'params', k101), schema_path + ('properties', 'machines', 'items', 'properties', 'params', 'patternProperties', '^[a-zA-Z_][a-zA-Z0-9_]*$', 'maximum'), 'maximum', v102)
+                    if isinstance(v93, dict):
+                        if 'id' not in v93:
+                            yield SchemaError("'id' is a required property", path + ('machines', i92), schema_path + ('properties', 'machines', 'items', 'required'), 'required', v93)
+                        if 'instanceId' not in v93:
+                            yield SchemaError("'instanceId' is a required property", path + ('machines', i92), schema_path + ('properties', 'machines', 'items', 'required'), 'required', v93)
+                        if 'midiChannel' not in v93:
+                            yield SchemaError("'midiChannel' is a required property", path + ('machines', i92), schema_path + ('properties', 'machines', 'items', 'required'), 'required', v93)
+                        if 'position' not in v93:
+                            yield SchemaError("'position' is a required property", path + ('machines', i92), schema_path + ('properties', 'machines', 'items', 'required'), 'required', v93)
+        if 'patterns' in instance:
+            v103 = instance['patterns']
+            if not (isinstance(v103, list)):
+                yield SchemaError(repr(v103) + " is not of type 'array'", path + ('patterns',), schema_path + ('properties', 'patterns', 'type'), 'type', v103)
+            if isinstance(v103, list):
+                for i104, v105 in enumerate(v103):
+                    yield from _validate_2(v105, path + ('patterns', i104), schema_path + ('properties', 'patterns', 'items'))
+        if 'routing' in instance:
+            v106 = instance['routing']
+            if not (isinstance(v106, list)):
+                yield SchemaError(repr(v106) + " is not of type 'array'", path + ('routing',), schema_path + ('properties', 'routing', 'type'), 'type', v106)
+            if isinstance(v106, list):
+                for i107, v108 in enumerate(v106):
+                    if not (isinstance(v108, dict)):
+                        yield SchemaError(repr(v108) + " is not of type 'object'", path + ('routing', i107), schema_path + ('properties', 'routing', 'items', 'type'), 'type', v108)
+                    if isinstance(v108, dict):
+                        if 'instanceId' in v108:
+                            v109 = v108['instanceId']
+                            if not (isinstance(v109, str)):
+                                yield SchemaError(repr(v109) + " is not of type 'string'", path + ('routing', i107, 'instanceId'), schema_path + ('properties', 'routing', 'items', 'properties', 'instanceId', 'type'), 'type', v109)
+                        if 'midiChannel' in v108:
+                            v110 = v108['midiChannel']
+                            if not (((isinstance(v110, int) and not isinstance(v110, bool)) or (isinstance(v110, float) and v110.is_integer()))):
+                                yield SchemaError(repr(v110) + " is not of type 'integer'", path + ('routing', i107, 'midiChannel'), schema_path + ('properties', 'routing', 'items', 'properties', 'midiChannel', 'type'), 'type', v110)
+                            if (isinstance(v110, (int, float)) and not isinstance(v110, bool)) and v110 < 1:
+                                yield SchemaError(repr(v110) + ' is less than the minimum of 1', path + ('routing', i107, 'midiChannel'), schema_path + ('properties', 'routing', 'items', 'properties', 'midiChannel', 'minimum'), 'minimum', v110)
+                            if (isinstance(v110, (int, float)) and not isinstance(v110, bool)) and v110 > 16:
+                                yield SchemaError(repr(v110) + ' is greater than the maximum of 16', path + ('routing', i107, 'midiChannel'), schema_path + ('properties', 'routing', 'items', 'properties', 'midiChannel', 'maximum'), 'maximum', v110)
+                        if 'trackName' in v108:
+                            v111 = v108['trackName']
+                            if not (isinstance(v111, str)):
+                                yield SchemaError(repr(v111) + " is not of type 'string'", path + ('routing', i107, 'trackName'), schema_path + ('properties', 'routing', 'items', 'properties', 'trackName', 'type'), 'type', v111)
+                    if isinstance(v108, dict):
+                        if 'instanceId' not in v108:
+                            yield SchemaError("'instanceId' is a required property", path + ('routing', i107), schema_path + ('properties', 'routing', 'items', 'required'), 'required', v108)
+                        if 'midiChannel' not in v108:
+                            yield SchemaError("'midiChannel' is a required property", path + ('routing', i107), schema_path + ('properties', 'routing', 'items', 'required'), 'required', v108)
+        if 'arrangement' in instance:
+            v112 = instance['arrangement']
+            if not (isinstance(v112, dict)):
+                yield SchemaError(repr(v112) + " is not of type 'object'", path + ('arrangement',), schema_path + ('properties', 'arrangement', 'type'), 'type', v112)
+            if isinstance(v112, dict):
+                if 'sections' in v112:
+                    v113 = v112['sections']
+                    if not (isinstance(v113, list)):
+                        yield SchemaError(repr(v113) + " is not of type 'array'", path + ('arrangement', 'sections'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'type'), 'type', v113)
+                    if isinstance(v113, list):
+                        for i114, v115 in enumerate(v113):
+                            if not (isinstance(v115, dict)):
+                                yield SchemaError(repr(v115) + " is not of type 'object'", path + ('arrangement', 'sections', i114), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'type'), 'type', v115)
+                            if isinstance(v115, dict):
+                                if 'name' in v115:
+                                    v116 = v115['name']
+                                    if not (isinstance(v116, str)):
+                                        yield SchemaError(repr(v116) + " is not of type 'string'", path + ('arrangement', 'sections', i114, 'name'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'name', 'type'), 'type', v116)
+                                if 'bars' in v115:
+                                    v117 = v115['bars']
+                                    if not (((isinstance(v117, int) and not isinstance(v117, bool)) or (isinstance(v117, float) and v117.is_integer()))):
+                                        yield SchemaError(repr(v117) + " is not of type 'integer'", path + ('arrangement', 'sections', i114, 'bars'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'bars', 'type'), 'type', v117)
+                                    if (isinstance(v117, (int, float)) and not isinstance(v117, bool)) and v117 < 1:
+                                        yield SchemaError(repr(v117) + ' is less than the minimum of 1', path + ('arrangement', 'sections', i114, 'bars'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'bars', 'minimum'), 'minimum', v117)
+                                if 'bpm' in v115:
+                                    v118 = v115['bpm']
+                                    if not ((isinstance(v118, (int, float)) and not isinstance(v118, bool))):
+                                        yield SchemaError(repr(v118) + " is not of type 'number'", path + ('arrangement', 'sections', i114, 'bpm'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'bpm', 'type'), 'type', v118)
+                                    if (isinstance(v118, (int, float)) and not isinstance(v118, bool)) and v118 < 20:
+                                        yield SchemaError(repr(v118) + ' is less than the minimum of 20', path + ('arrangement', 'sections', i114, 'bpm'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'bpm', 'minimum'), 'minimum', v118)
+                                    if (isinstance(v118, (int, float)) and not isinstance(v118, bool)) and v118 > 300:
+                                        yield SchemaError(repr(v118) + ' is greater than the maximum of 300', path + ('arrangement', 'sections', i114, 'bpm'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'bpm', 'maximum'), 'maximum', v118)
+                                if 'signature' in v115:
+                                    v119 = v115['signature']
+                                    if not (isinstance(v119, str)):
+                                        yield SchemaError(repr(v119) + " is not of type 'string'", path + ('arrangement', 'sections', i114, 'signature'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'signature', 'type'), 'type', v119)
+                                    if isinstance(v119, str) and not _PATTERN_16.search(v119):
+                                        yield SchemaError(repr(v119) + " does not match '^[0-9]+/(1|2|4|8|16|32)$'", path + ('arrangement', 'sections', i114, 'signature'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'signature', 'pattern'), 'pattern', v119)
+                                if 'patterns' in v115:
+                                    v120 = v115['patterns']
+                                    if not (isinstance(v120, list)):
+                                        yield SchemaError(repr(v120) + " is not of type 'array'", path + ('arrangement', 'sections', i114, 'patterns'), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'patterns', 'type'), 'type', v120)
+                                    if isinstance(v120, list):
+                                        for i121, v122 in enumerate(v120):
+                                            if not (isinstance(v122, str)):
+                                                yield SchemaError(repr(v122) + " is not of type 'string'", path + ('arrangement', 'sections', i114, 'patterns', i121), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'properties', 'patterns', 'items', 'type'), 'type', v122)
+                            if isinstance(v115, dict):
+                                if 'name' not in v115:
+                                    yield SchemaError("'name' is a required property", path + ('arrangement', 'sections', i114), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'required'), 'required', v115)
+                                if 'bars' not in v115:
+                                    yield SchemaError("'bars' is a required property", path + ('arrangement', 'sections', i114), schema_path + ('properties', 'arrangement', 'properties', 'sections', 'items', 'required'), 'required', v115)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'meta' not in instance:
+            yield SchemaError("'meta' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'machines' not in instance:
+            yield SchemaError("'machines' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'patterns' not in instance:
+            yield SchemaError("'patterns' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'routing' not in instance:
+            yield SchemaError("'routing' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_4(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """ActionBatch.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v123 = instance['schema']
+            if not (isinstance(v123, str)):
+                yield SchemaError(repr(v123) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v123)
+            if v123 != 'ActionBatch.v1':
+                yield SchemaError("'ActionBatch.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v123)
+        if 'actions' in instance:
+            v124 = instance['actions']
+            if not (isinstance(v124, list)):
+                yield SchemaError(repr(v124) + " is not of type 'array'", path + ('actions',), schema_path + ('properties', 'actions', 'type'), 'type', v124)
+            if isinstance(v124, list):
+                for i125, v126 in enumerate(v124):
+                    if not (isinstance(v126, dict)):
+                        yield SchemaError(repr(v126) + " is not of type 'object'", path + ('actions', i125), schema_path + ('properties', 'actions', 'items', 'type'), 'type', v126)
+                    if isinstance(v126, dict):
+                        if 'schema' in v126:
+                            v127 = v126['schema']
+                            if not (isinstance(v127, str)):
+                                yield SchemaError(repr(v127) + " is not of type 'string'", path + ('actions', i125, 'schema'), schema_path + ('properties', 'actions', 'items', 'properties', 'schema', 'type'), 'type', v127)
+                            if not (isinstance(v127, str) and v127 in _ENUM_17):
+                                yield SchemaError(repr(v127) + " is not one of ['AddMachine.v1', 'CreatePattern.v1', 'SetParam.v1', 'Arrange.v1', 'ExportPlan.v1']", path + ('actions', i125, 'schema'), schema_path + ('properties', 'actions', 'items', 'properties', 'schema', 'enum'), 'enum', v127)
+                    if isinstance(v126, dict):
+                        if 'schema' not in v126:
+                            yield SchemaError("'schema' is a required property", path + ('actions', i125), schema_path + ('properties', 'actions', 'items', 'required'), 'required', v126)
+            if isinstance(v124, list) and len(v124) < 1:
+                yield SchemaError(repr(v124) + ' should be non-empty', path + ('actions',), schema_path + ('properties', 'actions', 'minItems'), 'minItems', v124)
+        if 'explain' in instance:
+            v128 = instance['explain']
+            if not (isinstance(v128, str)):
+                yield SchemaError(repr(v128) + " is not of type 'string'", path + ('explain',), schema_path + ('properties', 'explain', 'type'), 'type', v128)
+            if isinstance(v128, str) and len(v128) > 200:
+                yield SchemaError(repr(v128) + ' is too long', path + ('explain',), schema_path + ('properties', 'explain', 'maxLength'), 'maxLength', v128)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'actions' not in instance:
+            yield SchemaError("'actions' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_5(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """AddMachine.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v129 = instance['schema']
+            if not (isinstance(v129, str)):
+                yield SchemaError(repr(v129) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v129)
+            if v129 != 'AddMachine.v1':
+                yield SchemaError("'AddMachine.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v129)
+        if 'machineId' in instance:
+            v130 = instance['machineId']
+            if not (isinstance(v130, str)):
+                yield SchemaError(repr(v130) + " is not of type 'string'", path + ('machineId',), schema_path + ('properties', 'machineId', 'type'), 'type', v130)
+            if isinstance(v130, str) and not _PATTERN_18.search(v130):
+                yield SchemaError(repr(v130) + " does not match '^[a-z]+\\\\.[a-z0-9]+$'", path + ('machineId',), schema_path + ('properties', 'machineId', 'pattern'), 'pattern', v130)
+        if 'instanceId' in instance:
+            v131 = instance['instanceId']
+            if not (isinstance(v131, str)):
+                yield SchemaError(repr(v131) + " is not of type 'string'", path + ('instanceId',), schema_path + ('properties', 'instanceId', 'type'), 'type', v131)
+        if 'midiChannel' in instance:
+            v132 = instance['midiChannel']
+            if not (((isinstance(v132, int) and not isinstance(v132, bool)) or (isinstance(v132, float) and v132.is_integer()))):
+                yield SchemaError(repr(v132) + " is not of type 'integer'", path + ('midiChannel',), schema_path + ('properties', 'midiChannel', 'type'), 'type', v132)
+            if (isinstance(v132, (int, float)) and not isinstance(v132, bool)) and v132 < 1:
+                yield SchemaError(repr(v132) + ' is less than the minimum of 1', path + ('midiChannel',), schema_path + ('properties', 'midiChannel', 'minimum'), 'minimum', v132)
+            if (isinstance(v132, (int, float)) and not isinstance(v132, bool)) and v132 > 16:
+                yield SchemaError(repr(v132) + ' is greater than the maximum of 16', path + ('midiChannel',), schema_path + ('properties', 'midiChannel', 'maximum'), 'maximum', v132)
+        if 'position' in instance:
+            v133 = instance['position']
+            if not (isinstance(v133, dict)):
+                yield SchemaError(repr(v133) + " is not of type 'object'", path + ('position',), schema_path + ('properties', 'position', 'type'), 'type', v133)
+            if isinstance(v133, dict):
+                if 'x' in v133:
+                    v134 = v133['x']
+                    if not ((isinstance(v134, (int, float)) and not isinstance(v134, bool))):
+                        yield SchemaError(repr(v134) + " is not of type 'number'", path + ('position', 'x'), schema_path + ('properties', 'position', 'properties', 'x', 'type'), 'type', v134)
+                if 'y' in v133:
+                    v135 = v133['y']
+                    if not ((isinstance(v135, (int, float)) and not isinstance(v135, bool))):
+                        yield SchemaError(repr(v135) + " is not of type 'number'", path + ('position', 'y'), schema_path + ('properties', 'position', 'properties', 'y', 'type'), 'type', v135)
+            if isinstance(v133, dict):
+                if 'x' not in v133:
+                    yield SchemaError("'x' is a required property", path + ('position',), schema_path + ('properties', 'position', 'required'), 'required', v133)
+                if 'y' not in v133:
+                    yield SchemaError("'y' is a required property", path + ('position',), schema_path + ('properties', 'position', 'required'), 'required', v133)
+        if 'explain' in instance:
+            v136 = instance['explain']
+            if not (isinstance(v136, str)):
+                yield SchemaError(repr(v136) + " is not of type 'string'", path + ('explain',), schema_path + ('properties', 'explain', 'type'), 'type', v136)
+            if isinstance(v136, str) and len(v136) > 200:
+                yield SchemaError(repr(v136) + ' is too long', path + ('explain',), schema_path + ('properties', 'explain', 'maxLength'), 'maxLength', v136)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'machineId' not in instance:
+            yield SchemaError("'machineId' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'midiChannel' not in instance:
+            yield SchemaError("'midiChannel' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'position' not in instance:
+            yield SchemaError("'position' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_6(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """Arrange.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v137 = instance['schema']
+            if not (isinstance(v137, str)):
+                yield SchemaError(repr(v137) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v137)
+            if v137 != 'Arrange.v1':
+                yield SchemaError("'Arrange.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v137)
+        if 'sections' in instance:
+            v138 = instance['sections']
+            if not (isinstance(v138, list)):
+                yield SchemaError(repr(v138) + " is not of type 'array'", path + ('sections',), schema_path + ('properties', 'sections', 'type'), 'type', v138)
+            if isinstance(v138, list):
+                for i139, v140 in enumerate(v138):
+                    if not (isinstance(v140, dict)):
+                        yield SchemaError(repr(v140) + " is not of type 'object'", path + ('sections', i139), schema_path + ('properties', 'sections', 'items', 'type'), 'type', v140)
+                    if isinstance(v140, dict):
+                        if 'name' in v140:
+                            v141 = v140['name']
+                            if not (isinstance(v141, str)):
+                                yield SchemaError(repr(v141) + " is not of type 'string'", path + ('sections', i139, 'name'), schema_path + ('properties', 'sections', 'items', 'properties', 'name', 'type'), 'type', v141)
+                        if 'bars' in v140:
+                            v142 = v140['bars']
+                            if not (((isinstance(v142, int) and not isinstance(v142, bool)) or (isinstance(v142, float) and v142.is_integer()))):
+                                yield SchemaError(repr(v142) + " is not of type 'integer'", path + ('sections', i139, 'bars'), schema_path + ('properties', 'sections', 'items', 'properties', 'bars', 'type'), 'type', v142)
+                            if (isinstance(v142, (int, float)) and not isinstance(v142, bool)) and v142 < 1:
+                                yield SchemaError(repr(v142) + ' is less than the minimum of 1', path + ('sections', i139, 'bars'), schema_path + ('properties', 'sections', 'items', 'properties', 'bars', 'minimum'), 'minimum', v142)
+                        if 'bpm' in v140:
+                            v143 = v140['bpm']
+                            if not ((isinstance(v143, (int, float)) and not isinstance(v143, bool))):
+                                yield SchemaError(repr(v143) + " is not of type 'number'", path + ('sections', i139, 'bpm'), schema_path + ('properties', 'sections', 'items', 'properties', 'bpm', 'type'), 'type', v143)
+                            if (isinstance(v143, (int, float)) and not isinstance(v143, bool)) and v143 < 20:
+                                yield SchemaError(repr(v143) + ' is less than the minimum of 20', path + ('sections', i139, 'bpm'), schema_path + ('properties', 'sections', 'items', 'properties', 'bpm', 'minimum'), 'minimum', v143)
+                            if (isinstance(v143, (int, float)) and not isinstance(v143, bool)) and v143 > 300:
+                                yield SchemaError(repr(v143) + ' is greater than the maximum of 300', path + ('sections', i139, 'bpm'), schema_path + ('properties', 'sections', 'items', 'properties', 'bpm', 'maximum'), 'maximum', v143)
+                        if 'signature' in v140:
+                            v144 = v140['signature']
+                            if not (isinstance(v144, str)):
+                                yield SchemaError(repr(v144) + " is not of type 'string'", path + ('sections', i139, 'signature'), schema_path + ('properties', 'sections', 'items', 'properties', 'signature', 'type'), 'type', v144)
+                            if isinstance(v144, str) and not _PATTERN_19.search(v144):
+                                yield SchemaError(repr(v144) + " does not match '^[0-9]+/(1|2|4|8|16|32)$'", path + ('sections', i139, 'signature'), schema_path + ('properties', 'sections', 'items', 'properties', 'signature', 'pattern'), 'pattern', v144)
+                        if 'patterns' in v140:
+                            v145 = v140['patterns']
+                            if not (isinstance(v145, list)):
+                                yield SchemaError(repr(v145) + " is not of type 'array'", path + ('sections', i139, 'patterns'), schema_path + ('properties', 'sections', 'items', 'properties', 'patterns', 'type'), 'type', v145)
+                            if isinstance(v145, list):
+                                for i146, v147 in enumerate(v145):
+                                    if not (isinstance(v147, str)):
+                                        yield SchemaError(repr(v147) + " is not of type 'string'", path + ('sections', i139, 'patterns', i146), schema_path + ('properties', 'sections', 'items', 'properties', 'patterns', 'items', 'type'), 'type', v147)
+                    if isinstance(v140, dict):
+                        if 'name' not in v140:
+                            yield SchemaError("'name' is a required property", path + ('sections', i139), schema_path + ('properties', 'sections', 'items', 'required'), 'required', v140)
+                        if 'bars' not in v140:
+                            yield SchemaError("'bars' is a required property", path + ('sections', i139), schema_path + ('properties', 'sections', 'items', 'required'), 'required', v140)
+            if isinstance(v138, list) and len(v138) < 1:
+                yield SchemaError(repr(v138) + ' should be non-empty', path + ('sections',), schema_path + ('properties', 'sections', 'minItems'), 'minItems', v138)
+        if 'explain' in instance:
+            v148 = instance['explain']
+            if not (isinstance(v148, str)):
+                yield SchemaError(repr(v148) + " is not of type 'string'", path + ('explain',), schema_path + ('properties', 'explain', 'type'), 'type', v148)
+            if isinstance(v148, str) and len(v148) > 200:
+                yield SchemaError(repr(v148) + ' is too long', path + ('explain',), schema_path + ('properties', 'explain', 'maxLength'), 'maxLength', v148)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'sections' not in instance:
+            yield SchemaError("'sections' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_7(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """CreatePattern.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v149 = instance['schema']
+            if not (isinstance(v149, str)):
+                yield SchemaError(repr(v149) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v149)
+            if v149 != 'CreatePattern.v1':
+                yield SchemaError("'CreatePattern.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v149)
+        if 'patternId' in instance:
+            v150 = instance['patternId']
+            if not (isinstance(v150, str)):
+                yield SchemaError(repr(v150) + " is not of type 'string'", path + ('patternId',), schema_path + ('properties', 'patternId', 'type'), 'type', v150)
+        if 'name' in instance:
+            v151 = instance['name']
+            if not (isinstance(v151, str)):
+                yield SchemaError(repr(v151) + " is not of type 'string'", path + ('name',), schema_path + ('properties', 'name', 'type'), 'type', v151)
+        if 'targetMachine' in instance:
+            v152 = instance['targetMachine']
+            if not (isinstance(v152, str)):
+                yield SchemaError(repr(v152) + " is not of type 'string'", path + ('targetMachine',), schema_path + ('properties', 'targetMachine', 'type'), 'type', v152)
+        if 'lengthSteps' in instance:
+            v153 = instance['lengthSteps']
+            if not (((isinstance(v153, int) and not isinstance(v153, bool)) or (isinstance(v153, float) and v153.is_integer()))):
+                yield SchemaError(repr(v153) + " is not of type 'integer'", path + ('lengthSteps',), schema_path + ('properties', 'lengthSteps', 'type'), 'type', v153)
+            if not ((isinstance(v153, (int, float)) and not isinstance(v153, bool)) and v153 in _ENUM_20):
+                yield SchemaError(repr(v153) + ' is not one of [12, 16, 32, 48, 64, 68, 128, 256]', path + ('lengthSteps',), schema_path + ('properties', 'lengthSteps', 'enum'), 'enum', v153)
+        if 'resolutionPPQ' in instance:
+            v154 = instance['resolutionPPQ']
+            if not (((isinstance(v154, int) and not isinstance(v154, bool)) or (isinstance(v154, float) and v154.is_integer()))):
+                yield SchemaError(repr(v154) + " is not of type 'integer'", path + ('resolutionPPQ',), schema_path + ('properties', 'resolutionPPQ', 'type'), 'type', v154)
+            if not ((isinstance(v154, (int, float)) and not isinstance(v154, bool)) and v154 in _ENUM_21):
+                yield SchemaError(repr(v154) + ' is not one of [96, 192, 480]', path + ('resolutionPPQ',), schema_path + ('properties', 'resolutionPPQ', 'enum'), 'enum', v154)
+        if 'steps' in instance:
+            v155 = instance['steps']
+            if not (isinstance(v155, list)):
+                yield SchemaError(repr(v155) + " is not of type 'array'", path + ('steps',), schema_path + ('properties', 'steps', 'type'), 'type', v155)
+            if isinstance(v155, list):
+                for i156, v157 in enumerate(v155):
+                    if not (isinstance(v157, dict)):
+                        yield SchemaError(repr(v157) + " is not of type 'object'", path + ('steps', i156), schema_path + ('properties', 'steps', 'items', 'type'), 'type', v157)
+                    if isinstance(v157, dict):
+                        if 't' in v157:
+                            v158 = v157['t']
+                            if not (((isinstance(v158, int) and not isinstance(v158, bool)) or (isinstance(v158, float) and v158.is_integer()))):
+                                yield SchemaError(repr(v158) + " is not of type 'integer'", path + ('steps', i156, 't'), schema_path + ('properties', 'steps', 'items', 'properties', 't', 'type'), 'type', v158)
+                            if (isinstance(v158, (int, float)) and not isinstance(v158, bool)) and v158 < 0:
+                                yield SchemaError(repr(v158) + ' is less than the minimum of 0', path + ('steps', i156, 't'), schema_path + ('properties', 'steps', 'items', 'properties', 't', 'minimum'), 'minimum', v158)
+                        if 'note' in v157:
+                            v159 = v157['note']
+                            if not (((isinstance(v159, int) and not isinstance(v159, bool)) or (isinstance(v159, float) and v159.is_integer()))):
+                                yield SchemaError(repr(v159) + " is not of type 'integer'", path + ('steps', i156, 'note'), schema_path + ('properties', 'steps', 'items', 'properties', 'note', 'type'), 'type', v159)
+                            if (isinstance(v159, (int, float)) and not isinstance(v159, bool)) and v159 < 0:
+                                yield SchemaError(repr(v159) + ' is less than the minimum of 0', path + ('steps', i156, 'note'), schema_path + ('properties', 'steps', 'items', 'properties', 'note', 'minimum'), 'minimum', v159)
+                            if (isinstance(v159, (int, float)) and not isinstance(v159, bool)) and v159 > 127:
+                                yield SchemaError(repr(v159) + ' is greater than the maximum of 127', path + ('steps', i156, 'note'), schema_path + ('properties', 'steps', 'items', 'properties', 'note', 'maximum'), 'maximum', v159)
+                        if 'vel' in v157:
+                            v160 = v157['vel']
+                            if not (((isinstance(v160, int) and not isinstance(v160, bool)) or (isinstance(v160, float) and v160.is_integer()))):
+                                yield SchemaError(repr(v160) + " is not of type 'integer'", path + ('steps', i156, 'vel'), schema_path + ('properties', 'steps', 'items', 'properties', 'vel', 'type'), 'type', v160)
+                            if (isinstance(v160, (int, float)) and not isinstance(v160, bool)) and v160 < 0:
+                                yield SchemaError(repr(v160) + ' is less than the minimum of 0', path + ('steps', i156, 'vel'), schema_path + ('properties', 'steps', 'items', 'properties', 'vel', 'minimum'), 'minimum', v160)
+                            if (isinstance(v160, (int, float)) and not isinstance(v160, bool)) and v160 > 127:
+                                yield SchemaError(repr(v160) + ' is greater than the maximum of 127', path + ('steps', i156, 'vel'), schema_path + ('properties', 'steps', 'items', 'properties', 'vel', 'maximum'), 'maximum', v160)
+                        if 'duration' in v157:
+                            v161 = v157['duration']
+                            if not ((isinstance(v161, (int, float)) and not isinstance(v161, bool))):
+                                yield SchemaError(repr(v161) + " is not of type 'number'", path + ('steps', i156, 'duration'), schema_path + ('properties', 'steps', 'items', 'properties', 'duration', 'type'), 'type', v161)
+                            if (isinstance(v161, (int, float)) and not isinstance(v161, bool)) and v161 < 0:
+                                yield SchemaError(repr(v161) + ' is less than the minimum of 0', path + ('steps', i156, 'duration'), schema_path + ('properties', 'steps', 'items', 'properties', 'duration', 'minimum'), 'minimum', v161)
+                        if 'microTime' in v157:
+                            v162 = v157['microTime']
+                            if not (((isinstance(v162, int) and not isinstance(v162, bool)) or (isinstance(v162, float) and v162.is_integer()))):
+                                yield SchemaError(repr(v162) + " is not of type 'integer'", path + ('steps', i156, 'microTime'), schema_path + ('properties', 'steps', 'items', 'properties', 'microTime', 'type'), 'type', v162)
+                        if 'ratchet' in v157:
+                            v163 = v157['ratchet']
+                            if not (((isinstance(v163, int) and not isinstance(v163, bool)) or (isinstance(v163, float) and v163.is_integer()))):
+                                yield SchemaError(repr(v163) + " is not of type 'integer'", path + ('steps', i156, 'ratchet'), schema_path + ('properties', 'steps', 'items', 'properties', 'ratchet', 'type'), 'type', v163)
+                            if (isinstance(v163, (int, float)) and not isinstance(v163, bool)) and v163 < 1:
+                                yield SchemaError(repr(v163) + ' is less than the minimum of 1', path + ('steps', i156, 'ratchet'), schema_path + ('properties', 'steps', 'items', 'properties', 'ratchet', 'minimum'), 'minimum', v163)
+                        if 'prob' in v157:
+                            v164 = v157['prob']
+                            if not ((isinstance(v164, (int, float)) and not isinstance(v164, bool))):
+                                yield SchemaError(repr(v164) + " is not of type 'number'", path + ('steps', i156, 'prob'), schema_path + ('properties', 'steps', 'items', 'properties', 'prob', 'type'), 'type', v164)
+                            if (isinstance(v164, (int, float)) and not isinstance(v164, bool)) and v164 < 0:
+                                yield SchemaError(repr(v164) + ' is less than the minimum of 0', path + ('steps', i156, 'prob'), schema_path + ('properties', 'steps', 'items', 'properties', 'prob', 'minimum'), 'minimum', v164)
+                            if (isinstance(v164, (int, float)) and not isinstance(v164, bool)) and v164 > 1:
+                                yield SchemaError(repr(v164) + ' is greater than the maximum of 1', path + ('steps', i156, 'prob'), schema_path + ('properties', 'steps', 'items', 'properties', 'prob', 'maximum'), 'maximum', v164)
+                        if 'slide' in v157:
+                            v165 = v157['slide']
+                            if not (isinstance(v165, bool)):
+                                yield SchemaError(repr(v165) + " is not of type 'boolean'", path + ('steps', i156, 'slide'), schema_path + ('properties', 'steps', 'items', 'properties', 'slide', 'type'), 'type', v165)
+                        if 'accent' in v157:
+                            v166 = v157['accent']
+                            if not (isinstance(v166, bool)):
+                                yield SchemaError(repr(v166) + " is not of type 'boolean'", path + ('steps', i156, 'accent'), schema_path + ('properties', 'steps', 'items', 'properties', 'accent', 'type'), 'type', v166)
+                    if isinstance(v157, dict):
+                        if 't' not in v157:
+                            yield SchemaError("'t' is a required property", path + ('steps', i156), schema_path + ('properties', 'steps', 'items', 'required'), 'required', v157)
+                        if 'note' not in v157:
+                            yield SchemaError("'note' is a required property", path + ('steps', i156), schema_path + ('properties', 'steps', 'items', 'required'), 'required', v157)
+                        if 'vel' not in v157:
+                            yield SchemaError("'vel' is a required property", path + ('steps', i156), schema_path + ('properties', 'steps', 'items', 'required'), 'required', v157)
+        if 'automation' in instance:
+            v167 = instance['automation']
+            if not (isinstance(v167, list)):
+                yield SchemaError(repr(v167) + " is not of type 'array'", path + ('automation',), schema_path + ('properties', 'automation', 'type'), 'type', v167)
+            if isinstance(v167, list):
+                for i168, v169 in enumerate(v167):
+                    if not (isinstance(v169, dict)):
+                        yield SchemaError(repr(v169) + " is not of type 'object'", path + ('automation', i168), schema_path + ('properties', 'automation', 'items', 'type'), 'type', v169)
+                    if isinstance(v169, dict):
+                        if 'target' in v169:
+                            v170 = v169['target']
+                            if not (isinstance(v170, str)):
+                                yield SchemaError(repr(v170) + " is not of type 'string'", path + ('automation', i168, 'target'), schema_path + ('properties', 'automation', 'items', 'properties', 'target', 'type'), 'type', v170)
+                        if 'at' in v169:
+                            v171 = v169['at']
+                            if not ((isinstance(v171, (int, float)) and not isinstance(v171, bool))):
+                                yield SchemaError(repr(v171) + " is not of type 'number'", path + ('automation', i168, 'at'), schema_path + ('properties', 'automation', 'items', 'properties', 'at', 'type'), 'type', v171)
+                            if (isinstance(v171, (int, float)) and not isinstance(v171, bool)) and v171 < 0:
+                                yield SchemaError(repr(v171) + ' is less than the minimum of 0', path + ('automation', i168, 'at'), schema_path + ('properties', 'automation', 'items', 'properties', 'at', 'minimum'), 'minimum', v171)
+                        if 'val' in v169:
+                            v172 = v169['val']
+                            if not ((isinstance(v172, (int, float)) and not isinstance(v172, bool))):
+                                yield SchemaError(repr(v172) + " is not of type 'number'", path + ('automation', i168, 'val'), schema_path + ('properties', 'automation', 'items', 'properties', 'val', 'type'), 'type', v172)
+                            if (isinstance(v172, (int, float)) and not isinstance(v172, bool)) and v172 < 0:
+                                yield SchemaError(repr(v172) + ' is less than the minimum of 0', path + ('automation', i168, 'val'), schema_path + ('properties', 'automation', 'items', 'properties', 'val', 'minimum'), 'minimum', v172)
+                            if (isinstance(v172, (int, float)) and not isinstance(v172, bool)) and v172 > 1:
+                                yield SchemaError(repr(v172) + ' is greater than the maximum of 1', path + ('automation', i168, 'val'), schema_path + ('properties', 'automation', 'items', 'properties', 'val', 'maximum'), 'maximum', v172)
+                        if 'easing' in v169:
+                            v173 = v169['easing']
+                            if not (isinstance(v173, str)):
+                                yield SchemaError(repr(v173) + " is not of type 'string'", path + ('automation', i168, 'easing'), schema_path + ('properties', 'automation', 'items', 'properties', 'easing', 'type'), 'type', v173)
+                            if not (isinstance(v173, str) and v173 in _ENUM_22):
+                                yield SchemaError(repr(v173) + " is not one of ['lin', 'log', 'exp', 'smooth']", path + ('automation', i168, 'easing'), schema_path + ('properties', 'automation', 'items', 'properties', 'easing', 'enum'), 'enum', v173)
+                        if 'duration' in v169:
+                            v174 = v169['duration']
+                            if not ((isinstance(v174, (int, float)) and not isinstance(v174, bool))):
+                                yield SchemaError(repr(v174) + " is not of type 'number'", path + ('automation', i168, 'duration'), schema_path + ('properties', 'automation', 'items', 'properties', 'duration', 'type'), 'type', v174)
+                            if (isinstance(v174, (int, float)) and not isinstance(v174, bool)) and v174 < 0:
+                                yield SchemaError(repr(v174) + ' is less than the minimum of 0', path + ('automation', i168, 'duration'), schema_path + ('properties', 'automation', 'items', 'properties', 'duration', 'minimum'), 'minimum', v174)
+                    if isinstance(v169, dict):
+                        if 'target' not in v169:
+                            yield SchemaError("'target' is a required property", path + ('automation', i168), schema_path + ('properties', 'automation', 'items', 'required'), 'required', v169)
+                        if 'at' not in v169:
+                            yield SchemaError("'at' is a required property", path + ('automation', i168), schema_path + ('properties', 'automation', 'items', 'required'), 'required', v169)
+                        if 'val' not in v169:
+                            yield SchemaError("'val' is a required property", path + ('automation', i168), schema_path + ('properties', 'automation', 'items', 'required'), 'required', v169)
+        if 'swing' in instance:
+            v175 = instance['swing']
+            if not ((isinstance(v175, (int, float)) and not isinstance(v175, bool))):
+                yield SchemaError(repr(v175) + " is not of type 'number'", path + ('swing',), schema_path + ('properties', 'swing', 'type'), 'type', v175)
+            if (isinstance(v175, (int, float)) and not isinstance(v175, bool)) and v175 < 0:
+                yield SchemaError(repr(v175) + ' is less than the minimum of 0', path + ('swing',), schema_path + ('properties', 'swing', 'minimum'), 'minimum', v175)
+            if (isinstance(v175, (int, float)) and not isinstance(v175, bool)) and v175 > 1:
+                yield SchemaError(repr(v175) + ' is greater than the maximum of 1', path + ('swing',), schema_path + ('properties', 'swing', 'maximum'), 'maximum', v175)
+        if 'explain' in instance:
+            v176 = instance['explain']
+            if not (isinstance(v176, str)):
+                yield SchemaError(repr(v176) + " is not of type 'string'", path + ('explain',), schema_path + ('properties', 'explain', 'type'), 'type', v176)
+            if isinstance(v176, str) and len(v176) > 200:
+                yield SchemaError(repr(v176) + ' is too long', path + ('explain',), schema_path + ('properties', 'explain', 'maxLength'), 'maxLength', v176)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'targetMachine' not in instance:
+            yield SchemaError("'targetMachine' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'lengthSteps' not in instance:
+            yield SchemaError("'lengthSteps' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'resolutionPPQ' not in instance:
+            yield SchemaError("'resolutionPPQ' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'steps' not in instance:
+            yield SchemaError("'steps' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_8(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """ExportPlan.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v177 = instance['schema']
+            if not (isinstance(v177, str)):
+                yield SchemaError(repr(v177) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v177)
+            if v177 != 'ExportPlan.v1':
+                yield SchemaError("'ExportPlan.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v177)
+        if 'bpm' in instance:
+            v178 = instance['bpm']
+            if not ((isinstance(v178, (int, float)) and not isinstance(v178, bool))):
+                yield SchemaError(repr(v178) + " is not of type 'number'", path + ('bpm',), schema_path + ('properties', 'bpm', 'type'), 'type', v178)
+            if (isinstance(v178, (int, float)) and not isinstance(v178, bool)) and v178 < 20:
+                yield SchemaError(repr(v178) + ' is less than the minimum of 20', path + ('bpm',), schema_path + ('properties', 'bpm', 'minimum'), 'minimum', v178)
+            if (isinstance(v178, (int, float)) and not isinstance(v178, bool)) and v178 > 300:
+                yield SchemaError(repr(v178) + ' is greater than the maximum of 300', path + ('bpm',), schema_path + ('properties', 'bpm', 'maximum'), 'maximum', v178)
+        if 'signature' in instance:
+            v179 = instance['signature']
+            if not (isinstance(v179, str)):
+                yield SchemaError(repr(v179) + " is not of type 'string'", path + ('signature',), schema_path + ('properties', 'signature', 'type'), 'type', v179)
+            if isinstance(v179, str) and not _PATTERN_23.search(v179):
+                yield SchemaError(repr(v179) + " does not match '^[0-9]+/[0-9]+$'", path + ('signature',), schema_path + ('properties', 'signature', 'pattern'), 'pattern', v179)
+        if 'tracks' in instance:
+            v180 = instance['tracks']
+            if not (isinstance(v180, list)):
+                yield SchemaError(repr(v180) + " is not of type 'array'", path + ('tracks',), schema_path + ('properties', 'tracks', 'type'), 'type', v180)
+            if isinstance(v180, list):
+                for i181, v182 in enumerate(v180):
+                    if not (isinstance(v182, dict)):
+                        yield SchemaError(repr(v182) + " is not of type 'object'", path + ('tracks', i181), schema_path + ('properties', 'tracks', 'items', 'type'), 'type', v182)
+                    if isinstance(v182, dict):
+                        if 'machine' in v182:
+                            v183 = v182['machine']
+                            if not (isinstance(v183, str)):
+                                yield SchemaError(repr(v183) + " is not of type 'string'", path + ('tracks', i181, 'machine'), schema_path + ('properties', 'tracks', 'items', 'properties', 'machine', 'type'), 'type', v183)
+                        if 'type' in v182:
+                            v184 = v182['type']
+                            if not (isinstance(v184, str)):
+                                yield SchemaError(repr(v184) + " is not of type 'string'", path + ('tracks', i181, 'type'), schema_path + ('properties', 'tracks', 'items', 'properties', 'type', 'type'), 'type', v184)
+                            if not (isinstance(v184, str) and v184 in _ENUM_24):
+                                yield SchemaError(repr(v184) + " is not one of ['midi']", path + ('tracks', i181, 'type'), schema_path + ('properties', 'tracks', 'items', 'properties', 'type', 'enum'), 'enum', v184)
+                        if 'channel' in v182:
+                            v185 = v182['channel']
+                            if not (((isinstance(v185, int) and not isinstance(v185, bool)) or (isinstance(v185, float) and v185.is_integer()))):
+                                yield SchemaError(repr(v185) + " is not of type 'integer'", path + ('tracks', i181, 'channel'), schema_path + ('properties', 'tracks', 'items', 'properties', 'channel', 'type'), 'type', v185)
+                            if (isinstance(v185, (int, float)) and not isinstance(v185, bool)) and v185 < 1:
+                                yield SchemaError(repr(v185) + ' is less than the minimum of 1', path + ('tracks', i181, 'channel'), schema_path + ('properties', 'tracks', 'items', 'properties', 'channel', 'minimum'), 'minimum', v185)
+                            if (isinstance(v185, (int, float)) and not isinstance(v185, bool)) and v185 > 16:
+                                yield SchemaError(repr(v185) + ' is greater than the maximum of 16', path + ('tracks', i181, 'channel'), schema_path + ('properties', 'tracks', 'items', 'properties', 'channel', 'maximum'), 'maximum', v185)
+                        if 'name' in v182:
+                            v186 = v182['name']
+                            if not (isinstance(v186, str)):
+                                yield SchemaError(repr(v186) + " is not of type 'string'", path + ('tracks', i181, 'name'), schema_path + ('properties', 'tracks', 'items', 'properties', 'name', 'type'), 'type', v186)
+                    if isinstance(v182, dict):
+                        if 'machine' not in v182:
+                            yield SchemaError("'machine' is a required property", path + ('tracks', i181), schema_path + ('properties', 'tracks', 'items', 'required'), 'required', v182)
+                        if 'type' not in v182:
+                            yield SchemaError("'type' is a required property", path + ('tracks', i181), schema_path + ('properties', 'tracks', 'items', 'required'), 'required', v182)
+                        if 'channel' not in v182:
+                            yield SchemaError("'channel' is a required property", path + ('tracks', i181), schema_path + ('properties', 'tracks', 'items', 'required'), 'required', v182)
+                        if 'name' not in v182:
+                            yield SchemaError("'name' is a required property", path + ('tracks', i181), schema_path + ('properties', 'tracks', 'items', 'required'), 'required', v182)
+            if isinstance(v180, list) and len(v180) < 1:
+                yield SchemaError(repr(v180) + ' should be non-empty', path + ('tracks',), schema_path + ('properties', 'tracks', 'minItems'), 'minItems', v180)
+        if 'explain' in instance:
+            v187 = instance['explain']
+            if not (isinstance(v187, str)):
+                yield SchemaError(repr(v187) + " is not of type 'string'", path + ('explain',), schema_path + ('properties', 'explain', 'type'), 'type', v187)
+            if isinstance(v187, str) and len(v187) > 200:
+                yield SchemaError(repr(v187) + ' is too long', path + ('explain',), schema_path + ('properties', 'explain', 'maxLength'), 'maxLength', v187)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'bpm' not in instance:
+            yield SchemaError("'bpm' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'signature' not in instance:
+            yield SchemaError("'signature' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'tracks' not in instance:
+            yield SchemaError("'tracks' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+def _validate_9(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:
+    """SetParam.v1.schema.json"""
+    if not (isinstance(instance, dict)):
+        yield SchemaError(repr(instance) + " is not of type 'object'", path, schema_path + ('type',), 'type', instance)
+    if isinstance(instance, dict):
+        if 'schema' in instance:
+            v188 = instance['schema']
+            if not (isinstance(v188, str)):
+                yield SchemaError(repr(v188) + " is not of type 'string'", path + ('schema',), schema_path + ('properties', 'schema', 'type'), 'type', v188)
+            if v188 != 'SetParam.v1':
+                yield SchemaError("'SetParam.v1' was expected", path + ('schema',), schema_path + ('properties', 'schema', 'const'), 'const', v188)
+        if 'targetMachine' in instance:
+            v189 = instance['targetMachine']
+            if not (isinstance(v189, str)):
+                yield SchemaError(repr(v189) + " is not of type 'string'", path + ('targetMachine',), schema_path + ('properties', 'targetMachine', 'type'), 'type', v189)
+        if 'param' in instance:
+            v190 = instance['param']
+            if not (isinstance(v190, str)):
+                yield SchemaError(repr(v190) + " is not of type 'string'", path + ('param',), schema_path + ('properties', 'param', 'type'), 'type', v190)
+        if 'value' in instance:
+            v191 = instance['value']
+            if not ((isinstance(v191, (int, float)) and not isinstance(v191, bool))):
+                yield SchemaError(repr(v191) + " is not of type 'number'", path + ('value',), schema_path + ('properties', 'value', 'type'), 'type', v191)
+            if (isinstance(v191, (int, float)) and not isinstance(v191, bool)) and v191 < 0:
+                yield SchemaError(repr(v191) + ' is less than the minimum of 0', path + ('value',), schema_path + ('properties', 'value', 'minimum'), 'minimum', v191)
+            if (isinstance(v191, (int, float)) and not isinstance(v191, bool)) and v191 > 1:
+                yield SchemaError(repr(v191) + ' is greater than the maximum of 1', path + ('value',), schema_path + ('properties', 'value', 'maximum'), 'maximum', v191)
+        if 'easing' in instance:
+            v192 = instance['easing']
+            if not (isinstance(v192, str)):
+                yield SchemaError(repr(v192) + " is not of type 'string'", path + ('easing',), schema_path + ('properties', 'easing', 'type'), 'type', v192)
+            if not (isinstance(v192, str) and v192 in _ENUM_25):
+                yield SchemaError(repr(v192) + " is not one of ['lin', 'log', 'exp', 'smooth']", path + ('easing',), schema_path + ('properties', 'easing', 'enum'), 'enum', v192)
+        if 'durationBeats' in instance:
+            v193 = instance['durationBeats']
+            if not ((isinstance(v193, (int, float)) and not isinstance(v193, bool))):
+                yield SchemaError(repr(v193) + " is not of type 'number'", path + ('durationBeats',), schema_path + ('properties', 'durationBeats', 'type'), 'type', v193)
+            if (isinstance(v193, (int, float)) and not isinstance(v193, bool)) and v193 < 0:
+                yield SchemaError(repr(v193) + ' is less than the minimum of 0', path + ('durationBeats',), schema_path + ('properties', 'durationBeats', 'minimum'), 'minimum', v193)
+        if 'explain' in instance:
+            v194 = instance['explain']
+            if not (isinstance(v194, str)):
+                yield SchemaError(repr(v194) + " is not of type 'string'", path + ('explain',), schema_path + ('properties', 'explain', 'type'), 'type', v194)
+            if isinstance(v194, str) and len(v194) > 200:
+                yield SchemaError(repr(v194) + ' is too long', path + ('explain',), schema_path + ('properties', 'explain', 'maxLength'), 'maxLength', v194)
+    if isinstance(instance, dict):
+        if 'schema' not in instance:
+            yield SchemaError("'schema' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'targetMachine' not in instance:
+            yield SchemaError("'targetMachine' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'param' not in instance:
+            yield SchemaError("'param' is a required property", path, schema_path + ('required',), 'required', instance)
+        if 'value' not in instance:
+            yield SchemaError("'value' is a required property", path, schema_path + ('required',), 'required', instance)
+
+
+# Validateurs par nom ("Pattern.v1") et par $id
+VALIDATORS: Dict[str, Callable[[Any, Tuple, Tuple], Iterator[SchemaError]]] = {
+    'Acknowledgement.v1': _validate_0,
+    'Machine.v1': _validate_1,
+    'Pattern.v1': _validate_2,
+    'ProjectState.v1': _validate_3,
+    'ActionBatch.v1': _validate_4,
+    'AddMachine.v1': _validate_5,
+    'Arrange.v1': _validate_6,
+    'CreatePattern.v1': _validate_7,
+    'ExportPlan.v1': _validate_8,
+    'SetParam.v1': _validate_9,
+    'Acknowledgement.v1.schema.json': _validate_0,
+    'Machine.v1.schema.json': _validate_1,
+    'Pattern.v1.schema.json': _validate_2,
+    'ProjectState.v1.schema.json': _validate_3,
+    'ActionBatch.v1.schema.json': _validate_4,
+    'AddMachine.v1.schema.json': _validate_5,
+    'Arrange.v1.schema.json': _validate_6,
+    'CreatePattern.v1.schema.json': _validate_7,
+    'ExportPlan.v1.schema.json': _validate_8,
+    'SetParam.v1.schema.json': _validate_9,
+}
+
+
+def iter_errors(schema_name: str, instance: Any) -> Iterator[SchemaError]:
+    """Toutes les erreurs d'un document (ordre de Draft7Validator.iter_errors).
+
+    Raises:
+        KeyError: Schéma inconnu
+    """
+    return VALIDATORS[schema_name](instance, (), ())
+
+
+def first_error(schema_name: str, instance: Any) -> Optional[SchemaError]:
+    """Première erreur (arrêt dès qu'elle est trouvée), None si le document est valide."""
+    return next(iter_errors(schema_name, instance), None)
+
+
+def validate(schema_name: str, instance: Any) -> None:
+    """Lève la première erreur du document.
+
+    Raises:
+        SchemaError: Document invalide
+        KeyError: Schéma inconnu
+    """
+    error = first_error(schema_name, instance)
+    if error is not None:
+        raise error
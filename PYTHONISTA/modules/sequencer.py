@@ -0,0 +1,312 @@
+"""
+sequencer.py — Séquenceur côté serveur avec fenêtre d'anticipation (lookahead)
+
+Le ProjectState est précalculé une fois en une timeline triée (secondes via
+la carte de tempo, boucle sur la longueur du morceau). Une session de
+streaming réveille périodiquement un thread, extrait les événements qui
+tombent dans la fenêtre [déjà planifié, maintenant + lookahead] et les
+pousse au client avec un horodatage absolu (horloge murale en secondes) :
+le client se contente de les mettre en file.
+
+Mesures :
+- jitter : retard de réveil du thread de planification par rapport à sa cible
+- marge (lead) : avance avec laquelle chaque événement est envoyé
+  (négative = événement envoyé en retard)
+"""
+
+import bisect
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+from modules.groove import GrooveSettings, apply_groove
+from modules.metrics import LatencyStats
+from modules.pattern_buffer import as_buffer
+from modules.tempo_map import TempoMap
+from modules.websocket import ConnectionClosed, WebSocketConnection
+
+# Valeurs par défaut (surchargées par le message "start" du client)
+DEFAULT_LOOKAHEAD = 0.2     # secondes d'anticipation
+DEFAULT_INTERVAL = 0.025    # période du thread de planification
+START_DELAY = 0.1           # marge avant le premier temps
+
+Validator = Callable[[Any], Optional[str]]
+
+# ============================================================================
+# TIMELINE
+# ============================================================================
+
+class SequencerEngine:
+    """Timeline précalculée d'un ProjectState.
+
+    Attributes:
+        machines: Machines du projet (index → dict machine)
+        time: Début de chaque événement (secondes depuis le début de boucle)
+        note, vel, channel: Données MIDI (canal 1-16)
+        length: Durée en secondes
+        machine: Index dans `machines`
+        loop_length: Durée d'une boucle (secondes)
+    """
+
+    def __init__(self, project_state: Dict[str, Any],
+                 groove: Optional[GrooveSettings] = None) -> None:
+        ppq = project_state.get("meta", {}).get("ppq", 480)
+        tempo = TempoMap.from_project(project_state)
+        seconds = tempo.tick_to_seconds
+
+        self.machines: List[Dict[str, Any]] = list(project_state.get("machines", []))
+        patterns = project_state.get("patterns", [])
+
+        rows = []
+        loop_ticks = 0
+        for index, machine in enumerate(self.machines):
+            keys = (machine.get("instanceId"), machine.get("id"))
+            channel = machine.get("midiChannel", 1)
+            offset = 0
+            for pattern in patterns:
+                buffer = as_buffer(pattern)
+                if buffer.meta.get("targetMachine") not in keys:
+                    continue
+                length_steps = buffer.meta.get("lengthSteps", 16)
+                ticks_per_step = tempo.bar_ticks(offset) // length_steps  # 1 pattern = 1 mesure (cf. export_midi)
+                for tick, note, vel, length in apply_groove(buffer, ppq, ticks_per_step, groove).iter_events():
+                    rows.append((offset + tick, note, vel, channel, length, index))
+                offset += length_steps * ticks_per_step
+            loop_ticks = max(loop_ticks, offset)
+
+        rows.sort()
+        self.time = array("d", (seconds(r[0]) for r in rows))
+        self.note = array("B", (r[1] for r in rows))
+        self.vel = array("B", (r[2] for r in rows))
+        self.channel = array("B", (r[3] for r in rows))
+        self.length = array("d", (seconds(r[0] + r[4]) - seconds(r[0]) for r in rows))
+        self.machine = array("H", (r[5] for r in rows))
+        self.loop_length = seconds(loop_ticks)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def _event(self, i: int, loop_start: float) -> Dict[str, Any]:
+        machine = self.machines[self.machine[i]]
+        machine_id = machine.get("id", "")
+        return {
+            "time": loop_start + self.time[i],
+            "note": self.note[i],
+            "vel": self.vel[i],
+            "channel": self.channel[i],
+            "duration": self.length[i],
+            "machine": machine.get("instanceId", machine_id),
+            "kind": "rd9" if "rd9" in machine_id else "td3",
+        }
+
+    def window(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Événements dont le début tombe dans [start, end[ (temps de lecture).
+
+        Le temps de lecture croît sans fin : la timeline est répétée toutes
+        les `loop_length` secondes.
+        """
+        if not len(self) or self.loop_length <= 0 or end <= start:
+            return []
+
+        events = []
+        loop = int(start // self.loop_length)
+        while loop * self.loop_length < end:
+            loop_start = loop * self.loop_length
+            lo = bisect.bisect_left(self.time, start - loop_start)
+            hi = bisect.bisect_left(self.time, end - loop_start)
+            events.extend(self._event(i, loop_start) for i in range(lo, hi))
+            loop += 1
+        return events
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+class SequencerStats:
+    """Mesures agrégées de toutes les sessions (exposées par /api/sequencer/stats).
+
+    Partagées par les threads de toutes les sessions : les compteurs ne sont
+    modifiés que sous verrou (session_started, add_batch).
+    """
+
+    def __init__(self) -> None:
+        self.jitter = LatencyStats()
+        self.lead = LatencyStats()
+        self.batches = 0
+        self.events = 0
+        self.late_events = 0
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def session_started(self) -> None:
+        with self._lock:
+            self.sessions += 1
+
+    def add_batch(self, leads: List[float]) -> None:
+        """Enregistre un lot envoyé (marge de chaque événement, en secondes)."""
+        self.lead.extend(leads)
+        with self._lock:
+            self.batches += 1
+            self.events += len(leads)
+            self.late_events += sum(1 for lead in leads if lead < 0)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "sessions": self.sessions,
+                "batches": self.batches,
+                "events": self.events,
+                "lateEvents": self.late_events,
+            }
+        return dict(counters, jitterMs=self.jitter.summary(), leadMs=self.lead.summary())
+
+
+class SequencerSession:
+    """Lecture d'un projet pour une connexion WebSocket.
+
+    Protocole (JSON) :
+        client → {"type": "start", "projectState": {...}, "lookaheadMs": 200,
+                  "intervalMs": 25, "groove": {...}}
+        serveur → {"type": "started", "startTime": t0, "loopLength": s, "serverTime": t}
+        serveur → {"type": "events", "serverTime": t, "from": s0, "to": s1, "events": [...]}
+        client → {"type": "stop"}
+        serveur → {"type": "stopped", "stats": {...}}
+    """
+
+    def __init__(self, conn: WebSocketConnection, engine: SequencerEngine,
+                 stats: SequencerStats, lookahead: float = DEFAULT_LOOKAHEAD,
+                 interval: float = DEFAULT_INTERVAL) -> None:
+        if not 0 < interval <= lookahead:
+            raise ValueError("L'intervalle doit être positif et inférieur au lookahead")
+        self.conn = conn
+        self.engine = engine
+        self.stats = stats
+        self.lookahead = lookahead
+        self.interval = interval
+        self.local = SequencerStats()
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """Boucle de planification (bloquante jusqu'à stop() ou déconnexion)."""
+        start_time = time.time() + START_DELAY
+        scheduled_until = 0.0
+        next_wake = time.monotonic()
+        self.stats.session_started()
+
+        self.conn.send_json({
+            "type": "started",
+            "startTime": start_time,
+            "loopLength": self.engine.loop_length,
+            "serverTime": time.time(),
+        })
+
+        while not self._stop.is_set():
+            lateness = time.monotonic() - next_wake
+            for stats in (self.stats, self.local):
+                stats.jitter.add(max(0.0, lateness))
+
+            now = time.time()
+            horizon = now - start_time + self.lookahead
+            if horizon > scheduled_until:
+                events = self.engine.window(scheduled_until, horizon)
+                for event in events:
+                    event["time"] += start_time
+                try:
+                    self.conn.send_json({
+                        "type": "events",
+                        "serverTime": now,
+                        "from": scheduled_until,
+                        "to": horizon,
+                        "events": events,
+                    })
+                except ConnectionClosed:
+                    break
+                leads = [e["time"] - now for e in events]
+                for stats in (self.stats, self.local):
+                    stats.add_batch(leads)
+                scheduled_until = horizon
+
+            next_wake += self.interval
+            delay = next_wake - time.monotonic()
+            if delay < 0:
+                # Retard accumulé : repartir de maintenant plutôt que rattraper en rafale
+                next_wake = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+
+def serve_sequencer(conn: WebSocketConnection, stats: SequencerStats,
+                    validate: Optional[Validator] = None) -> None:
+    """Handler WebSocket de /ws/sequencer.
+
+    Attend un message "start", lance la planification dans un thread et lit
+    les messages de contrôle ("stop", nouveau "start") sur le thread courant.
+
+    Args:
+        conn: Connexion du client
+        stats: Mesures partagées entre sessions
+        validate: validate(projectState) → message d'erreur ou None ; un
+            projet refusé est signalé par {"type": "error"}
+    """
+    session: Optional[SequencerSession] = None
+    worker: Optional[threading.Thread] = None
+
+    def stop_session() -> None:
+        if session is not None:
+            session.stop()
+            worker.join()
+
+    try:
+        while True:
+            try:
+                message = conn.recv_json()
+            except ValueError as e:
+                # JSON invalide (ou texte non UTF-8) : la connexion reste ouverte
+                conn.send_json({"type": "error", "error": f"Message invalide : {e}"})
+                continue
+            if not isinstance(message, dict):
+                conn.send_json({"type": "error", "error": "Message invalide : objet JSON attendu"})
+                continue
+            kind = message.get("type")
+
+            if kind == "start":
+                stop_session()
+                project_state = message.get("projectState", {})
+                if not isinstance(project_state, dict):
+                    error = "projectState doit être un objet"
+                else:
+                    error = validate(project_state) if validate is not None else None
+                if error:
+                    session = None
+                    conn.send_json({"type": "error", "error": f"ProjectState invalide : {error}"})
+                    continue
+                try:
+                    engine = SequencerEngine(
+                        project_state,
+                        GrooveSettings.from_json(message.get("groove")),
+                    )
+                    session = SequencerSession(
+                        conn, engine, stats,
+                        lookahead=message.get("lookaheadMs", DEFAULT_LOOKAHEAD * 1000) / 1000.0,
+                        interval=message.get("intervalMs", DEFAULT_INTERVAL * 1000) / 1000.0,
+                    )
+                except (TypeError, ValueError) as e:
+                    session = None
+                    conn.send_json({"type": "error", "error": str(e)})
+                    continue
+                worker = threading.Thread(target=session.run, name="sequencer", daemon=True)
+                worker.start()
+
+            elif kind == "stop":
+                stop_session()
+                conn.send_json({
+                    "type": "stopped",
+                    "stats": session.local.summary() if session else None,
+                })
+                session = None
+    finally:
+        stop_session()
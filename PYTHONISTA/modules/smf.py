@@ -0,0 +1,163 @@
+"""
+smf.py — Encodage Standard MIDI File (SMF) sans dépendance
+
+Encodeur minimal utilisé par l'export en flux : chaque piste est encodée
+en octets (chunk `MTrk`) dès que ses événements sont prêts, puis libérée.
+Les fichiers Type 0 sont obtenus en fusionnant des chunks déjà encodés,
+sans recréer d'objets message.
+
+Événements : (tick absolu, octets MIDI). Les messages canal n'utilisent pas
+le running status, ce qui permet de relire et fusionner les chunks.
+"""
+
+import heapq
+import struct
+from typing import Iterable, Iterator, List, Tuple
+
+# Types de méta-événements
+META_TRACK_NAME = 0x03
+META_MARKER = 0x06
+META_END_OF_TRACK = 0x2F
+META_SET_TEMPO = 0x51
+META_TIME_SIGNATURE = 0x58
+
+END_OF_TRACK = b"\xff\x2f\x00"
+
+Event = Tuple[int, bytes]
+
+
+def vlq(value: int) -> bytes:
+    """Quantité à longueur variable (delta-times, longueurs méta)."""
+    if value < 0:
+        raise ValueError(f"Valeur négative: {value}")
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.insert(0, (value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(out)
+
+
+def header(fmt: int, tracks: int, ppq: int) -> bytes:
+    """Chunk MThd."""
+    return b"MThd" + struct.pack(">IHHH", 6, fmt, tracks, ppq)
+
+
+def meta(meta_type: int, data: bytes) -> bytes:
+    """Méta-événement FF <type> <longueur> <données>."""
+    return bytes([0xFF, meta_type]) + vlq(len(data)) + data
+
+
+def track_name(name: str) -> bytes:
+    return meta(META_TRACK_NAME, name.encode("utf-8"))
+
+
+def marker(text: str) -> bytes:
+    return meta(META_MARKER, text.encode("utf-8"))
+
+
+def set_tempo(bpm: float) -> bytes:
+    return meta(META_SET_TEMPO, int(round(60_000_000 / bpm)).to_bytes(3, "big"))
+
+
+def time_signature(numerator: int, denominator: int, clocks_per_click: int = 24) -> bytes:
+    return meta(META_TIME_SIGNATURE, bytes([numerator, denominator.bit_length() - 1, clocks_per_click, 8]))
+
+
+def channel_message(status: int, data1: int, data2: int) -> bytes:
+    """Message canal 3 octets (note on/off, CC)."""
+    return bytes([status, data1 & 0x7F, data2 & 0x7F])
+
+
+def encode_track(events: Iterable[Event]) -> bytes:
+    """Chunk MTrk depuis des événements triés par tick (fin de piste ajoutée)."""
+    body = bytearray()
+    last = 0
+    for tick, data in events:
+        body += vlq(tick - last)
+        body += data
+        last = tick
+    body += b"\x00" + END_OF_TRACK
+    return b"MTrk" + struct.pack(">I", len(body)) + bytes(body)
+
+
+def iter_events(chunk: bytes) -> Iterator[Event]:
+    """Relit un chunk MTrk produit par encode_track (ticks absolus)."""
+    pos, end = 8, 8 + struct.unpack(">I", chunk[4:8])[0]
+    tick = 0
+    while pos < end:
+        delta = 0
+        while True:
+            byte = chunk[pos]
+            pos += 1
+            delta = (delta << 7) | (byte & 0x7F)
+            if byte < 0x80:
+                break
+        tick += delta
+        status = chunk[pos]
+        if status == 0xFF:
+            length_pos = pos + 2
+            length = 0
+            while True:
+                byte = chunk[length_pos]
+                length_pos += 1
+                length = (length << 7) | (byte & 0x7F)
+                if byte < 0x80:
+                    break
+            size = length_pos - pos + length
+        else:
+            size = 2 if status & 0xF0 in (0xC0, 0xD0) else 3
+        yield tick, chunk[pos:pos + size]
+        pos += size
+
+
+def merge_tracks(chunks: List[bytes], skip_names: bool = True) -> Iterator[Event]:
+    """Fusionne des chunks par tick (ordre des chunks à tick égal).
+
+    Les fins de piste sont retirées ; les noms de piste aussi (sauf
+    skip_names=False) puisqu'une piste Type 0 n'en porte qu'un.
+    """
+    def tagged(index: int, chunk: bytes) -> Iterator[Tuple[int, int, bytes]]:
+        for tick, data in iter_events(chunk):
+            if data[:2] == b"\xff\x2f":
+                continue
+            if skip_names and data[:2] == b"\xff\x03":
+                continue
+            yield tick, index, data
+
+    merged = heapq.merge(*(tagged(i, c) for i, c in enumerate(chunks)), key=lambda e: (e[0], e[1]))
+    for tick, _, data in merged:
+        yield tick, data
+
+
+def iter_merged_track(chunks: List[bytes], name: str = "", batch: int = 4096) -> Iterator[bytes]:
+    """Chunk MTrk fusionné, produit par morceaux.
+
+    Deux passes sur les chunks : la première calcule la longueur du chunk
+    (en-tête MTrk), la seconde émet les événements par lots de `batch`.
+    """
+    prefix = [(0, track_name(name))] if name else []
+
+    def events() -> Iterator[Event]:
+        yield from prefix
+        yield from merge_tracks(chunks)
+
+    length = len(END_OF_TRACK) + 1
+    last = 0
+    for tick, data in events():
+        length += len(vlq(tick - last)) + len(data)
+        last = tick
+
+    yield b"MTrk" + struct.pack(">I", length)
+    out = bytearray()
+    last = count = 0
+    for tick, data in events():
+        out += vlq(tick - last)
+        out += data
+        last = tick
+        count += 1
+        if count % batch == 0:
+            yield bytes(out)
+            out.clear()
+    out += b"\x00" + END_OF_TRACK
+    yield bytes(out)
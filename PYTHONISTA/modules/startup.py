@@ -0,0 +1,149 @@
+"""
+startup.py — Profil du temps de démarrage du serveur
+
+Deux mesures, chacune dans un interpréteur neuf (les modules déjà importés
+fausseraient le résultat) :
+
+- `profile_imports` : lance `python -X importtime` sur le module serveur et
+  résume la sortie par paquet de premier niveau (temps propre cumulé) ;
+- `measure_first_response` : temps entre le lancement de l'interpréteur et
+  la première réponse de `/api/machines` (client de test Flask, stockage
+  dans un dossier temporaire).
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Sous-systèmes qui doivent rester non chargés tant qu'on ne les utilise pas
+LAZY_MODULES = ("openai", "jsonschema")
+
+# Script exécuté dans l'interpréteur fils pour measure_first_response
+_FIRST_RESPONSE_SCRIPT = """
+import json, sys, tempfile, time
+from pathlib import Path
+t0 = time.perf_counter()
+sys.path.insert(0, {base_dir!r})
+server = __import__({module!r})
+t_import = time.perf_counter()
+data_dir = Path(tempfile.mkdtemp())
+server.DATA_DIR = data_dir
+server.DB_PATH = data_dir / "startup.db"
+response = server.app.test_client().get("/api/machines")
+t_first = time.perf_counter()
+print(json.dumps({{
+    "status": response.status_code,
+    "importMs": (t_import - t0) * 1000,
+    "firstRequestMs": (t_first - t_import) * 1000,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Analyse la sortie de `-X importtime`.
+
+    Returns:
+        Lignes {"module", "self_us", "cumulative_us", "depth"} dans l'ordre
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        self_us = self_us.replace("import time:", "").strip()
+        stripped = name.lstrip(" ")
+        rows.append({
+            "module": stripped.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us.strip()),
+            # L'indentation (2 espaces par niveau, après l'espace séparateur) = profondeur
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return rows
+
+
+def summarize_imports(rows: List[Dict[str, Any]], top: int = 15) -> Dict[str, Any]:
+    """Résume un profil d'import.
+
+    Returns:
+        {"totalMs", "packages": [(paquet, ms propre cumulé)],
+         "slowest": [(import direct du module profilé, ms cumulé)]}
+    """
+    packages: Dict[str, int] = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + row["self_us"]
+
+    total_us = sum(row["self_us"] for row in rows)
+    by_package = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    slowest = sorted((r for r in rows if r["depth"] == 1),
+                     key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "totalMs": round(total_us / 1000, 1),
+        "packages": [(name, round(us / 1000, 1)) for name, us in by_package],
+        "slowest": [(r["module"], round(r["cumulative_us"] / 1000, 1)) for r in slowest],
+    }
+
+
+def profile_imports(base_dir: Path, module: str, top: int = 15) -> Dict[str, Any]:
+    """Importe `module` sous `-X importtime` et résume le résultat."""
+    code = f"import sys; sys.path.insert(0, {str(base_dir)!r}); import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=str(base_dir))
+    if result.returncode != 0:
+        raise RuntimeError(f"Import de {module} impossible :\n{result.stderr[-2000:]}")
+    return summarize_imports(parse_importtime(result.stderr), top)
+
+
+def measure_first_response(base_dir: Path, module: str) -> Dict[str, Any]:
+    """Mesure le temps jusqu'à la première réponse dans un interpréteur neuf.
+
+    Returns:
+        {"status", "totalMs", "importMs", "firstRequestMs", "loaded"} où
+        `loaded` liste les modules de LAZY_MODULES chargés malgré tout
+    """
+    script = _FIRST_RESPONSE_SCRIPT.format(base_dir=str(base_dir), module=module, lazy=LAZY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script],
+                            capture_output=True, text=True, cwd=str(base_dir))
+    total_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Démarrage de {module} impossible :\n{result.stderr[-2000:]}")
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["totalMs"] = total_ms
+    return report
+
+
+def print_startup_profile(base_dir: Path, module: str, top: int = 15) -> Dict[str, Any]:
+    """Affiche le profil de démarrage (mode --profile-startup)."""
+    imports = profile_imports(base_dir, module, top)
+    first = measure_first_response(base_dir, module)
+
+    print("=" * 60)
+    print(f"⏱️  Profil de démarrage — {module}")
+    print("=" * 60)
+    print(f"\nImports : {imports['totalMs']:.1f} ms (somme des temps propres)\n")
+    print("Par paquet (temps propre) :")
+    for name, ms in imports["packages"]:
+        print(f"  {name:<28} {ms:8.1f} ms")
+    print("\nImports directs du serveur (cumulé) :")
+    for name, ms in imports["slowest"]:
+        print(f"  {name:<28} {ms:8.1f} ms")
+    print("\nPremière réponse (/api/machines) :")
+    print(f"  Interpréteur → réponse : {first['totalMs']:8.1f} ms")
+    print(f"  Import du serveur      : {first['importMs']:8.1f} ms")
+    print(f"  Première requête       : {first['firstRequestMs']:8.1f} ms")
+    if first["loaded"]:
+        print(f"\n⚠️  Chargés au démarrage : {', '.join(first['loaded'])}")
+    else:
+        print(f"\n✅ Non chargés au démarrage : {', '.join(LAZY_MODULES)}")
+
+    return {"imports": imports, "firstResponse": first}
@@ -0,0 +1,177 @@
+"""
+tempo_map.py — Carte de tempo et de signatures (ticks ↔ secondes)
+
+Le tempo et la signature de `meta` s'appliquent au début du morceau ; chaque
+section de l'arrangement peut en changer (`bpm`, `signature`, optionnels :
+sinon la valeur courante est conservée). La carte est découpée en segments
+de tempo et de signature constants. Pour chaque segment on précalcule son
+tick de début, son temps de début cumulé (secondes) et sa mesure de début :
+une conversion est une recherche dichotomique (bisect) suivie d'une
+interpolation linéaire dans le segment.
+
+Le dernier segment s'étend indéfiniment (patterns plus longs que
+l'arrangement, boucle du séquenceur).
+"""
+
+import bisect
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules import smf
+
+DEFAULT_BPM = 128
+DEFAULT_SIGNATURE = (4, 4)
+
+
+def parse_signature(signature: Any) -> Tuple[int, int]:
+    """"7/8" → (7, 8) ; le dénominateur doit être une puissance de 2.
+
+    Raises:
+        ValueError: Signature invalide
+    """
+    try:
+        numerator, denominator = (int(part) for part in str(signature).split("/"))
+    except ValueError:
+        raise ValueError(f"Signature invalide: {signature!r}") from None
+    if not 1 <= numerator <= 255 or denominator < 1 or denominator & (denominator - 1):
+        raise ValueError(f"Signature invalide: {signature!r}")
+    return numerator, denominator
+
+
+def clocks_per_click(numerator: int, denominator: int) -> int:
+    """Horloges MIDI (24 par noire) par clic de métronome.
+
+    Clic sur le temps : la valeur du dénominateur, ou sa valeur pointée en
+    mesure composée (6/8, 9/8, 12/16…).
+    """
+    clocks = 96 // denominator or 1
+    if denominator >= 8 and numerator > 3 and numerator % 3 == 0:
+        clocks *= 3
+    return clocks
+
+
+class TempoMap:
+    """Segments de tempo/signature constants et tables de conversion.
+
+    Attributes:
+        ppq: Résolution (ticks par noire)
+        ticks: Tick de début de chaque segment
+        seconds: Temps de début cumulé de chaque segment
+        bars: Numéro de mesure (depuis 0) au début de chaque segment
+        bpm: Tempo de chaque segment
+        signatures: (numérateur, dénominateur) de chaque segment
+        markers: (tick, nom) des sections de l'arrangement
+    """
+
+    def __init__(self, ppq: int, bpm: float = DEFAULT_BPM,
+                 signature: Tuple[int, int] = DEFAULT_SIGNATURE) -> None:
+        self.ppq = ppq
+        self.ticks = array("q", [0])
+        self.seconds = array("d", [0.0])
+        self.bars = array("q", [0])
+        self.bpm: List[float] = [bpm]
+        self.signatures: List[Tuple[int, int]] = [signature]
+        self.markers: List[Tuple[int, str]] = []
+        self._check(bpm, signature)
+
+    @classmethod
+    def from_project(cls, project_state: Dict[str, Any]) -> "TempoMap":
+        """Carte d'un ProjectState.v1 (meta + sections de `arrangement`).
+
+        Raises:
+            ValueError: Tempo ou signature invalide
+        """
+        meta = project_state.get("meta", {})
+        tempo = cls(meta.get("ppq", 480), meta.get("bpm", DEFAULT_BPM),
+                    parse_signature(meta.get("signature", "4/4")))
+        bar = 0
+        for section in (project_state.get("arrangement") or {}).get("sections", []):
+            signature = section.get("signature")
+            tempo.change(bar, section.get("bpm"), parse_signature(signature) if signature else None)
+            tempo.markers.append((tempo.bar_tick(bar), section.get("name", "")))
+            bar += section.get("bars", 1)
+        return tempo
+
+    def _check(self, bpm: float, signature: Tuple[int, int]) -> None:
+        if not bpm or bpm <= 0:
+            raise ValueError(f"Tempo invalide: {bpm}")
+        numerator, denominator = signature
+        if (self.ppq * 4) % denominator:
+            raise ValueError(f"Signature {numerator}/{denominator} incompatible avec PPQ {self.ppq}")
+
+    def _bar_length(self, index: int) -> int:
+        numerator, denominator = self.signatures[index]
+        return self.ppq * 4 * numerator // denominator
+
+    def change(self, bar: int, bpm: Optional[float] = None,
+               signature: Optional[Tuple[int, int]] = None) -> None:
+        """Change le tempo et/ou la signature au début de la mesure `bar`.
+
+        Les changements s'ajoutent dans l'ordre des mesures ; un changement
+        sans effet est ignoré.
+        """
+        last = len(self.ticks) - 1
+        if bar < self.bars[last]:
+            raise ValueError(f"Changement de tempo non ordonné (mesure {bar})")
+        bpm = self.bpm[last] if bpm is None else bpm
+        signature = self.signatures[last] if signature is None else signature
+        if (bpm, signature) == (self.bpm[last], self.signatures[last]):
+            return
+        self._check(bpm, signature)
+
+        tick = self.bar_tick(bar)
+        if tick == self.ticks[last]:
+            # Même début que le dernier segment : on le remplace
+            self.bpm[last] = bpm
+            self.signatures[last] = signature
+            return
+        self.seconds.append(self.tick_to_seconds(tick))
+        self.ticks.append(tick)
+        self.bars.append(bar)
+        self.bpm.append(bpm)
+        self.signatures.append(signature)
+
+    def segment(self, tick: float) -> int:
+        """Index du segment contenant `tick`."""
+        return max(0, bisect.bisect_right(self.ticks, tick) - 1)
+
+    def tick_to_seconds(self, tick: float) -> float:
+        i = self.segment(tick)
+        return self.seconds[i] + (tick - self.ticks[i]) * 60.0 / (self.bpm[i] * self.ppq)
+
+    def seconds_to_tick(self, seconds: float) -> float:
+        i = max(0, bisect.bisect_right(self.seconds, seconds) - 1)
+        return self.ticks[i] + (seconds - self.seconds[i]) * self.bpm[i] * self.ppq / 60.0
+
+    def bar_tick(self, bar: int) -> int:
+        """Tick de début de la mesure `bar` (depuis 0)."""
+        i = max(0, bisect.bisect_right(self.bars, bar) - 1)
+        return self.ticks[i] + (bar - self.bars[i]) * self._bar_length(i)
+
+    def bar_at(self, tick: float) -> int:
+        """Numéro de la mesure (depuis 0) contenant `tick`."""
+        i = self.segment(tick)
+        return self.bars[i] + int(tick - self.ticks[i]) // self._bar_length(i)
+
+    def bar_ticks(self, tick: float) -> int:
+        """Longueur (ticks) de la mesure en cours à `tick`."""
+        return self._bar_length(self.segment(tick))
+
+    def meta_events(self) -> List[Tuple[int, bytes]]:
+        """Méta-événements SMF de la piste de tempo, triés par tick.
+
+        Tempo et signature au tick 0, puis à chaque changement effectif ;
+        un marqueur par section.
+        """
+        events = []
+        previous: Tuple[Optional[float], Optional[Tuple[int, int]]] = (None, None)
+        for i, tick in enumerate(self.ticks):
+            bpm, signature = self.bpm[i], self.signatures[i]
+            if bpm != previous[0]:
+                events.append((tick, 0, smf.set_tempo(bpm)))
+            if signature != previous[1]:
+                events.append((tick, 1, smf.time_signature(*signature, clocks_per_click(*signature))))
+            previous = (bpm, signature)
+        events.extend((tick, 2, smf.marker(name)) for tick, name in self.markers if name)
+        events.sort(key=lambda e: (e[0], e[1]))
+        return [(tick, data) for tick, _, data in events]
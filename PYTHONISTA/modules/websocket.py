@@ -0,0 +1,354 @@
+"""
+websocket.py — Serveur et client WebSocket minimalistes (RFC 6455, stdlib)
+
+Flask (serveur de développement Werkzeug) ne gère pas WebSocket et les
+extensions existantes ajoutent des dépendances. Ce module tourne sur un port
+dédié (WS_PORT) dans un thread à part et route les connexions par chemin.
+
+Limites volontaires : pas d'extensions (permessage-deflate), pas de TLS.
+Les navigateurs n'appliquent pas la same-origin policy à WebSocket : le
+serveur refuse lui-même les en-têtes Origin hors de sa liste (les clients
+hors navigateur n'en envoient pas).
+"""
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# GUID défini par la RFC 6455 pour le calcul de Sec-WebSocket-Accept
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Opcodes
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# Taille maximale d'un message reçu, fragments réassemblés (protection mémoire)
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+class ConnectionClosed(Exception):
+    """La connexion WebSocket a été fermée (par le pair ou localement)."""
+
+
+def accept_key(key: str) -> str:
+    """Calcule Sec-WebSocket-Accept à partir de Sec-WebSocket-Key."""
+    digest = hashlib.sha1((key + WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _apply_mask(data: bytes, mask: bytes) -> bytes:
+    """XOR du payload avec la clé de masquage (en un seul entier)."""
+    n = len(data)
+    if not n:
+        return data
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+
+def _read_headers(rfile) -> Tuple[str, Dict[str, str]]:
+    """Lit une requête/réponse HTTP (ligne de statut + en-têtes)."""
+    start_line = rfile.readline(65537).decode("latin-1").strip()
+    headers = {}
+    while True:
+        line = rfile.readline(65537).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return start_line, headers
+
+# ============================================================================
+# CONNEXION
+# ============================================================================
+
+class WebSocketConnection:
+    """Connexion WebSocket établie (côté serveur ou client).
+
+    Les envois sont protégés par un verrou : un thread peut émettre pendant
+    qu'un autre lit.
+
+    Attributes:
+        path: Chemin demandé (côté serveur)
+        query: Paramètres de la query string
+        closed: Vrai après fermeture
+    """
+
+    def __init__(self, sock: socket.socket, rfile, is_client: bool,
+                 path: str = "", query: Optional[Dict[str, str]] = None) -> None:
+        self.sock = sock
+        self.rfile = rfile
+        self.is_client = is_client
+        self.path = path
+        self.query = query or {}
+        self.closed = False
+        self._send_lock = threading.Lock()
+
+    # ------------------------------------------------------------------------
+    # Émission
+    # ------------------------------------------------------------------------
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        if self.closed:
+            raise ConnectionClosed("Connexion fermée")
+
+        header = bytearray([0x80 | opcode])
+        mask_bit = 0x80 if self.is_client else 0
+        length = len(payload)
+        if length < 126:
+            header.append(mask_bit | length)
+        elif length < 1 << 16:
+            header.append(mask_bit | 126)
+            header += struct.pack(">H", length)
+        else:
+            header.append(mask_bit | 127)
+            header += struct.pack(">Q", length)
+
+        if self.is_client:
+            # Les trames client → serveur doivent être masquées
+            mask = os.urandom(4)
+            header += mask
+            payload = _apply_mask(payload, mask)
+
+        try:
+            with self._send_lock:
+                self.sock.sendall(bytes(header) + payload)
+        except OSError as e:
+            self.closed = True
+            raise ConnectionClosed(str(e)) from e
+
+    def send_text(self, text: str) -> None:
+        """Envoie un message texte."""
+        self._send_frame(OP_TEXT, text.encode("utf-8"))
+
+    def send_json(self, data: Any) -> None:
+        """Envoie un objet sérialisé en JSON compact."""
+        self.send_text(json.dumps(data, separators=(",", ":")))
+
+    def send_bytes(self, data: bytes) -> None:
+        """Envoie un message binaire."""
+        self._send_frame(OP_BINARY, data)
+
+    def close(self, code: int = 1000) -> None:
+        """Ferme la connexion (trame CLOSE puis socket)."""
+        if self.closed:
+            return
+        try:
+            self._send_frame(OP_CLOSE, struct.pack(">H", code))
+        except ConnectionClosed:
+            pass
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------------
+    # Réception
+    # ------------------------------------------------------------------------
+
+    def _read_exact(self, n: int) -> bytes:
+        data = self.rfile.read(n)
+        if data is None or len(data) < n:
+            self.closed = True
+            raise ConnectionClosed("Connexion interrompue")
+        return data
+
+    def recv(self) -> Any:
+        """Attend le prochain message complet.
+
+        Returns:
+            str (message texte) ou bytes (message binaire)
+
+        Raises:
+            ConnectionClosed: Si le pair ferme la connexion
+        """
+        fragments = []
+        size = 0
+        message_opcode = None
+
+        while True:
+            try:
+                b1, b2 = self._read_exact(2)
+            except OSError as e:
+                self.closed = True
+                raise ConnectionClosed(str(e)) from e
+
+            fin = b1 & 0x80
+            opcode = b1 & 0x0F
+            length = b2 & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack(">Q", self._read_exact(8))[0]
+            # Limite sur le message entier : N fragments juste sous la limite
+            # ne doivent pas pouvoir s'accumuler
+            if opcode < OP_CLOSE:
+                size += length
+            if length > MAX_MESSAGE_SIZE or size > MAX_MESSAGE_SIZE:
+                self.close(1009)
+                raise ConnectionClosed("Message trop volumineux")
+
+            mask = self._read_exact(4) if b2 & 0x80 else None
+            payload = self._read_exact(length) if length else b""
+            if mask:
+                payload = _apply_mask(payload, mask)
+
+            if opcode == OP_CLOSE:
+                self.close()
+                raise ConnectionClosed("Fermeture demandée par le pair")
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+
+            if opcode != OP_CONTINUATION:
+                message_opcode = opcode
+            fragments.append(payload)
+            if fin:
+                break
+
+        data = b"".join(fragments)
+        return data.decode("utf-8") if message_opcode == OP_TEXT else data
+
+    def recv_json(self) -> Any:
+        """Attend le prochain message et le décode en JSON."""
+        return json.loads(self.recv())
+
+# ============================================================================
+# SERVEUR
+# ============================================================================
+
+Handler = Callable[[WebSocketConnection], None]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Effectue la poignée de main puis délègue au handler de la route."""
+
+    def handle(self) -> None:
+        try:
+            request_line, headers = _read_headers(self.rfile)
+        except (OSError, UnicodeDecodeError):
+            return
+        parts = request_line.split()
+        if len(parts) < 2 or parts[0] != "GET":
+            self.wfile.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return
+
+        url = urlsplit(parts[1])
+        route = self.server.routes.get(url.path)
+        key = headers.get("sec-websocket-key")
+        if route is None:
+            self.wfile.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            self.wfile.write(b"HTTP/1.1 426 Upgrade Required\r\nContent-Length: 0\r\n\r\n")
+            return
+        origin = headers.get("origin")
+        if origin is not None and self.server.origins is not None and origin not in self.server.origins:
+            # Page d'un autre site ouverte dans le navigateur de l'utilisateur
+            self.wfile.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n")
+            return
+
+        self.wfile.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n"
+        ).encode("ascii"))
+        self.wfile.flush()
+
+        # Latence avant débit : les lots d'événements sont petits
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        conn = WebSocketConnection(self.request, self.rfile, is_client=False,
+                                   path=url.path, query=query)
+        try:
+            route(conn)
+        except ConnectionClosed:
+            pass
+        finally:
+            conn.close()
+
+
+class WebSocketServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Serveur WebSocket multi-threads (un thread par connexion).
+
+    Args:
+        host: Adresse d'écoute
+        port: Port d'écoute
+        origins: Origines acceptées pour les connexions de navigateur
+            (en-tête Origin, ex. "http://127.0.0.1:8787") ; None = toutes
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str, port: int, origins: Optional[Iterable[str]] = None) -> None:
+        super().__init__((host, port), _RequestHandler)
+        self.routes: Dict[str, Handler] = {}
+        self.origins = None if origins is None else frozenset(origins)
+
+    def route(self, path: str) -> Callable[[Handler], Handler]:
+        """Décorateur : associe un handler à un chemin (ex. /ws/sequencer)."""
+        def decorator(handler: Handler) -> Handler:
+            self.routes[path] = handler
+            return handler
+        return decorator
+
+    def start(self) -> threading.Thread:
+        """Démarre le serveur dans un thread daemon."""
+        thread = threading.Thread(target=self.serve_forever, name="websocket", daemon=True)
+        thread.start()
+        return thread
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def connect(url: str, timeout: Optional[float] = 10.0) -> WebSocketConnection:
+    """Ouvre une connexion client (ws://hôte:port/chemin).
+
+    Raises:
+        ConnectionError: Si la poignée de main échoue
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "ws":
+        raise ValueError(f"URL WebSocket invalide: {url}")
+
+    sock = socket.create_connection((parts.hostname, parts.port or 80), timeout=timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    sock.sendall((
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {parts.hostname}:{parts.port or 80}\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\n"
+        "Sec-WebSocket-Version: 13\r\n\r\n"
+    ).encode("ascii"))
+
+    rfile = sock.makefile("rb")
+    status, headers = _read_headers(rfile)
+    if status.split()[1:2] != ["101"] or headers.get("sec-websocket-accept") != accept_key(key):
+        sock.close()
+        raise ConnectionError(f"Poignée de main refusée : {status}")
+
+    sock.settimeout(None)
+    return WebSocketConnection(sock, rfile, is_client=True, path=parts.path)
@@ -0,0 +1,64 @@
+"""
+zipstream.py — Archive ZIP produite en flux (sans fichier temporaire)
+
+`zipfile` sait écrire dans un flux non positionnable : chaque entrée est
+suivie d'un « data descriptor » (CRC et tailles connus après coup). Le flux
+est ici un tampon vidé après chaque écriture, ce qui permet de produire
+l'archive morceau par morceau depuis un générateur, entrée après entrée.
+"""
+
+import time
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+MEDIA_TYPE = "application/zip"
+
+
+class _Sink:
+    """Flux d'écriture non positionnable accumulant les octets à émettre."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, Iterable[bytes]]],
+               compression: int = zipfile.ZIP_DEFLATED) -> Iterator[bytes]:
+    """Produit une archive ZIP par morceaux.
+
+    Args:
+        entries: (nom dans l'archive, morceaux du contenu) ; les entrées et
+            leurs morceaux sont consommés paresseusement, dans l'ordre
+        compression: zipfile.ZIP_DEFLATED ou zipfile.ZIP_STORED
+
+    Yields:
+        Octets de l'archive, au fil de l'écriture
+    """
+    sink = _Sink()
+    date_time = time.localtime()[:6]
+    with zipfile.ZipFile(sink, "w", compression) as archive:
+        for name, chunks in entries:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = compression
+            with archive.open(info, "w") as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Répertoire central (écrit à la fermeture)
+    yield sink.drain()
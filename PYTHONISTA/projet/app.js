@@ -19,6 +19,7 @@
 // ============================================================================
 
 const API_BASE_URL = 'http://127.0.0.1:8787';
+const SEQUENCER_WS_URL = 'ws://127.0.0.1:8788/ws/sequencer';
 
 // État global de l'application
 const appState = {
@@ -30,7 +31,8 @@ const appState = {
     patterns: [],
     isPlaying: false,
     audioContext: null,
-    audioWorklet: null
+    audioWorklet: null,
+    sequencerSocket: null
 };
 
 // ============================================================================
@@ -268,12 +270,16 @@ function initTimeline() {
         if (appState.audioContext && appState.audioContext.state === 'suspended') {
             appState.audioContext.resume();
         }
+        
+        startServerSequencer();
     });
     
     stopBtn.addEventListener('click', () => {
         appState.isPlaying = false;
         console.log('⏹️ Stop');
         
+        stopServerSequencer();
+        
         // Arrêter la lecture audio (test simple)
         if (appState.audioContext && appState.audioContext.state === 'running') {
             appState.audioContext.suspend();
@@ -286,6 +292,86 @@ function initTimeline() {
     });
 }
 
+// ============================================================================
+// SÉQUENCEUR SERVEUR (WebSocket)
+// ============================================================================
+
+/**
+ * Le serveur précalcule les événements avec une fenêtre d'anticipation et
+ * les envoie horodatés (secondes, horloge murale) : le client convertit ces
+ * dates sur l'horloge de l'AudioContext et les confie au worklet, qui les
+ * déclenche à l'échantillon près (aucun setTimeout sur le chemin audio).
+ */
+function startServerSequencer() {
+    stopServerSequencer();
+    
+    const socket = new WebSocket(SEQUENCER_WS_URL);
+    appState.sequencerSocket = socket;
+    
+    socket.addEventListener('open', () => {
+        socket.send(JSON.stringify({
+            type: 'start',
+            projectState: getProjectState(),
+            lookaheadMs: 200
+        }));
+    });
+    
+    socket.addEventListener('message', (e) => {
+        const message = JSON.parse(e.data);
+        if (message.type === 'events') {
+            queueSequencerEvents(message.events);
+        } else if (message.type === 'stopped') {
+            console.log('📊 Séquenceur :', message.stats);
+        } else if (message.type === 'error') {
+            console.error('Erreur séquenceur :', message.error);
+        }
+    });
+    
+    socket.addEventListener('error', () => {
+        console.error('Séquenceur serveur indisponible');
+    });
+}
+
+function audioClockOffset() {
+    // Horloge murale (s) moins horloge AudioContext, au même instant
+    const ctx = appState.audioContext;
+    if (ctx.getOutputTimestamp) {
+        const stamp = ctx.getOutputTimestamp();
+        if (stamp.performanceTime) {
+            return (performance.timeOrigin + stamp.performanceTime) / 1000 - stamp.contextTime;
+        }
+    }
+    return Date.now() / 1000 - ctx.currentTime;
+}
+
+function queueSequencerEvents(events) {
+    if (!appState.audioWorklet || !appState.audioContext || events.length === 0) return;
+    
+    // Une seule lecture d'horloge par lot : la gigue des timers ne s'ajoute plus
+    const offset = audioClockOffset();
+    const scheduled = [];
+    events.forEach((event) => {
+        const time = event.time - offset;
+        scheduled.push({ type: 'noteOn', time, machine: event.kind, note: event.note, velocity: event.vel });
+        scheduled.push({ type: 'noteOff', time: time + event.duration, machine: event.kind, note: event.note });
+    });
+    
+    appState.audioWorklet.port.postMessage({ type: 'schedule', events: scheduled });
+}
+
+function stopServerSequencer() {
+    const socket = appState.sequencerSocket;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ type: 'stop' }));
+        socket.close();
+    }
+    appState.sequencerSocket = null;
+    
+    if (appState.audioWorklet) {
+        appState.audioWorklet.port.postMessage({ type: 'clearSchedule' });
+    }
+}
+
 // ============================================================================
 // CHAT IA
 // ============================================================================
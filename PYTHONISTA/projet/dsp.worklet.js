@@ -45,6 +45,9 @@ class LiveTechnoProcessor extends AudioWorkletProcessor {
             decay: 0.5
         };
         
+        // Événements du séquenceur serveur, triés par date (secondes, horloge AudioContext)
+        this.scheduled = [];
+        
         // Écouter les messages du thread principal
         this.port.onmessage = (e) => {
             this.handleMessage(e.data);
@@ -64,6 +67,30 @@ class LiveTechnoProcessor extends AudioWorkletProcessor {
             case 'setParam':
                 this.setParam(params);
                 break;
+            case 'schedule':
+                this.schedule(params.events);
+                break;
+            case 'clearSchedule':
+                this.scheduled = [];
+                break;
+        }
+    }
+    
+    schedule(events) {
+        // Tri stable : à date égale, un noteOff reçu avant un noteOn reste devant
+        this.scheduled.push(...events);
+        this.scheduled.sort((a, b) => a.time - b.time);
+    }
+    
+    dispatchScheduled(time) {
+        // Déclencher tous les événements échus (les retardataires partent au premier échantillon)
+        let count = 0;
+        while (count < this.scheduled.length && this.scheduled[count].time <= time) {
+            this.handleMessage(this.scheduled[count]);
+            count++;
+        }
+        if (count > 0) {
+            this.scheduled.splice(0, count);
         }
     }
     
@@ -417,8 +444,14 @@ class LiveTechnoProcessor extends AudioWorkletProcessor {
     process(inputs, outputs, parameters) {
         const output = outputs[0];
         const channel = output[0];
+        const blockStart = currentTime;
         
         for (let i = 0; i < channel.length; i++) {
+            // Événements planifiés, à l'échantillon près
+            if (this.scheduled.length > 0) {
+                this.dispatchScheduled(blockStart + i / this.sampleRate);
+            }
+            
             // Mixer
             let sample = 0.0;
             
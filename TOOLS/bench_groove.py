@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Débit du moteur de groove : variantes humanisées générées par seconde.
+
+Usage:
+    python3 bench_groove.py               # 1000 variantes d'un pattern 16 pas
+    python3 bench_groove.py 5000 64       # 5000 variantes d'un pattern 64 pas
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from modules.groove import MAX_VARIATIONS, GrooveSettings, variations  # noqa: E402
+from modules.pattern_buffer import PatternBuffer  # noqa: E402
+
+
+def make_pattern(length_steps: int) -> dict:
+    """Pattern RD-9 type : kick 4/4, hats avec prob, clap avec ratchet."""
+    steps = []
+    for t in range(length_steps):
+        if t % 4 == 0:
+            steps.append({"t": t, "note": 36, "vel": 120})
+        steps.append({"t": t, "note": 42, "vel": 80, "prob": 0.7})
+        if t % 8 == 4:
+            steps.append({"t": t, "note": 39, "vel": 100, "ratchet": 3})
+    return {
+        "schema": "Pattern.v1",
+        "id": "bench_groove",
+        "targetMachine": "behringer.rd9",
+        "lengthSteps": length_steps,
+        "resolutionPPQ": 96,
+        "swing": 0.3,
+        "steps": steps,
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    length_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    ppq = 480
+    ticks_per_step = ppq * 4 // length_steps
+
+    buffer = PatternBuffer.from_pattern(make_pattern(length_steps))
+    settings = GrooveSettings(humanize_ticks=12, humanize_vel=10, seed=1)
+
+    print(f"🥁 Groove — {count} variantes, {len(buffer)} pas\n")
+
+    produced = 0
+    start = time.perf_counter()
+    while produced < count:
+        batch = min(MAX_VARIATIONS, count - produced)
+        variations(buffer, ppq, ticks_per_step, batch, settings.with_seed(produced))
+        produced += batch
+    elapsed = time.perf_counter() - start
+
+    # Déterminisme : même seed → mêmes événements
+    first = variations(buffer, ppq, ticks_per_step, 1, settings)[0].to_list()
+    again = variations(buffer, ppq, ticks_per_step, 1, settings)[0].to_list()
+    assert first == again, "Variantes non déterministes"
+
+    print(f"  Durée      : {elapsed * 1000:.1f} ms")
+    print(f"  Débit      : {count / elapsed:,.0f} variantes/s")
+    print(f"  Événements : {len(first)} par variante (ratchets développés)")
+
+
+if __name__ == "__main__":
+    main()
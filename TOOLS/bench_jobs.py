@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tâches de fond (modules/jobs.py) : latence des routes rapides pendant des exports.
+
+Le serveur tourne dans ce processus (werkzeug, un thread par requête). Pendant
+chaque scénario, un client interroge /api/machines en boucle pendant que deux
+autres exportent le même projet (graine de groove différente à chaque fois :
+aucune piste reprise du cache) :
+
+- repos : aucun export ;
+- export en ligne : POST /api/midi/export (encodage dans le thread de requête) ;
+- tâches : POST /api/jobs?kind=midi (même corps), suivi de l'état puis
+  téléchargement du résultat (décodage et encodage dans le pool de processus).
+
+Usage:
+    python3 bench_jobs.py            # 16 machines × 8 patterns, 5 s par scénario
+    python3 bench_jobs.py 32 8 10    # machines, patterns par machine, secondes
+"""
+
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_track_cache import make_studio_project  # noqa: E402
+
+import HTML_Studio_V4_0 as studio  # noqa: E402
+
+
+def call(url: str, body: bytes = None) -> bytes:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def export_inline(base: str, project: dict, seed: int) -> None:
+    call(f"{base}/api/midi/export", json.dumps({"projectState": project, "groove": {"seed": seed}}).encode())
+
+
+def export_job(base: str, project: dict, seed: int) -> None:
+    body = json.dumps({"projectState": project, "groove": {"seed": seed}}).encode()
+    job = json.loads(call(f"{base}/api/jobs?kind=midi", body))
+    while job["state"] in ("queued", "running"):
+        time.sleep(0.05)
+        job = json.loads(call(f"{base}/api/jobs/{job['id']}"))
+    assert job["state"] == "done", job
+    call(f"{base}/api/jobs/{job['id']}/result")
+
+
+def scenario(base: str, project: dict, exporter, seconds: float) -> tuple:
+    """(latences de /api/machines en ms, exports terminés)."""
+    stop = threading.Event()
+    exports = []
+    seeds = iter(range(1, 1 << 30))
+
+    def worker():
+        while not stop.is_set():
+            exporter(base, project, next(seeds))
+            exports.append(1)
+
+    workers = [threading.Thread(target=worker) for _ in range(2 if exporter else 0)]
+    for thread in workers:
+        thread.start()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        call(f"{base}/api/machines")
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return latencies, len(exports)
+
+
+def main():
+    n_machines = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_machine = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    data_dir = Path(tempfile.mkdtemp())
+    studio.DATA_DIR = data_dir
+    studio.DB_PATH = data_dir / "bench.db"
+    http = make_server("127.0.0.1", 0, studio.app, threaded=True)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{http.server_port}"
+
+    project = make_studio_project(n_machines, per_machine)
+    export_job(base, project, 0)  # démarrage des workers hors mesure
+    print(f"⚙️  /api/machines pendant des exports — {n_machines} machines × {per_machine} patterns de 256 pas, "
+          f"{seconds:.0f} s par scénario ({studio.job_manager().stats()['mode']})\n")
+    print(f"  {'scénario':<18}{'p50':>9}{'p95':>9}{'max':>10}{'exports':>10}")
+    results = {}
+    for label, exporter in (("repos", None), ("export en ligne", export_inline), ("tâches", export_job)):
+        latencies, exports = scenario(base, project, exporter, seconds)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)]
+        results[label] = p95
+        print(f"  {label:<18}{statistics.median(latencies):7.1f}ms{p95:7.1f}ms{latencies[-1]:8.1f}ms"
+              f"{exports if exporter else '-':>10}")
+    print(f"\n  p95 en ligne / tâches : ×{results['export en ligne'] / results['tâches']:.1f}")
+    http.shutdown()
+    studio.job_manager().shutdown()
+
+
+if __name__ == "__main__":
+    main()
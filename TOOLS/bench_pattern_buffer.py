@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Comparaison mémoire/débit : pas en liste de dicts vs PatternBuffer.
+
+Usage:
+    python3 bench_pattern_buffer.py            # 100 000 pas
+    python3 bench_pattern_buffer.py 1000000    # taille personnalisée
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from modules.pattern_buffer import PatternBuffer  # noqa: E402
+
+
+def make_pattern(n_steps: int, seed: int = 42) -> Dict:
+    """Génère un Pattern.v1 synthétique de n_steps pas."""
+    rng = random.Random(seed)
+    steps = []
+    for i in range(n_steps):
+        step = {"t": i, "note": rng.choice((36, 38, 42, 46)), "vel": rng.randint(60, 127)}
+        if i % 2:
+            step["duration"] = 0.25
+        if i % 7 == 0:
+            step["prob"] = 0.5
+        if i % 11 == 0:
+            step["accent"] = True
+        steps.append(step)
+    return {
+        "schema": "Pattern.v1",
+        "id": "bench",
+        "targetMachine": "behringer.rd9",
+        "lengthSteps": 16,
+        "resolutionPPQ": 96,
+        "steps": steps,
+    }
+
+
+def measure_alloc(fn):
+    """Retourne (résultat, octets alloués) d'un appel."""
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def walk_dicts(steps: List[Dict]) -> int:
+    """Boucle type exporteur sur la liste de dicts."""
+    acc = 0
+    for step in steps:
+        acc += step.get("t", 0) + step.get("note", 60) + step.get("vel", 100)
+        acc += int(step.get("duration", 0.5) * 480)
+    return acc
+
+
+def walk_buffer(buffer: PatternBuffer) -> int:
+    """Même boucle sur les colonnes du buffer."""
+    acc = 0
+    for t, note, vel, duration in buffer.iter_events():
+        acc += t + note + vel + int(duration * 480)
+    return acc
+
+
+def timed(fn, repeat: int = 3) -> float:
+    """Meilleur temps (secondes) sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw = json.dumps(make_pattern(n_steps))
+
+    print(f"📊 PatternBuffer vs dicts — {n_steps} pas\n")
+
+    pattern, dict_bytes = measure_alloc(lambda: json.loads(raw))
+    buffer, buffer_bytes = measure_alloc(lambda: PatternBuffer.from_pattern(pattern))
+
+    assert buffer.to_pattern() == pattern, "Conversion non réversible"
+
+    print("Mémoire")
+    print(f"  dicts         : {dict_bytes / n_steps:8.1f} o/pas ({dict_bytes / 1e6:.1f} Mo)")
+    print(f"  PatternBuffer : {buffer_bytes / n_steps:8.1f} o/pas ({buffer_bytes / 1e6:.1f} Mo)")
+    print(f"  colonnes      : {buffer.nbytes() / n_steps:8.1f} o/pas")
+
+    steps = pattern["steps"]
+    t_dicts = timed(lambda: walk_dicts(steps))
+    t_buffer = timed(lambda: walk_buffer(buffer))
+    t_convert = timed(lambda: PatternBuffer.from_pattern(pattern), repeat=1)
+    t_restore = timed(lambda: buffer.to_pattern(), repeat=1)
+
+    print("\nDébit (boucle exporteur)")
+    print(f"  dicts         : {n_steps / t_dicts / 1e6:8.2f} M pas/s")
+    print(f"  PatternBuffer : {n_steps / t_buffer / 1e6:8.2f} M pas/s  (x{t_dicts / t_buffer:.2f})")
+    print("\nConversion")
+    print(f"  dicts → buffer: {t_convert * 1000:8.1f} ms")
+    print(f"  buffer → dicts: {t_restore * 1000:8.1f} ms")
+
+    try:
+        columns = buffer.as_numpy()
+        start = time.perf_counter()
+        total = int(columns["t"].sum() + columns["note"].sum() + columns["vel"].sum())
+        elapsed = time.perf_counter() - start
+        print(f"\nNumPy (sommes vectorisées) : {elapsed * 1000:.2f} ms (check {total})")
+    except ImportError:
+        print("\n⚠️  NumPy absent : vues vectorisées ignorées")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la bibliothèque de patterns (modules/pattern_index.py).
+
+Indexe N patterns synthétiques (grooves de base + variantes proches +
+doublons exacts), puis mesure la recherche des voisins et vérifie ses
+résultats contre un parcours exhaustif.
+
+Avec --ties, tous les patterns sont des kicks 4/4 (même masque, vélocités
+variées) : chaque recherche départage des milliers d'égalités par le contour.
+
+Usage:
+    python3 bench_pattern_index.py
+    python3 bench_pattern_index.py --patterns 50000 --queries 200
+    python3 bench_pattern_index.py --ties
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from modules.metrics import LatencyStats  # noqa: E402
+from modules.pattern_buffer import as_buffer  # noqa: E402
+from modules.pattern_index import PatternIndex, content_hash, contour_distance, fingerprint, hamming  # noqa: E402
+
+
+def make_pattern(rng: random.Random, base: list, flips: int, index: int,
+                 velocities: tuple = (70, 100, 127)) -> dict:
+    """Variante d'un groove : `flips` pas ajoutés ou retirés."""
+    active = set(base)
+    for t in rng.sample(range(16), flips):
+        active ^= {t}
+    return {
+        "schema": "Pattern.v1", "id": f"p{index}", "name": f"Groove {index}",
+        "targetMachine": rng.choice(["behringer.rd9", "behringer.td3"]),
+        "lengthSteps": 16, "resolutionPPQ": 96,
+        "steps": [{"t": t, "note": 36, "vel": rng.choice(velocities)} for t in sorted(active)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'index de patterns")
+    parser.add_argument("--patterns", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ties", action="store_true", help="Bibliothèque de kicks 4/4 (égalités)")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    if args.ties:
+        # Même masque pour tous ; vélocités libres : des patterns tous distincts
+        bases, flips, query_flips, velocities = [[0, 4, 8, 12]], (0, 0), (0, 0), tuple(range(1, 128))
+    else:
+        bases = [rng.sample(range(16), rng.randint(3, 10)) for _ in range(args.patterns // 20)]
+        flips, query_flips, velocities = (0, 3), (0, 4), (70, 100, 127)
+    patterns = []
+    for i in range(args.patterns):
+        if patterns and rng.random() < 0.1:
+            patterns.append(dict(rng.choice(patterns), name=f"Copie {i}"))  # doublon exact
+        else:
+            patterns.append(make_pattern(rng, rng.choice(bases), rng.randint(*flips), i, velocities))
+
+    index = PatternIndex(Path(tempfile.mkdtemp()) / "patterns.db")
+    start = time.perf_counter()
+    counts = {"added": 0, "duplicates": 0}
+    for i in range(0, len(patterns), 1000):
+        for key, value in index.add_many(patterns[i:i + 1000], "bench").items():
+            counts[key] += value
+    elapsed = time.perf_counter() - start
+    print(f"📚 {args.patterns} patterns indexés en {elapsed:.2f} s "
+          f"({counts['added']} ajoutés, {counts['duplicates']} doublons exacts)\n")
+
+    # Référence exhaustive : empreintes des patterns distincts
+    stored = {}
+    for pattern in patterns:
+        buffer = as_buffer(pattern)
+        stored.setdefault(content_hash(buffer), fingerprint(buffer))
+    prints = list(stored.values())
+
+    latency = LatencyStats()
+    mismatches = 0
+    queries = [make_pattern(rng, rng.choice(bases), rng.randint(*query_flips), -1, velocities)
+               for _ in range(args.queries)]
+    for query in queries:
+        result = index.similar(query, args.k)
+        latency.add(result["tookMs"] / 1000)
+
+        onsets, contour = fingerprint(as_buffer(query))
+        expected = sorted((hamming(onsets, mask), contour_distance(contour, other))
+                          for mask, other in prints)[:args.k]
+        if [(r["distance"], r["contourDistance"]) for r in result["results"]] != expected:
+            mismatches += 1
+
+    summary = latency.summary()
+    print(f"🔎 {args.queries} recherches (k={args.k}) : p50 {summary['p50']:.2f} ms, "
+          f"p95 {summary['p95']:.2f} ms, max {summary['max']:.2f} ms")
+    sample = index.similar(queries[0], 3)
+    for r in sample["results"]:
+        print(f"   #{r['id']:<6} distance {r['distance']}  contour {r['contourDistance']}  {r['name']}")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} recherche(s) différente(s) du parcours exhaustif")
+        sys.exit(1)
+    print("\n✅ Distances et contours identiques au parcours exhaustif")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Comparaison taille/temps : project.json (indent=2) vs conteneur binaire LTPB.
+
+Usage:
+    python3 bench_project_format.py              # 64 patterns × 256 pas
+    python3 bench_project_format.py 512 256      # patterns, pas par pattern
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from modules import project_format  # noqa: E402
+
+
+def make_project(n_patterns: int, n_steps: int, seed: int = 7) -> dict:
+    """ProjectState synthétique (pas + automation de cutoff)."""
+    rng = random.Random(seed)
+    patterns = []
+    for p in range(n_patterns):
+        steps = [{"t": t, "note": rng.randint(36, 60), "vel": rng.randint(60, 127),
+                  "duration": 0.25, "accent": t % 4 == 0}
+                 for t in range(n_steps)]
+        automation = [{"target": "cutoff", "at": t, "val": round(rng.random(), 3), "easing": "lin"}
+                      for t in range(0, n_steps, 4)]
+        patterns.append({
+            "schema": "Pattern.v1", "id": f"p{p}", "name": f"Pattern {p}",
+            "targetMachine": "behringer.td3", "lengthSteps": 256, "resolutionPPQ": 96,
+            "steps": steps, "automation": automation,
+        })
+    return {
+        "schema": "ProjectState.v1",
+        "meta": {"name": "bench", "bpm": 128, "signature": "4/4", "ppq": 480},
+        "machines": [{"id": "behringer.td3", "instanceId": "bass_1", "midiChannel": 1,
+                      "position": {"x": 0, "y": 0}}],
+        "patterns": patterns,
+        "routing": [{"instanceId": "bass_1", "midiChannel": 1}],
+    }
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_patterns = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    n_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    project = make_project(n_patterns, n_steps)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "project.json"
+        ltpb_path = Path(tmp) / "project.ltpb"
+
+        t_json_dump = best_of(lambda: json_path.write_text(
+            json.dumps(project, indent=2, ensure_ascii=False), encoding="utf-8"))
+        t_ltpb_dump = best_of(lambda: project_format.save(project, ltpb_path))
+
+        t_json_load = best_of(lambda: json.loads(json_path.read_text(encoding="utf-8")))
+        t_ltpb_load = best_of(lambda: project_format.load(ltpb_path))
+        t_ltpb_packed = best_of(lambda: project_format.load(ltpb_path, packed=True))
+
+        def lazy_one():
+            with project_format.BinaryProject.open(ltpb_path) as binary:
+                binary.pattern(len(binary) // 2)
+        t_lazy = best_of(lazy_one)
+
+        assert project_format.load(ltpb_path) == project, "Conversion non réversible"
+
+        json_size = json_path.stat().st_size
+        ltpb_size = ltpb_path.stat().st_size
+
+    print(f"📦 Format projet — {n_patterns} patterns × {n_steps} pas\n")
+    print(f"  Taille  JSON : {json_size / 1e6:8.2f} Mo")
+    print(f"  Taille  LTPB : {ltpb_size / 1e6:8.2f} Mo  (÷{json_size / ltpb_size:.1f})\n")
+    print(f"  Écriture JSON          : {t_json_dump * 1000:8.1f} ms")
+    print(f"  Écriture LTPB          : {t_ltpb_dump * 1000:8.1f} ms")
+    print(f"  Lecture JSON           : {t_json_load * 1000:8.1f} ms")
+    print(f"  Lecture LTPB (dicts)   : {t_ltpb_load * 1000:8.1f} ms")
+    print(f"  Lecture LTPB (buffers) : {t_ltpb_packed * 1000:8.1f} ms  (x{t_json_load / t_ltpb_packed:.1f})")
+    print(f"  Lecture LTPB 1 pattern : {t_lazy * 1000:8.2f} ms (mmap, paresseux)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Synchronisation du projet (/ws/project) : octets par modification, deltas
+contre rechargement complet.
+
+Deux clients (« phone » et « tablet ») se connectent à un serveur embarqué.
+Le phone modifie des pas et des paramètres de machine ; la tablette applique
+les deltas reçus à sa réplique. On compare les octets reçus par la tablette
+à ce qu'aurait coûté un GET /api/project/load après chaque modification,
+puis on provoque un conflit (deux modifications sur la même base) et on
+vérifie que les deux répliques convergent vers l'état du serveur.
+
+Usage:
+    python3 bench_project_sync.py              # 64 patterns × 64 pas, 200 modifications
+    python3 bench_project_sync.py 256 256 500  # patterns, pas, modifications
+"""
+
+import copy
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_project_format import make_project  # noqa: E402
+from modules.project_sync import ProjectHub, ProjectReplica, entity_key, serve_project  # noqa: E402
+from modules.websocket import WebSocketServer, connect  # noqa: E402
+
+
+class Client:
+    """Client de test : réplique locale tenue à jour par un thread lecteur."""
+
+    def __init__(self, url: str) -> None:
+        self.conn = connect(url)
+        self.replica = ProjectReplica.from_snapshot(self.conn.recv_json())
+        self.acks = {}
+        self.delta_bytes = 0
+        self.deltas = 0
+        self.changed = threading.Condition()
+        self._next_id = 0
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self) -> None:
+        try:
+            while True:
+                raw = self.conn.recv()
+                message = json.loads(raw)
+                with self.changed:
+                    if message["type"] == "delta":
+                        self.replica.apply(message["changes"], message["revision"])
+                        self.delta_bytes += len(raw.encode("utf-8"))
+                        self.deltas += 1
+                    elif message["type"] == "ack":
+                        self.acks[message["id"]] = message
+                    self.changed.notify_all()
+        except Exception:
+            pass
+
+    def edit(self, changes: list) -> dict:
+        """Envoie des modifications et attend l'acquittement."""
+        self._next_id += 1
+        request_id = self._next_id
+        self.conn.send_json({"type": "edit", "id": request_id, "changes": changes})
+        with self.changed:
+            self.changed.wait_for(lambda: request_id in self.acks, timeout=10)
+            ack = self.acks.pop(request_id)
+            for applied in ack["applied"]:
+                self.replica.revs[entity_key(applied["kind"], applied.get("id"))] = applied["rev"]
+            self.replica.revision = max(self.replica.revision, ack["revision"])
+            return ack
+
+    def wait_revision(self, revision: int) -> None:
+        with self.changed:
+            self.changed.wait_for(lambda: self.replica.revision >= revision, timeout=10)
+
+
+def main():
+    n_patterns = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    n_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    n_edits = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    rng = random.Random(3)
+
+    project = make_project(n_patterns, n_steps)
+    project["machines"][0]["params"] = {"cutoff": 0.5, "resonance": 0.3}
+    hub = ProjectHub(project)
+    server = WebSocketServer("127.0.0.1", 0)
+    server.route("/ws/project")(lambda conn: serve_project(conn, hub))
+    server.start()
+    url = f"ws://127.0.0.1:{server.server_address[1]}/ws/project"
+
+    phone, tablet = Client(url), Client(url)
+    reload_bytes = len(json.dumps({"projectState": hub.project_state()}, separators=(",", ":")).encode("utf-8"))
+
+    # Modifications du phone : un pas d'un pattern, ou un paramètre de machine
+    start = time.perf_counter()
+    for i in range(n_edits):
+        if i % 4 == 3:
+            machine = copy.deepcopy(phone.replica.entities["machine/bass_1"])
+            machine["params"]["cutoff"] = round(rng.random(), 3)
+            change = {"kind": "machine", "id": "bass_1", "value": machine}
+            key = "machine/bass_1"
+        else:
+            pattern_id = f"p{rng.randrange(n_patterns)}"
+            key = f"pattern/{pattern_id}"
+            pattern = copy.deepcopy(phone.replica.entities[key])
+            pattern["steps"][rng.randrange(len(pattern["steps"]))]["vel"] = rng.randint(1, 127)
+            change = {"kind": "pattern", "id": pattern_id, "value": pattern}
+        phone.replica.entities[key] = change["value"]
+        ack = phone.edit([dict(change, baseRev=phone.replica.rev(key))])
+        assert ack["applied"], ack
+    elapsed = time.perf_counter() - start
+    tablet.wait_revision(hub.revision)
+
+    # Conflit : les deux clients modifient p0 depuis la même révision
+    base = phone.replica.rev("pattern/p0")
+    edits = {}
+    for name, client, vel in (("phone", phone, 11), ("tablet", tablet, 99)):
+        pattern = copy.deepcopy(client.replica.entities["pattern/p0"])
+        pattern["steps"][0]["vel"] = vel
+        edits[name] = {"kind": "pattern", "id": "p0", "baseRev": base, "value": pattern}
+    results = {}
+    threads = [threading.Thread(target=lambda n=n, c=c: results.__setitem__(n, c.edit([edits[n]])))
+               for n, c in (("phone", phone), ("tablet", tablet))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    winner = next(n for n, r in results.items() if r["applied"])
+    loser = "tablet" if winner == "phone" else "phone"
+    assert results[loser]["conflicts"], results
+    # Le perdant repart de la valeur du serveur renvoyée dans le conflit
+    conflict = results[loser]["conflicts"][0]
+    retry = copy.deepcopy(conflict["value"])
+    retry["steps"][1]["vel"] = 42
+    client = phone if loser == "phone" else tablet
+    client.replica.entities["pattern/p0"] = conflict["value"]
+    assert client.edit([{"kind": "pattern", "id": "p0", "baseRev": conflict["rev"], "value": retry}])["applied"]
+    client.replica.entities["pattern/p0"] = retry
+
+    phone.wait_revision(hub.revision)
+    tablet.wait_revision(hub.revision)
+    expected = hub.project_state()
+    assert phone.replica.project_state() == expected, "Réplique phone divergente"
+    assert tablet.replica.project_state() == expected, "Réplique tablet divergente"
+
+    per_delta = tablet.delta_bytes / max(1, tablet.deltas)
+    print(f"🔄 Synchronisation projet — {n_patterns} patterns × {n_steps} pas, {n_edits} modifications\n")
+    print(f"  Rechargement complet   : {reload_bytes / 1e3:10.1f} Ko par modification")
+    print(f"  Delta moyen (tablette) : {per_delta / 1e3:10.2f} Ko par modification (÷{reload_bytes / per_delta:.0f})")
+    print(f"  Total deltas reçus     : {tablet.delta_bytes / 1e6:10.2f} Mo "
+          f"(rechargements : {reload_bytes * tablet.deltas / 1e6:.1f} Mo)")
+    print(f"  Aller-retour edit/ack  : {elapsed / n_edits * 1000:10.2f} ms")
+    print(f"  Conflit                : {winner} appliqué, {loser} rejoué sur rev {conflict['rev']}")
+    print(f"  Répliques convergentes : ✅ (révision {hub.revision})")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
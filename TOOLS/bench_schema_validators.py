@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Validateurs compilés (modules/schema_validators.py) contre Draft7Validator.
+
+1. Parité : des documents valides sont altérés au hasard (types, bornes,
+   énumérations, clés manquantes, motifs) ; les listes d'erreurs
+   (message, path, schema_path, validator) des deux validateurs doivent être
+   identiques, dans le même ordre.
+2. Vitesse : validation complète de documents Pattern.v1 et ProjectState.v1
+   de taille croissante.
+
+Usage:
+    python3 bench_schema_validators.py            # 500 documents altérés
+    python3 bench_schema_validators.py 2000
+"""
+
+import copy
+import random
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)  # RefResolver (jsonschema ≥ 4.18)
+
+from bench_project_format import make_project  # noqa: E402
+from jsonschema import Draft7Validator, RefResolver  # noqa: E402
+
+import HTML_Studio_V4_0 as studio  # noqa: E402
+from modules import schema_validators  # noqa: E402
+
+ODD_VALUES = [None, True, False, 0, -1, 1.5, 2.0, 128, 999, "", "x", "TD-3", [], [1], {}, {"a": 1}]
+
+
+def draft7(schema_name: str) -> Draft7Validator:
+    schema = studio.load_schema(schema_name)
+    resolver = RefResolver(base_uri=schema.get("$id", ""), referrer=schema, store=studio.schema_store())
+    return Draft7Validator(schema, resolver=resolver)
+
+
+def errors_reference(validator: Draft7Validator, document) -> list:
+    return [(e.message, tuple(e.path), tuple(e.schema_path), e.validator) for e in validator.iter_errors(document)]
+
+
+def errors_compiled(schema_name: str, document) -> list:
+    return [(e.message, e.path, e.schema_path, e.validator)
+            for e in schema_validators.iter_errors(schema_name, document)]
+
+
+def containers(value, out):
+    """Tous les dicts et listes d'un document (cibles d'altération)."""
+    if isinstance(value, (dict, list)):
+        out.append(value)
+        for child in (value.values() if isinstance(value, dict) else value):
+            containers(child, out)
+    return out
+
+
+def mutate(document, rng: random.Random, count: int):
+    document = copy.deepcopy(document)
+    for _ in range(count):
+        target = rng.choice(containers(document, []))
+        if not target:
+            continue
+        key = rng.choice(list(target) if isinstance(target, dict) else range(len(target)))
+        if isinstance(target, dict) and rng.random() < 0.25:
+            del target[key]
+        else:
+            target[key] = copy.deepcopy(rng.choice(ODD_VALUES))
+    return document
+
+
+def samples() -> dict:
+    """Un document de départ par schéma (parité)."""
+    project = make_project(2, 16)
+    pattern = project["patterns"][0]
+    return {
+        "Pattern.v1": pattern,
+        "ProjectState.v1": project,
+        "Machine.v1": {"schema": "Machine.v1", "id": "behringer.td3", "name": "TD-3", "vendor": "Behringer",
+                       "type": "synth", "midi": {"channel": 1}},
+        "CreatePattern.v1": {"type": "CreatePattern", "pattern": pattern},
+        "Acknowledgement.v1": {"schema": "Acknowledgement.v1", "actor": "ui", "timestamp": "2024-01-01T00:00:00Z",
+                               "read": [{"path": "a.json", "sha256": "0" * 64}]},
+    }
+
+
+def check_parity(n_documents: int) -> int:
+    rng = random.Random(7)
+    mismatches = 0
+    for schema_name, document in samples().items():
+        validator = draft7(schema_name)
+        for i in range(n_documents // 5):
+            candidate = mutate(document, rng, 1 + i % 4) if i else document
+            expected, got = errors_reference(validator, candidate), errors_compiled(schema_name, candidate)
+            if expected != got:
+                mismatches += 1
+                if mismatches <= 3:
+                    print(f"  ❌ {schema_name} : attendu {expected[:2]}, obtenu {got[:2]}")
+    return mismatches
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    n_documents = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"🧾 Parité avec Draft7Validator ({n_documents} documents, dont altérés)")
+    mismatches = check_parity(n_documents)
+    print(f"  {'✅ erreurs identiques' if not mismatches else f'❌ {mismatches} écarts'}\n")
+
+    print("⚡ Validation complète (document valide, meilleur de 3)\n")
+    print(f"  {'document':<28}{'jsonschema':>12}{'compilé':>12}{'gain':>8}")
+    pattern_validator, project_validator = draft7("Pattern.v1"), draft7("ProjectState.v1")
+    cases = [("Pattern.v1", f"pattern {n} pas", pattern_validator, make_project(1, n)["patterns"][0], 4096 // n)
+             for n in (16, 64, 256, 1024)]
+    cases += [("ProjectState.v1", f"projet {n} × 256 pas", project_validator, make_project(n, 256), 64 // n)
+              for n in (1, 16, 64)]
+    for schema_name, label, validator, document, repeat in cases:
+        assert not errors_compiled(schema_name, document) and not errors_reference(validator, document)
+        reference = timed(lambda: list(validator.iter_errors(document)), repeat)
+        compiled = timed(lambda: list(schema_validators.iter_errors(schema_name, document)), repeat)
+        print(f"  {label:<28}{reference * 1000:10.2f} ms{compiled * 1000:10.2f} ms{reference / compiled:7.0f}×")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Lecture en flux d'un gros corps ProjectState : mémoire de pointe bornée.
+
+Génère un corps {"projectState": ...} synthétique (200 Mo par défaut,
+patterns de 256 pas écrits un à un), puis mesure dans un processus séparé
+pour chaque mode la mémoire de pointe (ru_maxrss, au-delà de celle du
+processus au repos) :
+
+- stream : POST /api/project/save par le client de test Flask, corps lu en
+  flux (patterns validés un à un, project.json écrit au fil de l'eau) ;
+- json   : json.load du même corps, ce que fait request.json avant tout
+  traitement (sans validation ni écriture).
+
+Usage:
+    python3 bench_stream_body.py             # 200 Mo
+    python3 bench_stream_body.py 50          # taille en Mo
+    python3 bench_stream_body.py 200 stream  # un seul mode
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_project_format import make_project  # noqa: E402
+
+MODES = ("stream", "json")
+
+
+def write_body(path: Path, megabytes: float) -> int:
+    """Écrit le corps pattern par pattern ; renvoie le nombre de patterns."""
+    template = make_project(1, 256)
+    pattern = template["patterns"][0]
+    head = {k: v for k, v in template.items() if k != "patterns"}
+    target = int(megabytes * 1e6)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"projectState": ')
+        f.write(json.dumps(head)[:-1] + ', "patterns": [')
+        while f.tell() < target:
+            f.write(("," if count else "") + json.dumps(dict(pattern, id=f"p{count}", name=f"Pattern {count}")))
+            count += 1
+        f.write("]}}")
+    return count
+
+
+def peak_mb() -> float:
+    """Mémoire résidente de pointe du processus (Mo)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3
+
+
+def child(mode: str, body_path: Path) -> None:
+    """Mesure un mode (processus dédié) ; résultat JSON sur stdout."""
+    import HTML_Studio_V4_0 as studio
+
+    data_dir = Path(tempfile.mkdtemp())
+    studio.DATA_DIR = data_dir
+    studio.DB_PATH = data_dir / "bench.db"
+    client = studio.app.test_client()
+    studio.schema_error({}, "Pattern.v1")  # schémas chargés avant la mesure
+    baseline = peak_mb()
+
+    start = time.perf_counter()
+    if mode == "stream":
+        with open(body_path, "rb") as f:
+            response = client.post("/api/project/save", input_stream=f, content_type="application/json",
+                                   content_length=body_path.stat().st_size)
+        assert response.status_code == 200, response.get_json()
+        written = (data_dir / "project.json").stat().st_size
+    else:
+        with open(body_path, "rb") as f:
+            written = len(json.load(f)["projectState"]["patterns"])
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peakMb": peak_mb() - baseline, "written": written}))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], Path(sys.argv[3]))
+        return
+
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 200
+    modes = sys.argv[2:] or MODES
+    with tempfile.TemporaryDirectory() as tmp:
+        body_path = Path(tmp) / "body.json"
+        count = write_body(body_path, megabytes)
+        size = body_path.stat().st_size
+        largest = max(len(json.dumps(p)) for p in make_project(1, 256)["patterns"])
+        print(f"🌊 Corps en flux — {size / 1e6:.0f} Mo, {count} patterns (≈ {largest / 1e3:.0f} Ko chacun)\n")
+
+        for mode in modes:
+            out = subprocess.run([sys.executable, __file__, "--child", mode, str(body_path)],
+                                 capture_output=True, text=True, env=dict(os.environ, PYTHONUNBUFFERED="1"))
+            if out.returncode:
+                print(f"  ❌ {mode} : {out.stderr.strip().splitlines()[-1]}")
+                continue
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"  {mode:<7}: {result['seconds']:7.1f} s, mémoire de pointe +{result['peakMb']:7.1f} Mo "
+                  f"({size / 1e6 / result['seconds']:.1f} Mo/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Réexport MIDI incrémental : cache des pistes encodées (modules/track_cache.py).
+
+Projet de 16 machines (4 patterns de 256 pas chacune, automation de
+cutoff). Mesure :
+
+- export à froid (toutes les pistes encodées) ;
+- réexport sans modification (toutes les pistes reprises du cache) ;
+- réexport après modification d'une note d'un seul pattern (une piste
+  réencodée), comparé au temps d'encodage d'une piste seule.
+
+Le fichier réassemblé est comparé octet pour octet à un export à froid
+du même projet.
+
+Usage:
+    python3 bench_track_cache.py          # 16 machines × 4 patterns
+    python3 bench_track_cache.py 32 8     # machines, patterns par machine
+"""
+
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_project_format import make_project  # noqa: E402
+
+import HTML_Studio_V4_0 as studio  # noqa: E402
+
+
+def make_studio_project(n_machines: int, per_machine: int) -> dict:
+    project = make_project(n_machines * per_machine, 256)
+    project["machines"] = [{"id": f"behringer.bass{m}", "instanceId": f"bass_{m}", "midiChannel": m % 16 + 1,
+                            "position": {"x": 0, "y": 0}, "params": {"cutoff": 0.5}}
+                           for m in range(n_machines)]
+    project["routing"] = [{"instanceId": f"bass_{m}", "midiChannel": m % 16 + 1} for m in range(n_machines)]
+    for i, pattern in enumerate(project["patterns"]):
+        pattern["targetMachine"] = f"behringer.bass{i % n_machines}"
+    return project
+
+
+def export(project: dict, path: Path) -> tuple:
+    counts = {"hits": 0, "misses": 0}
+    start = time.perf_counter()
+    assert studio.export_midi(project, path, cache_counts=counts)
+    return time.perf_counter() - start, counts
+
+
+def main():
+    n_machines = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_machine = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    data_dir = Path(tempfile.mkdtemp())
+    studio.DATA_DIR = data_dir
+    studio.DB_PATH = data_dir / "bench.db"
+    studio.ensure_storage()
+    project = make_studio_project(n_machines, per_machine)
+    print(f"🎹 Réexport MIDI — {n_machines} machines × {per_machine} patterns de 256 pas\n")
+
+    studio.TRACK_CACHE.clear()
+    cold, counts = export(project, data_dir / "cold.mid")
+    print(f"  Export à froid            : {cold * 1000:8.1f} ms  ({counts['misses']} pistes encodées)")
+
+    warm, counts = export(project, data_dir / "warm.mid")
+    print(f"  Réexport sans changement  : {warm * 1000:8.1f} ms  ({counts['hits']} pistes reprises)")
+
+    edited = copy.deepcopy(project)
+    edited["patterns"][5]["steps"][10]["note"] += 1
+    incremental, counts = export(edited, data_dir / "edit.mid")
+    print(f"  Réexport après 1 pattern  : {incremental * 1000:8.1f} ms  "
+          f"({counts['misses']} encodée, {counts['hits']} reprises)")
+
+    # Référence : une piste seule, et le même projet exporté à froid
+    single = copy.deepcopy(edited)
+    target = edited["patterns"][5]["targetMachine"]
+    single["machines"] = [m for m in edited["machines"] if m["id"] == target]
+    studio.TRACK_CACHE.clear()
+    one_track, _ = export(single, data_dir / "single.mid")
+    studio.TRACK_CACHE.clear()
+    export(edited, data_dir / "reference.mid")
+    same = (data_dir / "edit.mid").read_bytes() == (data_dir / "reference.mid").read_bytes()
+
+    print(f"  Encodage d'une piste seule: {one_track * 1000:8.1f} ms")
+    print(f"\n  Gain après modification   : ×{cold / incremental:.1f} "
+          f"(surcoût des empreintes : {(incremental - one_track) * 1000:.1f} ms)")
+    print(f"  Fichier réassemblé        : {'✅ identique' if same else '❌ différent'} à un export à froid")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Vérifie /api/gpt/batch contre le faux serveur OpenAI (latence simulée).
+
+Contrôles :
+- chaque pattern est un CreatePattern.v1 valide ;
+- les prompts identiques ne provoquent qu'un appel amont (single-flight) ;
+- le nombre d'appels simultanés ne dépasse pas la concurrence demandée ;
+- la durée totale suit ceil(prompts uniques / concurrence) × latence.
+
+Usage:
+    python3 check_gpt_batch.py
+    python3 check_gpt_batch.py --latency-ms 300 --concurrency 2
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from fake_openai import start_fake_server  # noqa: E402
+
+PROMPTS = ["kick 4/4", "open hats", "303 bass", "kick 4/4", "snare on 2 and 4", "open hats"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de /api/gpt/batch")
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    fake = start_fake_server(latency=args.latency_ms / 1000)
+    os.environ["OPENAI_BASE_URL"] = fake.base_url
+
+    import HTML_Studio_V4_0 as server  # noqa: E402 - après OPENAI_BASE_URL
+
+    data_dir = Path(tempfile.mkdtemp())
+    server.DATA_DIR = data_dir
+    server.DB_PATH = data_dir / "check_gpt_batch.db"
+    server.OPENAI_API_KEY = "sk-test"
+
+    client = server.app.test_client()
+    server.get_openai_client(server.OPENAI_API_KEY)  # import paresseux hors mesure
+    unique = len({p.strip() for p in PROMPTS})
+    print(f"🤖 {len(PROMPTS)} prompts ({unique} uniques), concurrence {args.concurrency}, "
+          f"latence {args.latency_ms:.0f} ms\n")
+
+    start = time.perf_counter()
+    response = client.post("/api/gpt/batch", json={
+        "prompts": PROMPTS, "projectState": {}, "concurrency": args.concurrency,
+    })
+    arrivals = []
+    results = []
+    for line in response.response:
+        arrivals.append(time.perf_counter() - start)
+        results.append(json.loads(line))
+    elapsed = time.perf_counter() - start
+
+    for result, at in zip(results, arrivals):
+        status = "✅" if "pattern" in result else "❌"
+        shared = " (partagé)" if result["shared"] else ""
+        print(f"  {status} +{at * 1000:6.0f} ms  #{result['index']} {result['prompt']}{shared}")
+
+    errors = []
+    if response.status_code != 200:
+        errors.append(f"statut HTTP {response.status_code}")
+    if sorted(r["index"] for r in results) != list(range(len(PROMPTS))):
+        errors.append("résultats manquants ou dupliqués")
+    invalid = [r for r in results if "pattern" not in r or not server.validate_json(r["pattern"], "CreatePattern.v1")]
+    if invalid:
+        errors.append(f"{len(invalid)} pattern(s) invalide(s)")
+    if fake.requests != unique:
+        errors.append(f"{fake.requests} appels amont au lieu de {unique} (single-flight)")
+    if fake.max_in_flight > args.concurrency:
+        errors.append(f"{fake.max_in_flight} appels simultanés > concurrence {args.concurrency}")
+
+    expected = math.ceil(unique / args.concurrency) * args.latency_ms / 1000
+    print(f"\n  Durée : {elapsed * 1000:.0f} ms (attendu ≈ {expected * 1000:.0f} ms), "
+          f"appels amont : {fake.requests}, pic simultané : {fake.max_in_flight}")
+    if elapsed > expected * 1.5 + 0.5:
+        errors.append(f"durée {elapsed:.2f} s très supérieure à {expected:.2f} s")
+
+    print()
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+    print("✅ Lot conforme")
+
+
+if __name__ == "__main__":
+    main()
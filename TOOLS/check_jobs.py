@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Vérifie les annulations concurrentes de modules/jobs.py (pool de threads).
+
+Des tâches courtes sont soumises puis annulées aussitôt, depuis plusieurs
+threads : l'annulation tombe tantôt sur une tâche en file, tantôt sur une
+future pas encore démarrée dans le pool, tantôt sur une tâche en cours ou
+déjà terminée.
+
+Contrôles :
+- aucun blocage (Future.cancel() rappelle _finish, qui prend le verrou) ;
+- toutes les tâches finissent (terminée, annulée) et les compteurs concordent ;
+- aucun fichier .cancel ni .progress ne reste dans le spool.
+
+Usage:
+    python3 check_jobs.py             # 4 threads × 500 tâches
+    python3 check_jobs.py 8 2000      # threads, tâches par thread
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from modules.jobs import JobManager  # noqa: E402
+
+TIMEOUT = 30.0  # Secondes avant de conclure à un blocage
+
+
+def short_task(params, context):
+    if params["sleep"]:
+        time.sleep(params["sleep"])
+    return {"ok": True}
+
+
+def submit_and_cancel(manager: JobManager, count: int, errors: list) -> None:
+    for i in range(count):
+        job = manager.submit("short", {"sleep": 0.001 * (i % 3 == 0)})
+        try:
+            manager.cancel(job.id)
+        except ValueError:
+            pass  # déjà terminée
+        except Exception as e:
+            errors.append(repr(e))
+
+
+def main():
+    threads_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    total = threads_count * per_thread
+
+    spool_dir = Path(tempfile.mkdtemp()) / "jobs"
+    manager = JobManager(spool_dir, {"short": short_task}, workers=2,
+                         processes=False, history=total)
+    errors = []
+    threads = [threading.Thread(target=submit_and_cancel, args=(manager, per_thread, errors), daemon=True)
+               for _ in range(threads_count)]
+
+    print(f"🧵 {threads_count} threads × {per_thread} tâches soumises puis annulées\n")
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + TIMEOUT
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    if any(thread.is_alive() for thread in threads):
+        print(f"❌ Blocage : soumissions/annulations inachevées après {TIMEOUT:.0f} s")
+        sys.exit(1)
+
+    # Laisser les dernières tâches en cours se terminer
+    stats = manager.stats()
+    while (stats["running"] or stats["queued"]) and time.monotonic() < deadline:
+        time.sleep(0.01)
+        stats = manager.stats()
+    elapsed = time.perf_counter() - start
+    manager.shutdown()
+
+    failures = list(errors)
+    if stats["running"] or stats["queued"]:
+        failures.append(f"tâches jamais terminées ({stats['running']} en cours, {stats['queued']} en file)")
+    if stats["done"] + stats["cancelled"] + stats["failed"] != total:
+        failures.append(f"compteurs incohérents : {stats}")
+    if stats["failed"]:
+        failures.append(f"{stats['failed']} tâches en échec")
+    leftovers = [p.name for p in spool_dir.iterdir() if p.suffix in (".cancel", ".progress")]
+    if leftovers:
+        failures.append(f"fichiers restés dans le spool : {', '.join(leftovers[:5])}")
+
+    print(f"   {total} tâches en {elapsed:.2f} s : {stats['done']} terminées, "
+          f"{stats['cancelled']} annulées")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Annulations concurrentes sans blocage")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test de non-régression du démarrage de HTML_Studio_V4_0.py.
+
+Échoue (code 1) si le temps entre le lancement de l'interpréteur et la
+première réponse de /api/machines dépasse le budget, ou si openai ou
+jsonschema sont chargés avant d'être utilisés.
+
+Usage:
+    python3 check_startup.py                 # budget par défaut (1500 ms)
+    python3 check_startup.py --budget-ms 800 --runs 5
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PYTHONISTA_DIR = Path(__file__).parent.parent / "PYTHONISTA"
+sys.path.insert(0, str(PYTHONISTA_DIR))
+
+from modules.startup import LAZY_MODULES, measure_first_response  # noqa: E402
+
+SERVER_MODULE = "HTML_Studio_V4_0"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budget de démarrage du serveur")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=3, help="Mesures (la meilleure est retenue)")
+    args = parser.parse_args()
+
+    print(f"⏱️  Démarrage de {SERVER_MODULE} — budget {args.budget_ms:.0f} ms, {args.runs} mesure(s)\n")
+
+    reports = [measure_first_response(PYTHONISTA_DIR, SERVER_MODULE) for _ in range(args.runs)]
+    for report in reports:
+        print(f"  {report['totalMs']:8.1f} ms (import {report['importMs']:.1f} ms, "
+              f"1re requête {report['firstRequestMs']:.1f} ms, statut {report['status']})")
+
+    best = min(reports, key=lambda r: r["totalMs"])
+    errors = []
+    if best["status"] != 200:
+        errors.append(f"/api/machines a répondu {best['status']}")
+    if best["totalMs"] > args.budget_ms:
+        errors.append(f"{best['totalMs']:.1f} ms > budget {args.budget_ms:.0f} ms")
+    loaded = sorted({m for r in reports for m in r["loaded"]})
+    if loaded:
+        errors.append(f"modules chargés au démarrage : {', '.join(loaded)} (attendus paresseux : {', '.join(LAZY_MODULES)})")
+
+    print()
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+    print(f"✅ Première réponse en {best['totalMs']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
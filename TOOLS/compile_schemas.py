@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Compilation des schémas JSON (SCHEMAS/) en validateurs Python sans dépendance.
+
+Chaque schéma (et chaque cible de `$ref`) devient une fonction génératrice
+d'erreurs : les sous-schémas sont déroulés en code Python (tests isinstance,
+boucles sur les tableaux, expressions régulières précompilées), sans
+interprétation du schéma à l'exécution. Les erreurs suivent la sémantique
+Draft-07 de jsonschema : même ordre que Draft7Validator.iter_errors, mêmes
+messages, mêmes chemins (`path`, `schema_path`).
+
+Le module produit est écrit dans PYTHONISTA/modules/ et, à plat, dans
+source/ (serveur Pythonista sans jsonschema).
+
+Usage:
+    python3 compile_schemas.py           # génère les deux fichiers
+    python3 compile_schemas.py --check   # vérifie qu'ils sont à jour
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urljoin
+
+ROOT = Path(__file__).parent.parent
+SCHEMAS_DIR = ROOT / "SCHEMAS"
+OUTPUTS = [ROOT / "PYTHONISTA" / "modules" / "schema_validators.py", ROOT / "source" / "schema_validators.py"]
+
+# Mots-clés sans effet sur la validation (annotations). `format` n'est pas
+# vérifié par jsonschema sans format_checker (cas de validate_json).
+IGNORED = {"$schema", "$id", "$comment", "title", "description", "default", "examples",
+           "definitions", "format"}
+
+TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+}
+NUMBER = TYPE_CHECKS["number"]
+
+HEADER = '''"""
+schema_validators.py — Validateurs JSON Schema compilés (fichier généré)
+
+Généré par TOOLS/compile_schemas.py depuis SCHEMAS/ : ne pas modifier à la
+main, relancer le script après toute modification d'un schéma (`--check`
+vérifie que ce fichier est à jour).
+
+Chaque schéma est une fonction Python (bibliothèque standard uniquement,
+utilisable sous Pythonista). Les erreurs sont produites dans le même ordre
+que Draft7Validator.iter_errors de jsonschema, avec les mêmes messages et
+chemins ; comme jsonschema sans vérificateur de formats, `format` n'est pas
+contrôlé.
+"""
+
+import re
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class SchemaError(ValueError):
+    """Écart d'un document à un schéma.
+
+    Attributes:
+        message: Message (identique à jsonschema)
+        path: Chemin dans le document (clés et indices)
+        schema_path: Chemin dans le schéma
+        validator: Mot-clé en échec
+        instance: Valeur en échec
+    """
+
+    def __init__(self, message: str, path: Tuple, schema_path: Tuple, validator: Optional[str],
+                 instance: Any) -> None:
+        super().__init__(message)
+        self.message = message
+        self.path = path
+        self.schema_path = schema_path
+        self.validator = validator
+        self.instance = instance
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _unbool(value: Any) -> Any:
+    return (bool, value) if isinstance(value, bool) else value
+
+
+def _equal(one: Any, two: Any) -> bool:
+    """Égalité JSON (True ≠ 1), comme jsonschema."""
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(_equal(a, b) for a, b in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return one.keys() == two.keys() and all(_equal(one[k], two[k]) for k in one)
+    return _unbool(one) == _unbool(two)
+'''
+
+FOOTER = '''
+
+def iter_errors(schema_name: str, instance: Any) -> Iterator[SchemaError]:
+    """Toutes les erreurs d'un document (ordre de Draft7Validator.iter_errors).
+
+    Raises:
+        KeyError: Schéma inconnu
+    """
+    return VALIDATORS[schema_name](instance, (), ())
+
+
+def first_error(schema_name: str, instance: Any) -> Optional[SchemaError]:
+    """Première erreur (arrêt dès qu'elle est trouvée), None si le document est valide."""
+    return next(iter_errors(schema_name, instance), None)
+
+
+def validate(schema_name: str, instance: Any) -> None:
+    """Lève la première erreur du document.
+
+    Raises:
+        SchemaError: Document invalide
+        KeyError: Schéma inconnu
+    """
+    error = first_error(schema_name, instance)
+    if error is not None:
+        raise error
+'''
+
+
+def schema_name(path: Path) -> str:
+    """Pattern.v1.schema.json → Pattern.v1"""
+    return path.name[:-len(".schema.json")]
+
+
+def _tuple(items: List[str]) -> str:
+    if not items:
+        return "()"
+    return "(" + ", ".join(items) + ("," if len(items) == 1 else "") + ")"
+
+
+class Compiler:
+    """Traduit des schémas Draft-07 en fonctions Python.
+
+    Args:
+        store: Schémas par $id (résolution des $ref)
+    """
+
+    def __init__(self, store: Dict[str, Dict[str, Any]]) -> None:
+        self.store = store
+        self.functions: Dict[Tuple[str, str], str] = {}
+        self.queue: List[Tuple[str, str]] = []
+        self.constants: List[str] = []
+        self.bodies: List[str] = []
+        self._names = itertools.count()
+
+    def function(self, doc_id: str, pointer: str = "") -> str:
+        """Nom de la fonction d'un (sous-)schéma, compilée plus tard si nouvelle."""
+        key = (doc_id, pointer)
+        if key not in self.functions:
+            self.functions[key] = f"_validate_{len(self.functions)}"
+            self.queue.append(key)
+        return self.functions[key]
+
+    def resolve(self, base: str, ref: str) -> Tuple[str, str]:
+        url = urljoin(base, ref)
+        doc_id, _, pointer = url.partition("#")
+        if doc_id not in self.store:
+            raise ValueError(f"$ref introuvable : {ref} (depuis {base})")
+        return doc_id, pointer
+
+    def target(self, doc_id: str, pointer: str) -> Any:
+        schema = self.store[doc_id]
+        for part in filter(None, pointer.split("/")):
+            part = part.replace("~1", "/").replace("~0", "~")
+            schema = schema[int(part)] if isinstance(schema, list) else schema[part]
+        return schema
+
+    def constant(self, prefix: str, expr: str) -> str:
+        name = f"_{prefix}_{len(self.constants)}"
+        self.constants.append(f"{name} = {expr}")
+        return name
+
+    def compile(self) -> str:
+        while len(self.bodies) < len(self.queue):
+            doc_id, pointer = self.queue[len(self.bodies)]
+            self.bodies.append(self.emit_function(doc_id, pointer))
+        return "\n".join(self.constants) + "\n\n\n" + "\n\n\n".join(self.bodies)
+
+    # ------------------------------------------------------------------------
+    # Émission
+    # ------------------------------------------------------------------------
+
+    def emit_function(self, doc_id: str, pointer: str) -> str:
+        lines = [f"def {self.functions[(doc_id, pointer)]}(instance: Any, path: Tuple, schema_path: Tuple) -> Iterator[SchemaError]:",
+                 f'    """{doc_id}{"#" + pointer if pointer else ""}"""']
+        before = len(lines)
+        self.node(self.target(doc_id, pointer), "instance", [], [], 1, lines, doc_id)
+        if not any("yield" in line for line in lines[before:]):
+            lines.append("    yield from ()")
+        return "\n".join(lines)
+
+    def fresh(self, prefix: str) -> str:
+        return f"{prefix}{next(self._names)}"
+
+    def error(self, lines: List[str], indent: int, message: str, var: str,
+              rel: List[str], spath: List[Any], keyword: Any) -> None:
+        """Émet `yield SchemaError(...)` ; `message` est une expression Python."""
+        path = "path" if not rel else f"path + {_tuple(rel)}"
+        schema_path = "schema_path" if not spath else f"schema_path + {_tuple([repr(p) for p in spath])}"
+        lines.append("    " * indent + f"yield SchemaError({message}, {path}, {schema_path}, {keyword!r}, {var})")
+
+    def node(self, schema: Any, var: str, rel: List[str], spath: List[Any], indent: int,
+             lines: List[str], base: str) -> None:
+        """Code de validation de `var` contre `schema` (ordre des mots-clés du schéma)."""
+        pad = "    " * indent
+        if schema is True:
+            return
+        if schema is False:
+            self.error(lines, indent, f'"False schema does not allow " + repr({var})', var, rel, spath, None)
+            return
+        if "$ref" in schema:
+            # Draft-07 : les mots-clés voisins de $ref sont ignorés
+            name = self.function(*self.resolve(base, schema["$ref"]))
+            path = "path" if not rel else f"path + {_tuple(rel)}"
+            schema_path = "schema_path" if not spath else f"schema_path + {_tuple([repr(p) for p in spath])}"
+            lines.append(f"{pad}yield from {name}({var}, {path}, {schema_path})")
+            return
+        for keyword, value in schema.items():
+            if keyword in IGNORED:
+                continue
+            emit = getattr(self, "kw_" + keyword, None)
+            if emit is None:
+                raise NotImplementedError(f"Mot-clé non supporté : {keyword}")
+            emit(value, var, rel, spath + [keyword], indent, lines, base)
+
+    # ------------------------------------------------------------------------
+    # Mots-clés
+    # ------------------------------------------------------------------------
+
+    def kw_type(self, types, var, rel, spath, indent, lines, base):
+        types = types if isinstance(types, list) else [types]
+        check = " or ".join(TYPE_CHECKS[t].format(v=var) for t in types)
+        suffix = " is not of type " + ", ".join(repr(t) for t in types)
+        lines.append("    " * indent + f"if not ({check}):")
+        self.error(lines, indent + 1, f"repr({var}) + {suffix!r}", var, rel, spath, "type")
+
+    def kw_properties(self, properties, var, rel, spath, indent, lines, base):
+        pad = "    " * indent
+        lines.append(f"{pad}if isinstance({var}, dict):")
+        body = len(lines)
+        for name, subschema in properties.items():
+            value = self.fresh("v")
+            lines.append(f"{pad}    if {name!r} in {var}:")
+            lines.append(f"{pad}        {value} = {var}[{name!r}]")
+            size = len(lines)
+            self.node(subschema, value, rel + [repr(name)], spath + [name], indent + 2, lines, base)
+            if len(lines) == size:
+                del lines[-2:]
+        if len(lines) == body:
+            lines.pop()
+
+    def kw_required(self, required, var, rel, spath, indent, lines, base):
+        pad = "    " * indent
+        if not required:
+            return
+        lines.append(f"{pad}if isinstance({var}, dict):")
+        for name in required:
+            lines.append(f"{pad}    if {name!r} not in {var}:")
+            self.error(lines, indent + 2, repr(f"{name!r} is a required property"), var, rel, spath, "required")
+
+    def kw_items(self, items, var, rel, spath, indent, lines, base):
+        pad = "    " * indent
+        index, item = self.fresh("i"), self.fresh("v")
+        if isinstance(items, list):
+            lines.append(f"{pad}if isinstance({var}, list):")
+            for position, subschema in enumerate(items):
+                lines.append(f"{pad}    if len({var}) > {position}:")
+                lines.append(f"{pad}        {item} = {var}[{position}]")
+                self.node(subschema, item, rel + [str(position)], spath + [position], indent + 2, lines, base)
+            return
+        if items is True or items == {}:
+            return
+        lines.append(f"{pad}if isinstance({var}, list):")
+        lines.append(f"{pad}    for {index}, {item} in enumerate({var}):")
+        self.node(items, item, rel + [index], spath, indent + 2, lines, base)
+
+    def kw_patternProperties(self, patterns, var, rel, spath, indent, lines, base):
+        pad = "    " * indent
+        lines.append(f"{pad}if isinstance({var}, dict):")
+        for pattern, subschema in patterns.items():
+            regex = self.constant("PATTERN", f"re.compile({pattern!r})")
+            key, value = self.fresh("k"), self.fresh("v")
+            lines.append(f"{pad}    for {key}, {value} in {var}.items():")
+            lines.append(f"{pad}        if {regex}.search({key}):")
+            self.node(subschema, value, rel + [key], spath + [pattern], indent + 3, lines, base)
+
+    def kw_enum(self, enum, var, rel, spath, indent, lines, base):
+        pad = "    " * indent
+        suffix = f" is not one of {enum!r}"
+        if all(isinstance(e, str) for e in enum):
+            values = self.constant("ENUM", f"frozenset({sorted(set(enum))!r})")
+            check = f"isinstance({var}, str) and {var} in {values}"
+        elif all(isinstance(e, (int, float)) and not isinstance(e, bool) for e in enum):
+            values = self.constant("ENUM", f"frozenset({sorted(set(enum))!r})")
+            check = f"{NUMBER.format(v=var)} and {var} in {values}"
+        else:
+            values = self.constant("ENUM", repr(enum))
+            check = f"any(_equal(e, {var}) for e in {values})"
+        lines.append(f"{pad}if not ({check}):")
+        self.error(lines, indent + 1, f"repr({var}) + {suffix!r}", var, rel, spath, "enum")
+
+    def kw_const(self, const, var, rel, spath, indent, lines, base):
+        pad = "    " * indent
+        if isinstance(const, str):
+            lines.append(f"{pad}if {var} != {const!r}:")
+        else:
+            lines.append(f"{pad}if not _equal({var}, {const!r}):")
+        self.error(lines, indent + 1, repr(f"{const!r} was expected"), var, rel, spath, "const")
+
+    def kw_pattern(self, pattern, var, rel, spath, indent, lines, base):
+        regex = self.constant("PATTERN", f"re.compile({pattern!r})")
+        lines.append("    " * indent + f"if isinstance({var}, str) and not {regex}.search({var}):")
+        self.error(lines, indent + 1, f"repr({var}) + {' does not match ' + repr(pattern)!r}", var, rel, spath, "pattern")
+
+    def _bound(self, op, text, limit, keyword, var, rel, spath, indent, lines):
+        lines.append("    " * indent + f"if {NUMBER.format(v=var)} and {var} {op} {limit!r}:")
+        self.error(lines, indent + 1, f"repr({var}) + {f' {text} {limit!r}'!r}", var, rel, spath, keyword)
+
+    def kw_minimum(self, limit, var, rel, spath, indent, lines, base):
+        self._bound("<", "is less than the minimum of", limit, "minimum", var, rel, spath, indent, lines)
+
+    def kw_maximum(self, limit, var, rel, spath, indent, lines, base):
+        self._bound(">", "is greater than the maximum of", limit, "maximum", var, rel, spath, indent, lines)
+
+    def kw_exclusiveMinimum(self, limit, var, rel, spath, indent, lines, base):
+        self._bound("<=", "is less than or equal to the minimum of", limit, "exclusiveMinimum",
+                    var, rel, spath, indent, lines)
+
+    def kw_exclusiveMaximum(self, limit, var, rel, spath, indent, lines, base):
+        self._bound(">=", "is greater than or equal to the maximum of", limit, "exclusiveMaximum",
+                    var, rel, spath, indent, lines)
+
+    def _length(self, kind, op, limit, text, keyword, var, rel, spath, indent, lines):
+        lines.append("    " * indent + f"if isinstance({var}, {kind}) and len({var}) {op} {limit!r}:")
+        self.error(lines, indent + 1, f"repr({var}) + {' ' + text!r}", var, rel, spath, keyword)
+
+    def kw_minLength(self, limit, var, rel, spath, indent, lines, base):
+        text = "should be non-empty" if limit == 1 else "is too short"
+        self._length("str", "<", limit, text, "minLength", var, rel, spath, indent, lines)
+
+    def kw_maxLength(self, limit, var, rel, spath, indent, lines, base):
+        text = "is expected to be empty" if limit == 0 else "is too long"
+        self._length("str", ">", limit, text, "maxLength", var, rel, spath, indent, lines)
+
+    def kw_minItems(self, limit, var, rel, spath, indent, lines, base):
+        text = "should be non-empty" if limit == 1 else "is too short"
+        self._length("list", "<", limit, text, "minItems", var, rel, spath, indent, lines)
+
+    def kw_maxItems(self, limit, var, rel, spath, indent, lines, base):
+        text = "is expected to be empty" if limit == 0 else "is too long"
+        self._length("list", ">", limit, text, "maxItems", var, rel, spath, indent, lines)
+
+
+def generate() -> str:
+    """Source du module de validateurs pour tous les schémas de SCHEMAS/."""
+    paths = sorted(SCHEMAS_DIR.rglob("*.schema.json"))
+    store, names, hashes = {}, {}, {}
+    for path in paths:
+        data = path.read_bytes()
+        schema = json.loads(data)
+        store[schema.get("$id", path.name)] = schema
+        names[schema_name(path)] = schema.get("$id", path.name)
+        hashes[path.relative_to(SCHEMAS_DIR).as_posix()] = hashlib.sha1(data).hexdigest()
+
+    compiler = Compiler(store)
+    for doc_id in names.values():
+        compiler.function(doc_id)
+    code = compiler.compile()
+
+    table = [f"    {name!r}: {compiler.functions[(doc_id, '')]}," for name, doc_id in names.items()]
+    table += [f"    {doc_id!r}: {compiler.functions[(doc_id, '')]}," for doc_id in names.values()
+              if doc_id not in names]
+    sources = [f"    {path!r}: {digest!r}," for path, digest in hashes.items()]
+    return (HEADER + "\n# SHA-1 des schémas compilés\nSOURCES = {\n" + "\n".join(sources) + "\n}\n\n"
+            + code + "\n\n\n# Validateurs par nom (\"Pattern.v1\") et par $id\n"
+            + "VALIDATORS: Dict[str, Callable[[Any, Tuple, Tuple], Iterator[SchemaError]]] = {\n"
+            + "\n".join(table) + "\n}\n" + FOOTER)
+
+
+def main():
+    source = generate()
+    compile(source, "schema_validators.py", "exec")
+    if "--check" in sys.argv[1:]:
+        stale = [p for p in OUTPUTS if not p.exists() or p.read_text(encoding="utf-8") != source]
+        for path in stale:
+            print(f"❌ {path.relative_to(ROOT)} n'est pas à jour (relancer compile_schemas.py)")
+        if not stale:
+            print("✅ Validateurs compilés à jour")
+        sys.exit(1 if stale else 0)
+
+    for path in OUTPUTS:
+        path.write_text(source, encoding="utf-8")
+        print(f"✅ {path.relative_to(ROOT)} ({source.count(chr(10))} lignes)")
+
+
+if __name__ == "__main__":
+    main()
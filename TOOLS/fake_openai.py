@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Faux serveur OpenAI (chat completions) avec latence simulée.
+
+Répond à POST /v1/chat/completions par un CreatePattern.v1 valide déduit du
+prompt utilisateur (kick, snare, hats, bass…), après une latence
+configurable. Sert aux tests de /api/gpt et /api/gpt/batch sans réseau.
+
+Usage:
+    python3 fake_openai.py --port 8799 --latency-ms 800
+    OPENAI_BASE_URL=http://127.0.0.1:8799/v1 python3 PYTHONISTA/HTML_Studio_V4_0.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# Instrument → (machine, note MIDI, pas actifs)
+VOICES = {
+    "kick": ("behringer.rd9", 36, range(0, 16, 4)),
+    "snare": ("behringer.rd9", 38, (4, 12)),
+    "clap": ("behringer.rd9", 39, (4, 12)),
+    "hat": ("behringer.rd9", 42, range(2, 16, 4)),
+    "bass": ("behringer.td3", 36, range(0, 16, 2)),
+}
+
+
+def fake_pattern(prompt: str) -> Dict:
+    """CreatePattern.v1 déterministe pour un prompt."""
+    lowered = prompt.lower()
+    voice = next((v for k, v in VOICES.items() if k in lowered), VOICES["kick"])
+    machine, note, active = voice
+    rng = random.Random(prompt)
+    return {
+        "schema": "CreatePattern.v1",
+        "name": prompt[:40],
+        "targetMachine": machine,
+        "lengthSteps": 16,
+        "resolutionPPQ": 96,
+        "steps": [{"t": t, "note": note, "vel": rng.randint(90, 127)} for t in active],
+    }
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Serveur HTTP multi-threads comptant les requêtes reçues.
+
+    Attributes:
+        latency: Latence de base en secondes
+        jitter: Variation aléatoire maximale en secondes
+        requests: Nombre de complétions servies
+        max_in_flight: Pic de requêtes simultanées observé
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.5, jitter: float = 0.0) -> None:
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="fake-openai", daemon=True)
+        thread.start()
+        return thread
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - signature imposée
+        pass
+
+    def do_POST(self):
+        server: FakeOpenAIServer = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+        if not self.path.endswith("/chat/completions"):
+            self._reply(404, {"error": {"message": "not found"}})
+            return
+
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            payload = json.loads(body or b"{}")
+            prompt = next((m["content"] for m in reversed(payload.get("messages", []))
+                           if m.get("role") == "user"), "")
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+            self._reply(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(fake_pattern(prompt))},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, status: int, data: Dict) -> None:
+        raw = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def start_fake_server(latency: float = 0.5, jitter: float = 0.0,
+                      port: int = 0) -> FakeOpenAIServer:
+    """Démarre un faux serveur dans un thread et le retourne."""
+    server = FakeOpenAIServer(port=port, latency=latency, jitter=jitter)
+    server.start()
+    return server
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Faux serveur OpenAI (latence simulée)")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(port=args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+    print(f"🤖 Faux OpenAI sur {server.base_url} (latence {args.latency_ms:.0f} ms)")
+    print(f"   OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Rapport de performance client entre deux builds (modules/perf_store.py).
+
+Lit la télémétrie envoyée par performance_test.html (data/perf.db) et
+affiche, par appareil et par métrique, la moyenne de chaque build, l'écart
+et le verdict (régression, amélioration, inchangé). Code de sortie 1 si une
+régression est détectée (utilisable avant une mise à jour de l'iPhone).
+
+--demo remplit une base temporaire avec deux builds simulés (une heure de
+mesures à 1 Hz chacun, FPS moyen de 59 puis 55 sur le second) et indique la
+taille occupée par mesure.
+
+Usage:
+    python3 perf_report.py                          # deux derniers builds
+    python3 perf_report.py --base 1a2b3c --head 4d5e6f --device "iPhone 14 Pro Max"
+    python3 perf_report.py --demo
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "PYTHONISTA"))
+
+from modules.perf_store import REGRESSION_THRESHOLD, PerfStore  # noqa: E402
+
+DEFAULT_DB = ROOT / "PYTHONISTA" / "data" / "perf.db"
+DEMO_DEVICE = "iPhone 14 Pro Max"
+MARKS = {"regression": "❌", "improvement": "✅", "unchanged": "·"}
+
+
+def fill_demo(store: PerfStore) -> int:
+    """Deux builds simulés ; renvoie le nombre de valeurs enregistrées."""
+    rng = random.Random(7)
+    now = time.time()
+    values = 0
+    for build, fps, start in (("demo-before", 59.0, now - 7200), ("demo-after", 55.0, now - 3600)):
+        samples = [{"t": (start + i) * 1000, "cpu": rng.gauss(22, 3), "latency": rng.gauss(14, 1),
+                    "memory": None, "fps": min(60.0, rng.gauss(fps, 1.5))} for i in range(3600)]
+        for i in range(0, len(samples), 600):
+            values += store.ingest(DEMO_DEVICE, build, samples[i:i + 600])["accepted"]
+    return values
+
+
+def print_report(report: dict) -> None:
+    print(f"📊 {report['base']} → {report['head']} (seuil {report['threshold'] * 100:.0f} %)\n")
+    for entry in report["devices"]:
+        print(f"  {entry['device']}")
+        for m in entry["metrics"]:
+            relative = "-" if m["relative"] is None else f"{m['relative'] * 100:+.1f} %"
+            print(f"    {MARKS[m['verdict']]} {m['metric']:<8}{m['base']['mean']:9.1f}{m['unit']:<4}"
+                  f"→{m['head']['mean']:9.1f}{m['unit']:<4}{relative:>9}   n={m['base']['n']}/{m['head']['n']}")
+    if not report["devices"]:
+        print("  Aucune métrique mesurée sur les deux builds")
+    print(f"\n  {report['regressions']} régression(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparaison de performance entre builds")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Base de télémétrie")
+    parser.add_argument("--base", help="Build de référence (défaut : avant-dernier mesuré)")
+    parser.add_argument("--head", help="Build comparé (défaut : dernier mesuré)")
+    parser.add_argument("--device", help="Restreindre à un appareil")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Écart relatif minimal")
+    parser.add_argument("--demo", action="store_true", help="Données simulées dans une base temporaire")
+    args = parser.parse_args()
+
+    if args.demo:
+        store = PerfStore(Path(tempfile.mkdtemp()) / "perf.db")
+        values = fill_demo(store)
+        stats = store.stats()
+        print(f"🧪 {values} valeurs simulées → {stats['finePoints']} cases de 10 s, "
+              f"{stats['bytes'] / values:.1f} octets par valeur\n")
+    elif not args.db.exists():
+        sys.exit(f"❌ Base introuvable : {args.db}")
+    else:
+        store = PerfStore(args.db)
+
+    builds = [entry["build"] for entry in store.builds(args.device)]
+    head = args.head or (builds[0] if builds else None)
+    base = args.base or (store.previous_build(head, args.device) if head else None)
+    if head is None or base is None:
+        sys.exit("❌ Deux builds mesurés sont nécessaires")
+
+    report = store.compare(base, head, args.device, args.threshold)
+    print_report(report)
+    sys.exit(1 if report["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    main()
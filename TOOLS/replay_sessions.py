@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Test de charge par rejeu des sessions enregistrées dans `action_logs`.
+
+Les actions journalisées sont regroupées en sessions (coupure après un
+silence de --session-gap secondes), converties en requêtes HTTP, puis
+rejouées par N clients virtuels en respectant les intervalles d'origine
+divisés par --speedup. Les appels OpenAI partent vers le faux serveur local
+(fake_openai.py) : aucun réseau n'est nécessaire.
+
+Rapport : p50/p95/p99 et débit par route ; code de sortie 1 si une requête
+a échoué. Les routes absentes de source/server.py (lots GPT, groove) ne sont
+pas envoyées au serveur plat et figurent comme « non supportées ».
+
+Usage:
+    python3 replay_sessions.py --local --demo --clients 8 --speedup 20
+    python3 replay_sessions.py --local flat --demo            # source/server.py
+    python3 replay_sessions.py --db PYTHONISTA/data/HTML_Studio_logs.db --local
+    python3 replay_sessions.py --url http://127.0.0.1:8787 --db logs.db
+        (serveur lancé avec OPENAI_BASE_URL=http://127.0.0.1:8799/v1,
+         voir fake_openai.py)
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "PYTHONISTA"))
+
+from bench_project_format import make_project  # noqa: E402
+from fake_openai import start_fake_server  # noqa: E402
+from modules.metrics import LatencyStats  # noqa: E402
+
+DEFAULT_DB = ROOT / "PYTHONISTA" / "data" / "HTML_Studio_logs.db"
+API_KEY = "sk-replay"
+
+# Prompts des sessions de démonstration
+DEMO_PROMPTS = ["kick 4/4 techno", "open hats offbeat", "303 acid bass", "snare on 2 and 4",
+                "clap with reverb feel", "rolling bass 16th"]
+
+# Routes de HTML_Studio_V4_0.py sans équivalent dans source/server.py
+FLAT_UNSUPPORTED = {"POST /api/gpt/batch", "POST /api/groove/variations"}
+
+# (décalage en secondes depuis le début de la session, méthode, route, corps, en-têtes)
+Request = Tuple[float, str, str, Optional[Dict[str, Any]], Dict[str, str]]
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+def load_sessions(db_path: Path, session_gap: float) -> List[List[Dict[str, Any]]]:
+    """Lit action_logs (lecture seule) et découpe les actions en sessions."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            "SELECT timestamp, action_type, payload FROM action_logs ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+    sessions: List[List[Dict[str, Any]]] = []
+    last = None
+    for timestamp, action_type, payload in rows:
+        at = datetime.fromisoformat(timestamp).timestamp()
+        if last is None or at - last > session_gap:
+            sessions.append([])
+        try:
+            payload = json.loads(payload) if payload else {}
+        except json.JSONDecodeError:
+            payload = {}
+        sessions[-1].append({"at": at, "action": action_type, "payload": payload})
+        last = at
+    return sessions
+
+
+def demo_sessions(count: int, seed: int = 1) -> List[List[Dict[str, Any]]]:
+    """Sessions synthétiques au format de load_sessions (base vide ou démo)."""
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(count):
+        at = 0.0
+        session = []
+
+        def add(action: str, payload: Dict[str, Any], gap: Tuple[float, float] = (1, 10)) -> None:
+            nonlocal at
+            at += rng.uniform(*gap)
+            session.append({"at": at, "action": action, "payload": payload})
+
+        add("get_machines", {}, (0, 0))
+        add("validate_api_key", {"valid": True}, (2, 5))
+        add("project_load", {}, (1, 3))
+        for prompt in rng.sample(DEMO_PROMPTS, 3):
+            add("gpt_generate", {"prompt": prompt}, (5, 30))
+        batch = rng.sample(DEMO_PROMPTS, 2)
+        add("gpt_generate", {"prompt": batch[0], "batch": True}, (10, 20))
+        for prompt in batch[1:]:
+            # même lot : journalisé dans la fenêtre de regroupement de build_requests
+            add("gpt_generate", {"prompt": prompt, "batch": True}, (0, 0.5))
+        add("groove_variations", {"count": 4, "seed": rng.randint(0, 999)})
+        add("project_save", {}, (5, 20))
+        add("midi_export", {}, (2, 10))
+        add("project_load", {"format": "binary"}, (2, 10))
+        sessions.append(session)
+    return sessions
+
+
+def build_requests(session: List[Dict[str, Any]], project: Dict[str, Any]) -> List[Request]:
+    """Convertit une session en requêtes HTTP (décalages relatifs au début)."""
+    start = session[0]["at"]
+    requests: List[Request] = []
+    batch: Optional[Dict[str, Any]] = None
+    batch_offset = 0.0
+
+    for entry in session:
+        offset = entry["at"] - start
+        payload = entry["payload"]
+        action = entry["action"]
+
+        # Les prompts d'un même lot sont journalisés un par un : on les regroupe
+        if action == "gpt_generate" and payload.get("batch"):
+            if batch is not None and offset - batch_offset <= 1.0:
+                batch["prompts"].append(payload.get("prompt", ""))
+                continue
+            batch, batch_offset = {"prompts": [payload.get("prompt", "")], "projectState": {}}, offset
+            requests.append((offset, "POST", "/api/gpt/batch", batch, {}))
+            continue
+        batch = None
+
+        if action == "get_machines":
+            requests.append((offset, "GET", "/api/machines", None, {}))
+        elif action == "validate_api_key":
+            requests.append((offset, "POST", "/api/auth/validate", {"apiKey": API_KEY}, {}))
+        elif action == "gpt_generate":
+            requests.append((offset, "POST", "/api/gpt",
+                             {"prompt": payload.get("prompt", "kick"), "projectState": {}}, {}))
+        elif action == "midi_export":
+            requests.append((offset, "POST", "/api/midi/export", {"projectState": project}, {}))
+        elif action == "groove_variations":
+            body = {"pattern": project["patterns"][0], "count": payload.get("count", 1),
+                    "groove": {"humanizeTicks": 10, "humanizeVel": 8, "seed": payload.get("seed") or 0}}
+            requests.append((offset, "POST", "/api/groove/variations", body, {}))
+        elif action == "project_save":
+            requests.append((offset, "POST", "/api/project/save", {"projectState": project}, {}))
+        elif action == "project_load":
+            headers = {"Accept": "application/vnd.livetechno.project+binary"} \
+                if payload.get("format") == "binary" else {}
+            requests.append((offset, "GET", "/api/project/load", None, headers))
+        # sequencer_connect (WebSocket) et actions inconnues : non rejouées
+
+    return requests
+
+# ============================================================================
+# REJEU
+# ============================================================================
+
+class Recorder:
+    """Latences et erreurs par route (partagé entre clients)."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.routes: Dict[str, LatencyStats] = {}
+        self.errors: Dict[str, int] = {}
+        self.unsupported: Dict[str, int] = {}
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        with self.lock:
+            stats = self.routes.setdefault(route, LatencyStats())
+            self.errors.setdefault(route, 0)
+            if not ok:
+                self.errors[route] += 1
+        stats.add(seconds)
+
+    def skip(self, route: str) -> None:
+        """Requête non envoyée : route absente du serveur cible."""
+        with self.lock:
+            self.unsupported[route] = self.unsupported.get(route, 0) + 1
+
+
+def send(base_url: str, method: str, route: str, body: Optional[Dict[str, Any]],
+         headers: Dict[str, str]) -> int:
+    """Envoie une requête et lit toute la réponse ; retourne le statut HTTP."""
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(base_url + route, data=data, method=method, headers=dict(headers))
+    if data is not None:
+        request.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+
+
+def run_client(base_url: str, requests: List[Request], speedup: float, max_wait: float,
+               recorder: Recorder, unsupported: frozenset = frozenset()) -> None:
+    """Rejoue une session en respectant les intervalles (accélérés).
+
+    Les routes de `unsupported` ne sont pas envoyées (comptées à part).
+    """
+    due = time.perf_counter()
+    previous = 0.0
+    for offset, method, route, body, headers in requests:
+        due += min((offset - previous) / speedup, max_wait)
+        previous = offset
+        if f"{method} {route}" in unsupported:
+            recorder.skip(f"{method} {route}")
+            continue
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        t0 = time.perf_counter()
+        try:
+            status = send(base_url, method, route, body, headers)
+        except OSError:
+            status = 0
+        recorder.record(f"{method} {route}", time.perf_counter() - t0, 200 <= status < 400)
+
+
+def start_local_server(kind: str) -> str:
+    """Démarre le serveur choisi (studio ou flat) sur un port libre, données en dossier temporaire."""
+    import logging
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # pas une ligne par requête
+    data_dir = Path(tempfile.mkdtemp(prefix="replay_"))
+    if kind == "flat":
+        sys.path.insert(0, str(ROOT / "source"))
+        import server  # noqa: E402 - source/server.py
+        server.BASE_DIR = data_dir
+        server.DB_PATH = data_dir / "logs.db"
+        server.PROJECT_PATH = data_dir / "project.json"
+        server.init_db()
+    else:
+        import HTML_Studio_V4_0 as server  # noqa: E402
+        server.DATA_DIR = data_dir
+        server.DB_PATH = data_dir / "replay.db"
+    server.OPENAI_API_KEY = API_KEY
+
+    http = make_server("127.0.0.1", 0, server.app, threaded=True)
+    threading.Thread(target=http.serve_forever, name="replay-server", daemon=True).start()
+    return f"http://127.0.0.1:{http.server_port}"
+
+
+def print_report(recorder: Recorder, elapsed: float) -> int:
+    """Affiche le rapport ; retourne le nombre de requêtes en erreur."""
+    print(f"\n{'Route':<30} {'Req':>5} {'Err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>7}")
+    print("-" * 76)
+    total = errors = 0
+    for route in sorted(recorder.routes):
+        summary = recorder.routes[route].summary()
+        total += summary["count"]
+        errors += recorder.errors[route]
+        print(f"{route:<30} {summary['count']:>5} {recorder.errors[route]:>4} "
+              f"{summary['p50']:>6.1f}ms {summary['p95']:>6.1f}ms {summary['p99']:>6.1f}ms "
+              f"{summary['count'] / elapsed:>7.2f}")
+    for route in sorted(recorder.unsupported):
+        print(f"{route:<30} {recorder.unsupported[route]:>5}    - non supportée")
+    print("-" * 76)
+    print(f"{'Total':<30} {total:>5} {errors:>4} {'':>26} {total / elapsed:>7.2f}")
+    print(f"\n⏱️  Durée : {elapsed:.1f} s")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu de sessions (test de charge)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Base de logs à rejouer")
+    parser.add_argument("--demo", type=int, nargs="?", const=4, default=0, metavar="N",
+                        help="N sessions synthétiques au lieu de la base")
+    parser.add_argument("--url", help="Serveur cible (ex. http://127.0.0.1:8787)")
+    parser.add_argument("--local", nargs="?", const="studio", choices=("studio", "flat"),
+                        help="Serveur embarqué : HTML_Studio_V4_0 (défaut) ou source/server.py")
+    parser.add_argument("--flat", action="store_true",
+                        help="Avec --url : le serveur cible est source/server.py")
+    parser.add_argument("--clients", type=int, default=4, help="Clients virtuels")
+    parser.add_argument("--speedup", type=float, default=10.0, help="Accélération du temps")
+    parser.add_argument("--max-wait", type=float, default=5.0, help="Attente maximale entre deux requêtes (s)")
+    parser.add_argument("--session-gap", type=float, default=1800, help="Silence séparant deux sessions (s)")
+    parser.add_argument("--latency-ms", type=float, default=800, help="Latence du faux OpenAI (--local)")
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    if not args.url and not args.local:
+        parser.error("--url ou --local requis")
+
+    sessions = demo_sessions(args.demo) if args.demo else load_sessions(args.db, args.session_gap)
+    sessions = [s for s in sessions if s]
+    if not sessions:
+        print(f"❌ Aucune session dans {args.db} (utiliser --demo)")
+        sys.exit(1)
+
+    if args.local:
+        fake = start_fake_server(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+        os.environ["OPENAI_BASE_URL"] = fake.base_url
+        base_url = start_local_server(args.local)
+        print(f"🤖 Faux OpenAI : {fake.base_url} (latence {args.latency_ms:.0f} ± {args.jitter_ms:.0f} ms)")
+    else:
+        base_url = args.url.rstrip("/")
+        send(base_url, "POST", "/api/auth/validate", {"apiKey": API_KEY}, {})
+
+    project = make_project(4, 64)
+    plans = [build_requests(s, project) for s in sessions]
+    if args.local:
+        # Projet déjà sauvegardé, comme sur un serveur en service (un
+        # chargement en début de session ne doit pas répondre 404)
+        send(base_url, "POST", "/api/project/save", {"projectState": project}, {})
+    print(f"🎛️  {len(sessions)} session(s), {sum(len(p) for p in plans)} requêtes → {base_url}")
+    print(f"   {args.clients} clients virtuels, accélération ×{args.speedup:g}")
+
+    flat = args.local == "flat" or (args.url and args.flat)
+    unsupported = frozenset(FLAT_UNSUPPORTED if flat else ())
+    recorder = Recorder()
+    threads = [threading.Thread(target=run_client,
+                                args=(base_url, plans[i % len(plans)], args.speedup, args.max_wait,
+                                      recorder, unsupported))
+               for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    errors = print_report(recorder, time.perf_counter() - start)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Client headless du séquenceur WebSocket : vérifie la précision du timing.
+
+Le client reçoit les lots d'événements, mesure pour chacun l'avance avec
+laquelle il arrive (heure prévue - heure de réception) et compte les
+événements arrivés trop tard pour être joués.
+
+Usage:
+    python3 seq_client.py --local                     # serveur embarqué
+    python3 seq_client.py --url ws://127.0.0.1:8788/ws/sequencer --seconds 10
+    python3 seq_client.py --local --project PYTHONISTA/data/project.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "PYTHONISTA"))
+
+from modules.metrics import LatencyStats  # noqa: E402
+from modules.sequencer import SequencerStats, serve_sequencer  # noqa: E402
+from modules.websocket import WebSocketServer, connect  # noqa: E402
+
+
+def demo_project(bpm: float) -> dict:
+    """Projet minimal : kick 4/4 + hats 16e sur RD-9, basse sur TD-3."""
+    drums = [{"t": t, "note": 36, "vel": 120} for t in range(0, 16, 4)]
+    drums += [{"t": t, "note": 42, "vel": 70} for t in range(16)]
+    bass = [{"t": t, "note": 36 + (t % 3) * 7, "vel": 100, "duration": 0.2} for t in range(0, 16, 2)]
+    return {
+        "schema": "ProjectState.v1",
+        "meta": {"bpm": bpm, "signature": "4/4", "ppq": 480},
+        "machines": [
+            {"id": "behringer.rd9", "instanceId": "drums_1", "midiChannel": 10, "position": {"x": 0, "y": 0}},
+            {"id": "behringer.td3", "instanceId": "bass_1", "midiChannel": 1, "position": {"x": 0, "y": 0}},
+        ],
+        "patterns": [
+            {"schema": "Pattern.v1", "id": "d", "targetMachine": "behringer.rd9",
+             "lengthSteps": 16, "resolutionPPQ": 96, "steps": drums},
+            {"schema": "Pattern.v1", "id": "b", "targetMachine": "behringer.td3",
+             "lengthSteps": 16, "resolutionPPQ": 96, "steps": bass},
+        ],
+        "routing": [],
+    }
+
+
+def start_local_server() -> str:
+    """Démarre un serveur WebSocket embarqué sur un port libre."""
+    server = WebSocketServer("127.0.0.1", 0)
+    stats = SequencerStats()
+    server.route("/ws/sequencer")(lambda conn: serve_sequencer(conn, stats))
+    server.start()
+    return f"ws://127.0.0.1:{server.server_address[1]}/ws/sequencer"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", default="ws://127.0.0.1:8788/ws/sequencer")
+    parser.add_argument("--local", action="store_true", help="Serveur embarqué (sans Flask)")
+    parser.add_argument("--project", type=Path, help="ProjectState JSON (défaut : démo)")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--bpm", type=float, default=128)
+    parser.add_argument("--lookahead-ms", type=float, default=200)
+    parser.add_argument("--interval-ms", type=float, default=25)
+    args = parser.parse_args()
+
+    url = start_local_server() if args.local else args.url
+    if args.project:
+        project = json.loads(args.project.read_text(encoding="utf-8"))
+        project = project.get("projectState", project)
+    else:
+        project = demo_project(args.bpm)
+
+    print(f"🔌 Connexion à {url}")
+    conn = connect(url)
+    conn.send_json({
+        "type": "start",
+        "projectState": project,
+        "lookaheadMs": args.lookahead_ms,
+        "intervalMs": args.interval_ms,
+    })
+
+    arrival = LatencyStats()
+    batch_gaps = LatencyStats()
+    late = 0
+    received = 0
+    last_batch = None
+    deadline = time.time() + args.seconds
+
+    while time.time() < deadline:
+        message = conn.recv_json()
+        now = time.time()
+        if message["type"] == "error":
+            print(f"❌ {message['error']}")
+            sys.exit(1)
+        if message["type"] != "events":
+            continue
+        if last_batch is not None:
+            batch_gaps.add(now - last_batch)
+        last_batch = now
+        for event in message["events"]:
+            lead = event["time"] - now
+            arrival.add(lead)
+            received += 1
+            if lead < 0:
+                late += 1
+
+    conn.send_json({"type": "stop"})
+    while True:
+        message = conn.recv_json()
+        if message["type"] == "stopped":
+            server_stats = message["stats"]
+            break
+    conn.close()
+
+    print(f"\n📊 {received} événements reçus en {args.seconds:.1f} s "
+          f"(lookahead {args.lookahead_ms:.0f} ms, période {args.interval_ms:.0f} ms)\n")
+    print(f"  Avance à la réception (ms) : {arrival.summary()}")
+    print(f"  Écart entre lots (ms)      : {batch_gaps.summary()}")
+    print(f"  Jitter serveur (ms)        : {server_stats['jitterMs']}")
+    print(f"  Marge serveur (ms)         : {server_stats['leadMs']}")
+
+    if late:
+        print(f"\n❌ {late} événement(s) arrivé(s) après leur heure de déclenchement")
+        sys.exit(1)
+    print("\n✅ Tous les événements sont arrivés à temps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Copie des modules partagés vers le dossier plat source/.
+
+Les modules de PYTHONISTA/modules/ qui ne dépendent que de la bibliothèque
+standard (et d'aucun autre module du paquet) sont aussi utilisés par
+source/server.py. L'exemplaire de PYTHONISTA/modules/ fait référence :
+source/ en reçoit une copie identique, à ne pas modifier à la main.
+(schema_validators.py est généré pour les deux dossiers par
+compile_schemas.py.)
+
+Usage:
+    python3 sync_flat_modules.py           # recopie les modules
+    python3 sync_flat_modules.py --check   # vérifie que les copies sont à jour
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+MODULES_DIR = ROOT / "PYTHONISTA" / "modules"
+FLAT_DIR = ROOT / "source"
+
+# Modules recopiés tels quels dans source/
+SHARED_MODULES = ["profiling.py"]
+
+
+def main():
+    check = "--check" in sys.argv[1:]
+    stale = []
+    for name in SHARED_MODULES:
+        source = (MODULES_DIR / name).read_text(encoding="utf-8")
+        if "from modules" in source or "import modules" in source:
+            sys.exit(f"❌ {name} importe le paquet modules : pas de copie à plat possible")
+        target = FLAT_DIR / name
+        if target.exists() and target.read_text(encoding="utf-8") == source:
+            continue
+        if check:
+            stale.append(target)
+            print(f"❌ {target.relative_to(ROOT)} diffère de PYTHONISTA/modules/{name} "
+                  f"(relancer sync_flat_modules.py)")
+        else:
+            target.write_text(source, encoding="utf-8")
+            print(f"✅ {target.relative_to(ROOT)} mis à jour")
+
+    if check:
+        if not stale:
+            print("✅ Modules du dossier plat à jour")
+        sys.exit(1 if stale else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+profiling.py — Profilage par requête (cProfile + tracemalloc, échantillonné)
+
+Mode opt-in : une requête sur N (ou toute requête portant l'en-tête
+`X-Profile: 1`) est exécutée sous cProfile et tracemalloc. Pour chaque
+requête profilée on conserve, par route :
+
+- les piles repliées (« collapsed stacks », `a;b;c <µs>`) reconstruites à
+  partir du graphe d'appels de cProfile — format lu par flamegraph.pl,
+  speedscope ou inferno ;
+- les fonctions les plus coûteuses (temps cumulé) ;
+- les sites d'allocation les plus gros encore vivants en fin de requête et
+  le pic mémoire.
+
+Une seule requête est profilée à la fois (cProfile et tracemalloc sont
+globaux) ; les autres passent sans profilage. Le corps des réponses
+profilées est lu entièrement dans le profil (pas de streaming).
+
+Ce fichier ne dépend que de la bibliothèque standard. Il existe en deux
+exemplaires identiques : PYTHONISTA/modules/profiling.py (référence) et
+source/profiling.py (dossier plat du serveur sans dépendances), recopié
+par TOOLS/sync_flat_modules.py (`--check` vérifie la copie).
+"""
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# En-tête (WSGI) demandant le profilage d'une requête
+PROFILE_HEADER = "HTTP_X_PROFILE"
+
+# Routes jamais profilées (la route de consultation elle-même)
+EXCLUDED_PREFIXES = ("/api/debug/",)
+
+# Profondeur maximale des piles reconstruites et part minimale émise (µs)
+MAX_DEPTH = 64
+MIN_SHARE_US = 10
+
+_Func = Tuple[str, int, str]
+
+
+def _label(func: _Func) -> str:
+    """Nom lisible d'une fonction pstats (sans ';', séparateur des piles)."""
+    filename, line, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+def collapse(profile: cProfile.Profile, min_share_us: float = MIN_SHARE_US) -> Dict[str, int]:
+    """Piles repliées depuis un profil cProfile.
+
+    cProfile ne garde que les arcs appelant → appelé : le temps propre d'une
+    fonction est réparti entre ses chemins au prorata du temps cumulé de
+    chaque arc (approximation usuelle de flameprof).
+
+    Returns:
+        {"racine;...;feuille": microsecondes}
+    """
+    stats = pstats.Stats(profile).stats
+    callees: Dict[_Func, Dict[_Func, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    roots = [f for f, (_, _, _, _, callers) in stats.items()
+             if not any(c in stats for c in callers)]
+    out: Dict[str, float] = defaultdict(float)
+
+    def walk(func: _Func, stack: List[str], seen: Tuple[_Func, ...], share: float) -> None:
+        _, _, tt, ct, _ = stats[func]
+        ratio = share / ct if ct else 0.0
+        path = stack + [_label(func)]
+        own = tt * ratio * 1e6
+        if own >= 1:
+            out[";".join(path)] += own
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, {}).items():
+            callee_share = edge_ct * ratio
+            if callee in seen or callee not in stats or callee_share * 1e6 < min_share_us:
+                continue
+            walk(callee, path, seen + (callee,), callee_share)
+
+    for root in roots:
+        walk(root, [], (root,), stats[root][3])
+
+    return {stack: int(us) for stack, us in out.items() if us >= 1}
+
+
+def top_functions(profile: cProfile.Profile, top: int = 15) -> List[Dict[str, Any]]:
+    """Fonctions triées par temps cumulé."""
+    stats = pstats.Stats(profile, stream=io.StringIO()).stats
+    rows = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:top]
+    return [{
+        "function": _label(func),
+        "calls": nc,
+        "ownMs": round(tt * 1000, 3),
+        "cumulativeMs": round(ct * 1000, 3),
+    } for func, (_, nc, tt, ct, _) in rows]
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, top: int = 15) -> List[Dict[str, Any]]:
+    """Sites d'allocation (fichier:ligne) triés par taille."""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    return [{
+        "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+        "sizeKiB": round(stat.size / 1024, 2),
+        "count": stat.count,
+    } for stat in snapshot.statistics("lineno")[:top]]
+
+# ============================================================================
+# PROFILEUR
+# ============================================================================
+
+class _Session:
+    """Profilage d'une requête en cours."""
+
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.owns_tracemalloc = not tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        return self.profile.runcall(fn, *args)
+
+    def finish(self) -> Tuple[float, tracemalloc.Snapshot, int]:
+        duration = time.perf_counter() - self.started
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+        return duration, snapshot, peak
+
+
+class RequestProfiler:
+    """Échantillonne des requêtes et conserve leurs profils par route.
+
+    Args:
+        every: Profiler une requête sur `every` (0 = en-tête X-Profile uniquement)
+        keep: Profils conservés par route (les plus récents)
+        top: Lignes conservées (fonctions, allocations)
+    """
+
+    def __init__(self, every: int = 0, keep: int = 20, top: int = 15) -> None:
+        if every < 0:
+            raise ValueError(f"Échantillonnage invalide: {every}")
+        self.every = every
+        self.keep = keep
+        self.top = top
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._profiles: Dict[str, Deque[Dict[str, Any]]] = {}
+
+    def wants(self, environ: Dict[str, Any], route: str) -> bool:
+        """Cette requête doit-elle être profilée ?"""
+        if route.startswith(EXCLUDED_PREFIXES):
+            return False
+        if environ.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes"):
+            return True
+        return self.every > 0 and next(self._counter) % self.every == 0
+
+    def begin(self) -> Optional[_Session]:
+        """Démarre un profil, ou None si une autre requête est déjà profilée."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            return _Session()
+        except Exception:
+            self._busy.release()
+            raise
+
+    def end(self, session: _Session, method: str, route: str, status: str) -> Dict[str, Any]:
+        """Termine un profil et l'enregistre."""
+        try:
+            duration, snapshot, peak = session.finish()
+        finally:
+            self._busy.release()
+
+        record = {
+            "id": next(self._ids),
+            "timestamp": datetime.utcnow().isoformat(),
+            "method": method,
+            "route": route,
+            "status": status,
+            "durationMs": round(duration * 1000, 3),
+            "peakKiB": round(peak / 1024, 2),
+            "topFunctions": top_functions(session.profile, self.top),
+            "allocations": top_allocations(snapshot, self.top),
+            "collapsed": collapse(session.profile),
+        }
+        with self._lock:
+            self._profiles.setdefault(route, deque(maxlen=self.keep)).append(record)
+        return record
+
+    def profiles(self, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Résumés des profils (sans les piles), du plus récent au plus ancien."""
+        with self._lock:
+            records = [r for key, q in self._profiles.items() if route in (None, key) for r in q]
+        return [{k: v for k, v in r.items() if k != "collapsed"}
+                for r in sorted(records, key=lambda r: r["id"], reverse=True)]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        """Profil complet (piles comprises)."""
+        with self._lock:
+            for q in self._profiles.values():
+                for record in q:
+                    if record["id"] == profile_id:
+                        return record
+        return None
+
+    def collapsed(self, route: Optional[str] = None, profile_id: Optional[int] = None) -> str:
+        """Piles repliées (un profil, une route, ou tout) fusionnées, une par ligne."""
+        if profile_id is not None:
+            record = self.get(profile_id)
+            records = [record] if record else []
+        else:
+            with self._lock:
+                records = [r for key, q in self._profiles.items() if route in (None, key) for r in q]
+
+        merged: Dict[str, int] = defaultdict(int)
+        for record in records:
+            for stack, us in record["collapsed"].items():
+                merged[stack] += us
+        return "".join(f"{stack} {us}\n" for stack, us in sorted(merged.items()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+class ProfilingMiddleware:
+    """Middleware WSGI appliquant un RequestProfiler.
+
+    Args:
+        app: Application WSGI enveloppée
+        profiler: Profileur
+        url_map: Table de routes werkzeug (facultatif) pour regrouper les
+            profils par règle (`/api/jobs/<job_id>`) plutôt que par chemin
+    """
+
+    def __init__(self, app: Callable, profiler: RequestProfiler, url_map: Any = None) -> None:
+        self.app = app
+        self.profiler = profiler
+        self.url_map = url_map
+
+    def route_of(self, environ: Dict[str, Any]) -> str:
+        path = environ.get("PATH_INFO", "") or "/"
+        if self.url_map is None:
+            return path
+        try:
+            rule, _ = self.url_map.bind_to_environ(environ).match(return_rule=True)
+            return rule.rule
+        except Exception:
+            return path
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Any:
+        route = self.route_of(environ)
+        if not self.profiler.wants(environ, route):
+            return self.app(environ, start_response)
+        session = self.profiler.begin()
+        if session is None:
+            return self.app(environ, start_response)
+
+        status: List[str] = ["500"]
+
+        def capture(status_line, headers, exc_info=None):
+            status[0] = status_line.split(" ", 1)[0]
+            return start_response(status_line, headers, exc_info)
+
+        def consume(result):
+            try:
+                return list(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+
+        try:
+            return session.run(lambda: consume(self.app(environ, capture)))
+        finally:
+            self.profiler.end(session, environ.get("REQUEST_METHOD", "GET"), route, status[0])
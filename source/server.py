@@ -2,20 +2,31 @@
 # -*- coding: utf-8 -*-
 """
 server.py — Backend Flask pour LiveTechno-Web v0.1 (Pythonista compatible)
-Sans dépendances C/C++ : pas de mido, pas de jsonschema
+Sans dépendances C/C++ : pas de mido, pas de jsonschema (validation par
+schema_validators.py, schémas compilés en Python pur)
 Tous les fichiers à plat dans le même dossier
 """
 
 import os
 import json
 import sqlite3
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Flask (disponible via pip, pure Python)
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 
+# Profilage des requêtes (profiling.py, même dossier, facultatif)
+try:
+    from profiling import ProfilingMiddleware, RequestProfiler
+except ImportError:
+    ProfilingMiddleware = RequestProfiler = None
+
+# Validateurs JSON Schema compilés (schema_validators.py, même dossier)
+import schema_validators
+
 # OpenAI (disponible via pip, pure Python)
 try:
     from openai import OpenAI
@@ -31,12 +42,62 @@ PORT = 8787
 
 OPENAI_API_KEY = None
 OPENAI_MODEL = "gpt-4.1-mini"
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")  # None = API OpenAI (sinon serveur local de test)
 
 # Chemins (tous dans le même dossier)
 BASE_DIR = Path(__file__).parent
 DB_PATH = BASE_DIR / "logs.db"
 PROJECT_PATH = BASE_DIR / "project.json"
 
+# Profilage par requête (opt-in) : PROFILE_EVERY=N → 1 requête sur N, 0 → en-tête X-Profile uniquement
+PROFILE_EVERY = os.environ.get("PROFILE_EVERY")
+
+# Rétention des logs (au-delà : agrégats horaires dans logs_hourly)
+LOG_RETENTION_DAYS = 30
+LOG_BATCH_SIZE = 1000
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+# Le frontend v0.1 n'envoie ni `schema` ni `id` dans ses patterns
+PATTERN_OPTIONAL = ("'schema' is a required property", "'id' is a required property")
+
+def _first_error(schema_name, document, optional=()):
+    """Premier écart au schéma (hors champs racine tolérés absents), None si valide."""
+    for error in schema_validators.iter_errors(schema_name, document):
+        if not (error.validator == "required" and not error.path and error.message in optional):
+            return error.message
+    return None
+
+def pattern_error(pattern):
+    """Premier écart d'un pattern sauvegardé à Pattern.v1, None s'il est valide."""
+    return _first_error("Pattern.v1", pattern, PATTERN_OPTIONAL)
+
+def created_pattern_error(pattern):
+    """Premier écart d'une réponse GPT à CreatePattern.v1, None si elle est valide.
+
+    `schema` peut manquer : le prompt v0.1 ne le demandait pas.
+    """
+    return _first_error("CreatePattern.v1", pattern, ("'schema' is a required property",))
+
+def pattern_from_created(created):
+    """Pattern.v1 (stocké dans le projet) depuis un CreatePattern.v1 validé."""
+    pattern = {k: v for k, v in created.items() if k not in ("schema", "patternId")}
+    pattern["schema"] = "Pattern.v1"
+    pattern["id"] = created.get("patternId") or f"gpt-{uuid.uuid4().hex[:8]}"
+    return pattern
+
+def project_error(project_state):
+    """Premier pattern invalide d'un projet (message), None si tous sont valides."""
+    if not isinstance(project_state, dict) or not isinstance(project_state.get('patterns', []), list):
+        return "projectState invalide"
+    for index, pattern in enumerate(project_state.get('patterns', [])):
+        error = pattern_error(pattern)
+        if error:
+            return f"Pattern {index} invalide : {error}"
+    return None
+
 # ============================================================================
 # BASE DE DONNÉES
 # ============================================================================
@@ -54,11 +115,44 @@ def init_db():
             message TEXT
         )
     """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS logs_hourly (
+            hour TEXT NOT NULL,
+            level TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (hour, level)
+        )
+    """)
     
     conn.commit()
     conn.close()
+    compact_logs()
     log("INFO", "Base de données initialisée")
 
+def compact_logs():
+    """Agrège les logs plus anciens que LOG_RETENTION_DAYS par heure et niveau, puis les supprime par lots."""
+    cutoff = (datetime.utcnow() - timedelta(days=LOG_RETENTION_DAYS)).isoformat()
+    batch = "SELECT id FROM logs WHERE timestamp < ? ORDER BY id LIMIT ?"
+    conn = sqlite3.connect(DB_PATH)
+    removed = 0
+    while True:
+        with conn:
+            conn.execute(f"""
+                INSERT INTO logs_hourly (hour, level, total)
+                SELECT substr(timestamp, 1, 13), level, COUNT(*) FROM logs
+                WHERE id IN ({batch}) GROUP BY substr(timestamp, 1, 13), level
+                ON CONFLICT(hour, level) DO UPDATE SET total = total + excluded.total
+            """, (cutoff, LOG_BATCH_SIZE))
+            deleted = conn.execute(f"DELETE FROM logs WHERE id IN ({batch})", (cutoff, LOG_BATCH_SIZE)).rowcount
+        removed += deleted
+        if deleted < LOG_BATCH_SIZE:
+            break
+    conn.close()
+    if removed:
+        print(f"[INFO] {removed} logs compactés")
+
 def log(level, message):
     """Log un message."""
     try:
@@ -83,10 +177,10 @@ def create_midi_file(project_state):
     
     # MThd chunk
     midi_data.extend(b'MThd')
-    midi_data.extend((0, 0, 0, 6).to_bytes(4, 'big'))  # Length
-    midi_data.extend((0, 1).to_bytes(2, 'big'))  # Format 1
-    midi_data.extend((0, 2).to_bytes(2, 'big'))  # 2 tracks
-    midi_data.extend((1, 224).to_bytes(2, 'big'))  # 480 PPQ
+    midi_data.extend((6).to_bytes(4, 'big'))  # Length
+    midi_data.extend((1).to_bytes(2, 'big'))  # Format 1
+    midi_data.extend((2).to_bytes(2, 'big'))  # 2 tracks
+    midi_data.extend((480).to_bytes(2, 'big'))  # 480 PPQ
     
     # Track 0: Tempo
     track0 = bytearray()
@@ -153,6 +247,13 @@ def encode_variable_length(value):
 app = Flask(__name__)
 CORS(app)
 
+PROFILER = None
+if PROFILE_EVERY is not None and RequestProfiler is None:
+    print("⚠️  PROFILE_EVERY ignoré : profiling.py absent")
+elif PROFILE_EVERY is not None:
+    PROFILER = RequestProfiler(int(PROFILE_EVERY))
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app, PROFILER, app.url_map)
+
 @app.after_request
 def add_headers(response):
     response.headers['Cross-Origin-Opener-Policy'] = 'same-origin'
@@ -225,11 +326,12 @@ def generate_pattern():
     project_state = data.get('projectState', {})
     
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
         
         system_prompt = """Tu es une IA compositrice pour LiveTechno-Web.
-Génère un pattern JSON avec cette structure :
+Génère un pattern JSON (CreatePattern.v1) avec cette structure :
 {
+  "schema": "CreatePattern.v1",
   "name": "nom du pattern",
   "targetMachine": "behringer.rd9" ou "behringer.td3",
   "lengthSteps": 16,
@@ -262,7 +364,15 @@ Retourne UNIQUEMENT le JSON, sans texte avant ou après."""
             content = content[:-3]
         content = content.strip()
         
-        pattern = json.loads(content)
+        created = json.loads(content)
+        error = created_pattern_error(created)
+        if not error:
+            # Le frontend ajoute le pattern tel quel au projet (validé en Pattern.v1 à la sauvegarde)
+            pattern = pattern_from_created(created)
+            error = pattern_error(pattern)
+        if error:
+            log("ERROR", f"Pattern GPT invalide : {error}")
+            return jsonify({"error": f"Pattern invalide : {error}"}), 500
         
         log("INFO", f"Pattern généré : {pattern.get('name', 'sans nom')}")
         return jsonify({"pattern": pattern})
@@ -276,6 +386,9 @@ def export_midi():
     """Exporter en MIDI."""
     data = request.json
     project_state = data.get('projectState', {})
+    error = project_error(project_state)
+    if error:
+        return jsonify({"error": error}), 400
     
     try:
         midi_data = create_midi_file(project_state)
@@ -296,6 +409,9 @@ def save_project():
     """Sauvegarder le projet."""
     data = request.json
     project_state = data.get('projectState', {})
+    error = project_error(project_state)
+    if error:
+        return jsonify({"error": error}), 400
     
     try:
         with open(PROJECT_PATH, 'w', encoding='utf-8') as f:
@@ -325,6 +441,61 @@ def load_project():
         log("ERROR", f"Erreur chargement : {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/logs', methods=['GET'])
+def query_logs():
+    """Logs paginés du plus récent au plus ancien (curseur `before` = nextCursor)."""
+    try:
+        try:
+            limit = int(request.args.get('limit', 50))
+            before = request.args.get('before')
+            before = int(before) if before else None
+        except ValueError:
+            return jsonify({"error": "limit et before doivent être des entiers"}), 400
+        level = request.args.get('level')
+        if not 1 <= limit <= 500:
+            return jsonify({"error": "limit invalide (1-500)"}), 400
+        
+        clauses, params = [], []
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        if level:
+            clauses.append("level = ?")
+            params.append(level)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        conn = sqlite3.connect(DB_PATH)
+        rows = conn.execute(f"SELECT id, timestamp, level, message FROM logs {where} ORDER BY id DESC LIMIT ?",
+                            params + [limit + 1]).fetchall()
+        conn.close()
+        
+        items = [{"id": r[0], "timestamp": r[1], "level": r[2], "message": r[3]} for r in rows[:limit]]
+        next_cursor = items[-1]["id"] if len(rows) > limit else None
+        return jsonify({"items": items, "nextCursor": next_cursor})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/debug/profiles', methods=['GET', 'DELETE'])
+def debug_profiles():
+    """Profils de requêtes (?route=, ?id=, ?format=collapsed pour flamegraph)."""
+    if PROFILER is None:
+        return jsonify({"error": "Profilage désactivé (PROFILE_EVERY, profiling.py)"}), 404
+    
+    if request.method == 'DELETE':
+        PROFILER.clear()
+        return jsonify({"success": True})
+    
+    route = request.args.get('route')
+    profile_id = request.args.get('id', type=int)
+    if request.args.get('format') == 'collapsed':
+        return PROFILER.collapsed(route, profile_id), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+    if profile_id is not None:
+        record = PROFILER.get(profile_id)
+        if record is None:
+            return jsonify({"error": "Profil introuvable"}), 404
+        return jsonify(record)
+    return jsonify({"every": PROFILER.every, "profiles": PROFILER.profiles(route)})
+
 # ============================================================================
 # MAIN
 # ============================================================================